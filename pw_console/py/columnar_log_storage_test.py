@@ -0,0 +1,220 @@
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""Tests for pw_console.columnar_log_storage"""
+
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import unittest
+
+from pw_console.columnar_log_storage import ColumnarLogStorage
+
+
+def _record(
+    message: str,
+    *args,
+    level: int = logging.INFO,
+    name: str = 'device',
+    extra_metadata_fields: dict | None = None,
+    exc_info=None,
+) -> logging.LogRecord:
+    record = logging.LogRecord(
+        name, level, '/src/device/main.py', 42, message, args, exc_info
+    )
+    if extra_metadata_fields is not None:
+        record.extra_metadata_fields = extra_metadata_fields
+    return record
+
+
+class TestColumnarLogStorage(unittest.TestCase):
+    """Tests for ColumnarLogStorage."""
+
+    def test_recreates_records(self) -> None:
+        """Test rows are read back as records with the original fields."""
+        storage = ColumnarLogStorage(chunk_size=2)
+        original = _record(
+            'Temperature %d%%',
+            21,
+            level=logging.WARNING,
+            extra_metadata_fields={
+                'module': 'SENSOR',
+                'msg': 'Temperature 21%',
+            },
+        )
+        storage.append(original)
+        storage.append(_record('Second'))
+        storage.append(_record('Third', name='host'))
+
+        self.assertEqual(len(storage), 3)
+        record = storage[0].record
+        self.assertEqual(record.getMessage(), 'Temperature 21%')
+        self.assertEqual(record.levelno, logging.WARNING)
+        self.assertEqual(record.levelname, 'WARNING')
+        self.assertEqual(record.name, 'device')
+        self.assertEqual(record.created, original.created)
+        self.assertEqual(record.filename, 'main.py')
+        self.assertEqual(record.lineno, 42)
+        self.assertEqual(
+            record.extra_metadata_fields,  # type: ignore[attr-defined]
+            {'module': 'SENSOR', 'msg': 'Temperature 21%'},
+        )
+
+        self.assertEqual(storage[-1].record.name, 'host')
+        self.assertEqual(
+            [storage[i].record.getMessage() for i in range(1, len(storage))],
+            ['Second', 'Third'],
+        )
+        with self.assertRaises(IndexError):
+            _ = storage[3]
+
+    def test_keeps_exception_text(self) -> None:
+        """Test formatted exception text is stored with the message."""
+        storage = ColumnarLogStorage()
+        try:
+            raise ValueError('bad value')
+        except ValueError:
+            storage.append(_record('Failed', exc_info=sys.exc_info()))
+
+        exc_text = storage[0].record.exc_text
+        assert exc_text is not None
+        self.assertIn('ValueError: bad value', exc_text)
+
+    def test_formats_lines_when_read(self) -> None:
+        """Test LogLines are created only when rows are read, then cached."""
+        storage = ColumnarLogStorage(cache_size=2)
+        created = []
+
+        def line_factory(record: logging.LogRecord):
+            created.append(record.getMessage())
+            return ColumnarLogStorage().line_factory(record)
+
+        storage.line_factory = line_factory
+        for i in range(4):
+            storage.append(_record('Log %d', i))
+        self.assertEqual(created, [])
+
+        self.assertIs(storage[1], storage[1])
+        _ = storage[2], storage[3], storage[1]
+        self.assertEqual(created, ['Log 1', 'Log 2', 'Log 3', 'Log 1'])
+
+    def test_spills_full_chunks(self) -> None:
+        """Test payloads of full chunks are moved to the spill directory."""
+        with tempfile.TemporaryDirectory() as spill_directory:
+            storage = ColumnarLogStorage(
+                spill_directory=spill_directory, chunk_size=100, cache_size=0
+            )
+            for i in range(1000):
+                storage.append(
+                    _record('Log message number %d', i, name=f'logger{i % 3}')
+                )
+
+            in_memory = ColumnarLogStorage(chunk_size=100)
+            for i in range(1000):
+                in_memory.append(_record('Log message number %d', i))
+
+            self.assertLess(storage.memory_usage(), in_memory.memory_usage())
+            self.assertEqual(
+                storage[150].record.getMessage(), 'Log message number 150'
+            )
+            self.assertEqual(storage[999].record.name, 'logger0')
+
+            storage.clear()
+            self.assertEqual(len(storage), 0)
+            self.assertEqual(os.listdir(spill_directory), [])
+
+    def test_evicts_oldest_chunks(self) -> None:
+        """Test whole chunks are evicted without shifting indexes."""
+        storage = ColumnarLogStorage(chunk_size=10, max_rows=25)
+        for i in range(100):
+            storage.append(_record('Log %d', i))
+
+        self.assertEqual(len(storage), 100)
+        self.assertEqual(storage.first_index, 70)
+        self.assertEqual(storage[70].record.getMessage(), 'Log 70')
+        self.assertEqual(storage[-1].record.getMessage(), 'Log 99')
+        with self.assertRaises(IndexError):
+            _ = storage[69]
+
+        messages = [line.record.getMessage() for line in storage]
+        self.assertEqual(messages, [f'Log {i}' for i in range(70, 100)])
+        self.assertEqual(
+            [line.record.getMessage() for line in reversed(storage)],
+            messages[::-1],
+        )
+
+    def test_eviction_bounds_memory(self) -> None:
+        """Test memory use stops growing once chunks are evicted."""
+        with tempfile.TemporaryDirectory() as spill_directory:
+            storage = ColumnarLogStorage(
+                spill_directory=spill_directory,
+                chunk_size=10,
+                cache_size=0,
+                max_rows=50,
+            )
+            for i in range(100):
+                storage.append(_record('Log message number %d', i))
+            memory_usage = storage.memory_usage()
+
+            for i in range(100, 1000):
+                storage.append(_record('Log message number %d', i))
+
+            self.assertLess(storage.memory_usage(), 2 * memory_usage)
+            self.assertEqual(
+                storage[950].record.getMessage(), 'Log message number 950'
+            )
+
+            storage.clear()
+            self.assertEqual(storage.first_index, 0)
+            self.assertEqual(os.listdir(spill_directory), [])
+
+    def test_concurrent_reads(self) -> None:
+        """Test reading from several threads while the cache turns over."""
+        storage = ColumnarLogStorage(chunk_size=10, cache_size=5)
+        for i in range(10):
+            storage.append(_record('Log %d', i))
+
+        errors: list[Exception] = []
+
+        def read(seed: int) -> None:
+            rows = random.Random(seed).choices(range(10), k=20000)
+            try:
+                for row in rows:
+                    self.assertEqual(
+                        storage[row].record.getMessage(), f'Log {row}'
+                    )
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+        # Switch threads often so that cache updates interleave.
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [
+                threading.Thread(target=read, args=(seed,)) for seed in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        self.assertEqual(errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,15 +17,17 @@ import logging
 import unittest
 from unittest.mock import MagicMock
 
+from pw_console.columnar_log_storage import ColumnarLogStorage
 from pw_console.log_store import LogStore
 from pw_console.console_prefs import ConsolePrefs
 
 
-def _create_log_store():
+def _create_log_store(storage: ColumnarLogStorage | None = None):
     log_store = LogStore(
         prefs=ConsolePrefs(
             project_file=False, project_user_file=False, user_file=False
-        )
+        ),
+        storage=storage,
     )
 
     assert not log_store.table.prefs.show_python_file
@@ -139,6 +141,37 @@ class TestLogStore(unittest.TestCase):
             log_store.render_table_header(),
         )
 
+    def test_columnar_storage(self) -> None:
+        """Test logs kept in columnar storage are formatted when read."""
+        log_store, viewer = _create_log_store(ColumnarLogStorage(chunk_size=2))
+        test_log = logging.getLogger('log_store.test')
+
+        with self.assertLogs(test_log, level='DEBUG') as _log_context:
+            test_log.addHandler(log_store)
+            for i in range(5):
+                test_log.debug(
+                    'Test log %s',
+                    i,
+                    extra=dict(extra_metadata_fields={'planet': 'Jupiter'}),
+                )
+
+        viewer.new_logs_arrived.assert_called()
+        self.assertEqual(5, log_store.get_total_count())
+        self.assertEqual({'log_store.test': 5}, log_store.channel_counts)
+        # Metadata columns are found as logs are read.
+        self.assertNotIn('planet', log_store.table.column_widths)
+
+        log_line = log_store.logs[3]
+        self.assertRegex(
+            log_line.ansi_stripped_log,
+            r'[0-9]{8} [0-9]{2}:[0-9]{2}:[0-9]{2} DEBUG Test log 3',
+        )
+        self.assertEqual('Jupiter', log_line.metadata.fields['planet'])
+        self.assertEqual(7, log_store.table.column_widths['planet'])
+
+        log_store.clear_logs()
+        self.assertEqual(0, log_store.get_total_count())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -22,7 +22,9 @@ from unittest.mock import MagicMock, patch
 from parameterized import parameterized  # type: ignore
 from prompt_toolkit.data_structures import Point
 
+from pw_console.columnar_log_storage import ColumnarLogStorage
 from pw_console.console_prefs import ConsolePrefs
+from pw_console.log_store import LogStore
 from pw_console.log_view import LogView
 from pw_console.log_screen import ScreenLine
 from pw_console.text_formatting import (
@@ -36,7 +38,7 @@ _PYTHON_3_8 = sys.version_info >= (
 )
 
 
-def _create_log_view():
+def _create_log_view(log_store: LogStore | None = None):
     log_pane = MagicMock()
     log_pane.pane_resized = MagicMock(return_value=True)
     log_pane.current_log_pane_width = 80
@@ -47,7 +49,7 @@ def _create_log_view():
         project_file=False, project_user_file=False, user_file=False
     )
     application.prefs.reset_config()
-    log_view = LogView(log_pane, application)
+    log_view = LogView(log_pane, application, log_store)
     return log_view, log_pane
 
 
@@ -336,6 +338,36 @@ class TestLogView(unittest.TestCase):
         log_view.render_content()
         self.assertEqual(log_view.get_current_line(), 7)
 
+    def test_evicted_logs_are_hidden(self) -> None:
+        """Test logs evicted from columnar storage are skipped by the view."""
+        # pylint: disable=protected-access
+        log_view, _pane = _create_log_view(
+            LogStore(storage=ColumnarLogStorage(chunk_size=10, max_rows=25))
+        )
+
+        test_log = logging.getLogger('log_view.test')
+        with self.assertLogs(test_log, level='DEBUG') as _log_context:
+            test_log.addHandler(log_view.log_store)
+            for i in range(100):
+                test_log.debug('Test log %s', i)
+        log_view.render_content()
+
+        self.assertEqual(log_view.get_total_count(), 100)
+        self.assertEqual(log_view.hidden_line_count(), 70)
+        self.assertEqual(log_view._get_log_lines()[0], 70)
+        self.assertEqual(
+            [log.record.message for log in log_view._get_visible_log_lines()],
+            [f'Test log {i}' for i in range(70, 100)],
+        )
+
+        log_view.scroll_to_top()
+        log_view.render_content()
+        self.assertEqual(log_view.get_current_line(), 70)
+
+        text = log_view._logs_to_text(use_table_formatting=False)
+        self.assertEqual(len(text.splitlines()), 30)
+        self.assertIn('Test log 70', text.splitlines()[0])
+
     def test_get_line_at_cursor_position(self) -> None:
         """Tests fuctions that rely on getting a log_index for the current
         cursor position.
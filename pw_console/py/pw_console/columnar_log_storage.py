@@ -0,0 +1,448 @@
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""Compact columnar storage for LogStore."""
+
+from __future__ import annotations
+
+from array import array
+import collections
+from collections.abc import Sequence
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+import tempfile
+import threading
+from typing import Any, Callable, Iterator, overload
+
+from pw_console.log_line import LogLine
+
+
+class _StringTable:
+    """Stores each distinct string once and refers to it by index."""
+
+    def __init__(self) -> None:
+        self._strings: list[str] = []
+        self._indexes: dict[str, int] = {}
+
+    def index(self, string: str) -> int:
+        index = self._indexes.get(string)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(string)
+            self._indexes[string] = index
+        return index
+
+    def __getitem__(self, index: int) -> str:
+        return self._strings[index]
+
+
+class _Chunk:  # pylint: disable=too-many-instance-attributes
+    """A block of rows stored as one array per column.
+
+    Message text and extra fields are encoded together as a UTF-8 payload per
+    row. Payloads are kept in memory until the chunk is full, after which they
+    may be moved to the segment file.
+    """
+
+    def __init__(self) -> None:
+        self.created = array('d')
+        self.levelno = array('H')
+        self.levelname = array('I')
+        self.name = array('I')
+        self.pathname = array('I')
+        self.lineno = array('I')
+        # Start of each row's payload, relative to the start of the chunk's
+        # payload. The final entry is the end of the last payload.
+        self.payload_offsets = array('I', [0])
+        self.payload: bytearray | None = bytearray()
+        # The segment file and offset of the payload, once it has been spilled.
+        self.segment: _Segment | None = None
+        self.segment_offset = 0
+
+    def __len__(self) -> int:
+        return len(self.created)
+
+
+class _Segment:
+    """A temporary file holding the spilled payloads of a run of chunks.
+
+    Each segment holds a limited number of chunks, so that the file is closed
+    once all of its chunks have been evicted and nothing refers to it.
+    """
+
+    MAX_CHUNKS = 16
+
+    def __init__(self, directory: str | Path) -> None:
+        self._file = tempfile.TemporaryFile(
+            prefix='pw_console_logs_', dir=directory
+        )
+        self._size = 0
+        self._map: mmap.mmap | None = None
+        self.chunk_count = 0
+
+    def write(self, payload: bytearray) -> int:
+        """Appends a chunk's payload and returns its offset in the file."""
+        offset = self._size
+        self._file.seek(offset)
+        self._file.write(payload)
+        self._file.flush()
+        self._size += len(payload)
+        self.chunk_count += 1
+        return offset
+
+    def read(self, start: int, end: int) -> bytes:
+        # Map the file again if it has grown since it was last mapped.
+        if self._map is None or len(self._map) < end:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        return self._map[start:end]
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+# pylint: disable-next=too-many-instance-attributes
+class ColumnarLogStorage(Sequence[LogLine]):
+    """Stores logs for a LogStore in compact columnar chunks.
+
+    Instead of keeping a LogRecord, a formatted string and an ANSI-stripped
+    copy of it for every log, only the fields needed to recreate the record
+    are kept: the time, level, logger name, source file and line as columns of
+    numbers, with repeated strings stored once, and the message, extra
+    metadata fields and any exception text as a UTF-8 payload.
+
+    A LogLine is created only when a row is read, such as when it is rendered
+    or scanned by a filter, and recently read lines are cached. The cache is
+    locked, since lines may be read from several threads, such as the UI and a
+    websocket server. Other LogRecord attributes, such as the function name or
+    thread, are not kept.
+
+    If a spill directory is given, the payloads of full chunks are written to
+    temporary segment files there and read back through mmap, so that memory
+    use grows by only a few dozen bytes per log.
+
+    If max_rows is given, the oldest chunks are evicted once more than max_rows
+    logs would remain without them, which bounds both memory and disk use.
+    Indexes are not shifted by eviction: len() is the total number of logs
+    appended, first_index is the index of the oldest log still stored, and
+    reading an evicted log raises IndexError.
+    """
+
+    DEFAULT_CHUNK_SIZE = 4096
+    DEFAULT_CACHE_SIZE = 10000
+
+    def __init__(
+        self,
+        spill_directory: str | Path | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        max_rows: int | None = None,
+    ) -> None:
+        """Creates columnar log storage.
+
+        Args:
+            spill_directory: Optional directory for the temporary segment files
+                holding the payloads of full chunks. If None, all payloads stay
+                in memory.
+            chunk_size: Number of rows in each chunk.
+            cache_size: Maximum number of recently read LogLines to keep.
+            max_rows: Optional number of most recent logs to keep. Whole chunks
+                are evicted, so up to chunk_size more logs may be kept. If
+                None, no logs are evicted.
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+        if max_rows is not None and max_rows < 1:
+            raise ValueError('max_rows must be at least 1')
+
+        self._spill_directory = spill_directory
+        self._chunk_size = chunk_size
+        self._cache_size = cache_size
+        self._max_rows = max_rows
+
+        # Creates the LogLine for a record recreated from a row. Set by the
+        # LogStore, which formats the record.
+        self.line_factory: Callable[
+            [logging.LogRecord], LogLine
+        ] = _default_line_factory
+
+        self._strings = _StringTable()
+        # Chunk i holds rows [i * chunk_size, (i + 1) * chunk_size). Evicted
+        # chunks are replaced with None so that indexes stay the same.
+        self._chunks: list[_Chunk | None] = []
+        self._evicted_chunks = 0
+        self._length = 0
+        self._cache: collections.OrderedDict[
+            int, LogLine
+        ] = collections.OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # The segment file that full chunks are currently spilled to.
+        self._segment: _Segment | None = None
+
+    @property
+    def first_index(self) -> int:
+        """Index of the oldest log that has not been evicted."""
+        return self._evicted_chunks * self._chunk_size
+
+    def append(self, record: logging.LogRecord) -> None:
+        """Adds a log record as a new row, evicting the oldest chunk if full."""
+        # The newest chunk is never evicted.
+        chunk = self._chunks[-1] if self._chunks else None
+        if self._length % self._chunk_size == 0:
+            if chunk is not None:
+                self._seal(chunk)
+            chunk = _Chunk()
+            self._chunks.append(chunk)
+
+        assert chunk is not None and chunk.payload is not None
+        chunk.payload.extend(_encode_payload(record))
+        chunk.payload_offsets.append(len(chunk.payload))
+
+        chunk.created.append(record.created)
+        chunk.levelno.append(record.levelno)
+        chunk.levelname.append(self._strings.index(record.levelname))
+        chunk.name.append(self._strings.index(record.name))
+        chunk.pathname.append(self._strings.index(record.pathname or ''))
+        chunk.lineno.append(record.lineno or 0)
+
+        # Rows become visible to readers once all of their columns are set.
+        self._length += 1
+
+        if (
+            self._max_rows is not None
+            and self._length - self.first_index - self._chunk_size
+            >= self._max_rows
+        ):
+            self._evict_oldest_chunk()
+
+    def clear(self) -> None:
+        """Removes all rows and deletes the segment files."""
+        segments = {
+            chunk.segment
+            for chunk in self._chunks
+            if chunk is not None and chunk.segment is not None
+        }
+        if self._segment is not None:
+            segments.add(self._segment)
+
+        self._chunks = []
+        self._evicted_chunks = 0
+        self._length = 0
+        with self._cache_lock:
+            self._cache.clear()
+        self._strings = _StringTable()
+        self._segment = None
+
+        for segment in segments:
+            segment.close()
+
+    def memory_usage(self) -> int:
+        """Returns the approximate number of bytes used by stored rows.
+
+        The segment file and cached LogLines are not included.
+        """
+        total = 0
+        for chunk in self._chunks[self._evicted_chunks :]:
+            assert chunk is not None
+            for column in (
+                chunk.created,
+                chunk.levelno,
+                chunk.levelname,
+                chunk.name,
+                chunk.pathname,
+                chunk.lineno,
+                chunk.payload_offsets,
+            ):
+                total += column.buffer_info()[1] * column.itemsize
+            if chunk.payload is not None:
+                total += len(chunk.payload)
+        return total
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> LogLine:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[LogLine]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> LogLine | list[LogLine]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('log index out of range')
+        if index < self.first_index:
+            raise IndexError('log has been evicted')
+
+        with self._cache_lock:
+            line = self._cache.get(index)
+            if line is not None:
+                self._cache.move_to_end(index)
+                return line
+
+        line = self.line_factory(self._record(index))
+
+        with self._cache_lock:
+            self._cache[index] = line
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+        return line
+
+    def __iter__(self) -> Iterator[LogLine]:
+        """Iterates over the logs that have not been evicted."""
+        for index in range(self.first_index, self._length):
+            yield self[index]
+
+    def __reversed__(self) -> Iterator[LogLine]:
+        for index in range(self._length - 1, self.first_index - 1, -1):
+            yield self[index]
+
+    def _record(self, index: int) -> logging.LogRecord:
+        """Recreates the LogRecord stored in a row."""
+        # The chunk may be evicted by the logging thread while it is read.
+        chunk = self._chunks[index // self._chunk_size]
+        if chunk is None:
+            raise IndexError('log has been evicted')
+        row = index % self._chunk_size
+
+        message, fields, exc_text, stack_info = _decode_payload(
+            self._payload(chunk, row)
+        )
+        pathname = self._strings[chunk.pathname[row]]
+        filename = os.path.basename(pathname)
+        created = chunk.created[row]
+
+        attributes: dict[str, Any] = dict(
+            name=self._strings[chunk.name[row]],
+            msg=message,
+            args=None,
+            levelno=chunk.levelno[row],
+            levelname=self._strings[chunk.levelname[row]],
+            pathname=pathname,
+            filename=filename,
+            module=os.path.splitext(filename)[0],
+            lineno=chunk.lineno[row],
+            created=created,
+            msecs=(created - int(created)) * 1000,
+            exc_text=exc_text,
+            stack_info=stack_info,
+        )
+        if fields is not None:
+            attributes['extra_metadata_fields'] = fields
+
+        return logging.makeLogRecord(attributes)
+
+    @staticmethod
+    def _payload(chunk: _Chunk, row: int) -> bytes | bytearray:
+        start = chunk.payload_offsets[row]
+        end = chunk.payload_offsets[row + 1]
+
+        # The chunk may be spilled by the logging thread while it is read.
+        payload = chunk.payload
+        if payload is not None:
+            return payload[start:end]
+
+        assert chunk.segment is not None
+        return chunk.segment.read(
+            chunk.segment_offset + start, chunk.segment_offset + end
+        )
+
+    def _seal(self, chunk: _Chunk) -> None:
+        """Moves a full chunk's payload to a segment file, if enabled."""
+        if self._spill_directory is None or chunk.payload is None:
+            return
+
+        if (
+            self._segment is None
+            or self._segment.chunk_count >= _Segment.MAX_CHUNKS
+        ):
+            self._segment = _Segment(self._spill_directory)
+
+        chunk.segment_offset = self._segment.write(chunk.payload)
+        chunk.segment = self._segment
+        chunk.payload = None
+
+    def _evict_oldest_chunk(self) -> None:
+        """Drops the oldest chunk.
+
+        Its segment file is closed once no other chunk or reader refers to it.
+        Cached lines for its rows are left to age out of the cache, so that
+        appending never waits for readers.
+        """
+        evicted = self._evicted_chunks
+        self._evicted_chunks += 1
+        self._chunks[evicted] = None
+
+
+def _default_line_factory(record: logging.LogRecord) -> LogLine:
+    message = record.getMessage()
+    return LogLine(record, message, message)
+
+
+def _encode_payload(record: logging.LogRecord) -> bytes:
+    """Encodes the message, extra fields and exception text of a record."""
+    message = record.getMessage()
+
+    exc_text = record.exc_text
+    if record.exc_info and not exc_text:
+        exc_text = logging.Formatter().formatException(record.exc_info)
+
+    fields = getattr(record, 'extra_metadata_fields', None) or None
+    msg_is_message = False
+    if fields is not None and fields.get('msg') == message:
+        # Device logs repeat the message in the 'msg' field; store it once.
+        # The field keeps its position, since it sets the table column order.
+        fields = dict(fields, msg=None)
+        msg_is_message = True
+
+    payload: list[Any] = [
+        message,
+        fields,
+        exc_text,
+        record.stack_info,
+        msg_is_message,
+    ]
+    while len(payload) > 1 and not payload[-1]:
+        payload.pop()
+
+    return json.dumps(
+        payload, ensure_ascii=False, separators=(',', ':'), default=str
+    ).encode()
+
+
+def _decode_payload(
+    payload: bytes | bytearray,
+) -> tuple[str, dict[str, Any] | None, str | None, str | None]:
+    decoded = json.loads(payload)
+    decoded += [None] * (5 - len(decoded))
+    message, fields, exc_text, stack_info, msg_is_message = decoded
+    if msg_is_message:
+        fields['msg'] = message
+    return message, fields, exc_text, stack_info
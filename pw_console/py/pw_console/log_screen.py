@@ -17,7 +17,7 @@ from __future__ import annotations
 import collections
 import dataclasses
 import logging
-from typing import Callable, TYPE_CHECKING
+from typing import Callable, Sequence, TYPE_CHECKING
 
 from prompt_toolkit.formatted_text import (
     to_formatted_text,
@@ -128,7 +128,7 @@ class LogScreen:
     log lines as the user moves the cursor."""
 
     # Callable functions to retrieve logs and display formatting.
-    get_log_source: Callable[[], tuple[int, collections.deque[LogLine]]]
+    get_log_source: Callable[[], tuple[int, Sequence[LogLine]]]
     get_line_wrapping: Callable[[], bool]
     get_log_formatter: Callable[
         [], Callable[[LogLine], StyleAndTextTuples] | None
@@ -571,8 +571,9 @@ class LogScreen:
 
         Before fetching the log message this function updates the log_source and
         formatting options."""
-        _start_log_index, log_source = self.get_log_source()
-        if log_index >= len(log_source):
+        start_log_index, log_source = self.get_log_source()
+        # The log may have been evicted from the log store since it was drawn.
+        if not start_log_index <= log_index < len(log_source):
             return []
         log = log_source[log_index]
         table_formatter = self.get_log_formatter()
@@ -22,6 +22,7 @@ from typing import TYPE_CHECKING
 
 from pw_cli.color import colors as pw_cli_colors
 
+from pw_console.columnar_log_storage import ColumnarLogStorage
 from pw_console.console_prefs import ConsolePrefs
 from pw_console.log_line import LogLine
 from pw_console.text_formatting import strip_ansi
@@ -76,10 +77,37 @@ class LogStore(logging.Handler):
 
         console.setup_python_logging()
         console.embed()
+
+    By default every log is kept as a ``LogLine`` holding its record and
+    formatted text. For captures of many millions of logs, pass a
+    ``ColumnarLogStorage`` instead. It stores logs in compact columns,
+    optionally spilling message text to temporary files, and formats only the
+    logs that are displayed or searched. Set ``max_rows`` to bound memory and
+    disk use by evicting the oldest logs:
+
+    .. code-block:: python
+
+        from pw_console.columnar_log_storage import ColumnarLogStorage
+
+        device_log_store = LogStore(
+            storage=ColumnarLogStorage(
+                spill_directory='/tmp', max_rows=10_000_000
+            )
+        )
     """
 
-    def __init__(self, prefs: ConsolePrefs | None = None):
-        """Initializes the LogStore instance."""
+    def __init__(
+        self,
+        prefs: ConsolePrefs | None = None,
+        storage: ColumnarLogStorage | None = None,
+    ):
+        """Initializes the LogStore instance.
+
+        Args:
+            prefs: Console preferences.
+            storage: Optional columnar storage for the logs. If None, logs are
+                stored as LogLines in a deque.
+        """
 
         # ConsolePrefs may not be passed on init. For example, if the user is
         # creating a LogStore to capture log messages before console startup.
@@ -88,9 +116,16 @@ class LogStore(logging.Handler):
                 project_file=False, project_user_file=False, user_file=False
             )
         self.prefs = prefs
+        self._storage = storage
+        if self._storage is not None:
+            # Format rows with this handler's formatter as they are read.
+            self._storage.line_factory = self._create_log_line
+
         # Log storage deque for fast addition and deletion from the beginning
         # and end of the iterable.
-        self.logs: collections.deque = collections.deque()
+        self.logs: collections.deque[
+            LogLine
+        ] | ColumnarLogStorage = collections.deque()
 
         # Only allow this many log lines in memory.
         self.max_history_size: int = 1000000
@@ -143,7 +178,11 @@ class LogStore(logging.Handler):
 
     def clear_logs(self):
         """Erase all stored pane lines."""
-        self.logs = collections.deque()
+        if self._storage is not None:
+            self._storage.clear()
+            self.logs = self._storage
+        else:
+            self.logs = collections.deque()
         self.channel_counts = {}
         self.channel_formatted_prefix_widths = {}
         self.line_index = 0
@@ -161,6 +200,12 @@ class LogStore(logging.Handler):
         """Total size of the logs store."""
         return len(self.logs)
 
+    def get_first_log_index(self) -> int:
+        """Index of the oldest log that has not been evicted."""
+        if isinstance(self.logs, ColumnarLogStorage):
+            return self.logs.first_index
+        return 0
+
     def get_last_log_index(self):
         """Last valid index of the logs."""
         # Subtract 1 since self.logs is zero indexed.
@@ -209,19 +254,31 @@ class LogStore(logging.Handler):
                 self.channel_formatted_prefix_widths.values()
             )
 
-    def _append_log(self, record: logging.LogRecord):
-        """Add a new log event."""
-        # Format incoming log line.
+    def _create_log_line(self, record: logging.LogRecord) -> LogLine:
+        """Formats a log record and parses its metadata fields."""
         formatted_log = self.format(record)
         ansi_stripped_log = strip_ansi(formatted_log)
-        # Save this log.
-        self.logs.append(
-            LogLine(
-                record=record,
-                formatted_log=formatted_log,
-                ansi_stripped_log=ansi_stripped_log,
-            )
+        log_line = LogLine(
+            record=record,
+            formatted_log=formatted_log,
+            ansi_stripped_log=ansi_stripped_log,
         )
+
+        # Parse metadata fields
+        log_line.update_metadata()
+
+        # Check for bigger column widths.
+        self.table.update_metadata_column_widths(log_line)
+        return log_line
+
+    def _append_log(self, record: logging.LogRecord):
+        """Add a new log event."""
+        # Save this log. Columnar storage formats the log when it is read.
+        if isinstance(self.logs, ColumnarLogStorage):
+            self.logs.append(record)
+        else:
+            self.logs.append(self._create_log_line(record))
+
         # Increment this logger count
         self.channel_counts[record.name] = (
             self.channel_counts.get(record.name, 0) + 1
@@ -232,12 +289,6 @@ class LogStore(logging.Handler):
         # Set the prefix width to 0
         self.channel_formatted_prefix_widths[record.name] = 0
 
-        # Parse metadata fields
-        self.logs[-1].update_metadata()
-
-        # Check for bigger column widths.
-        self.table.update_metadata_column_widths(self.logs[-1])
-
     def emit(self, record) -> None:
         """Process a new log record.
 
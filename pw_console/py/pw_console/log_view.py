@@ -25,7 +25,7 @@ import operator
 from pathlib import Path
 import re
 from threading import Thread
-from typing import Callable, TYPE_CHECKING
+from typing import Callable, Sequence, TYPE_CHECKING
 
 from prompt_toolkit.data_structures import Point
 from prompt_toolkit.formatted_text import StyleAndTextTuples
@@ -205,7 +205,11 @@ class LogView:
 
             _start_log_index, log_source = self._get_log_lines()
             log_index_range = range(
-                self._last_served_websocket_index + 1, self.get_total_count()
+                max(
+                    self._last_served_websocket_index + 1,
+                    self._first_log_index(),
+                ),
+                self.get_total_count(),
             )
 
             for i in log_index_range:
@@ -262,7 +266,7 @@ class LogView:
 
         log_beginning_index = self.hidden_line_count()
 
-        starting_index = self.log_index + 1
+        starting_index = max(self.log_index + 1, log_beginning_index)
         if starting_index > self.get_last_log_index():
             starting_index = log_beginning_index
 
@@ -288,7 +292,7 @@ class LogView:
         log_beginning_index = self.hidden_line_count()
 
         starting_index = self.log_index - 1
-        if starting_index < 0:
+        if starting_index < log_beginning_index:
             starting_index = self.get_last_log_index()
 
         _, logs = self._get_log_lines()
@@ -432,17 +436,28 @@ class LogView:
         self.search_highlight = False
         self._reset_log_screen_on_next_render = True
 
-    def _get_log_lines(self) -> tuple[int, collections.deque[LogLine]]:
-        logs = self.log_store.logs
+    def _get_log_lines(self) -> tuple[int, Sequence[LogLine]]:
+        logs: Sequence[LogLine] = self.log_store.logs
         if self.filtering_on:
             logs = self.filtered_logs
-        return self._scrollback_start_index, logs
+        return max(self._scrollback_start_index, self._first_log_index()), logs
+
+    def _first_log_index(self) -> int:
+        """Index of the oldest log that has not been evicted from the store."""
+        if self.filtering_on:
+            return 0
+        return self.log_store.get_first_log_index()
 
     def _get_visible_log_lines(self):
         _, logs = self._get_log_lines()
-        if self._scrollback_start_index > 0:
+        if self.hidden_line_count() > 0:
+            # Iterating over the logs starts at the first log not evicted.
             return collections.deque(
-                itertools.islice(logs, self.hidden_line_count(), len(logs))
+                itertools.islice(
+                    logs,
+                    self.hidden_line_count() - self._first_log_index(),
+                    len(logs),
+                )
             )
         return logs
 
@@ -491,6 +506,9 @@ class LogView:
 
         # From the end of the log store to the beginning.
         for i in range(starting_index, ending_index - 1, -1):
+            # Logs may be evicted while this task is paused.
+            if i < self._first_log_index():
+                break
             # Is this log a match?
             if self.search_filter.matches(logs[i]):
                 self.save_search_matched_line(i)
@@ -501,10 +519,13 @@ class LogView:
     async def filter_past_logs(self):
         """Filter past log lines."""
         starting_index = self.log_store.get_last_log_index()
-        ending_index = -1
+        ending_index = self.log_store.get_first_log_index() - 1
 
         # From the end of the log store to the beginning.
         for i in range(starting_index, ending_index, -1):
+            # Logs may be evicted while this task is paused.
+            if i < self.log_store.get_first_log_index():
+                break
             # Is this log a match?
             if self.filter_scan(self.log_store.logs[i]):
                 # Add to the beginning of the deque.
@@ -551,8 +572,10 @@ class LogView:
     def hidden_line_count(self):
         """Return the number of hidden lines."""
         if self._scrollback_start_index > 0:
-            return self._scrollback_start_index + 1
-        return 0
+            return max(
+                self._scrollback_start_index + 1, self._first_log_index()
+            )
+        return self._first_log_index()
 
     def undo_clear_scrollback(self):
         """Reset the current scrollback start index."""
@@ -594,17 +617,21 @@ class LogView:
         or scroll.
         """
         latest_total = self.log_store.get_total_count()
+        # Skip any logs that were evicted before they could be scanned.
+        first_new_index = max(
+            self._last_log_store_index, self.log_store.get_first_log_index()
+        )
 
         if self.filtering_on:
             # Scan newly arived log lines
-            for i in range(self._last_log_store_index, latest_total):
+            for i in range(first_new_index, latest_total):
                 if self.filter_scan(self.log_store.logs[i]):
                     self.filtered_logs.append(self.log_store.logs[i])
 
         if self.search_filter:
             last_matched_log: int | None = None
             # Scan newly arived log lines
-            for i in range(self._last_log_store_index, latest_total):
+            for i in range(first_new_index, latest_total):
                 if self.search_filter.matches(self.log_store.logs[i]):
                     self.save_search_matched_line(i)
                     last_matched_log = i
@@ -712,7 +739,7 @@ class LogView:
         self.log_pane.application.redraw_ui()
 
     def visual_select_all(self) -> None:
-        self.marked_logs_start = self._scrollback_start_index
+        self.marked_logs_start, _ = self._get_log_lines()
         self.marked_logs_end = self.get_total_count() - 1
 
         self.visual_select_mode = True
@@ -916,18 +943,17 @@ class LogView:
         if use_table_formatting:
             formatter = get_table_string
 
-        _start_log_index, log_source = self._get_log_lines()
+        start_log_index, log_source = self._get_log_lines()
 
-        log_index_range = range(
-            self._scrollback_start_index, self.get_total_count()
-        )
+        log_index_range = range(start_log_index, self.get_total_count())
         if (
             selected_lines_only
             and self.marked_logs_start is not None
             and self.marked_logs_end is not None
         ):
             log_index_range = range(
-                self.marked_logs_start, self.marked_logs_end + 1
+                max(self.marked_logs_start, start_log_index),
+                self.marked_logs_end + 1,
             )
 
         text_output = ''
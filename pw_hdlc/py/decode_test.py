@@ -27,6 +27,7 @@ from pw_hdlc.decode import (
     FrameDecoder,
     FrameAndNonFrameDecoder,
     FrameStatus,
+    FrameView,
     NO_ADDRESS,
 )
 from pw_hdlc.protocol import frame_check_sequence as fcs
@@ -520,6 +521,30 @@ def _define_py_decoder_test(ctx: Context) -> PyTest:
             decoded_frames,
             msg=f'{ctx.group} (byte-by-byte): {data!r}',
         )
+        # Decode as zero-copy views
+        self.assertEqual(
+            expected_frames,
+            list(FrameDecoder().process_views(data)),
+            msg=f'{ctx.group} (views): {data!r}',
+        )
+        self.assertEqual(
+            expected_frames,
+            list(FrameDecoder().process_views(memoryview(data))),
+            msg=f'{ctx.group} (memoryview): {data!r}',
+        )
+        # Decode with process_byte, which bypasses the bulk scanner
+        decoder = FrameDecoder()
+        decoded_frames = []
+        for byte in data:
+            frame = decoder.process_byte(byte)
+            if frame is not None:
+                decoded_frames.append(frame)
+
+        self.assertEqual(
+            expected_frames,
+            decoded_frames,
+            msg=f'{ctx.group} (process_byte): {data!r}',
+        )
 
     return test
 
@@ -709,6 +734,62 @@ class AdditionalNonFrameDecoderTests(unittest.TestCase):
         )
 
 
+class FrameViewTest(unittest.TestCase):
+    """Tests the zero-copy FrameView."""
+
+    def test_unescaped_frame_references_input(self) -> None:
+        data = _encode(1, 2, b'Hello') + _encode(3, 4, b'world')
+        first, second = FrameDecoder().process_views(data)
+
+        self.assertIs(first.raw_encoded.obj, data)
+        self.assertIs(second.data.obj, data)
+        self.assertEqual(Expected(1, b'\2', b'Hello'), first)
+        self.assertEqual(Expected(3, b'\4', b'world'), second)
+
+    def test_memoryview_input_is_not_copied(self) -> None:
+        data = bytearray(b'xx' + _encode(1, 2, b'Hello') + _encode(3, 4, b'~'))
+        first, second = FrameDecoder().process_views(memoryview(data)[2:])
+
+        self.assertIs(first.raw_decoded.obj, data)
+        self.assertEqual(Expected(1, b'\2', b'Hello'), first)
+        self.assertEqual(Expected(3, b'\4', b'~'), second)
+
+    def test_escaped_frame_is_copied_once(self) -> None:
+        data = _encode(1, 2, b'~}')
+        (frame,) = FrameDecoder().process_views(data)
+
+        self.assertIsNot(frame.raw_decoded.obj, data)
+        self.assertEqual(Expected(1, b'\2', b'~}'), frame)
+
+    def test_frame_split_across_calls(self) -> None:
+        data = _encode(1, 2, b'hello')
+        decoder = FrameDecoder()
+
+        self.assertEqual([], list(decoder.process_views(data[:4])))
+        self.assertEqual(
+            [Expected(1, b'\2', b'hello')],
+            list(decoder.process_views(data[4:])),
+        )
+
+    def test_to_frame_copies_fields(self) -> None:
+        data = bytearray(_encode(1, 2, b'hello'))
+        (view,) = FrameDecoder().process_views(data)
+        frame = view.to_frame()
+
+        self.assertIsInstance(frame.data, bytes)
+        self.assertEqual(bytes(view.raw_encoded), frame.raw_encoded)
+        self.assertEqual(bytes(view.raw_decoded), frame.raw_decoded)
+        self.assertEqual(Expected(1, b'\2', b'hello'), frame)
+
+    def test_bad_address_is_detected_lazily(self) -> None:
+        frame = b'\xfe' * 10 + b'\x01\x00'
+        view = FrameView(b'~' + frame + b'~', frame + fcs(frame))
+
+        self.assertEqual(NO_ADDRESS, view.address)
+        self.assertIs(FrameStatus.BAD_ADDRESS, view.status)
+        self.assertEqual(b'', view.data)
+
+
 if __name__ == '__main__':
     args = parse_test_generation_args()
     if args.generate_cc_test:
@@ -69,5 +69,48 @@ class TestEncodeUIFrame(unittest.TestCase):
         )
 
 
+class TestFrameEncoder(unittest.TestCase):
+    """Tests batch encoding with FrameEncoder."""
+
+    _PAYLOADS = (b'', b'A', b'123456789', b'A\x7e\x7dBC', b'\x7d' * 100)
+
+    def test_matches_ui_frame(self):
+        for address in (0, 0x3E, 128, 2**64 - 1):
+            self.assertEqual(
+                encode.ui_frames(address, self._PAYLOADS),
+                b''.join(encode.ui_frame(address, p) for p in self._PAYLOADS),
+            )
+
+    def test_append_to_existing_frames(self):
+        encoder = encode.FrameEncoder()
+        encoder.append_ui_frame(1, b'hello')
+        encoder.append_ui_frame(0x3E, b'world')
+
+        self.assertEqual(
+            encoder.view(),
+            encode.ui_frame(1, b'hello') + encode.ui_frame(0x3E, b'world'),
+        )
+        self.assertEqual(len(encoder), len(encoder.view()))
+
+    def test_buffer_is_reused(self):
+        encoder = encode.FrameEncoder(initial_size=4)
+
+        first = bytes(encoder.ui_frames(1, [b'x' * 100]))
+        self.assertEqual(first, encode.ui_frame(1, b'x' * 100))
+
+        self.assertEqual(
+            encoder.ui_frames(2, [b'abc', b'def']),
+            encode.ui_frame(2, b'abc') + encode.ui_frame(2, b'def'),
+        )
+
+    def test_grows_while_view_is_held(self):
+        encoder = encode.FrameEncoder(initial_size=4)
+        view = encoder.ui_frames(1, [b'a'])
+        self.assertEqual(
+            encoder.ui_frames(1, [b'b' * 64]), encode.ui_frame(1, b'b' * 64)
+        )
+        view.release()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -15,9 +15,10 @@
 
 import enum
 import logging
+import re
 import threading
 import time
-from typing import Iterable, Callable, Any
+from typing import Iterable, Iterator, Callable, Any
 import zlib
 
 from pw_hdlc import protocol
@@ -27,6 +28,15 @@ _LOG = logging.getLogger('pw_hdlc')
 NO_ADDRESS = -1
 _MIN_FRAME_SIZE = 6  # 1 B address + 1 B control + 4 B CRC-32
 _FLAG_BYTE = bytes([protocol.FLAG])
+_ESCAPE_BYTE = bytes([protocol.ESCAPE])
+
+# memoryview has no find() method, so memoryviews are searched with regular
+# expressions, which accept any buffer, instead of being copied to bytes.
+_SEARCH_PATTERNS = {
+    byte: re.compile(re.escape(byte)) for byte in (_FLAG_BYTE, _ESCAPE_BYTE)
+}
+
+_Buffer = bytes | bytearray | memoryview
 
 
 class FrameStatus(enum.Enum):
@@ -99,13 +109,120 @@ class Frame:
         return f'{type(self).__name__}({body})'
 
 
+_EMPTY_VIEW = memoryview(b'')
+
+
+class FrameView:
+    """A zero-copy view of an HDLC frame.
+
+    Unlike ``Frame``, which copies the frame's bytes, a ``FrameView``
+    references slices of the buffer the frame was decoded from. The address,
+    control, and data fields are parsed on first access. Use ``to_frame()`` to
+    copy the frame into a ``Frame`` if it is kept after the buffer changes.
+    """
+
+    __slots__ = (
+        'raw_encoded',
+        'raw_decoded',
+        '_status',
+        '_address',
+        '_address_length',
+    )
+
+    def __init__(
+        self,
+        raw_encoded: bytes | memoryview,
+        raw_decoded: bytes | memoryview,
+        status: FrameStatus = FrameStatus.OK,
+    ):
+        """Wraps an HDLC frame without parsing or copying it.
+
+        Arguments:
+            raw_encoded: The complete HDLC-encoded frame, including any HDLC
+                flag bytes.
+            raw_decoded: The complete decoded frame (address, control,
+                information, FCS).
+            status: Whether parsing the frame succeeded.
+        """
+        self.raw_encoded = memoryview(raw_encoded)
+        self.raw_decoded = memoryview(raw_decoded)
+        self._status = status
+        self._address = NO_ADDRESS
+        self._address_length = -1  # The address has not been parsed yet.
+
+    def _parse(self) -> None:
+        if self._address_length != -1:
+            return
+
+        self._address_length = 0
+
+        if self._status is FrameStatus.OK:
+            address, address_length = protocol.decode_address(self.raw_decoded)
+            if address_length == 0:
+                self._status = FrameStatus.BAD_ADDRESS
+            else:
+                self._address = address
+                self._address_length = address_length
+
+    @property
+    def status(self) -> FrameStatus:
+        self._parse()
+        return self._status
+
+    @property
+    def address(self) -> int:
+        self._parse()
+        return self._address
+
+    @property
+    def control(self) -> memoryview:
+        if not self.ok():
+            return _EMPTY_VIEW
+        start = self._address_length
+        return self.raw_decoded[start : start + 1]
+
+    @property
+    def data(self) -> memoryview:
+        if not self.ok():
+            return _EMPTY_VIEW
+        return self.raw_decoded[self._address_length + 1 : -4]
+
+    def ok(self) -> bool:
+        """``True`` if this represents a valid frame."""
+        return self.status is FrameStatus.OK
+
+    def to_frame(self) -> Frame:
+        """Copies this view into a ``Frame`` that owns its bytes."""
+        return Frame(
+            self.raw_encoded.tobytes(), self.raw_decoded.tobytes(), self._status
+        )
+
+    def __repr__(self) -> str:
+        if self.ok():
+            body = (
+                f'address={self.address}, control={bytes(self.control)!r}, '
+                f'data={bytes(self.data)!r}'
+            )
+        else:
+            body = (
+                f'raw_encoded={bytes(self.raw_encoded)!r}, '
+                f'status={str(self.status)}'
+            )
+
+        return f'{type(self).__name__}({body})'
+
+
+# Frame end index, raw encoded bytes, raw decoded bytes, and status.
+_ScannedFrame = tuple[int, bytes | memoryview, bytes | memoryview, FrameStatus]
+
+
 class _State(enum.Enum):
     INTERFRAME = 0
     FRAME = 1
     FRAME_ESCAPE = 2
 
 
-def _check_frame(frame_data: bytes) -> FrameStatus:
+def _check_frame(frame_data: _Buffer) -> FrameStatus:
     if len(frame_data) < _MIN_FRAME_SIZE:
         return FrameStatus.FRAMING_ERROR
 
@@ -116,6 +233,18 @@ def _check_frame(frame_data: bytes) -> FrameStatus:
     return FrameStatus.OK
 
 
+def _finder(data: _Buffer) -> Callable[[bytes, int, int], int]:
+    """Returns a function that works like bytes.find() for the data."""
+    if not isinstance(data, memoryview):
+        return data.find
+
+    def find(sub: bytes, start: int, end: int) -> int:
+        match = _SEARCH_PATTERNS[sub].search(data, start, end)
+        return -1 if match is None else match.start()
+
+    return find
+
+
 class FrameDecoder:
     """Decodes one or more HDLC frames from a stream of data."""
 
@@ -130,14 +259,17 @@ class FrameDecoder:
         The ``ok()`` method on ``Frame`` indicates whether it is valid or
         represents a frame parsing error.
 
+        Rather than stepping through ``data`` one byte at a time, the decoder
+        searches for flag and escape bytes in bulk and copies the runs between
+        them with slicing. The frames produced are identical to those produced
+        by calling ``process_byte()`` on each byte.
+
         Yields:
           Frames, which may be valid (``frame.ok()``) or corrupt
           (``!frame.ok()``)
         """
-        for byte in data:
-            frame = self.process_byte(byte)
-            if frame:
-                yield frame
+        for _, raw_encoded, raw_decoded, status in self._scan(data):
+            yield Frame(bytes(raw_encoded), bytes(raw_decoded), status)
 
     def process_valid_frames(self, data: bytes) -> Iterable[Frame]:
         """Decodes and yields valid HDLC frames, logging any errors."""
@@ -152,7 +284,19 @@ class FrameDecoder:
                 )
                 _LOG.debug('Discarded data: %s', frame.raw_encoded)
 
-    def _finish_frame(self, status: FrameStatus) -> Frame:
+    def process_views(self, data: _Buffer) -> Iterator[FrameView]:
+        """Decodes and yields zero-copy views of HDLC frames.
+
+        Works like ``process()``, but yields ``FrameView`` objects instead of
+        ``Frame`` objects. Frames that are contained entirely in ``data`` and
+        have no escaped bytes reference ``data`` directly; other frames
+        reference a single copy of their accumulated bytes. ``data`` must not
+        be modified while any of the views are in use.
+        """
+        for _, raw_encoded, raw_decoded, status in self._scan(data):
+            yield FrameView(raw_encoded, raw_decoded, status)
+
+    def _take_frame(self, status: FrameStatus) -> tuple[bytes, bytes]:
         # HDLC frames always start and end with a flag character, though the
         # character may be shared with other frames. Ensure the raw encoding of
         # OK frames always includes the start and end flags for consistency.
@@ -160,10 +304,119 @@ class FrameDecoder:
             if not self._raw_data.startswith(_FLAG_BYTE):
                 self._raw_data.insert(0, protocol.FLAG)
 
-        frame = Frame(bytes(self._raw_data), bytes(self._decoded_data), status)
+        frame_data = bytes(self._raw_data), bytes(self._decoded_data)
         self._raw_data.clear()
         self._decoded_data.clear()
-        return frame
+        return frame_data
+
+    def _finish_frame(self, status: FrameStatus) -> Frame:
+        return Frame(*self._take_frame(status), status)
+
+    def _scan(self, data: _Buffer) -> Iterator[_ScannedFrame]:
+        """Decodes frames from data, yielding their fields and end index.
+
+        The index is the position in ``data`` of the byte that completed the
+        frame. This is the bulk equivalent of calling ``process_byte()`` on
+        each byte, and leaves the decoder in the same state.
+
+        While a frame is contained in ``data`` and has no escaped bytes, its
+        bytes are not copied into the decoder's buffers. The raw encoded and
+        decoded bytes for such frames are yielded as slices of ``data``.
+        """
+        find = _finder(data)
+        view = memoryview(data)
+        end = len(data)
+        index = 0
+        next_flag = -1
+
+        # Index of the flag that opened a frame that has not been copied into
+        # the decoder's buffers, or -1. If the flag was shared with the
+        # previous frame, it is not part of this frame's raw data.
+        clean_start = -1
+        clean_shared = False
+
+        while index < end:
+            if next_flag < index:
+                next_flag = find(_FLAG_BYTE, index, end)
+                if next_flag == -1:
+                    next_flag = end
+
+            if self._state is _State.FRAME_ESCAPE:
+                byte = data[index]
+                self._raw_data.append(byte)
+
+                if byte == protocol.FLAG:
+                    status = FrameStatus.FRAMING_ERROR
+                    yield index, *self._take_frame(status), status
+                    self._state = _State.FRAME
+                elif byte in protocol.VALID_ESCAPED_BYTES:
+                    self._state = _State.FRAME
+                    self._decoded_data.append(protocol.escape(byte))
+                else:
+                    self._state = _State.INTERFRAME
+
+                index += 1
+                continue
+
+            if index != next_flag:
+                # Consume the run of bytes up to the next flag or escape.
+                if self._state is _State.INTERFRAME:
+                    self._raw_data += data[index:next_flag]
+                    index = next_flag
+                    continue
+
+                escape = find(_ESCAPE_BYTE, index, next_flag)
+                if escape == -1:
+                    if clean_start == -1:
+                        self._raw_data += data[index:next_flag]
+                        self._decoded_data += data[index:next_flag]
+                    index = next_flag
+                    continue
+
+                if clean_start != -1:
+                    self._raw_data += data[clean_start + clean_shared : index]
+                    self._decoded_data += data[clean_start + 1 : index]
+                    clean_start = -1
+
+                self._raw_data += data[index : escape + 1]
+                self._decoded_data += data[index:escape]
+                self._state = _State.FRAME_ESCAPE
+                index = escape + 1
+                continue
+
+            # The byte at index is a flag.
+            if clean_start != -1:
+                if clean_shared and index == clean_start + 1:
+                    clean_shared = False  # This flag starts the next frame.
+                else:
+                    decoded = view[clean_start + 1 : index]
+                    status = _check_frame(decoded)
+                    raw_start = clean_start
+                    if clean_shared and status is not FrameStatus.OK:
+                        raw_start += 1
+                    yield index, view[raw_start : index + 1], decoded, status
+                    clean_shared = True
+            else:
+                self._raw_data.append(protocol.FLAG)
+
+                if len(self._raw_data) != 1:
+                    if self._state is _State.INTERFRAME:
+                        status = FrameStatus.FRAMING_ERROR
+                    else:
+                        status = _check_frame(self._decoded_data)
+                    yield index, *self._take_frame(status), status
+                    clean_shared = True
+                else:
+                    self._raw_data.clear()
+                    clean_shared = False
+
+            clean_start = index
+            self._state = _State.FRAME
+            index += 1
+
+        if clean_start != -1:
+            self._raw_data += data[clean_start + clean_shared :]
+            self._decoded_data += data[clean_start + 1 :]
 
     def process_byte(self, byte: int) -> Frame | None:
         """Processes a single byte and returns a frame if one was completed."""
@@ -272,8 +525,16 @@ class FrameAndNonFrameDecoder:
         data.
         """
         with self._lock:
-            for byte in data:
-                yield from self._process_byte(byte)
+            start = 0
+            # pylint: disable-next=protected-access
+            frames = self._hdlc_decoder._scan(data)
+            for index, raw_encoded, raw_decoded, status in frames:
+                self._raw_data += data[start : index + 1]
+                start = index + 1
+                frame = Frame(bytes(raw_encoded), bytes(raw_decoded), status)
+                yield from self._process_frame(frame)
+
+            self._raw_data += data[start:]
 
             # Flush the data if it is larger than the MTU, or flag bytes are not
             # being shared and no initial flag was seen.
@@ -285,13 +546,7 @@ class FrameAndNonFrameDecoder:
 
             self._last_data_time = time.time()
 
-    def _process_byte(self, byte: int) -> Iterable[Frame]:
-        self._raw_data.append(byte)
-        frame = self._hdlc_decoder.process_byte(byte)
-
-        if frame is None:
-            return
-
+    def _process_frame(self, frame: Frame) -> Iterable[Frame]:
         if frame.ok():
             # Drop the valid frame from the data. Only drop matching bytes in
             # case the frame was flushed prematurely.
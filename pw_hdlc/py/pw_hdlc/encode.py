@@ -13,6 +13,9 @@
 # the License.
 """The encode module supports encoding HDLC frames."""
 
+from typing import Iterable
+import zlib
+
 from pw_hdlc import protocol
 
 _ESCAPE_BYTE = bytes([protocol.ESCAPE])
@@ -30,3 +33,88 @@ def ui_frame(address: int, data: bytes) -> bytes:
     frame = frame.replace(_ESCAPE_BYTE, b'\x7d\x5d')
     frame = frame.replace(_FLAG_BYTE, b'\x7d\x5e')
     return b''.join([_FLAG_BYTE, frame, _FLAG_BYTE])
+
+
+def _escape(data: bytes) -> bytes:
+    if _ESCAPE_BYTE in data:
+        data = data.replace(_ESCAPE_BYTE, b'\x7d\x5d')
+    if _FLAG_BYTE in data:
+        data = data.replace(_FLAG_BYTE, b'\x7d\x5e')
+    return data
+
+
+class FrameEncoder:
+    """Encodes batches of HDLC UI-frames into a reusable output buffer.
+
+    Frames are escaped directly into a buffer that is kept between batches,
+    and the frame check sequence is computed without concatenating the frame
+    fields. The encoded output is identical to calling ``ui_frame()`` for each
+    payload and joining the results.
+    """
+
+    def __init__(self, initial_size: int = 1024) -> None:
+        self._buffer = bytearray(initial_size)
+        self._size = 0
+        self._unescaped_headers: dict[int, bytes] = {}
+        self._escaped_headers: dict[int, bytes] = {}
+
+    def __len__(self) -> int:
+        """Returns the number of encoded bytes in the buffer."""
+        return self._size
+
+    def clear(self) -> None:
+        """Discards the encoded frames, keeping the buffer for reuse."""
+        self._size = 0
+
+    def view(self) -> memoryview:
+        """Returns the encoded frames in the buffer.
+
+        The view is only valid until the next frame is encoded.
+        """
+        return memoryview(self._buffer)[: self._size]
+
+    def append_ui_frame(self, address: int, data: bytes) -> None:
+        """Encodes a UI-frame and appends it to the buffer."""
+        header = self._unescaped_headers.get(address)
+        if header is None:
+            header = bytes(protocol.encode_address(address))
+            header += protocol.UFrameControl.unnumbered_information().data
+            self._unescaped_headers[address] = header
+            self._escaped_headers[address] = _FLAG_BYTE + _escape(header)
+
+        fcs = zlib.crc32(data, zlib.crc32(header)).to_bytes(4, 'little')
+
+        self._write(self._escaped_headers[address])
+        self._write(_escape(data))
+        self._write(_escape(fcs))
+        self._write(_FLAG_BYTE)
+
+    def ui_frames(self, address: int, payloads: Iterable[bytes]) -> memoryview:
+        """Encodes a batch of UI-frames, replacing any previous contents.
+
+        Returns:
+          A view of the encoded frames, which is only valid until the next
+          frame is encoded.
+        """
+        self.clear()
+        for data in payloads:
+            self.append_ui_frame(address, data)
+        return self.view()
+
+    def _write(self, data: bytes) -> None:
+        end = self._size + len(data)
+
+        if end > len(self._buffer):
+            # Allocate a new buffer rather than resizing the current one, since
+            # views of the current buffer may still exist.
+            buffer = bytearray(max(end, 2 * len(self._buffer)))
+            buffer[: self._size] = memoryview(self._buffer)[: self._size]
+            self._buffer = buffer
+
+        self._buffer[self._size : end] = data
+        self._size = end
+
+
+def ui_frames(address: int, payloads: Iterable[bytes]) -> bytes:
+    """Encodes multiple HDLC UI-frames into a single bytes object."""
+    return bytes(FrameEncoder().ui_frames(address, payloads))
@@ -53,7 +53,7 @@ def encode_address(address: int) -> bytes:
     return result
 
 
-def decode_address(frame: bytes) -> tuple[int, int]:
+def decode_address(frame: bytes | bytearray | memoryview) -> tuple[int, int]:
     """Decodes an HDLC address from a frame, returning it and its size."""
     result = 0
     length = 0
@@ -16,7 +16,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import asyncio
 from concurrent.futures import ThreadPoolExecutor
+import functools
 import io
 import logging
 import os
@@ -42,7 +44,7 @@ import serial
 
 from pw_protobuf_compiler import python_protos
 import pw_rpc
-from pw_rpc import callback_client
+from pw_rpc import asyncio_client, callback_client
 
 from pw_hdlc.decode import Frame, FrameDecoder
 from pw_hdlc import encode
@@ -82,6 +84,70 @@ def channel_output(
     return write_hdlc
 
 
+class CoalescingChannelOutput:
+    """A ``pw_rpc`` channel output that batches packets into fewer writes.
+
+    Each packet is HDLC-encoded into a shared buffer instead of being written
+    immediately. The buffer is written with a single ``writer()`` call once it
+    reaches ``flush_size_bytes`` or ``flush_delay_s`` after the first packet
+    was buffered, whichever comes first. A burst of packets, such as a
+    client stream, then results in one write instead of one per packet.
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[bytes], Any],
+        address: int = DEFAULT_ADDRESS,
+        *,
+        flush_size_bytes: int = 4096,
+        flush_delay_s: float = 0.001,
+    ) -> None:
+        """Creates a coalescing channel output.
+
+        Args:
+          writer: Function that writes encoded HDLC frames to the transport.
+          address: HDLC address to use for the frames.
+          flush_size_bytes: Write buffered frames once they reach this size.
+          flush_delay_s: Maximum time a packet may be buffered before it is
+              written.
+        """
+        self._writer = writer
+        self._address = address
+        self._flush_size_bytes = flush_size_bytes
+        self._flush_delay_s = flush_delay_s
+
+        self._encoder = encode.FrameEncoder(flush_size_bytes)
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def __call__(self, data: bytes) -> None:
+        with self._lock:
+            self._encoder.append_ui_frame(self._address, data)
+
+            if len(self._encoder) >= self._flush_size_bytes:
+                self._flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self._flush_delay_s, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Writes any buffered frames immediately."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._encoder:
+            frames = bytes(self._encoder.view())
+            self._encoder.clear()
+            _LOG.log(_VERBOSE, 'Write %2d B: %s', len(frames), frames)
+            self._writer(frames)
+
+
 FrameHandlers = dict[int, Callable[[Frame], Any]]
 FrameTypeT = TypeVar('FrameTypeT')
 
@@ -439,26 +505,7 @@ class HdlcRpcClient(RpcClient):
         if extra_frame_handlers:
             frame_handlers.update(extra_frame_handlers)
 
-        def handle_frame(frame: Frame) -> None:
-            # Suppress raising any frame errors to avoid crashes on data
-            # processing, which may hide or drop other data.
-            try:
-                if not frame.ok():
-                    _LOG.error('Failed to parse frame: %s', frame.status.value)
-                    _LOG.debug('%s', frame.data)
-                    return
-
-                try:
-                    frame_handlers[frame.address](frame)
-                except KeyError:
-                    _LOG.warning(
-                        'Unhandled frame for address %d: %s',
-                        frame.address,
-                        frame,
-                    )
-            except:  # pylint: disable=bare-except
-                _LOG.exception('Exception in HDLC frame handler thread')
-
+        handle_frame = _frame_dispatcher(frame_handlers)
         decoder = FrameDecoder()
 
         def on_read_error(exc: Exception) -> None:
@@ -472,6 +519,239 @@ class HdlcRpcClient(RpcClient):
         )
 
 
+def _frame_dispatcher(
+    frame_handlers: FrameHandlers,
+) -> Callable[[Frame], None]:
+    """Returns a function that passes frames to their address's handler."""
+
+    def handle_frame(frame: Frame) -> None:
+        # Suppress raising any frame errors to avoid crashes on data
+        # processing, which may hide or drop other data.
+        try:
+            if not frame.ok():
+                _LOG.error('Failed to parse frame: %s', frame.status.value)
+                _LOG.debug('%s', frame.data)
+                return
+
+            try:
+                frame_handlers[frame.address](frame)
+            except KeyError:
+                _LOG.warning(
+                    'Unhandled frame for address %d: %s',
+                    frame.address,
+                    frame,
+                )
+        except:  # pylint: disable=bare-except
+            _LOG.exception('Exception in HDLC frame handler thread')
+
+    return handle_frame
+
+
+class AsyncHdlcRpcClient:
+    """An RPC client over HDLC that reads from an asyncio event loop.
+
+    Unlike ``HdlcRpcClient``, this client does not start a reader thread or a
+    thread pool. Incoming data is read when the event loop reports that it is
+    available, decoded, and processed in the event loop thread. Many clients,
+    for example one per attached device, can share a single event loop.
+
+    Data may be read from a file descriptor or socket with ``add_reader()``,
+    from an ``asyncio.StreamReader`` with ``read_from()``, or passed directly
+    to ``data_received()``. With the asyncio client implementation, both
+    readers stop reading while a call has more unread responses than the
+    implementation's ``max_queued_responses``.
+    """
+
+    def __init__(
+        self,
+        paths_or_modules: PathsModulesOrProtoLibrary,
+        channels: Iterable[pw_rpc.Channel],
+        output: Callable[[bytes], Any] = write_to_file,
+        client_impl: pw_rpc.client.ClientImpl | None = None,
+        *,
+        loop: asyncio.AbstractEventLoop | None = None,
+        rpc_frames_address: int = DEFAULT_ADDRESS,
+        log_frames_address: int = STDOUT_ADDRESS,
+        extra_frame_handlers: FrameHandlers | None = None,
+        read_size: int = 4096,
+    ):
+        """Creates an asyncio RPC client configured to communicate using HDLC.
+
+        Args:
+          paths_or_modules: paths to .proto files or proto modules.
+          channels: RPC channels to use for output.
+          output: where to write ``stdout`` output from the device.
+          client_impl: The RPC Client implementation. Defaults to the asyncio
+            client implementation if not provided. Blocking implementations,
+            such as the callback client, wait for responses that are only
+            read when the event loop runs, so they must not be invoked from
+            the event loop thread.
+          loop: The event loop to read with. Defaults to the running loop when
+            a reader is added.
+          rpc_frames_address: the address used in the HDLC frames for RPC
+            packets. This can be the channel ID, or any custom address.
+          log_frames_address: the address used in the HDLC frames for ``stdout``
+            output from the device.
+          extra_frame_handlers: Optional mapping of HDLC frame addresses to
+            their callbacks.
+          read_size: Maximum number of bytes to read at once.
+        """
+        if isinstance(paths_or_modules, python_protos.Library):
+            self.protos = paths_or_modules
+        else:
+            self.protos = python_protos.Library.from_paths(paths_or_modules)
+
+        if client_impl is None:
+            client_impl = asyncio_client.Impl()
+
+        self.client = pw_rpc.Client.from_modules(
+            client_impl, channels, self.protos.modules()
+        )
+
+        # Only the asyncio client applies backpressure to the readers.
+        self._async_impl = (
+            client_impl
+            if isinstance(client_impl, asyncio_client.Impl)
+            else None
+        )
+
+        frame_handlers: FrameHandlers = {
+            rpc_frames_address: lambda frame: self.handle_rpc_packet(
+                frame.data
+            ),
+            log_frames_address: lambda frame: output(frame.data),
+        }
+        if extra_frame_handlers:
+            frame_handlers.update(extra_frame_handlers)
+
+        self._handle_frame = _frame_dispatcher(frame_handlers)
+        self._decoder = FrameDecoder()
+        self._loop = loop
+        self._read_size = read_size
+        self._readers: list[Any] = []
+        self._resume_tasks: set[asyncio.Task] = set()
+
+        # Set when all readers reach end of file, with the error, if any.
+        self.closed: asyncio.Future[Exception | None] | None = None
+
+    def __enter__(self) -> AsyncHdlcRpcClient:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def rpcs(self, channel_id: int | None = None) -> Any:
+        """Returns object for accessing services on the specified channel."""
+        if channel_id is None:
+            return next(iter(self.client.channels())).rpcs
+
+        return self.client.channel(channel_id).rpcs
+
+    def handle_rpc_packet(self, packet: bytes) -> None:
+        if not self.client.process_packet(packet):
+            _LOG.error('Packet not handled by RPC client: %s', packet)
+
+    def data_received(self, data: bytes) -> None:
+        """Decodes data and processes any complete HDLC frames."""
+        _LOG.log(_VERBOSE, 'Read %2d B: %s', len(data), data)
+
+        for frame in self._decoder.process_valid_frames(data):
+            self._handle_frame(frame)
+
+    def add_reader(
+        self,
+        fileobj: Any,
+        read: Callable[[int], bytes] | None = None,
+    ) -> None:
+        """Reads from a file descriptor or socket when data is available.
+
+        Args:
+          fileobj: A file descriptor or object with a ``fileno()`` method, such
+            as a ``socket.socket`` or POSIX ``serial.Serial``. It should be
+            in non-blocking mode.
+          read: Function that reads up to the given number of bytes. Defaults
+            to ``recv()`` for sockets and ``os.read()`` otherwise.
+        """
+        loop = self._get_loop()
+
+        if read is None:
+            if isinstance(fileobj, socket.socket):
+                read = fileobj.recv
+            else:
+                fd = fileobj if isinstance(fileobj, int) else fileobj.fileno()
+                read = functools.partial(os.read, fd)
+
+        read_function = read
+
+        def on_readable() -> None:
+            try:
+                data = read_function(self._read_size)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as exc:
+                self._stop_reading(fileobj, exc)
+                return
+
+            if not data:  # End of file
+                self._stop_reading(fileobj, None)
+                return
+
+            self.data_received(data)
+
+            if self._async_impl is not None and self._async_impl.backlogged():
+                # Stop reading until unread responses are consumed.
+                loop.remove_reader(fileobj)
+                task = loop.create_task(resume_reading(self._async_impl))
+                self._resume_tasks.add(task)
+                task.add_done_callback(self._resume_tasks.discard)
+
+        async def resume_reading(impl: asyncio_client.Impl) -> None:
+            await impl.drain()
+            if fileobj in self._readers:
+                loop.add_reader(fileobj, on_readable)
+
+        loop.add_reader(fileobj, on_readable)
+        self._readers.append(fileobj)
+
+    async def read_from(self, reader: asyncio.StreamReader) -> None:
+        """Processes data from a stream until it reaches end of file."""
+        while data := await reader.read(self._read_size):
+            self.data_received(data)
+
+            if self._async_impl is not None:
+                await self._async_impl.drain()
+
+    def close(self) -> None:
+        """Stops reading from all file descriptors added with add_reader()."""
+        for fileobj in self._readers:
+            self._get_loop().remove_reader(fileobj)
+        self._readers.clear()
+
+        for task in self._resume_tasks:
+            task.cancel()
+
+        if self.closed is not None and not self.closed.done():
+            self.closed.set_result(None)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        if self.closed is None:
+            self.closed = self._loop.create_future()
+        return self._loop
+
+    def _stop_reading(self, fileobj: Any, exc: Exception | None) -> None:
+        if exc is not None:
+            _LOG.error('data reader encountered an error', exc_info=exc)
+
+        self._get_loop().remove_reader(fileobj)
+        self._readers.remove(fileobj)
+
+        assert self.closed is not None
+        if not self._readers and not self.closed.done():
+            self.closed.set_result(exc)
+
+
 class NoEncodingSingleChannelRpcClient(RpcClient):
     """An RPC client without any frame encoding with a single channel output.
 
@@ -14,14 +14,44 @@
 # the License.
 """device module unit tests"""
 
+import asyncio
 from contextlib import contextmanager
 import logging
 import queue
+import socket
 import threading
 import time
 import unittest
 
-from pw_hdlc.rpc import RpcClient, HdlcRpcClient, CancellableReader
+from pw_protobuf_compiler import python_protos
+import pw_rpc
+from pw_rpc import asyncio_client, packets
+from pw_rpc.internal import packet_pb2
+
+from pw_hdlc import encode
+from pw_hdlc.rpc import (
+    AsyncHdlcRpcClient,
+    CancellableReader,
+    CoalescingChannelOutput,
+    DEFAULT_ADDRESS,
+    HdlcRpcClient,
+    RpcClient,
+    STDOUT_ADDRESS,
+)
+
+TEST_PROTO = """\
+syntax = "proto3";
+
+package pw.hdlc_test;
+
+message Message {
+  string payload = 1;
+}
+
+service TestService {
+  rpc Stream(Message) returns (stream Message) {}
+}
+"""
 
 
 class QueueFile:
@@ -290,5 +320,200 @@ class HdlcRpcClientTest(unittest.TestCase):
         self.assertEqual(threading.enumerate(), [threading.current_thread()])
 
 
+class AsyncHdlcRpcClientTest(unittest.IsolatedAsyncioTestCase):
+    """Tests the pw_hdlc.rpc.AsyncHdlcRpcClient class."""
+
+    def setUp(self) -> None:
+        self._requests: list[bytes] = []
+        self._protos = python_protos.Library.from_strings(TEST_PROTO)
+        self._impl = asyncio_client.Impl(max_queued_responses=1)
+
+    async def test_reads_frames_from_socket(self) -> None:
+        received: asyncio.Queue[bytes] = asyncio.Queue()
+        device, host = socket.socketpair()
+        host.setblocking(False)
+
+        with device, host:
+            with AsyncHdlcRpcClient([], [], received.put_nowait) as client:
+                client.add_reader(host)
+
+                frame = encode.ui_frame(STDOUT_ADDRESS, b'hello')
+                device.sendall(frame[:5])
+                device.sendall(frame[5:] + encode.ui_frame(99, b'ignored'))
+                device.sendall(encode.ui_frame(STDOUT_ADDRESS, b'world'))
+
+                self.assertEqual(await received.get(), b'hello')
+                self.assertEqual(await received.get(), b'world')
+
+                device.close()
+                assert client.closed is not None
+                self.assertIsNone(await client.closed)
+
+    async def test_clients_share_event_loop(self) -> None:
+        received: asyncio.Queue[tuple[int, bytes]] = asyncio.Queue()
+        pairs = [socket.socketpair() for _ in range(3)]
+        clients = []
+
+        for i, (_, host) in enumerate(pairs):
+            host.setblocking(False)
+
+            def output(data: bytes, i: int = i) -> None:
+                received.put_nowait((i, data))
+
+            client = AsyncHdlcRpcClient([], [], output)
+            client.add_reader(host)
+            clients.append(client)
+
+        for i, (device, _) in enumerate(pairs):
+            device.sendall(encode.ui_frame(STDOUT_ADDRESS, b'%d' % i))
+
+        results = {await received.get() for _ in pairs}
+        self.assertEqual(results, {(i, b'%d' % i) for i in range(3)})
+
+        for client in clients:
+            client.close()
+        for device, host in pairs:
+            device.close()
+            host.close()
+
+    async def test_close_sets_closed(self) -> None:
+        device, host = socket.socketpair()
+        host.setblocking(False)
+
+        with device, host:
+            client = AsyncHdlcRpcClient([], [], lambda _: None)
+            client.add_reader(host)
+            client.close()
+
+            assert client.closed is not None
+            self.assertIsNone(await asyncio.wait_for(client.closed, 1))
+
+    async def test_read_from_stream(self) -> None:
+        received: list[bytes] = []
+        stream = asyncio.StreamReader()
+        stream.feed_data(encode.ui_frames(STDOUT_ADDRESS, [b'a', b'b']))
+        stream.feed_eof()
+
+        await AsyncHdlcRpcClient([], [], received.append).read_from(stream)
+        self.assertEqual(received, [b'a', b'b'])
+
+    def _rpc_client(self) -> AsyncHdlcRpcClient:
+        return AsyncHdlcRpcClient(
+            self._protos,
+            [pw_rpc.Channel(1, self._requests.append)],
+            lambda _: None,
+            self._impl,
+        )
+
+    def _stream_frame(self, payload: str) -> bytes:
+        request = packets.decode(self._requests[-1])
+        message = self._protos.packages.pw.hdlc_test.Message
+        packet = packet_pb2.RpcPacket(
+            type=packet_pb2.PacketType.SERVER_STREAM,
+            channel_id=request.channel_id,
+            service_id=request.service_id,
+            method_id=request.method_id,
+            call_id=request.call_id,
+            payload=message(payload=payload).SerializeToString(),
+        )
+        return encode.ui_frame(DEFAULT_ADDRESS, packet.SerializeToString())
+
+    async def _wait_until_backlogged(self) -> None:
+        async def backlogged() -> None:
+            while not self._impl.backlogged():
+                await asyncio.sleep(0.001)
+
+        await asyncio.wait_for(backlogged(), 1)
+
+    async def test_add_reader_pauses_while_backlogged(self) -> None:
+        device, host = socket.socketpair()
+        host.setblocking(False)
+
+        with device, host, self._rpc_client() as client:
+            client.add_reader(host)
+            call = client.rpcs().pw.hdlc_test.TestService.Stream()
+
+            device.sendall(b''.join(self._stream_frame(p) for p in 'ab'))
+            await self._wait_until_backlogged()
+
+            # The reader is paused, so this response stays in the socket.
+            device.sendall(self._stream_frame('c'))
+            await asyncio.sleep(0.05)
+            self.assertEqual(call.queued_responses(), 2)
+
+            # Reading a response makes room, so the reader resumes.
+            self.assertEqual((await anext(call)).payload, 'a')
+            self.assertEqual((await anext(call)).payload, 'b')
+            response = await asyncio.wait_for(anext(call), 1)
+            self.assertEqual(response.payload, 'c')
+
+    async def test_read_from_drains_between_reads(self) -> None:
+        with self._rpc_client() as client:
+            call = client.rpcs().pw.hdlc_test.TestService.Stream()
+
+            stream = asyncio.StreamReader()
+            stream.feed_data(b''.join(self._stream_frame(p) for p in 'ab'))
+            reading = asyncio.ensure_future(client.read_from(stream))
+            await self._wait_until_backlogged()
+
+            # read_from() waits in drain(), so this data is not read yet.
+            stream.feed_data(self._stream_frame('c'))
+            stream.feed_eof()
+            await asyncio.sleep(0.01)
+            self.assertFalse(reading.done())
+            self.assertEqual(call.queued_responses(), 2)
+
+            self.assertEqual((await anext(call)).payload, 'a')
+            self.assertEqual((await anext(call)).payload, 'b')
+            await asyncio.wait_for(reading, 1)
+            self.assertEqual((await anext(call)).payload, 'c')
+
+
+class CoalescingChannelOutputTest(unittest.TestCase):
+    """Tests batching packets with CoalescingChannelOutput."""
+
+    def setUp(self) -> None:
+        self.writes: queue.Queue[bytes] = queue.Queue()
+
+    def test_flushes_when_size_is_reached(self) -> None:
+        frame = encode.ui_frame(1, b'packet')
+        output = CoalescingChannelOutput(
+            self.writes.put,
+            1,
+            flush_size_bytes=3 * len(frame),
+            flush_delay_s=60,
+        )
+
+        output(b'packet')
+        output(b'packet')
+        self.assertTrue(self.writes.empty())
+
+        output(b'packet')
+        self.assertEqual(self.writes.get_nowait(), frame * 3)
+        self.assertTrue(self.writes.empty())
+
+    def test_flushes_after_delay(self) -> None:
+        output = CoalescingChannelOutput(self.writes.put, 1, flush_delay_s=0.01)
+
+        output(b'one')
+        output(b'two')
+
+        self.assertEqual(
+            self.writes.get(timeout=5),
+            encode.ui_frame(1, b'one') + encode.ui_frame(1, b'two'),
+        )
+        self.assertTrue(self.writes.empty())
+
+    def test_explicit_flush(self) -> None:
+        output = CoalescingChannelOutput(self.writes.put, 1, flush_delay_s=60)
+
+        output.flush()
+        self.assertTrue(self.writes.empty())
+
+        output(b'one')
+        output.flush()
+        self.assertEqual(self.writes.get_nowait(), encode.ui_frame(1, b'one'))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,47 @@
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+"""Tests the decoded log memory benchmark."""
+
+from unittest import TestCase, main
+
+from pw_log import benchmark
+
+
+class BenchmarkTest(TestCase):
+    """Measures a small synthetic capture in each storage mode."""
+
+    def test_synthetic_log_entries(self) -> None:
+        batches = list(benchmark.synthetic_log_entries(100, batch_size=64))
+
+        self.assertEqual([len(b.entries) for b in batches], [64, 36])
+        self.assertEqual(batches[1].first_entry_sequence_id, 64)
+
+    def test_compact_logs_retain_less_memory(self) -> None:
+        results = {mode: benchmark.run(mode, 5000) for mode in benchmark.MODES}
+
+        for result in results.values():
+            self.assertEqual(result.entries, 5000)
+
+        self.assertLess(
+            results['compact'].retained_bytes, results['eager'].retained_bytes
+        )
+        self.assertLess(
+            results['formatted'].retained_bytes,
+            results['eager'].retained_bytes,
+        )
+
+
+if __name__ == '__main__':
+    main()
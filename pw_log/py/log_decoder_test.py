@@ -668,6 +668,50 @@ class TestLogStreamDecoderDecodingFunctionality(TestLogStreamDecoderBase):
         result = self.decoder.parse_log_entry_proto(log_entry)
         self.assertEqual(result, expected_log)
 
+    def test_log_formats_lazily(self) -> None:
+        """Tests that the timestamp and message are formatted on access."""
+        calls: list[str] = []
+
+        def parse_message(message: str) -> str:
+            calls.append(message)
+            return message.upper()
+
+        log = Log(
+            message='hello',
+            raw_timestamp=1_500_000_000,
+            timestamp_parser=timestamp_parser_ns_since_boot,
+            message_parser=parse_message,
+        )
+        self.assertEqual(calls, [])
+
+        self.assertEqual(log.message, 'HELLO')
+        self.assertEqual(log.message, 'HELLO')
+        self.assertEqual(calls, ['hello'])
+        self.assertEqual(log.timestamp, '0:00:01.500')
+        self.assertEqual(log, Log(message='HELLO', timestamp='0:00:01.500'))
+
+        with self.assertRaises(AttributeError):
+            setattr(log, 'extra', 'no per-instance dict')
+
+    def test_decoded_logs_share_repeated_fields(self) -> None:
+        """Tests that fields repeated across logs are stored once."""
+        logs = [
+            self.decoder.parse_log_entry_proto(
+                log_pb2.LogEntry(
+                    message=b'Hello',
+                    module=b'BLE',
+                    file=b'my/path/file.cc',
+                    thread=b'main',
+                    line_level=Log.pack_line_level(123, logging.INFO),
+                )
+            )
+            for _ in range(2)
+        ]
+
+        self.assertIs(logs[0].module_name, logs[1].module_name)
+        self.assertIs(logs[0].thread_name, logs[1].thread_name)
+        self.assertIs(logs[0].file_and_line, logs[1].file_and_line)
+
     def test_log_decoded_log(self):
         """Test that the logger correctly formats a decoded log."""
         test_log = Log(
@@ -865,5 +909,114 @@ class TestLogStreamDecoderLogDropDetectionFunctionality(
         )
 
 
+class TestLogStreamDecoderBatchFunctionality(TestLogStreamDecoderBase):
+    """Tests LogStreamDecoder batch decoding functionality."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.captured_batches: list[list[Log]] = []
+        self.batch_decoder = LogStreamDecoder(
+            decoded_log_handler=self.captured_logs.append,
+            detokenizer=_DETOKENIZER,
+            source_name='source',
+            timestamp_parser=timestamp_parser_ns_since_boot,
+            message_parser=pw_status_code_to_name,
+            decoded_logs_handler=self.captured_batches.append,
+        )
+
+    @staticmethod
+    def _log_entries() -> list[log_pb2.LogEntries]:
+        return [
+            log_pb2.LogEntries(
+                first_entry_sequence_id=2,
+                entries=[
+                    _create_log_entry_with_tokenized_fields(
+                        message='Jello, world!',
+                        module='TestName',
+                        file='parser_errors',
+                        thread='Jello?',
+                        line=10,
+                        level=logging.INFO,
+                    ),
+                    log_pb2.LogEntry(
+                        message=b'Status: pw::Status=5',
+                        file=b'my/path/file.cc',
+                        line_level=Log.pack_line_level(123, logging.ERROR),
+                        thread=b'thread 1',
+                    ),
+                    _create_drop_count_message_log_entry(3, 'Queue full'),
+                ],
+            ),
+            log_pb2.LogEntries(
+                first_entry_sequence_id=6,
+                entries=[
+                    log_pb2.LogEntry(
+                        message=(
+                            '■msg♦World■module♦wifi■file♦/path/to/file.cc'
+                        ).encode('utf-8'),
+                        line_level=Log.pack_line_level(0, logging.DEBUG),
+                        timestamp=100,
+                    ),
+                    log_pb2.LogEntry(
+                        message=b'Status: pw::Status=5',
+                        file=b'my/path/file.cc',
+                        line_level=Log.pack_line_level(124, logging.ERROR),
+                        thread=b'thread 1',
+                    ),
+                ],
+            ),
+        ]
+
+    def test_batch_matches_individual_parsing(self) -> None:
+        """Tests that batches decode the same logs as individual parsing."""
+        for log_entries in self._log_entries():
+            self.decoder.parse_log_entries_proto(log_entries)
+
+        logs = self.batch_decoder.parse_log_entries_batch(self._log_entries())
+
+        self.assertEqual(logs, self.captured_logs)
+        self.assertEqual(self.captured_batches, [logs])
+
+        # Drops are detected both before and between the batched messages.
+        self.assertEqual(
+            [log.message for log in logs if log.message.startswith('Dropped')],
+            [
+                'Dropped 2 logs due to '
+                f'{LogStreamDecoder.DROP_REASON_SOURCE_NOT_CONNECTED}',
+                'Dropped 3 logs due to queue full',
+                'Dropped 2 logs due to '
+                f'{LogStreamDecoder.DROP_REASON_LOSS_AT_TRANSPORT}',
+            ],
+        )
+
+    def test_batch_reuses_cached_fields(self) -> None:
+        """Tests that repeated fields are decoded once."""
+        logs = self.batch_decoder.parse_log_entries_batch(self._log_entries())
+
+        self.assertIs(logs[2].thread_name, logs[6].thread_name)
+        self.assertEqual(logs[5].file_and_line, '/path/to/file.cc')
+        self.assertEqual(logs[6].file_and_line, 'my/path/file.cc:124')
+        self.assertEqual(logs[6].message, 'Status: NOT_FOUND')
+
+        self.batch_decoder.clear_caches()
+        self.assertEqual(
+            self.batch_decoder.parse_log_entries_batch(
+                log_pb2.LogEntries(
+                    first_entry_sequence_id=8,
+                    entries=self._log_entries()[1].entries[1:],
+                )
+            ),
+            [logs[6]],
+        )
+
+    def test_batch_without_batch_handler(self) -> None:
+        """Tests that batches go to decoded_log_handler when there is no
+        batch handler."""
+        logs = self.decoder.parse_log_entries_batch(self._log_entries())
+
+        self.assertEqual(self.captured_logs, logs)
+        self.assertEqual(len(logs), 7)
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,232 @@
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""Measures the memory retained by a large capture of decoded logs.
+
+Decodes a synthetic stream of LogEntries messages, like one from a busy device,
+keeps every decoded log, and reports the memory they retain. Each mode stores
+the same logs differently:
+
+  eager: Logs decoded one at a time by LogStreamDecoder.parse_log_entries_proto
+      and stored as Log was before it used slots: attributes in a per-instance
+      dictionary, a metadata dictionary for every log, and formatted
+      timestamps and messages. This approximates the old decoder, which also
+      decoded a fresh module, thread, and file string for every log; those
+      strings are now interned, so the eager figure is a lower bound.
+  compact: Logs decoded by LogStreamDecoder.parse_log_entries_batch, with
+      interned repeated fields and unformatted timestamps and messages.
+  formatted: compact logs after every timestamp and message was accessed, as
+      when a whole capture is rendered.
+
+  python -m pw_log.benchmark --entries 1000000 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import json
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from typing import Iterator
+
+from pw_log.log_decoder import (
+    Log,
+    LogStreamDecoder,
+    timestamp_parser_ns_since_boot,
+)
+from pw_log.proto import log_pb2
+
+MODES = ('eager', 'compact', 'formatted')
+
+_MODULES = ('BLE', 'WIFI', 'SENSOR', 'POWER', 'STORAGE', 'RPC', 'UI', 'AUDIO')
+_THREADS = ('main', 'bt_host', 'wifi_rx', 'sensor_poll')
+_FILES = tuple(
+    f'{module.lower()}/{name}.cc'
+    for module in _MODULES
+    for name in ('driver', 'service')
+)
+_LEVELS = (logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR)
+
+
+@dataclasses.dataclass(frozen=True)
+class Result:
+    """The memory retained by the logs decoded in one mode."""
+
+    mode: str
+    entries: int
+    retained_bytes: int
+    decode_seconds: float
+
+    @property
+    def bytes_per_log(self) -> float:
+        return self.retained_bytes / self.entries if self.entries else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f'{self.mode:>9}: {self.entries} logs, '
+            f'{self.retained_bytes / 2**20:.1f} MiB retained '
+            f'({self.bytes_per_log:.0f} B/log), '
+            f'decoded in {self.decode_seconds:.2f} s'
+        )
+
+
+def synthetic_log_entries(
+    entries: int, batch_size: int = 64, seed: int = 0
+) -> Iterator[log_pb2.LogEntries]:
+    """Yields LogEntries messages with a realistic mix of repeated fields."""
+    rng = random.Random(seed)
+    sequence_id = 0
+    timestamp_ns = 0
+
+    while sequence_id < entries:
+        batch = log_pb2.LogEntries(first_entry_sequence_id=sequence_id)
+        for _ in range(min(batch_size, entries - sequence_id)):
+            module = rng.randrange(len(_MODULES))
+            timestamp_ns += rng.randrange(10_000, 5_000_000)
+            batch.entries.add(
+                message=(
+                    f'Event {rng.randrange(100)} value={rng.randrange(10**6)}'
+                ).encode(),
+                module=_MODULES[module].encode(),
+                file=_FILES[2 * module + rng.randrange(2)].encode(),
+                thread=rng.choice(_THREADS).encode(),
+                line_level=Log.pack_line_level(
+                    rng.randrange(20, 400), rng.choice(_LEVELS)
+                ),
+                timestamp=timestamp_ns,
+            )
+            sequence_id += 1
+        yield batch
+
+
+class _EagerLog:  # pylint: disable=too-few-public-methods
+    """A decoded log stored with the attributes Log had before it used slots."""
+
+    def __init__(self, log: Log) -> None:
+        self.message = log.message
+        self.level = log.level
+        self.flags = log.flags
+        self.timestamp = log.timestamp
+        self.module_name = log.module_name
+        self.thread_name = log.thread_name
+        self.source_name = log.source_name
+        self.file_and_line = log.file_and_line
+        self.metadata_fields = dict(log.metadata_fields)
+
+
+def _decode(mode: str, entries: int, seed: int) -> list:
+    logs: list = []
+
+    if mode == 'eager':
+        eager_decoder = LogStreamDecoder(
+            decoded_log_handler=lambda log: logs.append(_EagerLog(log)),
+            source_name='device',
+            timestamp_parser=timestamp_parser_ns_since_boot,
+        )
+        for log_entries in synthetic_log_entries(entries, seed=seed):
+            eager_decoder.parse_log_entries_proto(log_entries)
+        return logs
+
+    decoder = LogStreamDecoder(
+        decoded_log_handler=logs.append,
+        source_name='device',
+        timestamp_parser=timestamp_parser_ns_since_boot,
+        decoded_logs_handler=logs.extend,
+    )
+    for log_entries in synthetic_log_entries(entries, seed=seed):
+        decoder.parse_log_entries_batch(log_entries)
+
+    if mode == 'formatted':
+        for log in logs:
+            _ = log.timestamp, log.message
+
+    return logs
+
+
+def run(mode: str, entries: int, seed: int = 0) -> Result:
+    """Decodes a synthetic stream and measures the memory the logs retain."""
+    if mode not in MODES:
+        raise ValueError(f'Unknown mode {mode!r}; expected one of {MODES}')
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        logs = _decode(mode, entries, seed)
+        decode_seconds = time.perf_counter() - start
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(mode, len(logs), retained - baseline, decode_seconds)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        '--entries',
+        type=int,
+        default=1_000_000,
+        help='Number of log entries to decode (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--modes',
+        nargs='+',
+        choices=MODES,
+        default=list(MODES),
+        help='Storage modes to measure (default: all)',
+    )
+    parser.add_argument(
+        '--seed', type=int, default=0, help='Seed for the synthetic logs'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print the results as JSON instead of text',
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+
+    results = [run(mode, args.entries, args.seed) for mode in args.modes]
+
+    if args.json:
+        json.dump(
+            [
+                dict(dataclasses.asdict(r), bytes_per_log=r.bytes_per_log)
+                for r in results
+            ],
+            sys.stdout,
+        )
+        print()
+    else:
+        for result in results:
+            print(result)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
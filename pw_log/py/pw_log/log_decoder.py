@@ -18,7 +18,8 @@ from dataclasses import dataclass
 import datetime
 import logging
 import re
-from typing import Any, Callable
+import sys
+from typing import Any, Callable, Iterable, NamedTuple
 
 from pw_log.proto import log_pb2
 import pw_log_tokenized
@@ -29,6 +30,11 @@ from pw_tokenizer.proto import decode_optionally_tokenized
 _LOG = logging.getLogger(__name__)
 
 
+# Maximum number of entries in each LogStreamDecoder field cache. A full cache
+# is cleared rather than evicting entries one at a time.
+_FIELD_CACHE_SIZE = 4096
+
+
 @dataclass(frozen=True)
 class LogLineLevel:
     """Tuple of line number and level packed in LogEntry."""
@@ -43,6 +49,12 @@ class Log:
     Contains fields to represent a decoded pw_log/log.proto LogEntry message in
     a human readable way.
 
+    Logs are compact so that large captures can be kept in memory: attributes
+    are stored in slots, and the metadata dictionary is only allocated when a
+    log has metadata or it is accessed. A Log may hold its raw timestamp and
+    unparsed message along with the parsers for them, in which case the
+    timestamp and message strings are only formatted when first accessed.
+
     Attributes:
         message: The log message as a string.
         level: A integer representing the log level, follows logging levels.
@@ -55,6 +67,20 @@ class Log:
         metadata_fields: Extra fields with string-string mapping.
     """
 
+    __slots__ = (
+        '_message',
+        '_message_parser',
+        'level',
+        'flags',
+        '_timestamp',
+        '_timestamp_parser',
+        'module_name',
+        'thread_name',
+        'source_name',
+        'file_and_line',
+        '_metadata_fields',
+    )
+
     _LOG_LEVEL_NAMES = {
         logging.DEBUG: 'DBG',
         logging.INFO: 'INF',
@@ -68,7 +94,7 @@ class Log:
     _LEVEL_MASK = 0x7  # pylint: disable=C0103
     _LINE_OFFSET = 3  # pylint: disable=C0103
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         message: str = '',
         level: int = logging.NOTSET,
@@ -79,18 +105,77 @@ class Log:
         source_name: str = '',
         file_and_line: str = '',
         metadata_fields: dict[str, str] | None = None,
+        *,
+        raw_timestamp: int | None = None,
+        timestamp_parser: Callable[[int], str] | None = None,
+        message_parser: Callable[[str], str] | None = None,
     ) -> None:
-        self.message = message
+        """Creates a Log.
+
+        Args:
+            raw_timestamp: Optional timestamp number, formatted with
+              timestamp_parser (or str) in place of timestamp when the
+              timestamp is first accessed.
+            timestamp_parser: Parser for raw_timestamp.
+            message_parser: Optional parser applied to message when it is
+              first accessed.
+        """
+        self._message = message
+        self._message_parser = message_parser
         self.level = level  # Value from logging levels.
         self.flags = flags
-        self.timestamp = timestamp  # A human readable value.
+        self._timestamp: str | int = (
+            timestamp if raw_timestamp is None else raw_timestamp
+        )
+        self._timestamp_parser = (
+            None if raw_timestamp is None else (timestamp_parser or str)
+        )
         self.module_name = module_name
         self.thread_name = thread_name
         self.source_name = source_name
         self.file_and_line = file_and_line
-        self.metadata_fields = dict()
-        if metadata_fields:
-            self.metadata_fields.update(metadata_fields)
+        self._metadata_fields = (
+            dict(metadata_fields) if metadata_fields else None
+        )
+
+    @property
+    def message(self) -> str:
+        """The log message."""
+        if self._message_parser is not None:
+            self._message = self._message_parser(self._message)
+            self._message_parser = None
+        return self._message
+
+    @message.setter
+    def message(self, message: str) -> None:
+        self._message = message
+        self._message_parser = None
+
+    @property
+    def timestamp(self) -> str:
+        """A human readable timestamp."""
+        if self._timestamp_parser is not None:
+            assert isinstance(self._timestamp, int)
+            self._timestamp = self._timestamp_parser(self._timestamp)
+            self._timestamp_parser = None
+        assert isinstance(self._timestamp, str)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, timestamp: str) -> None:
+        self._timestamp = timestamp
+        self._timestamp_parser = None
+
+    @property
+    def metadata_fields(self) -> dict[str, str]:
+        """Extra fields, allocated when first accessed."""
+        if self._metadata_fields is None:
+            self._metadata_fields = {}
+        return self._metadata_fields
+
+    @metadata_fields.setter
+    def metadata_fields(self, metadata_fields: dict[str, str]) -> None:
+        self._metadata_fields = metadata_fields
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, Log):
@@ -105,7 +190,7 @@ class Log:
             and self.thread_name == other.thread_name
             and self.source_name == other.source_name
             and self.file_and_line == other.file_and_line
-            and self.metadata_fields == other.metadata_fields
+            and (self._metadata_fields or {}) == (other._metadata_fields or {})
         )
 
     def __repr__(self) -> str:
@@ -113,7 +198,7 @@ class Log:
 
     def __str__(self) -> str:
         level_name = self._LOG_LEVEL_NAMES.get(self.level, '')
-        metadata = ' '.join(map(str, self.metadata_fields.values()))
+        metadata = ' '.join(map(str, (self._metadata_fields or {}).values()))
         return (
             f'{level_name} [{self.source_name}] {self.module_name} '
             f'{self.timestamp} {self.message} {self.file_and_line} '
@@ -222,6 +307,15 @@ def log_decoded_log(
     )
 
 
+class _ParsedMessage(NamedTuple):
+    """The fields of a detokenized LogEntry message."""
+
+    message: str
+    module: str
+    file: str
+    metadata_fields: dict[str, str]
+
+
 def timestamp_parser_ns_since_boot(timestamp: int) -> str:
     """Decodes timestamp as nanoseconds since boot.
 
@@ -238,6 +332,12 @@ class LogStreamDecoder:
 
     Performs log drop detection on the stream of LogEntries proto messages.
 
+    LogEntries may be decoded one log at a time with parse_log_entries_proto,
+    or in batches with parse_log_entries_batch. The batch API caches decoded
+    messages, modules, threads, and file names, which repeat across logs, and
+    passes all of a batch's logs to decoded_logs_handler at once. This reduces
+    the per-log overhead for devices that produce many logs.
+
     Args:
         decoded_log_handler: Callback called on each decoded log.
         detokenizer: Detokenizes log messages if tokenized when provided.
@@ -245,6 +345,9 @@ class LogStreamDecoder:
         timestamp_parser: Optional timestamp parser number to a string.
         message_parser: Optional message parser called after detokenization is
           attempted on a log message.
+        decoded_logs_handler: Optional callback called with the list of logs
+          decoded by parse_log_entries_batch. If not provided, batches are
+          passed to decoded_log_handler one log at a time.
     """
 
     DROP_REASON_LOSS_AT_TRANSPORT = 'loss at transport'
@@ -258,14 +361,29 @@ class LogStreamDecoder:
         source_name: str = '',
         timestamp_parser: Callable[[int], str] | None = None,
         message_parser: Callable[[str], str] | None = None,
+        decoded_logs_handler: Callable[[list[Log]], None] | None = None,
     ):
         self.decoded_log_handler = decoded_log_handler
+        self.decoded_logs_handler = decoded_logs_handler
         self.detokenizer = detokenizer
         self.source_name = source_name
         self.timestamp_parser = timestamp_parser
         self.message_parser = message_parser
         self._expected_log_sequence_id = 0
 
+        # Caches used by parse_log_entries_batch.
+        self._decoded_fields: dict[bytes, str] = {}
+        self._parsed_messages: dict[str, _ParsedMessage] = {}
+
+    def clear_caches(self) -> None:
+        """Clears the decoded fields cached by parse_log_entries_batch.
+
+        Call this if the detokenizer's database changes, so that previously
+        undecodable tokens are detokenized again.
+        """
+        self._decoded_fields.clear()
+        self._parsed_messages.clear()
+
     def parse_log_entries_proto(
         self, log_entries_proto: log_pb2.LogEntries
     ) -> None:
@@ -276,6 +394,53 @@ class LogStreamDecoder:
         Returns:
             A Log object with the decoded log_entry_proto.
         """
+        self._parse_log_entries(
+            log_entries_proto,
+            self.decoded_log_handler,
+            self.parse_log_entry_proto,
+        )
+
+    def parse_log_entries_batch(
+        self,
+        log_entries_protos: log_pb2.LogEntries | Iterable[log_pb2.LogEntries],
+    ) -> list[Log]:
+        """Parses one or more LogEntries messages as a single batch.
+
+        Produces the same logs as calling parse_log_entries_proto on each
+        message, including log drop reports, but detokenizes fields through
+        caches shared by all batches and delivers the logs together to
+        decoded_logs_handler, if provided.
+
+        Args:
+            log_entries_protos: A LogEntries message proto or an iterable of
+              them, in the order they were received.
+        Returns:
+            The decoded logs.
+        """
+        if isinstance(log_entries_protos, log_pb2.LogEntries):
+            log_entries_protos = (log_entries_protos,)
+
+        logs: list[Log] = []
+        for log_entries_proto in log_entries_protos:
+            self._parse_log_entries(
+                log_entries_proto, logs.append, self._parse_log_entry_cached
+            )
+
+        if self.decoded_logs_handler is not None:
+            self.decoded_logs_handler(logs)
+        else:
+            for log in logs:
+                self.decoded_log_handler(log)
+
+        return logs
+
+    def _parse_log_entries(
+        self,
+        log_entries_proto: log_pb2.LogEntries,
+        handle_log: Callable[[Log], None],
+        parse_log_entry: Callable[[log_pb2.LogEntry], Log],
+    ) -> None:
+        """Reports drops in log_entries_proto and decodes its entries."""
         has_received_logs = self._expected_log_sequence_id > 0
         dropped_log_count = self._calculate_dropped_logs(log_entries_proto)
         if dropped_log_count > 0:
@@ -284,9 +449,7 @@ class LogStreamDecoder:
                 if has_received_logs
                 else self.DROP_REASON_SOURCE_NOT_CONNECTED
             )
-            self.decoded_log_handler(
-                self._handle_log_drop_count(dropped_log_count, reason)
-            )
+            handle_log(self._handle_log_drop_count(dropped_log_count, reason))
         elif dropped_log_count < 0:
             _LOG.error('Log sequence ID is smaller than expected')
 
@@ -299,8 +462,7 @@ class LogStreamDecoder:
                 # successful transmission.
                 if i == 0 and dropped_log_count >= log_entry_proto.dropped:
                     continue
-            parsed_log = self.parse_log_entry_proto(log_entry_proto)
-            self.decoded_log_handler(parsed_log)
+            handle_log(parse_log_entry(log_entry_proto))
 
     def parse_log_entry_proto(self, log_entry_proto: log_pb2.LogEntry) -> Log:
         """Parses the log_entry_proto contents into a human readable format.
@@ -354,29 +516,102 @@ class LogStreamDecoder:
             if k not in ['file', 'module', 'msg']
         }
 
-        message = message_and_metadata.message
-        if self.message_parser:
-            message = self.message_parser(message)
-        if self.timestamp_parser:
-            timestamp = self.timestamp_parser(log_entry_proto.timestamp)
-        else:
-            timestamp = str(log_entry_proto.timestamp)
+        # The message and timestamp are formatted when first accessed. Fields
+        # that repeat across logs are interned so that logs share them.
         log = Log(
-            message=message,
+            message=message_and_metadata.message,
             level=line_level_tuple.level,
             flags=log_entry_proto.flags,
-            timestamp=timestamp,
-            module_name=module_name,
-            thread_name=self._decode_optionally_tokenized_field(
-                log_entry_proto.thread
+            module_name=sys.intern(module_name),
+            thread_name=sys.intern(
+                self._decode_optionally_tokenized_field(log_entry_proto.thread)
             ),
             source_name=self.source_name,
-            file_and_line=file_and_line,
+            file_and_line=sys.intern(file_and_line),
             metadata_fields=metadata_fields,
+            raw_timestamp=log_entry_proto.timestamp,
+            timestamp_parser=self.timestamp_parser,
+            message_parser=self.message_parser,
         )
 
         return log
 
+    def _parse_log_entry_cached(self, log_entry_proto: log_pb2.LogEntry) -> Log:
+        """Parses a LogEntry like parse_log_entry_proto, using the caches."""
+        detokenized_message = self._decode_cached_field(log_entry_proto.message)
+        if log_entry_proto.dropped:
+            drop_reason = self.DROP_REASON_SOURCE_ENQUEUE_FAILURE
+            if detokenized_message:
+                drop_reason = detokenized_message.lower()
+            return self._handle_log_drop_count(
+                log_entry_proto.dropped, drop_reason
+            )
+
+        parsed = self._parsed_messages.get(detokenized_message)
+        if parsed is None:
+            parsed = self._parse_message(detokenized_message)
+            if len(self._parsed_messages) >= _FIELD_CACHE_SIZE:
+                self._parsed_messages.clear()
+            self._parsed_messages[detokenized_message] = parsed
+
+        module_name = self._decode_cached_field(log_entry_proto.module)
+        if not module_name:
+            module_name = parsed.module
+
+        line_level_tuple = Log.unpack_line_level(log_entry_proto.line_level)
+        file_and_line = self._decode_cached_field(log_entry_proto.file)
+        if not file_and_line:
+            file_and_line = parsed.file
+
+        # Add line number to filepath if needed.
+        if line_level_tuple.line and ':' not in file_and_line:
+            file_and_line += f':{line_level_tuple.line}'
+
+        return Log(
+            message=parsed.message,
+            level=line_level_tuple.level,
+            flags=log_entry_proto.flags,
+            module_name=module_name,
+            thread_name=self._decode_cached_field(log_entry_proto.thread),
+            source_name=self.source_name,
+            file_and_line=sys.intern(file_and_line),
+            metadata_fields=parsed.metadata_fields,
+            raw_timestamp=log_entry_proto.timestamp,
+            timestamp_parser=self.timestamp_parser,
+            message_parser=self.message_parser,
+        )
+
+    @staticmethod
+    def _parse_message(detokenized_message: str) -> _ParsedMessage:
+        """Splits a message into its text and key-value metadata."""
+        message_and_metadata = pw_log_tokenized.FormatStringWithMetadata(
+            detokenized_message
+        )
+        return _ParsedMessage(
+            message=message_and_metadata.message,
+            module=sys.intern(message_and_metadata.module),
+            file=sys.intern(message_and_metadata.file or ''),
+            metadata_fields={
+                k: v
+                for k, v in message_and_metadata.fields.items()
+                if k not in ['file', 'module', 'msg']
+            },
+        )
+
+    def _decode_cached_field(self, field: bytes) -> str:
+        """Decodes an optionally tokenized field, caching the result."""
+        if not field:
+            return ''
+
+        decoded = self._decoded_fields.get(field)
+        if decoded is None:
+            decoded = sys.intern(self._decode_optionally_tokenized_field(field))
+            if len(self._decoded_fields) >= _FIELD_CACHE_SIZE:
+                self._decoded_fields.clear()
+            self._decoded_fields[field] = decoded
+
+        return decoded
+
     def _handle_log_drop_count(self, drop_count: int, reason: str) -> Log:
         log_word = 'logs' if drop_count > 1 else 'log'
         log = Log(
@@ -390,9 +625,9 @@ class LogStreamDecoder:
         self, log_entries_proto: log_pb2.LogEntries
     ) -> int:
         # Count log messages received that don't use the dropped field.
-        messages_received = sum(
-            1 if not log_proto.dropped else 0
-            for log_proto in log_entries_proto.entries
+        entries = log_entries_proto.entries
+        messages_received = len(entries) - sum(
+            1 for log_proto in entries if log_proto.dropped
         )
         dropped_log_count = (
             log_entries_proto.first_entry_sequence_id
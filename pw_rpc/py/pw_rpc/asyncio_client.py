@@ -0,0 +1,681 @@
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""Defines an asyncio-based RPC ClientImpl to use with pw_rpc.Client.
+
+asyncio_client.Impl invokes RPCs from coroutines running in an asyncio event
+loop. No threads block while waiting for responses, so a single event loop can
+drive many concurrent RPCs across any number of channels.
+
+Unary and client streaming RPCs are awaitable. Awaiting a call returns a status
+and a response, as with the callback client.
+
+.. code-block:: python
+
+  status, response = await client.channel(1).rpcs.MyServer.MyUnary(a=123)
+
+  call = client.channel(1).rpcs.MyService.MyClientStreaming.invoke()
+  call.send(some_field=123)
+  status, response = await call.finish_and_wait()
+
+Server and bidirectional streaming calls are asynchronous iterators over their
+responses. Iteration ends when the RPC completes. If the RPC terminates with an
+error, iteration raises callback_client.RpcError.
+
+.. code-block:: python
+
+  async for response in client.channel(1).rpcs.MyService.MyServerStream(a=1):
+      process(response)
+
+  async with client.channel(1).rpcs.MyService.MyBidiStream.invoke() as call:
+      call.send(some_field=123)
+      async for response in call:
+          process(response)
+
+Each call queues up to max_queued_responses unread responses before the
+coroutine that reads packets from the transport should wait. That coroutine
+applies backpressure by awaiting Impl.drain() between packets, which waits for
+readers of any full queue to catch up.
+
+.. code-block:: python
+
+  async def read_packets(reader: asyncio.StreamReader) -> None:
+      async for packet in decode_packets(reader):
+          client.process_packet(packet)
+          await impl.drain()
+
+Transports that process packets without awaiting drain() get no backpressure,
+so each call also holds at most max_buffered_responses unread responses. Beyond
+that, the oldest unread response is dropped and counted in
+Call.dropped_responses.
+
+Calls must be started from a coroutine in the event loop, but packets may be
+processed from any thread. Responses are always handled in the event loop of the
+call to which they belong.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+from typing import Any, Iterable, Type, TypeVar, cast
+
+from google.protobuf.message import Message
+from pw_status import Status
+
+from pw_rpc import client
+from pw_rpc.callback_client.call import (
+    OptionalTimeout,
+    StreamResponse,
+    UnaryResponse,
+    UseDefault,
+)
+from pw_rpc.callback_client.errors import RpcError, RpcTimeout
+from pw_rpc.client import PendingRpc
+from pw_rpc.descriptors import Channel, Method, Service
+from pw_rpc.packets import ENCODED_PAYLOAD_TYPES, Payload
+
+DEFAULT_MAX_QUEUED_RESPONSES = 64
+DEFAULT_MAX_BUFFERED_RESPONSES = 1024
+
+_LOG = logging.getLogger(__package__)
+
+_CallT = TypeVar('_CallT', bound='Call')
+
+
+class Call:
+    """Represents an in-progress or completed RPC call."""
+
+    def __init__(
+        self,
+        impl: Impl,
+        rpc: PendingRpc,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        self._impl = impl
+        self._rpc = rpc
+        self._loop = loop
+
+        self.status: Status | None = None
+        self.error: Status | None = None
+
+        self._responses: deque = deque(maxlen=impl.max_buffered_responses)
+        self._last_response: Any = None
+
+        # Unread responses discarded because the queue was at its limit.
+        self.dropped_responses = 0
+
+        # Set when a response arrives or the call completes.
+        self._updated = asyncio.Event()
+        # Cleared while more than max_queued_responses are unread.
+        self._has_room = asyncio.Event()
+        self._has_room.set()
+
+    @property
+    def call_id(self) -> int:
+        return self._rpc.call_id
+
+    @property
+    def method(self) -> Method:
+        return self._rpc.method
+
+    def completed(self) -> bool:
+        """True if the RPC call has completed, successfully or from an error."""
+        return self.status is not None or self.error is not None
+
+    def queued_responses(self) -> int:
+        """Returns the number of responses that have not been read."""
+        return len(self._responses)
+
+    def cancel(self) -> bool:
+        """Cancels the RPC; returns whether the RPC was active."""
+        if self.completed():
+            return False
+
+        self.error = Status.CANCELLED
+        self._finish()
+
+        assert self._impl.rpcs
+        return self._impl.rpcs.send_cancel(self._rpc)
+
+    def _start(self, request: Message | None, ignore_errors: bool) -> None:
+        """Sends the request. This must be called immediately after __init__."""
+        assert self._impl.rpcs
+        previous = self._impl.rpcs.send_request(
+            self._rpc,
+            request,
+            self,
+            ignore_errors=ignore_errors,
+            override_pending=True,
+        )
+
+        # Only one instance of an RPC may be pending on a channel at once.
+        if isinstance(previous, Call) and not previous.completed():
+            previous._handle_error(  # pylint: disable=protected-access
+                Status.CANCELLED
+            )
+
+    def _send_client_stream(
+        self, request_proto: Payload | None, request_fields: dict
+    ) -> None:
+        if self.error:
+            raise RpcError(self._rpc, self.error)
+
+        if self.status is not None:
+            raise RpcError(self._rpc, Status.FAILED_PRECONDITION)
+
+        assert self._impl.rpcs
+        # Encoded payloads are sent as is, without checking the request type.
+        if (
+            isinstance(request_proto, ENCODED_PAYLOAD_TYPES)
+            and not request_fields
+        ):
+            request: Payload = request_proto
+        else:
+            request = self.method.get_request(
+                cast(Message | None, request_proto), request_fields
+            )
+
+        self._impl.rpcs.send_client_stream(self._rpc, request)
+
+    def _finish_client_stream(self, requests: Iterable[Payload]) -> None:
+        for request in requests:
+            self._send_client_stream(request, {})
+
+        if not self.completed():
+            assert self._impl.rpcs
+            self._impl.rpcs.send_client_stream_end(self._rpc)
+
+    def _handle_response(self, response: Any) -> None:
+        if len(self._responses) == self._responses.maxlen:
+            if not self.dropped_responses:
+                _LOG.warning(
+                    '%s has %d unread responses; dropping the oldest',
+                    self._rpc,
+                    self._responses.maxlen,
+                )
+            self.dropped_responses += 1
+
+        self._responses.append(response)
+        self._last_response = response
+        self._updated.set()
+
+        if len(self._responses) > self._impl.max_queued_responses:
+            self._has_room.clear()
+            self._impl._backlogged.add(self)  # pylint: disable=protected-access
+
+    def _handle_completion(self, status: Status) -> None:
+        self.status = status
+        self._finish()
+
+    def _handle_error(self, error: Status) -> None:
+        self.error = error
+        self._finish()
+
+    def _finish(self) -> None:
+        # No more responses will arrive, so the packet reader need not wait.
+        self._updated.set()
+        self._has_room.set()
+        self._impl._backlogged.discard(self)  # pylint: disable=protected-access
+
+    async def _next_response(self) -> Any:
+        """Waits for the next unread response.
+
+        Raises:
+          StopAsyncIteration: the RPC completed and all responses were read
+          RpcError: the RPC terminated with an error
+        """
+        while not self._responses:
+            if self.error:
+                raise RpcError(self._rpc, self.error)
+
+            if self.status is not None:
+                raise StopAsyncIteration
+
+            self._updated.clear()
+            await self._updated.wait()
+
+        response = self._responses.popleft()
+
+        if len(self._responses) <= self._impl.max_queued_responses:
+            self._has_room.set()
+            # pylint: disable-next=protected-access
+            self._impl._backlogged.discard(self)
+
+        return response
+
+    async def _wait(self, timeout_s: OptionalTimeout) -> list:
+        """Waits for the RPC to complete; returns the unread responses."""
+        if timeout_s is UseDefault.VALUE:
+            timeout_s = self._impl.default_timeout_s
+
+        responses: list = []
+
+        async def read_all() -> None:
+            while True:
+                try:
+                    responses.append(await self._next_response())
+                except StopAsyncIteration:
+                    return
+
+        try:
+            await asyncio.wait_for(read_all(), timeout_s)
+        except asyncio.TimeoutError:
+            self.cancel()
+            raise RpcTimeout(self._rpc, timeout_s)
+
+        return responses
+
+    async def _unary_wait(self, timeout_s: OptionalTimeout) -> UnaryResponse:
+        await self._wait(timeout_s)
+        assert self.status is not None
+        return UnaryResponse(self.status, self._last_response)
+
+    async def __aenter__(self: _CallT) -> _CallT:
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self.cancel()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.method})'
+
+
+class UnaryCall(Call):
+    """Tracks the state of a unary RPC call; await it for the response."""
+
+    @property
+    def response(self) -> Any:
+        return self._last_response
+
+    async def wait(
+        self, timeout_s: OptionalTimeout = UseDefault.VALUE
+    ) -> UnaryResponse:
+        return await self._unary_wait(timeout_s)
+
+    def __await__(self):
+        return self.wait().__await__()
+
+
+class ServerStreamingCall(Call):
+    """Tracks the state of a server streaming RPC call.
+
+    Iterate over the call with async for to read its responses.
+    """
+
+    async def wait(
+        self, timeout_s: OptionalTimeout = UseDefault.VALUE
+    ) -> StreamResponse:
+        """Waits for the RPC to complete; returns the unread responses."""
+        responses = await self._wait(timeout_s)
+        assert self.status is not None
+        return StreamResponse(self.status, responses)
+
+    def request_completion(self) -> None:
+        """Sends client completion packet to server."""
+        if not self.completed():
+            assert self._impl.rpcs
+            self._impl.rpcs.send_client_stream_end(self._rpc)
+
+    def __aiter__(self) -> ServerStreamingCall:
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self._next_response()
+
+
+class ClientStreamingCall(Call):
+    """Tracks the state of a client streaming RPC call."""
+
+    @property
+    def response(self) -> Any:
+        return self._last_response
+
+    def send(
+        self, _rpc_request_proto: Payload | None = None, **request_fields
+    ) -> None:
+        """Sends client stream request to the server.
+
+        The request may be a message, keyword arguments for its fields, or an
+        already-encoded payload (bytes, bytearray, or memoryview).
+        """
+        self._send_client_stream(_rpc_request_proto, request_fields)
+
+    async def finish_and_wait(
+        self,
+        requests: Iterable[Payload] = (),
+        *,
+        timeout_s: OptionalTimeout = UseDefault.VALUE,
+    ) -> UnaryResponse:
+        """Ends the client stream and waits for the RPC to complete."""
+        self._finish_client_stream(requests)
+        return await self._unary_wait(timeout_s)
+
+
+class BidirectionalStreamingCall(Call):
+    """Tracks the state of a bidirectional streaming RPC call.
+
+    Iterate over the call with async for to read its responses.
+    """
+
+    def send(
+        self, _rpc_request_proto: Payload | None = None, **request_fields
+    ) -> None:
+        """Sends a message to the server in the client stream.
+
+        The request may be a message, keyword arguments for its fields, or an
+        already-encoded payload (bytes, bytearray, or memoryview).
+        """
+        self._send_client_stream(_rpc_request_proto, request_fields)
+
+    async def finish_and_wait(
+        self,
+        requests: Iterable[Payload] = (),
+        *,
+        timeout_s: OptionalTimeout = UseDefault.VALUE,
+    ) -> StreamResponse:
+        """Ends the client stream and waits for the RPC to complete.
+
+        Returns:
+          the status and any responses that were not read by iterating
+        """
+        self._finish_client_stream(requests)
+        responses = await self._wait(timeout_s)
+        assert self.status is not None
+        return StreamResponse(self.status, responses)
+
+    def __aiter__(self) -> BidirectionalStreamingCall:
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self._next_response()
+
+
+class _MethodClient:
+    """A method that can be invoked for a particular channel."""
+
+    def __init__(self, impl: Impl, channel: Channel, method: Method) -> None:
+        self._impl = impl
+        self._channel = channel
+        self._method = method
+
+    @property
+    def channel(self) -> Channel:
+        return self._channel
+
+    @property
+    def method(self) -> Method:
+        return self._method
+
+    @property
+    def service(self) -> Service:
+        return self._method.service
+
+    @property
+    def request(self) -> type:
+        """Returns the request proto class."""
+        return self.method.request_type
+
+    @property
+    def response(self) -> type:
+        """Returns the response proto class."""
+        return self.method.response_type
+
+    def _start_call(
+        self,
+        call_type: Type[_CallT],
+        request: Message | None,
+        ignore_errors: bool = False,
+    ) -> _CallT:
+        """Creates the Call object and invokes the RPC using it."""
+        assert self._impl.rpcs
+        rpc = PendingRpc(
+            self._channel,
+            self.service,
+            self.method,
+            self._impl.rpcs.allocate_call_id(),
+        )
+        call = call_type(self._impl, rpc, asyncio.get_running_loop())
+        call._start(request, ignore_errors)  # pylint: disable=protected-access
+        return call
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.method})'
+
+
+class _UnaryMethodClient(_MethodClient):
+    def invoke(
+        self,
+        request: Message | None = None,
+        *,
+        request_args: dict[str, Any] | None = None,
+    ) -> UnaryCall:
+        """Invokes the unary RPC and returns a call object."""
+        return self._start_call(
+            UnaryCall, self.method.get_request(request, request_args)
+        )
+
+    def open(
+        self,
+        request: Message | None = None,
+        *,
+        request_args: dict[str, Any] | None = None,
+    ) -> UnaryCall:
+        """Returns a call object for the RPC, even if it cannot be invoked."""
+        return self._start_call(
+            UnaryCall, self.method.get_request(request, request_args), True
+        )
+
+    async def __call__(
+        self,
+        _rpc_request_proto: Message | None = None,
+        *,
+        pw_rpc_timeout_s: OptionalTimeout = UseDefault.VALUE,
+        **request_fields,
+    ) -> UnaryResponse:
+        return await self.invoke(
+            self.method.get_request(_rpc_request_proto, request_fields)
+        ).wait(pw_rpc_timeout_s)
+
+
+class _ServerStreamingMethodClient(_MethodClient):
+    def invoke(
+        self,
+        request: Message | None = None,
+        *,
+        request_args: dict[str, Any] | None = None,
+    ) -> ServerStreamingCall:
+        """Invokes the server streaming RPC and returns a call object."""
+        return self._start_call(
+            ServerStreamingCall, self.method.get_request(request, request_args)
+        )
+
+    def open(
+        self,
+        request: Message | None = None,
+        *,
+        request_args: dict[str, Any] | None = None,
+    ) -> ServerStreamingCall:
+        """Returns a call object for the RPC, even if it cannot be invoked.
+
+        Can be used to listen for responses from an RPC server that may yet be
+        available.
+        """
+        return self._start_call(
+            ServerStreamingCall,
+            self.method.get_request(request, request_args),
+            True,
+        )
+
+    def __call__(
+        self, _rpc_request_proto: Message | None = None, **request_fields
+    ) -> ServerStreamingCall:
+        """Invokes the RPC; iterate over the returned call for responses."""
+        return self.invoke(
+            self.method.get_request(_rpc_request_proto, request_fields)
+        )
+
+
+class _ClientStreamingMethodClient(_MethodClient):
+    def invoke(self) -> ClientStreamingCall:
+        """Invokes the client streaming RPC and returns a call object."""
+        return self._start_call(ClientStreamingCall, None)
+
+    def open(self) -> ClientStreamingCall:
+        """Returns a call object for the RPC, even if it cannot be invoked."""
+        return self._start_call(ClientStreamingCall, None, True)
+
+    async def __call__(
+        self,
+        requests: Iterable[Payload] = (),
+        *,
+        timeout_s: OptionalTimeout = UseDefault.VALUE,
+    ) -> UnaryResponse:
+        return await self.invoke().finish_and_wait(
+            requests, timeout_s=timeout_s
+        )
+
+
+class _BidirectionalStreamingMethodClient(_MethodClient):
+    def invoke(self) -> BidirectionalStreamingCall:
+        """Invokes the bidirectional streaming RPC and returns a call object."""
+        return self._start_call(BidirectionalStreamingCall, None)
+
+    def open(self) -> BidirectionalStreamingCall:
+        """Returns a call object for the RPC, even if it cannot be invoked."""
+        return self._start_call(BidirectionalStreamingCall, None, True)
+
+    async def __call__(
+        self,
+        requests: Iterable[Payload] = (),
+        *,
+        timeout_s: OptionalTimeout = UseDefault.VALUE,
+    ) -> StreamResponse:
+        return await self.invoke().finish_and_wait(
+            requests, timeout_s=timeout_s
+        )
+
+
+_METHOD_CLIENTS: dict[Method.Type, type] = {
+    Method.Type.UNARY: _UnaryMethodClient,
+    Method.Type.SERVER_STREAMING: _ServerStreamingMethodClient,
+    Method.Type.CLIENT_STREAMING: _ClientStreamingMethodClient,
+    Method.Type.BIDIRECTIONAL_STREAMING: _BidirectionalStreamingMethodClient,
+}
+
+
+class Impl(client.ClientImpl):
+    """asyncio-based ClientImpl, for use with pw_rpc.Client.
+
+    Args:
+        default_timeout_s: Default time to wait for an RPC to complete when
+            awaiting its result; None waits indefinitely.
+        max_queued_responses: Number of unread responses a call may queue
+            before drain() waits for them to be read.
+        max_buffered_responses: Number of unread responses a call may hold
+            at most; the oldest is dropped when another arrives.
+    """
+
+    def __init__(
+        self,
+        default_timeout_s: float | None = None,
+        max_queued_responses: int = DEFAULT_MAX_QUEUED_RESPONSES,
+        max_buffered_responses: int = DEFAULT_MAX_BUFFERED_RESPONSES,
+    ) -> None:
+        super().__init__()
+        if max_buffered_responses <= max_queued_responses:
+            raise ValueError(
+                'max_buffered_responses must be greater than '
+                'max_queued_responses'
+            )
+
+        self.default_timeout_s = default_timeout_s
+        self.max_queued_responses = max_queued_responses
+        self.max_buffered_responses = max_buffered_responses
+
+        # Calls with more than max_queued_responses unread responses.
+        self._backlogged: set[Call] = set()
+
+    def method_client(self, channel: Channel, method: Method) -> _MethodClient:
+        """Returns an object that invokes a method using the given channel."""
+        return _METHOD_CLIENTS[method.type](self, channel, method)
+
+    def backlogged(self) -> bool:
+        """True if any call has more than max_queued_responses unread."""
+        return bool(self._backlogged)
+
+    async def drain(self) -> None:
+        """Waits until no call has more than max_queued_responses unread.
+
+        Await this between packets in the coroutine that reads from the
+        transport so that slow readers apply backpressure to the transport
+        instead of queueing responses without limit.
+        """
+        while self._backlogged:
+            # pylint: disable=protected-access
+            await next(iter(self._backlogged))._has_room.wait()
+
+    @staticmethod
+    def _dispatch(context: Call, function, arg) -> None:
+        """Runs a call's handler in its event loop, from any thread."""
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        # pylint: disable=protected-access
+        if running_loop is context._loop:
+            function(arg)
+        else:
+            context._loop.call_soon_threadsafe(function, arg)
+
+    def handle_response(
+        self,
+        rpc: PendingRpc,
+        context: Call,
+        payload,
+        *,
+        args: tuple = (),
+        kwargs: dict | None = None,
+    ) -> None:
+        """Queues a response for the call."""
+        assert not args and not kwargs, 'Forwarding args & kwargs not supported'
+        # pylint: disable=protected-access
+        self._dispatch(context, context._handle_response, payload)
+
+    def handle_completion(
+        self,
+        rpc: PendingRpc,
+        context: Call,
+        status: Status,
+        *,
+        args: tuple = (),
+        kwargs: dict | None = None,
+    ) -> None:
+        assert not args and not kwargs, 'Forwarding args & kwargs not supported'
+        # pylint: disable=protected-access
+        self._dispatch(context, context._handle_completion, status)
+
+    def handle_error(
+        self,
+        rpc: PendingRpc,
+        context: Call,
+        status: Status,
+        *,
+        args: tuple = (),
+        kwargs: dict | None = None,
+    ) -> None:
+        assert not args and not kwargs, 'Forwarding args & kwargs not supported'
+        # pylint: disable=protected-access
+        self._dispatch(context, context._handle_error, status)
@@ -0,0 +1,424 @@
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""Measures the throughput and latency of the pw_rpc Python client.
+
+Drives a pw_rpc.Client with a callback_client.Impl against an in-process
+loopback server, so the results reflect the cost of the Python client stack:
+packet encoding and decoding, dispatch, and call bookkeeping. Packets may
+optionally be framed with HDLC and passed through a LossyChannel.
+
+Each workload reports packets processed per second, p50 and p99 call latency,
+and the net number of memory blocks still allocated per packet afterwards,
+which reveals responses or calls that are retained longer than expected. Blocks
+are counted with tracemalloc in a separate, untimed pass that excludes
+allocations made by the benchmark itself, such as its latency samples and the
+loopback server's packets.
+
+  python -m pw_rpc.benchmark --hdlc --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import enum
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, Iterable, Sequence
+
+from google.protobuf import descriptor_pb2, descriptor_pool
+from pw_status import Status
+
+from pw_rpc import callback_client, client, packets
+from pw_rpc.descriptors import Channel, Method, Service
+from pw_rpc.internal.packet_pb2 import PacketType, RpcPacket
+from pw_rpc.lossy_channel import LossyChannel, RandomLossGenerator
+
+CHANNEL_ID = 1
+HDLC_ADDRESS = ord('R')
+
+
+class Workload(enum.Enum):
+    UNARY = 'unary'
+    SERVER_STREAM = 'server_stream'
+    BIDI = 'bidi'
+
+
+@dataclasses.dataclass(frozen=True)
+class LossProfile:
+    """Packet loss applied to responses through a LossyChannel."""
+
+    dropped_probability: float = 0.01
+    duplicated_probability: float = 0.01
+    out_of_order_probability: float = 0.01
+
+    def loss_generator(self, seed: int) -> RandomLossGenerator:
+        return RandomLossGenerator(
+            duplicated_packet_probability=self.duplicated_probability,
+            max_duplications_per_packet=2,
+            out_of_order_probability=self.out_of_order_probability,
+            delayed_packet_probability=0,
+            delayed_packet_range_ms=(0, 0),
+            dropped_packet_probability=self.dropped_probability,
+            seed=seed,
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class Result:
+    """The results of running one workload."""
+
+    workload: str
+    hdlc: bool
+    lossy: bool
+    calls: int
+    completed_calls: int
+    packets: int
+    seconds: float
+    packets_per_s: float
+    latency_p50_us: float
+    latency_p99_us: float
+    allocated_blocks_per_packet: float
+
+    def __str__(self) -> str:
+        return (
+            f'{self.workload:<14}{self.packets_per_s:>12,.0f} packets/s'
+            f'{self.latency_p50_us:>10.1f} us p50'
+            f'{self.latency_p99_us:>10.1f} us p99'
+            f'{self.allocated_blocks_per_packet:>8.2f} blocks/packet'
+            f'  ({self.completed_calls}/{self.calls} calls completed)'
+        )
+
+
+def _benchmark_service() -> Service:
+    """Creates the service without compiling a .proto file."""
+    proto = descriptor_pb2.FileDescriptorProto(
+        name='pw_rpc_benchmark.proto',
+        package='pw.rpc.benchmark',
+        syntax='proto3',
+    )
+    proto.message_type.add(name='Payload').field.add(
+        name='data',
+        number=1,
+        type=descriptor_pb2.FieldDescriptorProto.TYPE_BYTES,
+        label=descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL,
+    )
+
+    service = proto.service.add(name='Benchmark')
+    for name, client_streaming, server_streaming in (
+        ('Unary', False, False),
+        ('ServerStream', False, True),
+        ('Bidi', True, True),
+    ):
+        service.method.add(
+            name=name,
+            input_type='.pw.rpc.benchmark.Payload',
+            output_type='.pw.rpc.benchmark.Payload',
+            client_streaming=client_streaming,
+            server_streaming=server_streaming,
+        )
+
+    pool = descriptor_pool.DescriptorPool()
+    pool.AddSerializedFile(proto.SerializeToString())
+    return Service.from_descriptor(
+        pool.FindServiceByName('pw.rpc.benchmark.Benchmark')
+    )
+
+
+class _Loopback:
+    """Connects a pw_rpc client to an in-process echo server.
+
+    The server replies to unary requests with the request payload, streams
+    stream_length copies of it for server streaming requests, and echoes each
+    client stream message for bidirectional streams.
+    """
+
+    def __init__(
+        self,
+        stream_length: int,
+        hdlc: bool,
+        loss: LossProfile | None,
+        seed: int,
+    ) -> None:
+        self.packets = 0
+        self._stream_length = stream_length
+
+        service = _benchmark_service()
+        self._methods = {method.id: method for method in service.methods}
+        self.client = client.Client(
+            callback_client.Impl(),
+            [Channel(CHANNEL_ID, self._send_to_server)],
+            [service],
+        )
+        self.service = self.client.channel(CHANNEL_ID).rpcs[service.full_name]
+
+        self._to_client: Callable[[bytes], None] = self._receive
+        self._to_server: Callable[[bytes], None] = self._handle_request
+
+        if hdlc:
+            self._add_hdlc_framing()
+
+        if loss is not None:
+            lossy = LossyChannel('benchmark', loss.loss_generator(seed))
+            lossy.send_packet = self._to_client
+            self._to_client = lossy.process_and_send
+
+    def _add_hdlc_framing(self) -> None:
+        # pylint: disable=import-outside-toplevel
+        from pw_hdlc import decode, encode
+
+        client_decoder = decode.FrameDecoder()
+        server_decoder = decode.FrameDecoder()
+        receive, handle_request = self._to_client, self._to_server
+
+        def to_client(packet: bytes) -> None:
+            frame = encode.ui_frame(HDLC_ADDRESS, packet)
+            for decoded in client_decoder.process_valid_frames(frame):
+                receive(decoded.data)
+
+        def to_server(packet: bytes) -> None:
+            frame = encode.ui_frame(HDLC_ADDRESS, packet)
+            for decoded in server_decoder.process_valid_frames(frame):
+                handle_request(decoded.data)
+
+        self._to_client, self._to_server = to_client, to_server
+
+    def _send_to_server(self, packet: bytes) -> None:
+        self._to_server(packet)
+
+    def _receive(self, packet: bytes) -> None:
+        self.packets += 1
+        self.client.process_packet(packet)
+
+    def _reply(
+        self, request: RpcPacket, packet_type: int, payload: bytes = b''
+    ) -> None:
+        self._to_client(
+            RpcPacket(
+                type=packet_type,
+                channel_id=request.channel_id,
+                service_id=request.service_id,
+                method_id=request.method_id,
+                call_id=request.call_id,
+                payload=payload,
+                status=Status.OK.value,
+            ).SerializeToString()
+        )
+
+    def _handle_request(self, data: bytes) -> None:
+        request = packets.decode(data)
+        method: Method = self._methods[request.method_id]
+
+        if request.type == PacketType.REQUEST:
+            if method.type is Method.Type.UNARY:
+                self._reply(request, PacketType.RESPONSE, request.payload)
+            elif method.type is Method.Type.SERVER_STREAMING:
+                for _ in range(self._stream_length):
+                    self._reply(
+                        request, PacketType.SERVER_STREAM, request.payload
+                    )
+                self._reply(request, PacketType.RESPONSE)
+        elif request.type == PacketType.CLIENT_STREAM:
+            self._reply(request, PacketType.SERVER_STREAM, request.payload)
+        elif request.type == PacketType.CLIENT_REQUEST_COMPLETION:
+            self._reply(request, PacketType.RESPONSE)
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def _call_function(
+    loopback: _Loopback, workload: Workload, stream_length: int, payload
+) -> Callable[[], object]:
+    """Returns a function that makes one call; responses arrive inline."""
+    if workload is Workload.UNARY:
+        unary = loopback.service.Unary
+        return lambda: unary(payload, pw_rpc_timeout_s=0)
+
+    if workload is Workload.SERVER_STREAM:
+        server_stream = loopback.service.ServerStream
+        return lambda: server_stream(payload, pw_rpc_timeout_s=0)
+
+    bidi = loopback.service.Bidi
+    requests = [payload] * stream_length
+    return lambda: bidi(requests, timeout_s=0)
+
+
+def _retained_blocks(call: Callable[[], object], calls: int) -> int:
+    """Counts blocks allocated while making calls that remain allocated."""
+    # Allocations made in this module are the harness, not the client.
+    harness = [
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(harness)
+
+        for _ in range(calls):
+            try:
+                call()
+            except (callback_client.RpcTimeout, callback_client.RpcError):
+                pass
+
+        gc.collect()
+        after = tracemalloc.take_snapshot().filter_traces(harness)
+    finally:
+        tracemalloc.stop()
+
+    return sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+
+
+def run(
+    workload: Workload,
+    calls: int = 1000,
+    stream_length: int = 10,
+    payload_size: int = 32,
+    hdlc: bool = False,
+    loss: LossProfile | None = None,
+    seed: int = 0,
+) -> Result:
+    """Runs a workload against a new loopback client and server.
+
+    Calls whose responses are lost do not complete. They are cancelled and
+    excluded from the latency statistics.
+    """
+
+    def start_loopback() -> tuple[_Loopback, Callable[[], object]]:
+        loopback = _Loopback(stream_length, hdlc, loss, seed)
+        payload = loopback.service.Unary.request(data=bytes(payload_size))
+        return loopback, _call_function(
+            loopback, workload, stream_length, payload
+        )
+
+    # Tracing allocations slows the client, so count them in a separate pass.
+    memory_loopback, call = start_loopback()
+    blocks = _retained_blocks(call, calls)
+
+    loopback, call = start_loopback()
+    latencies: list[float] = []
+    start = time.perf_counter()
+
+    for _ in range(calls):
+        call_start = time.perf_counter()
+        try:
+            call()
+        except (callback_client.RpcTimeout, callback_client.RpcError):
+            continue  # The response was lost or corrupted.
+
+        latencies.append(time.perf_counter() - call_start)
+
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    return Result(
+        workload=workload.value,
+        hdlc=hdlc,
+        lossy=loss is not None,
+        calls=calls,
+        completed_calls=len(latencies),
+        packets=loopback.packets,
+        seconds=seconds,
+        packets_per_s=loopback.packets / seconds if seconds else 0.0,
+        latency_p50_us=_percentile(latencies, 0.5) * 1e6,
+        latency_p99_us=_percentile(latencies, 0.99) * 1e6,
+        allocated_blocks_per_packet=blocks / max(memory_loopback.packets, 1),
+    )
+
+
+def run_all(workloads: Iterable[Workload] = Workload, **kwargs) -> list[Result]:
+    """Runs each workload with the same options."""
+    return [run(workload, **kwargs) for workload in workloads]
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        '-w',
+        '--workload',
+        dest='workloads',
+        action='append',
+        type=Workload,
+        choices=list(Workload),
+        help='Workload to run; may be repeated (default: all)',
+    )
+    parser.add_argument(
+        '--calls', type=int, default=1000, help='Calls per workload'
+    )
+    parser.add_argument(
+        '--stream-length',
+        type=int,
+        default=10,
+        help='Responses per server stream and messages per bidi stream',
+    )
+    parser.add_argument(
+        '--payload-size', type=int, default=32, help='Payload size in bytes'
+    )
+    parser.add_argument(
+        '--hdlc', action='store_true', help='Frame packets with HDLC'
+    )
+    parser.add_argument(
+        '--lossy',
+        action='store_true',
+        help='Drop, duplicate, and reorder responses with a LossyChannel',
+    )
+    parser.add_argument(
+        '--seed', type=int, default=0, help='Seed for the lossy channel'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print the results as a JSON list instead of a table',
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+
+    results = run_all(
+        args.workloads or list(Workload),
+        calls=args.calls,
+        stream_length=args.stream_length,
+        payload_size=args.payload_size,
+        hdlc=args.hdlc,
+        loss=LossProfile() if args.lossy else None,
+        seed=args.seed,
+    )
+
+    if args.json:
+        json.dump([dataclasses.asdict(r) for r in results], sys.stdout)
+        print()
+    else:
+        for result in results:
+            print(result)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
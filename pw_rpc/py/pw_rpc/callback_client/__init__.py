@@ -84,6 +84,21 @@ takes an iterable for responses to send before closing the stream.
 
   # Send the requests, close the stream, then wait for the RPC to complete.
   stream_responses = call.finish_and_wait([RequestType(some_field=123), ...])
+
+By default, server and bidirectional streaming calls keep every response in
+their responses sequence and in the queue used to iterate over them. For
+long-lived streams, choose a ResponseBuffering policy when creating the Impl,
+either for all streaming methods or for particular ones. Each call counts the
+responses it received and dropped in its response_counters.
+
+.. code-block:: python
+
+  impl = callback_client.Impl(
+      response_buffering=callback_client.ResponseBuffering.keep_last(100),
+      method_response_buffering={
+          'pw.log.Logs.Listen': callback_client.ResponseBuffering.keep_none(),
+      },
+  )
 """
 
 from pw_rpc.callback_client.call import (
@@ -98,6 +113,8 @@ from pw_rpc.callback_client.call import (
     OnNextCallback,
     OnCompletedCallback,
     OnErrorCallback,
+    ResponseBuffering,
+    ResponseCounters,
 )
 from pw_rpc.callback_client.errors import RpcError, RpcTimeout
 from pw_rpc.callback_client.impl import Impl
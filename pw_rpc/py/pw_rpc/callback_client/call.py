@@ -15,10 +15,13 @@
 
 from __future__ import annotations
 
+from collections import deque
+from dataclasses import dataclass
 import enum
 import logging
 import math
 import queue
+import threading
 from typing import (
     Any,
     Callable,
@@ -27,6 +30,7 @@ from typing import (
     NamedTuple,
     Sequence,
     TypeVar,
+    cast,
 )
 
 from pw_protobuf_compiler.python_protos import proto_repr
@@ -36,6 +40,7 @@ from google.protobuf.message import Message
 from pw_rpc.callback_client.errors import RpcTimeout, RpcError
 from pw_rpc.client import PendingRpc, PendingRpcs
 from pw_rpc.descriptors import Method
+from pw_rpc.packets import ENCODED_PAYLOAD_TYPES, Payload
 
 _LOG = logging.getLogger(__package__)
 
@@ -85,7 +90,143 @@ class StreamResponse(NamedTuple):
         )
 
 
-class Call:
+@dataclass(frozen=True)
+class ResponseBuffering:
+    """Policy for how a streaming call buffers the responses it receives.
+
+    Responses are buffered in two places: the call's responses sequence and
+    the queue read by get_responses() or by iterating over the call. Every
+    response is passed to the on_next callback regardless of the policy.
+
+    Create policies with the keep_all, keep_none, keep_last, and bounded_queue
+    class methods.
+
+    Attributes:
+      kept: Responses to keep in the responses sequence; None keeps all.
+      queued: Responses to queue for iteration; None queues all.
+      block: If True, a full queue blocks the thread processing packets until
+          a response is read. Otherwise, the oldest queued response is dropped.
+    """
+
+    kept: int | None = None
+    queued: int | None = None
+    block: bool = False
+
+    @classmethod
+    def keep_all(cls) -> ResponseBuffering:
+        """Keeps and queues every response. This is the default."""
+        return cls()
+
+    @classmethod
+    def keep_none(cls) -> ResponseBuffering:
+        """Only passes responses to on_next; nothing is kept or queued."""
+        return cls(kept=0, queued=0)
+
+    @classmethod
+    def keep_last(cls, count: int) -> ResponseBuffering:
+        """Keeps and queues only the most recent responses."""
+        return cls(kept=count, queued=count)
+
+    @classmethod
+    def bounded_queue(cls, size: int, block: bool = False) -> ResponseBuffering:
+        """Queues up to size responses for iteration and keeps none.
+
+        When the queue is full, the oldest response is dropped, or, if block
+        is True, processing packets blocks until the queue has room. Only block
+        if another thread reads the responses.
+        """
+        return cls(kept=0, queued=size, block=block)
+
+
+@dataclass
+class ResponseCounters:
+    """Counts what happened to a streaming call's responses.
+
+    Attributes:
+      received: Responses received for the call.
+      dropped: Responses that were discarded without being queued, or were
+          removed from the queue before they were read.
+      blocked: Times processing a packet blocked on a full queue.
+    """
+
+    received: int = 0
+    dropped: int = 0
+    blocked: int = 0
+
+
+class _ResponseQueue:
+    """Thread-safe response queue that applies a ResponseBuffering policy.
+
+    None marks the end of the responses. It is always queued, even if the
+    queue is full.
+    """
+
+    def __init__(
+        self, buffering: ResponseBuffering, counters: ResponseCounters
+    ) -> None:
+        self._items: deque = deque()
+        self._max_size = buffering.queued
+        self._block = buffering.block
+        self._counters = counters
+        self._closed = False
+
+        lock = threading.Lock()
+        self._not_empty = threading.Condition(lock)
+        self._not_full = threading.Condition(lock)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def put(self, response: Any) -> None:
+        with self._not_full:
+            if self._closed:
+                return
+
+            max_size = self._max_size
+            if max_size is not None:
+                if max_size == 0:
+                    self._counters.dropped += 1
+                    return
+
+                if len(self._items) >= max_size:
+                    if self._block:
+                        self._counters.blocked += 1
+                        self._not_full.wait_for(
+                            lambda: len(self._items) < max_size or self._closed
+                        )
+                        if self._closed:
+                            return
+                    else:
+                        self._items.popleft()
+                        self._counters.dropped += 1
+
+            self._items.append(response)
+            self._not_empty.notify()
+
+    def close(self) -> None:
+        """Queues the end marker and releases any blocked put() calls."""
+        with self._not_full:
+            if not self._closed:
+                self._closed = True
+                self._items.append(None)
+
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def get(self, block: bool = True, timeout: float | None = None) -> Any:
+        """Same as queue.Queue.get; raises queue.Empty on timeout."""
+        with self._not_empty:
+            if not self._not_empty.wait_for(
+                lambda: self._items, timeout if block else 0
+            ):
+                raise queue.Empty
+
+            response = self._items.popleft()
+            self._not_full.notify()
+            return response
+
+
+class Call:  # pylint: disable=too-many-instance-attributes
     """Represents an in-progress or completed RPC call."""
 
     def __init__(
@@ -96,6 +237,7 @@ class Call:
         on_next: OnNextCallback | None,
         on_completed: OnCompletedCallback | None,
         on_error: OnErrorCallback | None,
+        response_buffering: ResponseBuffering = ResponseBuffering(),
     ) -> None:
         self._rpcs = rpcs
         self._rpc = rpc
@@ -104,8 +246,16 @@ class Call:
         self.status: Status | None = None
         self.error: Status | None = None
         self._callback_exception: Exception | None = None
-        self._responses: list = []
-        self._response_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+        self.response_counters = ResponseCounters()
+        self._responses: list | deque = (
+            []
+            if response_buffering.kept is None
+            else deque(maxlen=response_buffering.kept)
+        )
+        self._response_queue = _ResponseQueue(
+            response_buffering, self.response_counters
+        )
 
         self.on_next = on_next or Call._default_response
         self.on_completed = on_completed or Call._default_completion
@@ -153,7 +303,7 @@ class Call:
         return self.status is not None or self.error is not None
 
     def _send_client_stream(
-        self, request_proto: Message | None, request_fields: dict
+        self, request_proto: Payload | None, request_fields: dict
     ) -> None:
         """Sends a client to the server in the client stream.
 
@@ -164,11 +314,20 @@ class Call:
         if self.status is not None:
             raise RpcError(self._rpc, Status.FAILED_PRECONDITION)
 
-        self._rpcs.send_client_stream(
-            self._rpc, self.method.get_request(request_proto, request_fields)
-        )
+        # Encoded payloads are sent as is, without checking the request type.
+        if (
+            isinstance(request_proto, ENCODED_PAYLOAD_TYPES)
+            and not request_fields
+        ):
+            request: Payload = request_proto
+        else:
+            request = self.method.get_request(
+                cast(Message | None, request_proto), request_fields
+            )
+
+        self._rpcs.send_client_stream(self._rpc, request)
 
-    def _finish_client_stream(self, requests: Iterable[Message]) -> None:
+    def _finish_client_stream(self, requests: Iterable[Payload]) -> None:
         for request in requests:
             self._send_client_stream(request, {})
 
@@ -189,7 +348,7 @@ class Call:
             pass
 
         assert self.status is not None
-        return StreamResponse(self.status, self._responses)
+        return StreamResponse(self.status, self._kept_responses())
 
     def _get_responses(
         self, *, count: int | None = None, timeout_s: OptionalTimeout
@@ -231,6 +390,7 @@ class Call:
             return False
 
         self.error = Status.CANCELLED
+        self._response_queue.close()
         return self._rpcs.send_cancel(self._rpc)
 
     def _check_errors(self) -> None:
@@ -240,9 +400,14 @@ class Call:
         if self.error:
             raise RpcError(self._rpc, self.error)
 
+    def _kept_responses(self) -> Sequence:
+        if isinstance(self._responses, list):
+            return self._responses
+
+        return list(self._responses)
+
     def _handle_response(self, response: Any) -> None:
-        # TODO(frolv): These lists could grow very large for persistent
-        # streaming RPCs such as logs. The size should be limited.
+        self.response_counters.received += 1
         self._responses.append(response)
         self._response_queue.put(response)
 
@@ -250,13 +415,13 @@ class Call:
 
     def _handle_completion(self, status: Status) -> None:
         self.status = status
-        self._response_queue.put(None)
+        self._response_queue.close()
 
         self._invoke_callback('on_completed', status)
 
     def _handle_error(self, error: Status) -> None:
         self.error = error
-        self._response_queue.put(None)
+        self._response_queue.close()
 
         self._invoke_callback('on_error', error)
 
@@ -307,7 +472,8 @@ class ServerStreamingCall(Call):
 
     @property
     def responses(self) -> Sequence:
-        return self._responses
+        """The responses kept according to the response buffering policy."""
+        return self._kept_responses()
 
     def wait(
         self, timeout_s: OptionalTimeout = UseDefault.VALUE
@@ -341,14 +507,18 @@ class ClientStreamingCall(Call):
     # TODO(hepler): Use / to mark the first arg as positional-only
     #     when when Python 3.7 support is no longer required.
     def send(
-        self, _rpc_request_proto: Message | None = None, **request_fields
+        self, _rpc_request_proto: Payload | None = None, **request_fields
     ) -> None:
-        """Sends client stream request to the server."""
+        """Sends client stream request to the server.
+
+        The request may be a message, keyword arguments for its fields, or an
+        already-encoded payload (bytes, bytearray, or memoryview).
+        """
         self._send_client_stream(_rpc_request_proto, request_fields)
 
     def finish_and_wait(
         self,
-        requests: Iterable[Message] = (),
+        requests: Iterable[Payload] = (),
         *,
         timeout_s: OptionalTimeout = UseDefault.VALUE,
     ) -> UnaryResponse:
@@ -362,19 +532,24 @@ class BidirectionalStreamingCall(Call):
 
     @property
     def responses(self) -> Sequence:
-        return self._responses
+        """The responses kept according to the response buffering policy."""
+        return self._kept_responses()
 
     # TODO(hepler): Use / to mark the first arg as positional-only
     #     when when Python 3.7 support is no longer required.
     def send(
-        self, _rpc_request_proto: Message | None = None, **request_fields
+        self, _rpc_request_proto: Payload | None = None, **request_fields
     ) -> None:
-        """Sends a message to the server in the client stream."""
+        """Sends a message to the server in the client stream.
+
+        The request may be a message, keyword arguments for its fields, or an
+        already-encoded payload (bytes, bytearray, or memoryview).
+        """
         self._send_client_stream(_rpc_request_proto, request_fields)
 
     def finish_and_wait(
         self,
-        requests: Iterable[Message] = (),
+        requests: Iterable[Payload] = (),
         *,
         timeout_s: OptionalTimeout = UseDefault.VALUE,
     ) -> StreamResponse:
@@ -18,7 +18,7 @@ from __future__ import annotations
 import inspect
 import logging
 import textwrap
-from typing import Any, Callable, Iterable, Type
+from typing import Any, Callable, Iterable, Mapping, Type
 
 from dataclasses import dataclass
 from pw_status import Status
@@ -27,6 +27,7 @@ from google.protobuf.message import Message
 from pw_rpc import client, descriptors
 from pw_rpc.client import PendingRpc, PendingRpcs
 from pw_rpc.descriptors import Channel, Method, Service
+from pw_rpc.packets import Payload
 
 from pw_rpc.callback_client.call import (
     UseDefault,
@@ -42,6 +43,7 @@ from pw_rpc.callback_client.call import (
     OnNextCallback,
     OnCompletedCallback,
     OnErrorCallback,
+    ResponseBuffering,
 )
 
 _LOG = logging.getLogger(__package__)
@@ -141,7 +143,13 @@ class _MethodClient:
             self._rpcs.allocate_call_id(),
         )
         call = call_type(
-            self._rpcs, rpc, timeout_s, on_next, on_completed, on_error
+            self._rpcs,
+            rpc,
+            timeout_s,
+            on_next,
+            on_completed,
+            on_error,
+            self._impl.response_buffering(self._method),
         )
         call._invoke(request, ignore_errors)  # pylint: disable=protected-access
         return call
@@ -155,7 +163,7 @@ class _MethodClient:
         """
 
         def send(
-            self, _rpc_request_proto: Message | None = None, **request_fields
+            self, _rpc_request_proto: Payload | None = None, **request_fields
         ) -> None:
             ClientStreamingCall.send(self, _rpc_request_proto, **request_fields)
 
@@ -334,7 +342,7 @@ class _ClientStreamingMethodClient(_MethodClient):
 
     def __call__(
         self,
-        requests: Iterable[Message] = (),
+        requests: Iterable[Payload] = (),
         *,
         timeout_s: OptionalTimeout = UseDefault.VALUE,
     ) -> UnaryResponse:
@@ -383,7 +391,7 @@ class _BidirectionalStreamingMethodClient(_MethodClient):
 
     def __call__(
         self,
-        requests: Iterable[Message] = (),
+        requests: Iterable[Payload] = (),
         *,
         timeout_s: OptionalTimeout = UseDefault.VALUE,
     ) -> StreamResponse:
@@ -405,6 +413,10 @@ class Impl(client.ClientImpl):
     Args:
         on_call_hook: A callable object to handle RPC method calls.
             If hook is set, it will be called before RPC execution.
+        response_buffering: How server and bidirectional streaming calls
+            buffer responses by default. Keeps all responses if not set.
+        method_response_buffering: Buffering policies for particular methods,
+            by full method name (package.Service.Method).
     """
 
     def __init__(
@@ -413,11 +425,20 @@ class Impl(client.ClientImpl):
         default_stream_timeout_s: float | None = None,
         on_call_hook: Callable[[CallInfo], Any] | None = None,
         cancel_duplicate_calls: bool | None = True,
+        response_buffering: ResponseBuffering = ResponseBuffering.keep_all(),
+        method_response_buffering: (
+            Mapping[str, ResponseBuffering] | None
+        ) = None,
     ) -> None:
         super().__init__()
         self._default_unary_timeout_s = default_unary_timeout_s
         self._default_stream_timeout_s = default_stream_timeout_s
         self.on_call_hook = on_call_hook
+        self.default_response_buffering = response_buffering
+        self.method_response_buffering: dict[str, ResponseBuffering] = {
+            name.replace('/', '.'): buffering
+            for name, buffering in (method_response_buffering or {}).items()
+        }
         # Temporary workaround for clients that rely on mulitple in-flight
         # instances of an RPC on the same channel, which is not supported.
         # TODO(hepler): Remove this option when clients have updated.
@@ -431,6 +452,19 @@ class Impl(client.ClientImpl):
     def default_stream_timeout_s(self) -> float | None:
         return self._default_stream_timeout_s
 
+    def response_buffering(self, method: Method) -> ResponseBuffering:
+        """Returns how calls to the method buffer their responses.
+
+        The policy only applies to methods with a server stream. Unary and
+        client streaming calls always keep their response.
+        """
+        if not method.server_streaming:
+            return ResponseBuffering.keep_all()
+
+        return self.method_response_buffering.get(
+            method.full_name, self.default_response_buffering
+        )
+
     def method_client(self, channel: Channel, method: Method) -> _MethodClient:
         """Returns an object that invokes a method using the given chanel."""
 
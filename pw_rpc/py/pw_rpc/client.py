@@ -78,11 +78,18 @@ class _PendingRpcMetadata:
         self.context = context
 
 
+def _ids(rpc: packets.RpcIds) -> tuple[int, int, int, int]:
+    return rpc.channel_id, rpc.service_id, rpc.method_id, rpc.call_id
+
+
 class PendingRpcs:
     """Tracks pending RPCs and encodes outgoing RPC packets."""
 
     def __init__(self) -> None:
         self._pending: dict[PendingRpc, _PendingRpcMetadata] = {}
+        # Pending RPCs by their IDs, so incoming packets can be dispatched
+        # without constructing a PendingRpc for each one.
+        self._by_ids: dict[tuple[int, int, int, int], PendingRpc] = {}
         # We skip call_id = 0 in order to avoid LEGACY_OPEN_CALL_ID.
         self._next_call_id: int = 1
 
@@ -97,7 +104,7 @@ class PendingRpcs:
     def request(
         self,
         rpc: PendingRpc,
-        request: Message | None,
+        request: packets.Payload | None,
         context: object,
         override_pending: bool = True,
     ) -> bytes:
@@ -109,7 +116,7 @@ class PendingRpcs:
     def send_request(
         self,
         rpc: PendingRpc,
-        request: Message | None,
+        request: packets.Payload | None,
         context: object,
         *,
         ignore_errors: bool = False,
@@ -117,6 +124,8 @@ class PendingRpcs:
     ) -> Any:
         """Starts the provided RPC and sends the request packet to the channel.
 
+        The request may be a message or an already-encoded payload.
+
         Returns:
           the previous context object or None
         """
@@ -153,6 +162,7 @@ class PendingRpcs:
         if override_pending:
             previous = self._pending.get(rpc)
             self._pending[rpc] = metadata
+            self._by_ids[_ids(rpc)] = rpc
             return None if previous is None else previous.context
 
         if self._pending.setdefault(rpc, metadata) is not metadata:
@@ -162,9 +172,23 @@ class PendingRpcs:
                 'Cancel the RPC before invoking it again'
             )
 
+        self._by_ids[_ids(rpc)] = rpc
         return None
 
-    def send_client_stream(self, rpc: PendingRpc, message: Message) -> None:
+    def find(
+        self, channel_id: int, service_id: int, method_id: int, call_id: int
+    ) -> PendingRpc | None:
+        """Returns the pending RPC with exactly these IDs, if there is one."""
+        return self._by_ids.get((channel_id, service_id, method_id, call_id))
+
+    def send_client_stream(
+        self, rpc: PendingRpc, message: packets.Payload
+    ) -> None:
+        """Sends a message or an already-encoded payload in the client stream.
+
+        Encoded payloads (bytes, bytearray, or memoryview) are copied directly
+        into the packet, which avoids serializing large messages twice.
+        """
         if rpc not in self._pending:
             raise Error(f'Attempt to send client stream for inactive RPC {rpc}')
 
@@ -193,6 +217,7 @@ class PendingRpcs:
         """
         _LOG.debug('Cancelling %s', rpc)
         del self._pending[rpc]
+        del self._by_ids[_ids(rpc)]
 
         return packets.encode_cancel(rpc)
 
@@ -225,7 +250,9 @@ class PendingRpcs:
             return self._pending[rpc].context
 
         _LOG.debug('%s finished with status %s', rpc, status)
-        return self._pending.pop(rpc).context
+        context = self._pending.pop(rpc).context
+        del self._by_ids[_ids(rpc)]
+        return context
 
 
 class ClientImpl(abc.ABC):
@@ -262,6 +289,40 @@ class ClientImpl(abc.ABC):
           args, kwargs: Arbitrary arguments passed to the ClientImpl
         """
 
+    def handle_encoded_response(
+        self,
+        rpc: PendingRpc,
+        context: Any,
+        payload: bytes,
+        *,
+        args: tuple = (),
+        kwargs: dict | None = None,
+    ) -> Any:
+        """Handles a response from the RPC server before it is decoded.
+
+        The Client defers decoding response payloads to this method.
+        Implementations that only count or forward responses may override it
+        to avoid decoding payloads that are never used. By default, the payload
+        is decoded and passed to handle_response.
+
+        Args:
+          rpc: Information about the pending RPC
+          context: Arbitrary context object associated with the pending RPC
+          payload: The serialized response protobuf
+          args, kwargs: Arbitrary arguments passed to the ClientImpl
+
+        Raises:
+          DecodeError: The payload could not be decoded. The Client terminates
+              the RPC with DATA_LOSS.
+        """
+        return self.handle_response(
+            rpc,
+            context,
+            rpc.method.response_type.FromString(payload),
+            args=args,
+            kwargs=kwargs,
+        )
+
     @abc.abstractmethod
     def handle_completion(
         self,
@@ -361,15 +422,14 @@ def _decode_status(rpc: PendingRpc, packet) -> Status | None:
         return Status.UNKNOWN
 
 
-def _decode_payload(rpc: PendingRpc, packet) -> Message | None:
+def _has_payload(rpc: PendingRpc, packet) -> bool:
     if packet.type == PacketType.SERVER_ERROR:
-        return None
+        return False
 
     # Server streaming RPCs do not send a payload with their RESPONSE packet.
-    if packet.type == PacketType.RESPONSE and rpc.method.server_streaming:
-        return None
-
-    return packets.decode_payload(packet, rpc.method.response_type)
+    return not (
+        packet.type == PacketType.RESPONSE and rpc.method.server_streaming
+    )
 
 
 @dataclass(frozen=True, eq=False)
@@ -493,6 +553,13 @@ class Client:
             for channel in channels
         }
 
+        # Methods by service and method ID, for resolving incoming packets.
+        self._methods_by_id: dict[tuple[int, int], Method] = {
+            (service.id, method.id): method
+            for service in self.services
+            for method in service.methods
+        }
+
         # Optional function called before processing every non-error RPC packet.
         self.response_callback: (
             Callable[[PendingRpc, Any, Status | None], Any] | None
@@ -555,18 +622,33 @@ class Client:
         if packets.for_server(packet):
             return Status.INVALID_ARGUMENT
 
-        try:
-            channel_client = self._channels_by_id[packet.channel_id]
-        except KeyError:
-            _LOG.warning('Unrecognized channel ID %d', packet.channel_id)
-            return Status.NOT_FOUND
+        # Protobuf is sometimes silly so the 32 bit python bindings return
+        # signed values from `fixed32` fields. Let's convert back to unsigned.
+        # b/239712573
+        service_id = packet.service_id & 0xFFFFFFFF
+        method_id = packet.method_id & 0xFFFFFFFF
 
-        try:
-            rpc = self._look_up_service_and_method(packet, channel_client)
-        except ValueError as err:
-            _send_client_error(channel_client, packet, Status.NOT_FOUND)
-            _LOG.warning('%s', err)
-            return Status.OK
+        # Responses to pending calls resolve directly to the pending RPC.
+        assert self._impl.rpcs
+        rpc = self._impl.rpcs.find(
+            packet.channel_id, service_id, method_id, packet.call_id
+        )
+
+        if rpc is None:
+            try:
+                channel = self._channels_by_id[packet.channel_id].channel
+            except KeyError:
+                _LOG.warning('Unrecognized channel ID %d', packet.channel_id)
+                return Status.NOT_FOUND
+
+            try:
+                rpc = self._look_up_service_and_method(
+                    channel, service_id, method_id, packet.call_id
+                )
+            except ValueError as err:
+                _send_client_error(channel, packet, Status.NOT_FOUND)
+                _LOG.warning('%s', err)
+                return Status.OK
 
         _update_for_backwards_compatibility(rpc, packet)
 
@@ -580,36 +662,34 @@ class Client:
             return Status.OK
 
         status = _decode_status(rpc, packet)
+        has_payload = _has_payload(rpc, packet)
+        payload: Message | None = None
 
-        try:
-            payload = _decode_payload(rpc, packet)
-        except DecodeError as err:
-            _send_client_error(channel_client, packet, Status.DATA_LOSS)
-            _LOG.warning(
-                'Failed to decode %s response for %s: %s',
-                rpc.method.response_type.DESCRIPTOR.full_name,
-                rpc.method.full_name,
-                err,
-            )
-            _LOG.debug('Raw payload: %s', packet.payload)
-
-            # Make this an error packet so the error handler is called.
-            packet.type = PacketType.SERVER_ERROR
-            status = Status.DATA_LOSS
-
-        # If set, call the response callback with non-error packets.
+        # If set, call the response callback with non-error packets. Otherwise,
+        # payloads are not decoded until the ClientImpl handles them.
         if self.response_callback and packet.type != PacketType.SERVER_ERROR:
-            self.response_callback(  # pylint: disable=not-callable
-                rpc, payload, status
-            )
+            if has_payload:
+                try:
+                    payload = packets.decode_payload(
+                        packet, rpc.method.response_type
+                    )
+                except DecodeError as err:
+                    self._handle_decode_error(rpc, packet, err)
+
+                    # Make this an error packet so the error handler is called.
+                    packet.type = PacketType.SERVER_ERROR
+                    status = Status.DATA_LOSS
+                    has_payload = False
+
+            if packet.type != PacketType.SERVER_ERROR:
+                self.response_callback(  # pylint: disable=not-callable
+                    rpc, payload, status
+                )
 
         try:
-            assert self._impl.rpcs
             context = self._impl.rpcs.get_pending(rpc, status)
         except KeyError:
-            _send_client_error(
-                channel_client, packet, Status.FAILED_PRECONDITION
-            )
+            _send_client_error(rpc.channel, packet, Status.FAILED_PRECONDITION)
             _LOG.debug('Discarding response for %s, which is not pending', rpc)
             return Status.OK
 
@@ -621,10 +701,41 @@ class Client:
             )
             return Status.OK
 
-        if payload is not None:
-            self._impl.handle_response(
-                rpc, context, payload, args=impl_args, kwargs=impl_kwargs
-            )
+        if has_payload:
+            try:
+                if payload is None:
+                    self._impl.handle_encoded_response(
+                        rpc,
+                        context,
+                        packet.payload,
+                        args=impl_args,
+                        kwargs=impl_kwargs,
+                    )
+                else:
+                    self._impl.handle_response(
+                        rpc,
+                        context,
+                        payload,
+                        args=impl_args,
+                        kwargs=impl_kwargs,
+                    )
+            except DecodeError as err:
+                self._handle_decode_error(rpc, packet, err)
+
+                # The RPC is still pending if this was a stream packet.
+                if status is None:
+                    self._impl.rpcs.get_pending(rpc, Status.DATA_LOSS)
+
+                _LOG.warning('%s: invocation failed with DATA_LOSS', rpc)
+                self._impl.handle_error(
+                    rpc,
+                    context,
+                    Status.DATA_LOSS,
+                    args=impl_args,
+                    kwargs=impl_kwargs,
+                )
+                return Status.OK
+
         if status is not None:
             self._impl.handle_completion(
                 rpc, context, status, args=impl_args, kwargs=impl_kwargs
@@ -633,29 +744,33 @@ class Client:
         return Status.OK
 
     def _look_up_service_and_method(
-        self, packet: RpcPacket, channel_client: ChannelClient
+        self, channel: Channel, service_id: int, method_id: int, call_id: int
     ) -> PendingRpc:
-        # Protobuf is sometimes silly so the 32 bit python bindings return
-        # signed values from `fixed32` fields. Let's convert back to unsigned.
-        # b/239712573
-        service_id = packet.service_id & 0xFFFFFFFF
         try:
-            service = self.services[service_id]
+            method = self._methods_by_id[service_id, method_id]
         except KeyError:
-            raise ValueError(f'Unrecognized service ID {service_id}')
+            if service_id not in self.services:
+                raise ValueError(f'Unrecognized service ID {service_id}')
 
-        # See above, also for b/239712573
-        method_id = packet.method_id & 0xFFFFFFFF
-        try:
-            method = service.methods[method_id]
-        except KeyError:
             raise ValueError(
-                f'No method ID {method_id} in service {service.name}'
+                f'No method ID {method_id} in service '
+                f'{self.services[service_id].name}'
             )
 
-        return PendingRpc(
-            channel_client.channel, service, method, packet.call_id
+        return PendingRpc(channel, method.service, method, call_id)
+
+    @staticmethod
+    def _handle_decode_error(
+        rpc: PendingRpc, packet: RpcPacket, err: DecodeError
+    ) -> None:
+        _send_client_error(rpc.channel, packet, Status.DATA_LOSS)
+        _LOG.warning(
+            'Failed to decode %s response for %s: %s',
+            rpc.method.response_type.DESCRIPTOR.full_name,
+            rpc.method.full_name,
+            err,
         )
+        _LOG.debug('Raw payload: %s', packet.payload)
 
     def __repr__(self) -> str:
         return (
@@ -665,10 +780,10 @@ class Client:
 
 
 def _send_client_error(
-    client: ChannelClient, packet: RpcPacket, error: Status
+    channel: Channel, packet: RpcPacket, error: Status
 ) -> None:
     # Never send responses to SERVER_ERRORs.
     if packet.type != PacketType.SERVER_ERROR:
-        client.channel.output(  # type: ignore
+        channel.output(  # type: ignore
             packets.encode_client_error(packet, error)
         )
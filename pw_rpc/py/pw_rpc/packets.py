@@ -14,6 +14,9 @@
 """Functions for working with pw_rpc packets."""
 
 import dataclasses
+import functools
+import struct
+from typing import Union
 
 from google.protobuf import message
 from pw_status import Status
@@ -43,39 +46,99 @@ class RpcIds:
     call_id: int
 
 
-def encode_request(rpc: RpcIds, request: message.Message | None) -> bytes:
-    payload = request.SerializeToString() if request is not None else bytes()
+# Payloads may be provided as messages or as already-encoded bytes. Encoded
+# payloads are copied once into the packet instead of being re-serialized.
+Payload = Union[message.Message, bytes, bytearray, memoryview]
 
-    return packet_pb2.RpcPacket(
-        type=packet_pb2.PacketType.REQUEST,
-        channel_id=rpc.channel_id,
-        service_id=rpc.service_id,
-        method_id=rpc.method_id,
-        call_id=rpc.call_id,
-        payload=payload,
-    ).SerializeToString()
+ENCODED_PAYLOAD_TYPES = (bytes, bytearray, memoryview)
 
+# Tags for the RpcPacket fields, which are encoded in field number order to
+# match the output of RpcPacket.SerializeToString().
+_TYPE_TAG = b'\x08'  # 1, varint
+_CHANNEL_ID_TAG = b'\x10'  # 2, varint
+_SERVICE_ID_TAG = b'\x1d'  # 3, fixed32
+_METHOD_ID_TAG = b'\x25'  # 4, fixed32
+_PAYLOAD_TAG = b'\x2a'  # 5, length delimited
+_STATUS_TAG = b'\x30'  # 6, varint
+_CALL_ID_TAG = b'\x38'  # 7, varint
 
-def encode_response(rpc: RpcIds, response: message.Message) -> bytes:
-    return packet_pb2.RpcPacket(
-        type=packet_pb2.PacketType.RESPONSE,
-        channel_id=rpc.channel_id,
-        service_id=rpc.service_id,
-        method_id=rpc.method_id,
-        call_id=rpc.call_id,
-        payload=response.SerializeToString(),
-    ).SerializeToString()
+_FIXED32 = struct.Struct('<I')
 
 
-def encode_client_stream(rpc: RpcIds, request: message.Message) -> bytes:
-    return packet_pb2.RpcPacket(
-        type=packet_pb2.PacketType.CLIENT_STREAM,
-        channel_id=rpc.channel_id,
-        service_id=rpc.service_id,
-        method_id=rpc.method_id,
-        call_id=rpc.call_id,
-        payload=request.SerializeToString(),
-    ).SerializeToString()
+def _varint(value: int) -> bytes:
+    if value < 0x80:
+        return bytes((value,))
+
+    encoded = bytearray()
+    while value >= 0x80:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+
+    encoded.append(value)
+    return bytes(encoded)
+
+
+@functools.lru_cache(maxsize=256)
+def _header(
+    packet_type: int, channel_id: int, service_id: int, method_id: int
+) -> bytes:
+    """Encodes the fields that precede the payload, which rarely change."""
+    header = bytearray()
+    if packet_type:
+        header += _TYPE_TAG + _varint(packet_type)
+    if channel_id:
+        header += _CHANNEL_ID_TAG + _varint(channel_id)
+    if service_id:
+        header += _SERVICE_ID_TAG + _FIXED32.pack(service_id)
+    if method_id:
+        header += _METHOD_ID_TAG + _FIXED32.pack(method_id)
+    return bytes(header)
+
+
+def encode(
+    packet_type: int,
+    rpc: RpcIds,
+    payload: Payload | None = None,
+    status: int = 0,
+) -> bytes:
+    """Encodes an RpcPacket without building an RpcPacket message.
+
+    The header fields are written directly and the payload is copied into the
+    packet only once. Payloads may be messages, which are serialized, or
+    already-encoded bytes, bytearrays, or memoryviews. Zero-valued fields are
+    omitted, so the result is identical to RpcPacket.SerializeToString().
+    """
+    parts: list[bytes | bytearray | memoryview] = [
+        _header(packet_type, rpc.channel_id, rpc.service_id, rpc.method_id)
+    ]
+
+    if isinstance(payload, message.Message):
+        payload = payload.SerializeToString()
+
+    if payload:
+        size = (
+            payload.nbytes if isinstance(payload, memoryview) else len(payload)
+        )
+        parts += (_PAYLOAD_TAG, _varint(size), payload)
+
+    if status:
+        parts += (_STATUS_TAG, _varint(status))
+    if rpc.call_id:
+        parts += (_CALL_ID_TAG, _varint(rpc.call_id))
+
+    return b''.join(parts)
+
+
+def encode_request(rpc: RpcIds, request: Payload | None) -> bytes:
+    return encode(packet_pb2.PacketType.REQUEST, rpc, request)
+
+
+def encode_response(rpc: RpcIds, response: Payload) -> bytes:
+    return encode(packet_pb2.PacketType.RESPONSE, rpc, response)
+
+
+def encode_client_stream(rpc: RpcIds, request: Payload) -> bytes:
+    return encode(packet_pb2.PacketType.CLIENT_STREAM, rpc, request)
 
 
 def encode_client_error(packet: packet_pb2.RpcPacket, status: Status) -> bytes:
@@ -90,24 +153,15 @@ def encode_client_error(packet: packet_pb2.RpcPacket, status: Status) -> bytes:
 
 
 def encode_cancel(rpc: RpcIds) -> bytes:
-    return packet_pb2.RpcPacket(
-        type=packet_pb2.PacketType.CLIENT_ERROR,
+    return encode(
+        packet_pb2.PacketType.CLIENT_ERROR,
+        rpc,
         status=Status.CANCELLED.value,
-        channel_id=rpc.channel_id,
-        service_id=rpc.service_id,
-        method_id=rpc.method_id,
-        call_id=rpc.call_id,
-    ).SerializeToString()
+    )
 
 
 def encode_client_stream_end(rpc: RpcIds) -> bytes:
-    return packet_pb2.RpcPacket(
-        type=packet_pb2.PacketType.CLIENT_REQUEST_COMPLETION,
-        channel_id=rpc.channel_id,
-        service_id=rpc.service_id,
-        method_id=rpc.method_id,
-        call_id=rpc.call_id,
-    ).SerializeToString()
+    return encode(packet_pb2.PacketType.CLIENT_REQUEST_COMPLETION, rpc)
 
 
 def for_server(packet: packet_pb2.RpcPacket) -> bool:
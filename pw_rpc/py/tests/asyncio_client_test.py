@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""Tests using the asyncio client for pw_rpc."""
+
+import asyncio
+import threading
+import unittest
+
+from pw_protobuf_compiler import python_protos
+from pw_status import Status
+
+from pw_rpc import asyncio_client, callback_client, client, packets
+from pw_rpc.internal import packet_pb2
+
+TEST_PROTO = """\
+syntax = "proto3";
+
+package pw.asyncio_test;
+
+message SomeMessage {
+  uint32 magic_number = 1;
+}
+
+message AnotherMessage {
+  string payload = 1;
+}
+
+service PublicService {
+  rpc SomeUnary(SomeMessage) returns (AnotherMessage) {}
+  rpc SomeServerStreaming(SomeMessage) returns (stream AnotherMessage) {}
+  rpc SomeClientStreaming(stream SomeMessage) returns (AnotherMessage) {}
+  rpc SomeBidiStreaming(stream SomeMessage) returns (stream AnotherMessage) {}
+}
+"""
+
+CHANNEL_IDS = tuple(range(1, 11))
+
+
+def _packet(
+    packet_type: packet_pb2.PacketType.ValueType,
+    request: packet_pb2.RpcPacket,
+    payload: bytes = b'',
+    status: Status = Status.OK,
+) -> bytes:
+    return packet_pb2.RpcPacket(
+        type=packet_type,
+        channel_id=request.channel_id,
+        service_id=request.service_id,
+        method_id=request.method_id,
+        call_id=request.call_id,
+        payload=payload,
+        status=status.value,
+    ).SerializeToString()
+
+
+class AsyncioClientTest(unittest.IsolatedAsyncioTestCase):
+    """Tests the asyncio client with packets processed by the test."""
+
+    def setUp(self) -> None:
+        self._protos = python_protos.Library.from_strings(TEST_PROTO)
+        self._response = self._protos.packages.pw.asyncio_test.AnotherMessage
+        self.requests: list[packet_pb2.RpcPacket] = []
+
+        self._impl = asyncio_client.Impl(max_queued_responses=2)
+        self._client = client.Client.from_modules(
+            self._impl,
+            [
+                client.Channel(channel_id, self._handle_packet)
+                for channel_id in CHANNEL_IDS
+            ],
+            self._protos.modules(),
+        )
+        self._service = self._client.channel().rpcs[
+            'pw.asyncio_test.PublicService'
+        ]
+
+    def _handle_packet(self, data: bytes) -> None:
+        self.requests.append(packets.decode(data))
+
+    def _request(self, packet_type: packet_pb2.PacketType.ValueType):
+        return next(p for p in self.requests if p.type == packet_type)
+
+    def _respond_later(self, payload: str, status: Status = Status.OK) -> None:
+        """Responds to the most recent request once the test awaits."""
+
+        def respond() -> None:
+            self._client.process_packet(
+                _packet(
+                    packet_pb2.PacketType.RESPONSE,
+                    self.requests[-1],
+                    self._response(payload=payload).SerializeToString(),
+                    status,
+                )
+            )
+
+        asyncio.get_running_loop().call_soon(respond)
+
+    def _stream(self, request, *payloads: str) -> None:
+        for payload in payloads:
+            self._client.process_packet(
+                _packet(
+                    packet_pb2.PacketType.SERVER_STREAM,
+                    request,
+                    self._response(payload=payload).SerializeToString(),
+                )
+            )
+
+    async def test_unary_awaits_response(self) -> None:
+        self._respond_later('hello', Status.ABORTED)
+
+        status, response = await self._service.SomeUnary(magic_number=6)
+
+        self.assertIs(status, Status.ABORTED)
+        self.assertEqual(response, self._response(payload='hello'))
+        self.assertEqual(self.requests[0].type, packet_pb2.PacketType.REQUEST)
+
+    async def test_unary_server_error_raises(self) -> None:
+        call = self._service.SomeUnary.invoke()
+        self._client.process_packet(
+            _packet(
+                packet_pb2.PacketType.SERVER_ERROR,
+                self.requests[-1],
+                status=Status.NOT_FOUND,
+            )
+        )
+
+        with self.assertRaises(callback_client.RpcError) as context:
+            await call
+
+        self.assertIs(context.exception.status, Status.NOT_FOUND)
+
+    async def test_unary_timeout_cancels_call(self) -> None:
+        with self.assertRaises(callback_client.RpcTimeout):
+            await self._service.SomeUnary(pw_rpc_timeout_s=0.001)
+
+        self.assertEqual(
+            self.requests[-1].type, packet_pb2.PacketType.CLIENT_ERROR
+        )
+        self.assertEqual(self.requests[-1].status, Status.CANCELLED.value)
+
+    async def test_concurrent_unary_calls_across_channels(self) -> None:
+        calls = [
+            self._client.channel(channel_id).rpcs.pw.asyncio_test.PublicService
+            for channel_id in CHANNEL_IDS
+        ]
+        results = asyncio.gather(
+            *(service.SomeUnary(magic_number=1) for service in calls)
+        )
+        await asyncio.sleep(0)  # Let the calls send their requests.
+
+        # Respond in reverse order.
+        for request in reversed(self.requests):
+            self._client.process_packet(
+                _packet(
+                    packet_pb2.PacketType.RESPONSE,
+                    request,
+                    self._response(
+                        payload=str(request.channel_id)
+                    ).SerializeToString(),
+                )
+            )
+
+        self.assertEqual(
+            [response.payload for _, response in await results],
+            [str(channel_id) for channel_id in CHANNEL_IDS],
+        )
+
+    async def test_server_stream_async_iteration(self) -> None:
+        call = self._service.SomeServerStreaming(magic_number=3)
+        request = self.requests[-1]
+
+        self._stream(request, 'a', 'b')
+        self._client.process_packet(
+            _packet(packet_pb2.PacketType.RESPONSE, request)
+        )
+
+        self.assertEqual(
+            [response.payload async for response in call], ['a', 'b']
+        )
+        self.assertIs(call.status, Status.OK)
+
+    async def test_server_stream_error_raises_from_iteration(self) -> None:
+        call = self._service.SomeServerStreaming()
+        request = self.requests[-1]
+
+        self._stream(request, 'a')
+        self._client.process_packet(
+            _packet(
+                packet_pb2.PacketType.SERVER_ERROR,
+                request,
+                status=Status.UNAVAILABLE,
+            )
+        )
+
+        responses = []
+        with self.assertRaises(callback_client.RpcError):
+            async for response in call:
+                responses.append(response.payload)
+
+        self.assertEqual(responses, ['a'])
+
+    async def test_drain_waits_for_full_queues(self) -> None:
+        call = self._service.SomeServerStreaming()
+        self._stream(self.requests[-1], '1', '2', '3', '4')
+        self.assertEqual(call.queued_responses(), 4)
+
+        drain = asyncio.ensure_future(self._impl.drain())
+        await asyncio.sleep(0)
+        self.assertFalse(drain.done())
+
+        self.assertEqual((await anext(call)).payload, '1')
+        await asyncio.sleep(0)
+        self.assertFalse(drain.done())
+
+        self.assertEqual((await anext(call)).payload, '2')
+        await asyncio.wait_for(drain, 1)
+
+        # Responses are not dropped below max_buffered_responses.
+        self.assertEqual(call.queued_responses(), 2)
+        self.assertEqual(call.dropped_responses, 0)
+
+    async def test_drain_returns_when_call_completes(self) -> None:
+        call = self._service.SomeServerStreaming()
+        self._stream(self.requests[-1], '1', '2', '3')
+
+        drain = asyncio.ensure_future(self._impl.drain())
+        await asyncio.sleep(0)
+        self.assertFalse(drain.done())
+
+        call.cancel()
+        await asyncio.wait_for(drain, 1)
+
+    async def test_queue_is_bounded_if_drain_is_not_awaited(self) -> None:
+        self._impl.max_buffered_responses = 4
+        call = self._service.SomeServerStreaming()
+
+        # The reader never consumes and the packets are processed without
+        # awaiting drain(), so only the newest responses are kept.
+        with self.assertLogs('pw_rpc', 'WARNING'):
+            self._stream(self.requests[-1], *'abcdefghij')
+
+        self.assertEqual(call.queued_responses(), 4)
+        self.assertEqual(call.dropped_responses, 6)
+
+        self._client.process_packet(
+            _packet(packet_pb2.PacketType.RESPONSE, self.requests[-1])
+        )
+        responses = [response.payload async for response in call]
+        self.assertEqual(responses, ['g', 'h', 'i', 'j'])
+
+    def test_buffered_responses_must_exceed_queued(self) -> None:
+        with self.assertRaises(ValueError):
+            asyncio_client.Impl(
+                max_queued_responses=4, max_buffered_responses=4
+            )
+
+    async def test_packets_processed_from_another_thread(self) -> None:
+        call = self._service.SomeServerStreaming()
+        request = self.requests[-1]
+
+        def process() -> None:
+            self._stream(request, 'x', 'y')
+            self._client.process_packet(
+                _packet(packet_pb2.PacketType.RESPONSE, request)
+            )
+
+        thread = threading.Thread(target=process)
+        thread.start()
+
+        responses = [response.payload async for response in call]
+        thread.join()
+
+        self.assertEqual(responses, ['x', 'y'])
+        self.assertIs(call.status, Status.OK)
+
+    async def test_bidi_stream_finish_returns_unread_responses(self) -> None:
+        async with self._service.SomeBidiStreaming.invoke() as call:
+            call.send(magic_number=1)
+            request = self._request(packet_pb2.PacketType.CLIENT_STREAM)
+
+            self._stream(request, 'a', 'b', 'c')
+            self.assertEqual((await anext(call)).payload, 'a')
+
+            self._respond_later('')
+            status, responses = await call.finish_and_wait()
+
+        self.assertIs(status, Status.OK)
+        self.assertEqual([r.payload for r in responses], ['b', 'c'])
+        self.assertEqual(
+            self.requests[-1].type,
+            packet_pb2.PacketType.CLIENT_REQUEST_COMPLETION,
+        )
+
+    async def test_client_stream(self) -> None:
+        call = self._service.SomeClientStreaming.invoke()
+        call.send(magic_number=1)
+        call.send(magic_number=2)
+
+        self._respond_later('done')
+        status, response = await call.finish_and_wait()
+
+        self.assertIs(status, Status.OK)
+        self.assertEqual(response.payload, 'done')
+        self.assertEqual(
+            [r.type for r in self.requests],
+            [
+                packet_pb2.PacketType.REQUEST,
+                packet_pb2.PacketType.CLIENT_STREAM,
+                packet_pb2.PacketType.CLIENT_STREAM,
+                packet_pb2.PacketType.CLIENT_REQUEST_COMPLETION,
+            ],
+        )
+
+    async def test_cancel(self) -> None:
+        call = self._service.SomeServerStreaming()
+
+        self.assertTrue(call.cancel())
+        self.assertFalse(call.cancel())
+        self.assertEqual(self.requests[-1].status, Status.CANCELLED.value)
+
+        with self.assertRaises(callback_client.RpcError) as context:
+            await anext(call)
+
+        self.assertIs(context.exception.status, Status.CANCELLED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""Tests the pw_rpc client benchmark."""
+
+import importlib.util
+import unittest
+
+from pw_rpc import benchmark
+from pw_rpc.benchmark import LossProfile, Workload
+
+_HDLC_AVAILABLE = importlib.util.find_spec('pw_hdlc') is not None
+
+
+class BenchmarkTest(unittest.TestCase):
+    """Runs each benchmark workload briefly."""
+
+    def test_unary(self) -> None:
+        result = benchmark.run(Workload.UNARY, calls=20)
+
+        self.assertEqual(result.workload, 'unary')
+        self.assertEqual(result.completed_calls, 20)
+        self.assertEqual(result.packets, 20)
+        self.assertGreater(result.packets_per_s, 0)
+        self.assertLessEqual(result.latency_p50_us, result.latency_p99_us)
+
+    def test_allocated_blocks_exclude_harness(self) -> None:
+        result = benchmark.run(Workload.UNARY, calls=200)
+
+        # Completed calls are released; the latency samples are not counted.
+        self.assertLess(result.allocated_blocks_per_packet, 0.5)
+
+    def test_server_stream(self) -> None:
+        result = benchmark.run(Workload.SERVER_STREAM, calls=5, stream_length=3)
+
+        self.assertEqual(result.completed_calls, 5)
+        self.assertEqual(result.packets, 5 * 4)
+
+    def test_bidi(self) -> None:
+        result = benchmark.run(Workload.BIDI, calls=5, stream_length=3)
+
+        self.assertEqual(result.completed_calls, 5)
+        self.assertEqual(result.packets, 5 * 4)
+
+    def test_lossy_calls_do_not_all_complete(self) -> None:
+        result = benchmark.run(
+            Workload.UNARY,
+            calls=50,
+            loss=LossProfile(dropped_probability=0.5),
+            seed=1,
+        )
+
+        self.assertLess(result.completed_calls, result.calls)
+        self.assertGreater(result.completed_calls, 0)
+
+    @unittest.skipUnless(_HDLC_AVAILABLE, 'pw_hdlc is not installed')
+    def test_hdlc(self) -> None:
+        results = benchmark.run_all(calls=5, stream_length=2, hdlc=True)
+
+        self.assertEqual(
+            [r.workload for r in results], ['unary', 'server_stream', 'bidi']
+        )
+        self.assertTrue(all(r.hdlc for r in results))
+        self.assertTrue(all(r.completed_calls == 5 for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
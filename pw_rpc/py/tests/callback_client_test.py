@@ -14,6 +14,8 @@
 # the License.
 """Tests using the callback client for pw_rpc."""
 
+import threading
+import time
 import unittest
 from unittest import mock
 from typing import Any
@@ -66,8 +68,9 @@ class _CallbackClientImplTestBase(unittest.TestCase):
         self._protos = python_protos.Library.from_strings(TEST_PROTO_1)
         self._request = self._protos.packages.pw.test1.SomeMessage
 
+        self._impl = callback_client.Impl()
         self._client = client.Client.from_modules(
-            callback_client.Impl(),
+            self._impl,
             [client.Channel(CLIENT_CHANNEL_ID, self._handle_packet)],
             self._protos.modules(),
         )
@@ -812,6 +815,28 @@ class ClientStreamingTest(_CallbackClientImplTestBase):
 
         self.assertIs(context.exception.status, Status.NOT_FOUND)
 
+    def test_send_encoded_payloads(self) -> None:
+        stream = self._service.SomeClientStreaming.invoke()
+        encoded = self.method.request_type(magic_number=5).SerializeToString()
+
+        stream.send(encoded)
+        self.assertEqual(self.last_request().payload, encoded)
+
+        stream.send(memoryview(encoded))
+        self.assertEqual(self.last_request().payload, encoded)
+
+        self.send_responses_after_packets = 2
+        self._enqueue_response(CLIENT_CHANNEL_ID, self.method)
+        stream.finish_and_wait([bytearray(encoded)])
+
+        self.assertEqual(self.requests[-2].payload, encoded)
+
+    def test_send_encoded_payload_and_fields_raises(self) -> None:
+        stream = self._service.SomeClientStreaming.invoke()
+
+        with self.assertRaises(TypeError):
+            stream.send(b'\x08\x01', magic_number=1)
+
     def test_nonblocking_call(self) -> None:
         """Tests a successful client streaming RPC ended by the server."""
         payload_1 = self.method.response_type(payload='-_-')
@@ -1235,5 +1260,173 @@ class BidirectionalStreamingTest(_CallbackClientImplTestBase):
         )
 
 
+class ResponseBufferingTest(_CallbackClientImplTestBase):
+    """Tests response buffering policies for streaming calls."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.rpc = self._service.SomeServerStreaming
+        self.method = self.rpc.method
+        self.replies = [
+            self.method.response_type(payload=str(i)) for i in range(3)
+        ]
+
+    def _enqueue_replies(self) -> None:
+        for reply in self.replies:
+            self._enqueue_server_stream(CLIENT_CHANNEL_ID, self.method, reply)
+
+        self._enqueue_response(CLIENT_CHANNEL_ID, self.method, Status.OK)
+
+    def test_keep_all_by_default(self) -> None:
+        self._enqueue_replies()
+        call = self.rpc.invoke()
+
+        self.assertEqual(call.responses, self.replies)
+        self.assertEqual(list(call), self.replies)
+        self.assertEqual(
+            call.response_counters,
+            callback_client.ResponseCounters(received=3),
+        )
+
+    def test_keep_none(self) -> None:
+        self._impl.default_response_buffering = (
+            callback_client.ResponseBuffering.keep_none()
+        )
+        self._enqueue_replies()
+        on_next = mock.Mock()
+        call = self.rpc.invoke(on_next=on_next)
+
+        on_next.assert_has_calls([mock.call(call, r) for r in self.replies])
+        self.assertEqual(call.responses, [])
+        self.assertEqual(list(call), [])
+        self.assertEqual(
+            call.response_counters,
+            callback_client.ResponseCounters(received=3, dropped=3),
+        )
+
+    def test_keep_last(self) -> None:
+        self._impl.default_response_buffering = (
+            callback_client.ResponseBuffering.keep_last(2)
+        )
+        self._enqueue_replies()
+        call = self.rpc.invoke()
+
+        self.assertEqual(call.responses, self.replies[1:])
+        self.assertEqual(list(call), self.replies[1:])
+        self.assertEqual(call.response_counters.dropped, 1)
+
+    def test_bounded_queue_keeps_no_responses(self) -> None:
+        self._impl.default_response_buffering = (
+            callback_client.ResponseBuffering.bounded_queue(2)
+        )
+        self._enqueue_replies()
+        status, responses = self.rpc()
+
+        self.assertIs(status, Status.OK)
+        self.assertEqual(responses, [])
+
+    def test_bounded_queue_drops_oldest(self) -> None:
+        self._impl.default_response_buffering = (
+            callback_client.ResponseBuffering.bounded_queue(2)
+        )
+        self._enqueue_replies()
+        call = self.rpc.invoke()
+
+        self.assertEqual(list(call), self.replies[1:])
+        self.assertEqual(call.response_counters.dropped, 1)
+
+    def test_bounded_queue_blocks_until_read(self) -> None:
+        self._impl.default_response_buffering = (
+            callback_client.ResponseBuffering.bounded_queue(1, block=True)
+        )
+        call = self.rpc.invoke()
+
+        self._enqueue_replies()
+        packets_to_process = [packet for packet, _ in self._next_packets]
+        self._next_packets.clear()
+
+        def process() -> None:
+            for packet in packets_to_process:
+                self._client.process_packet(packet)
+
+        thread = threading.Thread(target=process)
+        thread.start()
+        responses = list(call.get_responses(timeout_s=5))
+        thread.join()
+
+        self.assertEqual(responses, self.replies)
+        self.assertIs(call.status, Status.OK)
+        self.assertEqual(call.response_counters.dropped, 0)
+
+    def test_cancel_releases_blocked_queue(self) -> None:
+        self._impl.default_response_buffering = (
+            callback_client.ResponseBuffering.bounded_queue(1, block=True)
+        )
+        call = self.rpc.invoke()
+
+        self._enqueue_replies()
+        packets_to_process = [packet for packet, _ in self._next_packets]
+        self._next_packets.clear()
+
+        def process() -> None:
+            for packet in packets_to_process:
+                self._client.process_packet(packet)
+
+        thread = threading.Thread(target=process)
+        thread.start()
+
+        deadline = time.monotonic() + 5
+        while not call.response_counters.blocked:
+            if time.monotonic() > deadline:
+                self.fail('Response queue never blocked')
+            thread.join(0.001)
+
+        call.cancel()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+    def test_method_policy_overrides_default(self) -> None:
+        self._impl.default_response_buffering = (
+            callback_client.ResponseBuffering.keep_none()
+        )
+        self._impl.method_response_buffering[
+            self.method.full_name
+        ] = callback_client.ResponseBuffering.keep_last(1)
+        self._enqueue_replies()
+
+        self.assertEqual(self.rpc.invoke().responses, self.replies[2:])
+
+    def test_method_policy_by_slash_name(self) -> None:
+        impl = callback_client.Impl(
+            method_response_buffering={
+                'pw.test1.PublicService/SomeServerStreaming': (
+                    callback_client.ResponseBuffering.keep_none()
+                )
+            }
+        )
+
+        self.assertEqual(
+            impl.response_buffering(self.method),
+            callback_client.ResponseBuffering.keep_none(),
+        )
+        self.assertEqual(
+            impl.response_buffering(self._service.SomeBidiStreaming.method),
+            callback_client.ResponseBuffering.keep_all(),
+        )
+
+    def test_unary_calls_always_keep_response(self) -> None:
+        self._impl.default_response_buffering = (
+            callback_client.ResponseBuffering.keep_none()
+        )
+        method = self._service.SomeUnary.method
+        reply = method.response_type(payload='hi')
+        self._enqueue_response(CLIENT_CHANNEL_ID, method, Status.OK, reply)
+
+        self.assertEqual(
+            self._service.SomeUnary(magic_number=1),
+            (Status.OK, reply),
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
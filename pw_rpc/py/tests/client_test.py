@@ -429,6 +429,106 @@ class ClientTest(unittest.TestCase):
             Status.OK,
         )
 
+    def test_pending_rpc_dispatched_by_ids(self) -> None:
+        method = self._client.method('pw.test1.PublicService.SomeUnary')
+        rpc = client.PendingRpc(
+            self._client.channel(CLIENT_FIRST_CHANNEL_ID).channel,
+            method.service,
+            method,
+            call_id=SOME_CALL_ID,
+        )
+        ids = (CLIENT_FIRST_CHANNEL_ID, method.service.id, method.id)
+
+        rpcs = client.PendingRpcs()
+        self.assertIsNone(rpcs.find(*ids, SOME_CALL_ID))
+
+        rpcs.open(rpc, 'context')
+        self.assertIs(rpcs.find(*ids, SOME_CALL_ID), rpc)
+        self.assertIsNone(rpcs.find(*ids, SOME_CALL_ID + 1))
+
+        self.assertEqual(rpcs.get_pending(rpc, Status.OK), 'context')
+        self.assertIsNone(rpcs.find(*ids, SOME_CALL_ID))
+
+    def test_process_packet_defers_payload_decoding_to_impl(self) -> None:
+        """Tests response payloads are passed to the Impl still encoded."""
+        payloads: list[bytes] = []
+
+        class ForwardingImpl(callback_client.Impl):
+            def handle_encoded_response(
+                self, rpc, context, payload, *, args=(), kwargs=None
+            ) -> None:
+                payloads.append(payload)
+
+        forwarding_client = client.Client.from_modules(
+            ForwardingImpl(),
+            [client.Channel(CLIENT_FIRST_CHANNEL_ID, self._save_packet)],
+            self._protos.modules(),
+        )
+        method = forwarding_client.method(
+            'pw.test1.PublicService.SomeServerStreaming'
+        )
+        rpc = client.PendingRpc(
+            forwarding_client.channel().channel,
+            method.service,
+            method,
+            call_id=SOME_CALL_ID,
+        )
+        rpcs = forwarding_client._impl.rpcs  # pylint: disable=protected-access
+        assert rpcs is not None
+        rpcs.open(rpc, 'context')
+
+        packet = RpcPacket(
+            type=PacketType.SERVER_STREAM,
+            channel_id=CLIENT_FIRST_CHANNEL_ID,
+            service_id=method.service.id,
+            method_id=method.id,
+            call_id=SOME_CALL_ID,
+            payload=b'not decoded',
+        ).SerializeToString()
+
+        self.assertIs(forwarding_client.process_packet(packet), Status.OK)
+        self.assertIs(forwarding_client.process_packet(packet), Status.OK)
+
+        self.assertEqual(payloads, [b'not decoded', b'not decoded'])
+        self.assertIsNone(self._last_packet_sent_bytes)
+
+    def test_process_packet_invalid_payload_for_stream_is_data_loss(
+        self,
+    ) -> None:
+        method = self._client.method('pw.test1.PublicService.SomeBidiStreaming')
+        errors: list[Status] = []
+        call = self._client.channel(
+            CLIENT_FIRST_CHANNEL_ID
+        ).rpcs.pw.test1.PublicService.SomeBidiStreaming.invoke(
+            on_error=lambda _, error: errors.append(error)
+        )
+
+        packet = RpcPacket(
+            type=PacketType.SERVER_STREAM,
+            channel_id=CLIENT_FIRST_CHANNEL_ID,
+            service_id=method.service.id,
+            method_id=method.id,
+            call_id=call.call_id,
+            payload=b'INVALID DATA!!!',
+        ).SerializeToString()
+
+        self.assertIs(self._client.process_packet(packet), Status.OK)
+        self.assertEqual(errors, [Status.DATA_LOSS])
+        self.assertEqual(
+            self._last_packet_sent().status, Status.DATA_LOSS.value
+        )
+
+        rpcs = self._client._impl.rpcs  # pylint: disable=protected-access
+        assert rpcs is not None
+        self.assertIsNone(
+            rpcs.find(
+                CLIENT_FIRST_CHANNEL_ID,
+                method.service.id,
+                method.id,
+                call.call_id,
+            )
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
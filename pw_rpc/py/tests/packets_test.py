@@ -60,6 +60,52 @@ class PacketsTest(unittest.TestCase):
 
         self.assertEqual(_TEST_RESPONSE, packet)
 
+    def test_encode_matches_protobuf_serialization(self):
+        for packet_type in PacketType.values():
+            for ids in (
+                packets.RpcIds(0, 0, 0, 0),
+                _TEST_IDS,
+                packets.RpcIds(2**32 - 1, 2**32 - 1, 1, 2**32 - 1),
+            ):
+                for payload in (b'', b'\0', bytes(range(256)) * 3):
+                    for status in (0, _TEST_STATUS):
+                        expected = RpcPacket(
+                            type=packet_type,
+                            channel_id=ids.channel_id,
+                            service_id=ids.service_id,
+                            method_id=ids.method_id,
+                            call_id=ids.call_id,
+                            payload=payload,
+                            status=status,
+                        ).SerializeToString()
+
+                        self.assertEqual(
+                            packets.encode(packet_type, ids, payload, status),
+                            expected,
+                        )
+
+    def test_encode_client_stream_encoded_payloads(self):
+        payload = RpcPacket(status=_TEST_STATUS).SerializeToString()
+        expected = packets.encode_client_stream(
+            _TEST_IDS, RpcPacket(status=_TEST_STATUS)
+        )
+
+        for encoded in (
+            payload,
+            bytearray(payload),
+            memoryview(b'xx' + payload)[2:],
+        ):
+            self.assertEqual(
+                packets.encode_client_stream(_TEST_IDS, encoded), expected
+            )
+
+    def test_encode_memoryview_of_wide_items(self):
+        data = memoryview(bytearray(8)).cast('I')
+
+        packet = packets.decode(packets.encode_response(_TEST_IDS, data))
+
+        self.assertEqual(packet.payload, bytes(8))
+
     def test_encode_cancel(self):
         data = packets.encode_cancel(packets.RpcIds(9, 8, 7, 6))
 
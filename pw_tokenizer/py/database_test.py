@@ -18,6 +18,7 @@ import json
 import io
 import os
 from pathlib import Path
+import re
 import shutil
 import stat
 import subprocess
@@ -27,6 +28,7 @@ import unittest
 from unittest import mock
 
 from pw_tokenizer import database
+from pw_tokenizer import tokens
 
 # This is an ELF file with only the pw_tokenizer sections. It was created
 # from a tokenize_test binary built for the STM32F429i Discovery board. The
@@ -601,5 +603,111 @@ class TestDirectoryDatabaseCommandLine(unittest.TestCase):
         )
 
 
+class ElfDatabaseCacheTest(unittest.TestCase):
+    """Tests the ELF token database cache."""
+
+    def setUp(self) -> None:
+        self._dir = Path(tempfile.mkdtemp('_pw_tokenizer_test'))
+        self._cache = database.ElfDatabaseCache(self._dir / 'cache')
+        self._elf = self._dir / 'firmware.elf'
+        shutil.copyfile(TOKENIZED_ENTRIES_ELF, self._elf)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._dir)
+
+    def _entries(self) -> list[Path]:
+        return [p for p in self._cache.directory.iterdir() if p.is_dir()]
+
+    def test_load_matches_elf(self) -> None:
+        for domain in ('', 'TEST_DOMAIN', '.*', 'NOT_A_DOMAIN'):
+            expected = str(
+                database.load_token_database(self._elf, domain=domain)
+            )
+            for _ in range(2):  # Extract, then load from the cache.
+                self.assertEqual(
+                    expected,
+                    str(
+                        database.load_token_database(
+                            self._elf, domain=domain, elf_cache=self._cache
+                        )
+                    ),
+                )
+
+    def test_cached_load_does_not_read_elf(self) -> None:
+        self._cache.load(self._elf, re.compile(''))
+
+        with mock.patch.object(
+            database.elf_reader, 'Elf', side_effect=AssertionError
+        ):
+            db = self._cache.load(self._elf, re.compile(''))
+
+        self.assertIsInstance(db, tokens.MappedBinaryDatabase)
+        self.assertEqual(CSV_DEFAULT_DOMAIN, str(db))
+
+    def test_loaded_entries_keep_domain(self) -> None:
+        db = self._cache.load(self._elf, re.compile('TEST_DOMAIN'))
+        self.assertEqual(
+            {'TEST_DOMAIN'}, {entry.domain for entry in db.entries()}
+        )
+
+    def test_rebuilt_elf_reuses_entry(self) -> None:
+        self._cache.load(self._elf, re.compile(''))
+        os.utime(self._elf, ns=(1, 1))
+        self._cache.load(self._elf, re.compile(''))
+
+        self.assertEqual(1, len(self._entries()))
+        self.assertEqual(2, len(list(self._cache.directory.glob('*.ref'))))
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        self._cache.max_size_bytes = 0
+        self._cache.load(self._elf, re.compile(''))
+        self.assertEqual(1, len(self._entries()))
+
+        other_elf = Path(__file__).parent / 'elf_reader_test_binary.elf'
+        self._cache.load(other_elf, re.compile(''))
+
+        entries = self._entries()
+        self.assertEqual(1, len(entries))
+        refs = list(self._cache.directory.glob('*.ref'))
+        self.assertEqual(1, len(refs))
+        self.assertEqual(entries[0].name, refs[0].read_text())
+
+        # The evicted ELF is extracted again.
+        self.assertEqual(
+            CSV_DEFAULT_DOMAIN, str(self._cache.load(self._elf, re.compile('')))
+        )
+
+    def test_strings_that_are_not_utf8_are_cached(self) -> None:
+        self._elf.write_bytes(
+            self._elf.read_bytes().replace(
+                b'Jello, world!', b'Jello\xff world!'
+            )
+        )
+        expected = {
+            (e.token, e.string)
+            for e in database.load_token_database(
+                self._elf, domain=''
+            ).entries()
+        }
+        self.assertIn((0x2E668CD6, 'Jello\udcff world!'), expected)
+
+        for _ in range(2):  # Extract, then load from the cache.
+            db = self._cache.load(self._elf, re.compile(''))
+            self.assertEqual(
+                expected, {(e.token, e.string) for e in db.entries()}
+            )
+
+        self.assertEqual(1, len(self._entries()))
+
+    def test_cache_directory_from_environment(self) -> None:
+        with mock.patch.dict(
+            os.environ, {database.ELF_CACHE_DIR_ENV_VAR: str(self._dir / 'env')}
+        ):
+            db = database.load_token_database(self._elf)
+
+        self.assertIsInstance(db, tokens.MappedBinaryDatabase)
+        self.assertTrue((self._dir / 'env').is_dir())
+
+
 if __name__ == '__main__':
     unittest.main()
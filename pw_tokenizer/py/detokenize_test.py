@@ -22,7 +22,9 @@ import io
 import os
 from pathlib import Path
 import struct
+import sys
 import tempfile
+import threading
 from typing import Any, Callable, NamedTuple
 import unittest
 from unittest import mock
@@ -98,6 +100,11 @@ ELF_WITH_TOKENIZER_SECTIONS_PATH = Path(__file__).parent.joinpath(
 )
 ELF_WITH_TOKENIZER_SECTIONS = ELF_WITH_TOKENIZER_SECTIONS_PATH.read_bytes()
 
+# The same ELF with a string that is not valid UTF-8.
+ELF_WITH_NON_UTF8_STRING = ELF_WITH_TOKENIZER_SECTIONS.replace(
+    b'Jello, world!', b'Jello\xff world!'
+)
+
 TOKENS_IN_ELF = 22
 TOKENS_IN_ELF_WITH_TOKENIZER_SECTIONS = 26
 
@@ -152,6 +159,28 @@ class DetokenizeTest(unittest.TestCase):
             str(detok.detokenize(b'\xab\xcd')), 'This token is 16 bits'
         )
 
+    def test_mapped_binary_database_is_used_directly(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir, 'db.bin')
+            with path.open('wb') as fd:
+                tokens.write_binary(
+                    tokens.Database(
+                        [
+                            tokens.TokenizedStringEntry(1, 'one %d'),
+                            tokens.TokenizedStringEntry(2, 'two'),
+                        ]
+                    ),
+                    fd,
+                )
+
+            mapped = tokens.MappedBinaryDatabase(path)
+            detok = detokenize.Detokenizer(mapped)
+            self.assertIs(detok.database, mapped)
+            self.assertEqual(str(detok.detokenize(b'\1\0\0\0\2')), 'one 1')
+            self.assertEqual(str(detok.detokenize(b'\2\0\0\0')), 'two')
+            self.assertFalse(detok.detokenize(b'\3\0\0\0').ok())
+            mapped.close()
+
     def test_detokenize_missing_data_is_unsuccessful(self):
         detok = detokenize.Detokenizer(
             tokens.Database(
@@ -370,6 +399,76 @@ class DetokenizeTest(unittest.TestCase):
         )
 
 
+class DetokenizerCacheTest(unittest.TestCase):
+    """Tests the Detokenizer's format string cache."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.db = tokens.Database(
+            [
+                tokens.TokenizedStringEntry(1, 'one %d'),
+                tokens.TokenizedStringEntry(2, 'two %s'),
+                tokens.TokenizedStringEntry(3, 'three'),
+            ]
+        )
+
+    def test_counts_hits_and_misses(self) -> None:
+        detok = detokenize.Detokenizer(self.db)
+        self.assertEqual(detok.cache_info(), (0, 0, 4096, 0))
+
+        detok.lookup(1)
+        detok.lookup(1)
+        detok.lookup(2)
+        detok.lookup(404)
+
+        self.assertEqual(detok.cache_info(), (1, 3, 4096, 3))
+
+    def test_evicts_least_recently_used(self) -> None:
+        detok = detokenize.Detokenizer(self.db, cache_size=2)
+
+        first = detok.lookup(1)
+        detok.lookup(2)
+        self.assertIs(first, detok.lookup(1))  # 1 is now most recently used
+
+        detok.lookup(3)  # Evicts 2
+        self.assertEqual(detok.cache_info().currsize, 2)
+        self.assertIs(first, detok.lookup(1))
+
+        detok.lookup(2)
+        self.assertEqual(detok.cache_info(), (2, 4, 2, 2))
+
+    def test_unbounded(self) -> None:
+        detok = detokenize.Detokenizer(self.db, cache_size=None)
+        for token in range(100):
+            detok.lookup(token)
+
+        self.assertEqual(detok.cache_info(), (0, 100, None, 100))
+
+    def test_lookup_does_not_wait_for_reload(self) -> None:
+        detok = detokenize.Detokenizer(self.db)
+
+        # Hold the lock that serializes reloads.
+        with detok._database_lock:  # pylint: disable=protected-access
+            self.assertEqual(len(detok.lookup(1)), 1)
+
+    def test_reload_replaces_database_and_cache(self) -> None:
+        detok = detokenize.Detokenizer(self.db)
+        detok.lookup(1)
+
+        detok.database = tokens.Database(
+            [tokens.TokenizedStringEntry(1, 'uno %d')]
+        )
+        self.assertEqual(detok.cache_info().currsize, 0)
+        self.assertEqual(str(detok.detokenize(b'\1\0\0\0\x04')), 'uno 2')
+
+    def test_evicted_strings_still_detokenize(self) -> None:
+        detok = detokenize.Detokenizer(self.db, cache_size=1)
+
+        for _ in range(2):
+            self.assertEqual(str(detok.detokenize(b'\1\0\0\0\x04')), 'one 2')
+            self.assertEqual(str(detok.detokenize(b'\2\0\0\0\x02hi')), 'two hi')
+
+
 class DetokenizeWithCollisions(unittest.TestCase):
     """Tests collision resolution."""
 
@@ -512,13 +611,15 @@ class AutoUpdatingDetokenizerTest(unittest.TestCase):
 
                 pool = ManualPoolExecutor()
                 detok = detokenize.AutoUpdatingDetokenizer(
-                    file.name, min_poll_period_s=0, pool=pool
+                    file.name, min_poll_period_s=None, pool=pool
                 )
                 self.assertFalse(detok.detokenize(JELLO_WORLD_TOKEN).ok())
 
                 with open(file.name, 'wb') as fd:
                     tokens.write_binary(db, fd)
 
+                self.assertTrue(detok.check_for_updates())
+
                 # After the change but before the pool runs in another thread,
                 # the token should not exist.
                 self.assertFalse(detok.detokenize(JELLO_WORLD_TOKEN).ok())
@@ -559,17 +660,19 @@ class AutoUpdatingDetokenizerTest(unittest.TestCase):
 
                     pool = ManualPoolExecutor()
                     detok = detokenize.AutoUpdatingDetokenizer(
-                        dbdir, min_poll_period_s=0, pool=pool
+                        dbdir, min_poll_period_s=None, pool=pool
                     )
                     self.assertFalse(detok.detokenize(JELLO_WORLD_TOKEN).ok())
 
                     with open(mismatched_suffix_file.name, 'wb') as fd:
                         tokens.write_csv(db, fd)
+                    detok.check_for_updates()
                     pool.process()
                     self.assertFalse(detok.detokenize(JELLO_WORLD_TOKEN).ok())
 
                     with open(matching_suffix_file.name, 'wb') as fd:
                         tokens.write_csv(db, fd)
+                    self.assertTrue(detok.check_for_updates())
 
                     # After the change but before the pool runs in another
                     # thread, the token should not exist.
@@ -587,6 +690,7 @@ class AutoUpdatingDetokenizerTest(unittest.TestCase):
         self.assertTrue(detok.detokenize(JELLO_WORLD_TOKEN).ok())
 
     def test_no_update_if_time_is_same(self, mock_getmtime):
+        """Tests the database is not reloaded if its mtime is unchanged."""
         mock_getmtime.return_value = 100
 
         with tempfile.NamedTemporaryFile('wb', delete=False) as file:
@@ -600,7 +704,9 @@ class AutoUpdatingDetokenizerTest(unittest.TestCase):
                 file.close()
 
                 detok = detokenize.AutoUpdatingDetokenizer(
-                    file.name, min_poll_period_s=0, pool=InlinePoolExecutor()
+                    file.name,
+                    min_poll_period_s=None,
+                    pool=InlinePoolExecutor(),
                 )
                 self.assertTrue(detok.detokenize(JELLO_WORLD_TOKEN).ok())
 
@@ -608,12 +714,50 @@ class AutoUpdatingDetokenizerTest(unittest.TestCase):
                 with open(file.name, 'wb'):
                     pass
 
-                self.assertTrue(detok.detokenize(JELLO_WORLD_TOKEN).ok())
+                self.assertFalse(detok.check_for_updates())
                 self.assertTrue(detok.detokenize(JELLO_WORLD_TOKEN).ok())
 
                 # Move back time so the now-empty file is reloaded.
                 mock_getmtime.return_value = 50
+                self.assertTrue(detok.check_for_updates())
+                self.assertFalse(detok.detokenize(JELLO_WORLD_TOKEN).ok())
+            finally:
+                os.unlink(file.name)
+
+    def test_background_watcher_reloads(self, mock_getmtime) -> None:
+        """Tests the background watcher reloads a database that changed."""
+        mock_getmtime.return_value = 100
+
+        with tempfile.NamedTemporaryFile('wb', delete=False) as file:
+            try:
+                file.close()
+
+                reloaded = threading.Event()
+
+                class SignalingPoolExecutor(InlinePoolExecutor):
+                    def submit(self, func, *args, **kwargs):
+                        super().submit(func, *args, **kwargs)
+                        reloaded.set()
+
+                detok = detokenize.AutoUpdatingDetokenizer(
+                    file.name,
+                    min_poll_period_s=0.001,
+                    pool=SignalingPoolExecutor(),
+                )
                 self.assertFalse(detok.detokenize(JELLO_WORLD_TOKEN).ok())
+
+                with open(file.name, 'wb') as fd:
+                    tokens.write_binary(
+                        database.load_token_database(
+                            io.BytesIO(ELF_WITH_TOKENIZER_SECTIONS)
+                        ),
+                        fd,
+                    )
+                mock_getmtime.return_value = 200
+
+                self.assertTrue(reloaded.wait(timeout=10))
+                self.assertTrue(detok.detokenize(JELLO_WORLD_TOKEN).ok())
+                detok.close()
             finally:
                 os.unlink(file.name)
 
@@ -639,6 +783,28 @@ class AutoUpdatingDetokenizerTest(unittest.TestCase):
             len(detok.database), TOKENS_IN_ELF_WITH_TOKENIZER_SECTIONS
         )
 
+    def test_token_domain_with_non_utf8_string(self, _) -> None:
+        """Tests merging ELF domains that contain invalid UTF-8."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            elf = Path(temp_dir, 'firmware.elf')
+            elf.write_bytes(ELF_WITH_NON_UTF8_STRING)
+
+            detok = detokenize.AutoUpdatingDetokenizer(
+                f'{elf}#.*',
+                min_poll_period_s=0,
+                pool=InlinePoolExecutor(),
+            )
+            self.assertEqual(
+                len(detok.database), TOKENS_IN_ELF_WITH_TOKENIZER_SECTIONS
+            )
+            self.assertEqual(
+                ['Jello\udcff world!'],
+                [
+                    entry.string
+                    for entry in detok.database.token_to_entries[0x2E668CD6]
+                ],
+            )
+
     def test_token_no_domain_in_str(self, _) -> None:
         """Tests a str without a domain"""
         detok = detokenize.AutoUpdatingDetokenizer(
@@ -658,6 +824,100 @@ class AutoUpdatingDetokenizerTest(unittest.TestCase):
         self.assertEqual(len(detok.database), TOKENS_IN_ELF)
 
 
+def _write_csv(path: Path, mtime: int, *entries: tuple[int, str]) -> None:
+    with path.open('wb') as fd:
+        tokens.write_csv(
+            tokens.Database(
+                tokens.TokenizedStringEntry(token, string)
+                for token, string in entries
+            ),
+            fd,
+        )
+    os.utime(path, (mtime, mtime))
+
+
+class AutoUpdatingDetokenizerIncrementalTest(unittest.TestCase):
+    """Tests that AutoUpdatingDetokenizer only reloads what changed."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self._temp_dir.name)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+        super().tearDown()
+
+    def test_only_changed_path_is_parsed(self) -> None:
+        first = self.dir / 'first.csv'
+        second = self.dir / 'second.csv'
+        _write_csv(first, 100, (1, 'one'))
+        _write_csv(second, 100, (2, 'two'))
+
+        detok = detokenize.AutoUpdatingDetokenizer(
+            first, second, min_poll_period_s=None, pool=InlinePoolExecutor()
+        )
+
+        _write_csv(second, 200, (2, 'TWO'))
+        with mock.patch.object(
+            database, 'load_token_database', wraps=database.load_token_database
+        ) as load:
+            self.assertTrue(detok.check_for_updates())
+
+        self.assertEqual(
+            [call.args[0] for call in load.call_args_list if call.args],
+            [second],
+        )
+        self.assertEqual(str(detok.detokenize(b'\1\0\0\0')), 'one')
+        self.assertEqual(str(detok.detokenize(b'\2\0\0\0')), 'TWO')
+
+    def test_only_changed_directory_csvs_are_parsed(self) -> None:
+        first = self.dir / 'first.pw_tokenizer.csv'
+        second = self.dir / 'second.pw_tokenizer.csv'
+        _write_csv(first, 100, (1, 'one'))
+        _write_csv(second, 100, (2, 'two'))
+
+        detok = detokenize.AutoUpdatingDetokenizer(
+            self.dir, min_poll_period_s=None, pool=InlinePoolExecutor()
+        )
+
+        _write_csv(second, 200, (2, 'TWO'), (3, 'three'))
+        with mock.patch.object(
+            tokens.DatabaseFile, 'load', wraps=tokens.DatabaseFile.load
+        ) as load:
+            self.assertTrue(detok.check_for_updates())
+
+        load.assert_called_once_with(second)
+        self.assertEqual(str(detok.detokenize(b'\1\0\0\0')), 'one')
+        self.assertEqual(str(detok.detokenize(b'\2\0\0\0')), 'TWO')
+        self.assertEqual(str(detok.detokenize(b'\3\0\0\0')), 'three')
+
+        second.unlink()
+        _write_csv(first, 300, (1, 'one'))
+        self.assertTrue(detok.check_for_updates())
+        self.assertFalse(detok.detokenize(b'\2\0\0\0').ok())
+
+    def test_only_changed_tokens_are_evicted(self) -> None:
+        path = self.dir / 'db.csv'
+        _write_csv(path, 100, (1, 'one'), (2, 'two'), (3, 'three'))
+
+        detok = detokenize.AutoUpdatingDetokenizer(
+            path, min_poll_period_s=None, pool=InlinePoolExecutor()
+        )
+        unchanged = detok.lookup(1)
+        detok.lookup(2)
+        detok.lookup(3)
+
+        _write_csv(path, 200, (1, 'one'), (2, 'TWO'), (4, 'four'))
+        self.assertTrue(detok.check_for_updates())
+
+        # Tokens 2 and 3 changed; token 4 was added, but never looked up.
+        self.assertEqual(detok.cache_info().currsize, 1)
+        self.assertIs(detok.lookup(1), unchanged)
+        self.assertEqual(str(detok.lookup(2)[0].entry), 'TWO')
+        self.assertEqual(detok.lookup(3), [])
+
+
 def _next_char(message: bytes) -> bytes:
     return bytes(b + 1 for b in message)
 
@@ -767,17 +1027,40 @@ class NestedMessageParserTest(unittest.TestCase):
         data = io.BytesIO(b''.join(step[0] for step in self.MESSAGES_TEST))
         expected_pieces = sum((step[1:] for step in self.MESSAGES_TEST), ())
 
-        result = self.decoder.read_messages_io(data)
-        for expected_is_message, expected_data in expected_pieces:
-            if expected_is_message:
-                is_message, piece = next(result)
-                self.assertTrue(is_message)
-                self.assertEqual(expected_data, piece)
-            else:  # the IO version yields non-messages byte by byte
-                for byte in expected_data:
-                    is_message, piece = next(result)
-                    self.assertFalse(is_message)
-                    self.assertEqual(bytes([byte]), piece)
+        # The stream is read in one block, so adjacent non-messages combine.
+        combined: list[tuple[bool, bytes]] = []
+        for is_message, piece in expected_pieces:
+            if combined and not is_message and not combined[-1][0]:
+                combined[-1] = (False, combined[-1][1] + piece)
+            else:
+                combined.append((is_message, piece))
+
+        self.assertEqual(combined, list(self.decoder.read_messages_io(data)))
+
+    def test_read_messages_io_byte_at_a_time(self) -> None:
+        class Serial:  # Has read(), but no read1().
+            def __init__(self, data: bytes) -> None:
+                self._data = io.BytesIO(data)
+
+            def read(self, size: int) -> bytes:
+                return self._data.read(size)
+
+        result = self.decoder.read_messages_io(
+            Serial(b'123$abc456$a')  # type: ignore[arg-type]
+        )
+        self.assertEqual(
+            list(result),
+            [
+                (False, b'1'),
+                (False, b'2'),
+                (False, b'3'),
+                (True, b'$abc'),
+                (False, b'4'),
+                (False, b'5'),
+                (False, b'6'),
+                (True, b'$a'),
+            ],
+        )
 
 
 class DetokenizeNested(unittest.TestCase):
@@ -882,6 +1165,7 @@ class DetokenizeBase64(unittest.TestCase):
             tokens.TokenizedStringEntry(tokens.c_hash(s), s)
             for s in [self.RECURSION_STRING, self.RECURSION_STRING_2]
         )
+        self.db = db
         self.detok = detokenize.Detokenizer(db)
 
     def test_detokenize_base64_live(self):
@@ -891,6 +1175,66 @@ class DetokenizeBase64(unittest.TestCase):
 
             self.assertEqual(expected, output.getvalue(), f'Input: {data!r}')
 
+    def test_detokenize_text_live_split_reads(self):
+        class SlowStream:  # Returns up to three bytes per read.
+            def __init__(self, data: bytes) -> None:
+                self._data = io.BytesIO(data)
+
+            def read1(self, size: int) -> bytes:
+                return self._data.read(min(size, 3))
+
+        for data, expected in self.TEST_CASES:
+            output = io.BytesIO()
+            self.detok.detokenize_text_live(
+                SlowStream(data), output, '$'  # type: ignore[arg-type]
+            )
+            self.assertEqual(expected, output.getvalue(), f'Input: {data!r}')
+
+    def test_detokenize_bulk_preserves_order(self):
+        data = b'\n'.join(data for data, _ in self.TEST_CASES)
+        expected = b'\n'.join(expected for _, expected in self.TEST_CASES)
+
+        # Chunks smaller than some lines exercise splitting within a line.
+        output = io.BytesIO()
+        stats = detokenize.detokenize_bulk(
+            self.db, io.BytesIO(data), output, '$', jobs=2, chunk_size=16
+        )
+
+        self.assertEqual(expected, output.getvalue())
+        self.assertEqual(len(data), stats.input_bytes)
+        self.assertIn('MB/s', str(stats))
+        self.assertIn('messages/s', str(stats))
+
+    def test_detokenize_bulk_with_non_utf8_string(self):
+        stdin = io.TextIOWrapper(io.BytesIO(b'Say ' + self.JELLO + b'\n'))
+        output = io.BytesIO()
+        stdout = io.TextIOWrapper(output)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            elf = Path(temp_dir, 'firmware.elf')
+            elf.write_bytes(ELF_WITH_NON_UTF8_STRING)
+
+            argv = ['detokenize', 'base64', f'{elf}#.*', '--jobs', '2']
+            with mock.patch.multiple(
+                sys, argv=argv, stdin=stdin, stdout=stdout, stderr=io.StringIO()
+            ):
+                self.assertEqual(0, detokenize.main())
+
+        self.assertEqual(b'Say Jello\xff world!\n', output.getvalue())
+
+    def test_detokenize_bulk_counts_only_tokens(self):
+        data = b'$ costs $5 $#\n' + self.JELLO + b'\n$$' + self.JELLO + b'\n'
+        output = io.BytesIO()
+        stats = detokenize.detokenize_bulk(
+            self.db, io.BytesIO(data), output, '$', jobs=1
+        )
+
+        self.assertEqual(
+            b'$ costs $5 $#\nJello, world!\n$$Jello, world!\n',
+            output.getvalue(),
+        )
+        self.assertEqual(2, stats.messages)
+
     def test_detokenize_base64_to_file(self):
         for data, expected in self.TEST_CASES:
             output = io.BytesIO()
@@ -21,14 +21,17 @@ maintaining token databases.
 import argparse
 from datetime import datetime
 import glob
+import hashlib
 import itertools
 import json
 import logging
 import os
 from pathlib import Path
 import re
+import shutil
 import struct
 import sys
+import tempfile
 from typing import (
     Any,
     Callable,
@@ -118,6 +121,185 @@ def _database_from_elf(elf, domain: Pattern[str]) -> tokens.Database:
     return tokens.Database([])
 
 
+# If set, databases extracted from ELF files are cached in this directory.
+ELF_CACHE_DIR_ENV_VAR = 'PW_TOKENIZER_ELF_CACHE_DIR'
+
+DEFAULT_ELF_CACHE_SIZE_BYTES = 256 * 1024 * 1024
+
+# Changing this value invalidates existing ELF cache entries.
+_ELF_CACHE_VERSION = b'1'
+_ELF_CACHE_REF_SUFFIX = '.ref'
+_ELF_CACHE_DOMAIN_PREFIX = 'domain-'
+
+
+def _domain_file_name(domain: str) -> str:
+    hex_domain = domain.encode(errors=_ERROR_HANDLER).hex()
+    return f'{_ELF_CACHE_DOMAIN_PREFIX}{hex_domain}.bin'
+
+
+def _domain_from_file_name(path: Path) -> str:
+    hex_domain = path.stem[len(_ELF_CACHE_DOMAIN_PREFIX) :]
+    return bytes.fromhex(hex_domain).decode(errors=_ERROR_HANDLER)
+
+
+class ElfDatabaseCache:
+    """Caches the token databases extracted from ELF files on disk.
+
+    Extracting a database requires parsing the ELF and every tokenized string
+    entry in it. The cache stores each extracted database in the binary format,
+    with one file per domain. Loading a cached ELF memory-maps those files
+    instead, so entries are only decoded as they are looked up.
+
+    Cache entries are named by a hash of the ELF's tokenized string sections.
+    The hash is recorded for each ELF path, size, and modification time, so an
+    unchanged ELF is not read at all, and a rebuilt ELF with the same strings
+    reuses the existing entry. The least recently used entries are evicted when
+    the cache exceeds max_size_bytes.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        max_size_bytes: int = DEFAULT_ELF_CACHE_SIZE_BYTES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_size_bytes = max_size_bytes
+
+    def load(self, elf: Path | str, domain: Pattern[str]) -> tokens.Database:
+        """Loads the database for an ELF, extracting it if it isn't cached."""
+        elf = Path(elf).resolve()
+        stat = elf.stat()
+        ref = self.directory / (
+            hashlib.sha256(
+                b'\0'.join(
+                    [
+                        _ELF_CACHE_VERSION,
+                        os.fsencode(elf),
+                        str(stat.st_size).encode(),
+                        str(stat.st_mtime_ns).encode(),
+                    ]
+                )
+            ).hexdigest()
+            + _ELF_CACHE_REF_SUFFIX
+        )
+
+        try:
+            entry = self.directory / ref.read_text()
+            os.utime(entry)  # Mark the entry as recently used.
+            return self._load_entry(entry, domain)
+        except OSError:  # The ELF is not cached, or its entry was evicted.
+            pass
+
+        entry = self._add(elf, ref)
+        return self._load_entry(entry, domain)
+
+    @staticmethod
+    def _load_entry(entry: Path, domain: Pattern[str]) -> tokens.Database:
+        databases = [
+            tokens.MappedBinaryDatabase(path, name)
+            for path, name in (
+                (path, _domain_from_file_name(path))
+                for path in sorted(entry.iterdir())
+            )
+            if domain.fullmatch(name)
+        ]
+
+        if len(databases) == 1:
+            return databases[0]
+
+        return tokens.CompactDatabase.merged(*databases)
+
+    def _add(self, elf: Path, ref: Path) -> Path:
+        _LOG.debug('Adding tokenized strings from %s to %s', elf, ref.parent)
+
+        with elf.open('rb') as fd:
+            section_data = _elf_reader(fd).dump_section_contents(
+                _TOKENIZED_ENTRY_SECTIONS
+            )
+
+        if section_data is None:
+            section_data = b''
+
+        digest = hashlib.sha256(_ELF_CACHE_VERSION + section_data).hexdigest()
+        entry = self.directory / digest
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        if not entry.is_dir():
+            self._write_entry(entry, section_data)
+
+        self._write_file(ref, digest.encode())
+        self._evict(keep=entry)
+        return entry
+
+    def _write_entry(self, entry: Path, section_data: bytes) -> None:
+        domains: dict[str, list[tokens.TokenizedStringEntry]] = {}
+        for string in _read_tokenized_entries(section_data, re.compile('.*')):
+            domains.setdefault(string.domain, []).append(string)
+
+        # Write the entry in a temporary directory, then rename it, so other
+        # processes never see a partially written entry.
+        temp_dir = Path(tempfile.mkdtemp(prefix='.', dir=self.directory))
+        try:
+            for domain, strings in domains.items():
+                with (temp_dir / _domain_file_name(domain)).open('wb') as fd:
+                    tokens.write_binary(tokens.Database(strings), fd)
+
+            temp_dir.rename(entry)
+        except OSError:
+            if not entry.is_dir():  # Another process may have added it first.
+                raise
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _write_file(self, path: Path, data: bytes) -> None:
+        with tempfile.NamedTemporaryFile(
+            prefix='.', dir=self.directory, delete=False
+        ) as file:
+            file.write(data)
+
+        os.replace(file.name, path)
+
+    def _evict(self, keep: Path) -> None:
+        """Removes the least recently used entries until the cache fits."""
+        entries: list[tuple[float, int, Path]] = []
+        total_size = 0
+
+        for path in self.directory.iterdir():
+            if path.name.startswith('.') or not path.is_dir():
+                continue
+
+            try:
+                size = sum(file.stat().st_size for file in path.iterdir())
+                entries.append((path.stat().st_mtime, size, path))
+            except OSError:  # Another process removed the entry.
+                continue
+
+            total_size += size
+
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+
+            if path != keep:
+                _LOG.debug('Evicting %s from the ELF database cache', path)
+                shutil.rmtree(path, ignore_errors=True)
+                total_size -= size
+
+        # Remove the references to entries that were evicted.
+        for ref in self.directory.glob('*' + _ELF_CACHE_REF_SUFFIX):
+            try:
+                if not (self.directory / ref.read_text()).is_dir():
+                    ref.unlink()
+            except OSError:
+                pass
+
+
+def _default_elf_cache() -> ElfDatabaseCache | None:
+    directory = os.environ.get(ELF_CACHE_DIR_ENV_VAR)
+    return ElfDatabaseCache(directory) if directory else None
+
+
 def tokenization_domains(elf) -> Iterator[str]:
     """Lists all tokenization domains in an ELF file."""
     reader = _elf_reader(elf)
@@ -168,7 +350,7 @@ def _database_from_json(fd) -> tokens.Database:
 
 
 def _load_token_database(  # pylint: disable=too-many-return-statements
-    db, domain: Pattern[str]
+    db, domain: Pattern[str], elf_cache: ElfDatabaseCache | None
 ) -> tokens.Database:
     """Loads a Database from supported database types.
 
@@ -194,6 +376,9 @@ def _load_token_database(  # pylint: disable=too-many-return-statements
         # Read the path as an ELF file.
         with open(db, 'rb') as fd:
             if elf_reader.compatible_file(fd):
+                if elf_cache is not None:
+                    return elf_cache.load(db, domain)
+
                 return _database_from_elf(fd, domain)
 
         # Generate a database from JSON.
@@ -221,16 +406,34 @@ def _load_token_database(  # pylint: disable=too-many-return-statements
 
 
 def load_token_database(
-    *databases, domain: str | Pattern[str] = tokens.DEFAULT_DOMAIN
+    *databases,
+    domain: str | Pattern[str] = tokens.DEFAULT_DOMAIN,
+    elf_cache: ElfDatabaseCache | None = None,
 ) -> tokens.Database:
     """Loads a Database from supported database types.
 
     Supports Database objects, JSONs, ELFs, CSVs, and binary databases.
+
+    Databases extracted from ELF files are cached in elf_cache. If it is not
+    provided, the directory in the PW_TOKENIZER_ELF_CACHE_DIR environment
+    variable is used, if set.
     """
     domain = re.compile(domain)
-    return tokens.Database.merged(
-        *(_load_token_database(db, domain) for db in databases)
-    )
+    if elf_cache is None:
+        elf_cache = _default_elf_cache()
+
+    loaded = [_load_token_database(db, domain, elf_cache) for db in databases]
+
+    # A database mapped from the ELF cache is only decoded as it is used, so
+    # return it directly rather than copying all of its entries.
+    if (
+        len(loaded) == 1
+        and isinstance(loaded[0], tokens.MappedBinaryDatabase)
+        and not isinstance(databases[0], tokens.Database)
+    ):
+        return loaded[0]
+
+    return tokens.Database.merged(*loaded)
 
 
 def database_summary(db: tokens.Database) -> dict[str, Any]:
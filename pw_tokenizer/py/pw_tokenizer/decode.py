@@ -27,6 +27,7 @@ import math
 import re
 import struct
 from typing import (
+    Callable,
     Iterable,
     NamedTuple,
     Match,
@@ -41,7 +42,7 @@ def zigzag_decode(value: int) -> int:
     return (value >> 1) ^ (~0)
 
 
-class FormatSpec:
+class FormatSpec:  # pylint: disable=too-many-instance-attributes
     """Represents a format specifier parsed from a printf-style string.
 
     This implementation is designed to align with the C99 specification,
@@ -356,6 +357,23 @@ class FormatSpec:
             ]
         )
 
+        # Select the argument decoder once, rather than on every decode.
+        self._decode_value: Callable[[bytes], DecodedArg] | None
+        if self.type == 's':
+            self._decode_value = self._decode_string
+        elif self.type == 'c':
+            self._decode_value = self._decode_char
+        elif self.type in self.SIGNED_INT:
+            self._decode_value = self._decode_signed_integer
+        elif self.type in self.UNSIGNED_INT:
+            self._decode_value = self._decode_unsigned_integer
+        elif self.type in self.FLOATING_POINT:
+            self._decode_value = self._decode_float
+        else:
+            self._decode_value = None
+
+        self._has_star = self.width == '*' or self.precision == '.*'
+
     def decode(self, encoded_arg: bytes) -> DecodedArg:
         """Decodes the provided data according to this format specifier."""
         if self.error is not None:
@@ -363,14 +381,17 @@ class FormatSpec:
                 self, None, b'', DecodedArg.DECODE_ERROR, self.error
             )
 
+        if not self._has_star and self._decode_value is not None:
+            return self._decode_value(encoded_arg)
+
         width = None
         if self.width == '*':
-            width = FormatSpec.from_string('%d').decode(encoded_arg)
+            width = _STAR_SPEC.decode(encoded_arg)
             encoded_arg = encoded_arg[len(width.raw_data) :]
 
         precision = None
         if self.precision == '.*':
-            precision = FormatSpec.from_string('%d').decode(encoded_arg)
+            precision = _STAR_SPEC.decode(encoded_arg)
             encoded_arg = encoded_arg[len(precision.raw_data) :]
 
         if self.type == '%':
@@ -378,33 +399,14 @@ class FormatSpec:
                 self, (), b''
             )  # Use () as the value for % formatting.
 
-        if self.type == 's':
-            return self._merge_decoded_args(
-                width, precision, self._decode_string(encoded_arg)
-            )
-
-        if self.type == 'c':
-            return self._merge_decoded_args(
-                width, precision, self._decode_char(encoded_arg)
-            )
-
-        if self.type in self.SIGNED_INT:
-            return self._merge_decoded_args(
-                width, precision, self._decode_signed_integer(encoded_arg)
-            )
-
-        if self.type in self.UNSIGNED_INT:
-            return self._merge_decoded_args(
-                width, precision, self._decode_unsigned_integer(encoded_arg)
-            )
-
-        if self.type in self.FLOATING_POINT:
-            return self._merge_decoded_args(
-                width, precision, self._decode_float(encoded_arg)
-            )
-
         # Should be unreachable.
-        assert False, f'Unhandled format specifier: {self.type}'
+        assert (
+            self._decode_value is not None
+        ), f'Unhandled format specifier: {self.type}'
+
+        return self._merge_decoded_args(
+            width, precision, self._decode_value(encoded_arg)
+        )
 
     def text_float_safe_compatible(self) -> str:
         return ''.join(
@@ -726,6 +728,10 @@ class DecodedArg:
         return f'DecodedArg({self})'
 
 
+# Decodes the integer argument for a * width or precision.
+_STAR_SPEC = FormatSpec.from_string('%d')
+
+
 def parse_format_specifiers(format_string: str) -> Iterable[FormatSpec]:
     for spec in FormatSpec.FORMAT_SPEC.finditer(format_string):
         yield FormatSpec(spec)
@@ -766,20 +772,26 @@ class FormattedString(NamedTuple):
 
 
 class FormatString:
-    """Represents a printf-style format string."""
+    """Represents a printf-style format string.
+
+    The format string is compiled once into a decode plan: the argument decoder
+    for each specifier and the literal text between them. Formatting a message
+    then only runs the decoders and joins the results.
+    """
 
     def __init__(self, format_string: str):
         """Parses format specifiers in the format string."""
         self.format_string = format_string
         self.specifiers = tuple(parse_format_specifiers(self.format_string))
 
-        # List of non-specifier string pieces with room for formatted arguments.
-        self._segments = self._parse_string_segments()
+        # Non-specifier string pieces, which surround the formatted arguments.
+        self._literals = self._parse_string_segments()
+        self._decoders = tuple(spec.decode for spec in self.specifiers)
 
-    def _parse_string_segments(self) -> list:
+    def _parse_string_segments(self) -> tuple[str, ...]:
         """Splits the format string by format specifiers."""
         if not self.specifiers:
-            return [self.format_string]
+            return (self.format_string,)
 
         spec_spans = [spec.match.span() for spec in self.specifiers]
 
@@ -792,11 +804,7 @@ class FormatString:
         # Append the format string segment after the last format specifier.
         string_pieces.append(self.format_string[spec_spans[-1][1] :])
 
-        # Make a list with spots for the replacements between the string pieces.
-        segments: list = [None] * (len(string_pieces) + len(self.specifiers))
-        segments[::2] = string_pieces
-
-        return segments
+        return tuple(string_pieces)
 
     def decode(self, encoded: bytes) -> tuple[Sequence[DecodedArg], bytes]:
         """Decodes arguments according to the format string.
@@ -807,13 +815,16 @@ class FormatString:
         Returns:
           tuple with the decoded arguments and any unparsed data
         """
+        if not self._decoders:
+            return (), encoded
+
         decoded_args = []
 
         fatal_error = False
         index = 0
 
-        for spec in self.specifiers:
-            arg = spec.decode(encoded[index:])
+        for decode_arg in self._decoders:
+            arg = decode_arg(encoded[index:] if index else encoded)
 
             if fatal_error:
                 # After an error is encountered, continue to attempt to parse
@@ -841,18 +852,21 @@ class FormatString:
         Returns:
           tuple with the formatted string, decoded arguments, and remaining data
         """
-        # Insert formatted arguments in place of each format specifier.
-        args, remaining = self.decode(encoded_args)
+        if not self._decoders:
+            return FormattedString(self.format_string, (), encoded_args)
 
-        if show_errors:
-            self._segments[1::2] = (arg.format() for arg in args)
-        else:
-            self._segments[1::2] = (
-                arg.format() if arg.ok() else arg.specifier.specifier
-                for arg in args
-            )
+        args, remaining = self.decode(encoded_args)
 
-        return FormattedString(''.join(self._segments), args, remaining)
+        # Insert formatted arguments in place of each format specifier.
+        pieces = [self._literals[0]]
+        for arg, literal in zip(args, self._literals[1:]):
+            if show_errors or arg.ok():
+                pieces.append(arg.format())
+            else:
+                pieces.append(arg.specifier.specifier)
+            pieces.append(literal)
+
+        return FormattedString(''.join(pieces), args, remaining)
 
 
 def decode(
@@ -34,8 +34,15 @@ messages from a file or stdin.
 import argparse
 import base64
 import binascii
-from concurrent.futures import Executor, ThreadPoolExecutor
+from collections import deque, OrderedDict
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 import enum
+import functools
 import io
 import logging
 import os
@@ -44,8 +51,10 @@ import re
 import string
 import struct
 import sys
+import tempfile
 import threading
 import time
+import weakref
 from typing import (
     AnyStr,
     BinaryIO,
@@ -67,9 +76,16 @@ except ImportError:
 
 _LOG = logging.getLogger('pw_tokenizer')
 
+# Token strings from ELF files may contain invalid UTF-8 as surrogate escapes.
+_ERROR_HANDLER = 'surrogateescape'
+
 ENCODED_TOKEN = struct.Struct('<I')
 _BASE64_CHARS = string.ascii_letters + string.digits + '+/-_='
 DEFAULT_RECURSION = 9
+DEFAULT_CACHE_SIZE = 4096
+
+# Streams are read in blocks of up to this many bytes.
+_READ_SIZE = 64 * 1024
 NESTED_TOKEN_PREFIX = encode.NESTED_TOKEN_PREFIX.encode()
 NESTED_TOKEN_BASE_PREFIX = encode.NESTED_TOKEN_BASE_PREFIX.encode()
 
@@ -92,6 +108,11 @@ _NESTED_TOKEN_FORMATS = (
 )
 
 
+# Characters that may follow the prefix in a nested token.
+_TOKEN_CHARS = re.compile(rb'[A-Za-z0-9+/\-_=#]*')
+
+
+@functools.lru_cache
 def _token_regex(prefix: bytes) -> Pattern[bytes]:
     """Returns a regular expression for prefixed tokenized strings."""
     return re.compile(
@@ -109,6 +130,36 @@ def _token_regex(prefix: bytes) -> Pattern[bytes]:
     )
 
 
+def _complete_length(data: bytes, prefix: bytes) -> int:
+    """Returns the length of data that cannot end in a partial nested token.
+
+    Data after the last prefix may be an incomplete token if it only contains
+    token characters.
+    """
+    start = data.rfind(prefix)
+    if start != -1 and _TOKEN_CHARS.fullmatch(data, start + len(prefix)):
+        return start
+    return len(data)
+
+
+def _block_reader(binary_io: io.RawIOBase | BinaryIO) -> Callable[[], bytes]:
+    """Returns a function that reads whatever data a stream has available.
+
+    Raw and buffered streams return from read as soon as any data is
+    available, so they are read in large blocks. Other file-like objects, such
+    as serial ports, may block until all requested bytes arrive, so they are
+    read one byte at a time.
+    """
+    if isinstance(binary_io, io.RawIOBase):
+        return functools.partial(binary_io.read, _READ_SIZE)
+
+    read1 = getattr(binary_io, 'read1', None)
+    if read1 is not None:
+        return functools.partial(read1, _READ_SIZE)
+
+    return functools.partial(binary_io.read, 1)
+
+
 class DetokenizedString:
     """A detokenized string, with all results if there are collisions."""
 
@@ -212,10 +263,60 @@ class _TokenizedFormatString(NamedTuple):
     format: decode.FormatString
 
 
+class CacheInfo(NamedTuple):
+    """Statistics for the Detokenizer's format string cache."""
+
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+class _DatabaseSnapshot:
+    """A token database and the format strings cached for it.
+
+    The database in a snapshot is never modified. Reloading the database
+    creates a new snapshot, so lookups in progress keep using the old one.
+    """
+
+    __slots__ = ('database', 'cache')
+
+    def __init__(self, token_database: tokens.Database) -> None:
+        self.database = token_database
+
+        # Build the token lookup table now, rather than in the first lookup.
+        token_database.token_to_entries  # pylint: disable=pointless-statement
+
+        # Cache FormatStrings for faster lookup & formatting. The cache is
+        # ordered from least to most recently used.
+        self.cache: OrderedDict[
+            int, list[_TokenizedFormatString]
+        ] = OrderedDict()
+
+
+def _changed_tokens(old: tokens.Database, new: tokens.Database) -> set[int]:
+    """Returns tokens with entries that differ between two databases."""
+    old_entries = {entry.key(): entry.date_removed for entry in old.entries()}
+    new_entries = {entry.key(): entry.date_removed for entry in new.entries()}
+
+    changed = {key.token for key in old_entries.keys() ^ new_entries.keys()}
+    changed.update(
+        key.token
+        for key, date_removed in new_entries.items()
+        if key in old_entries and old_entries[key] != date_removed
+    )
+    return changed
+
+
 class Detokenizer:
     """Main detokenization class; detokenizes strings and caches results."""
 
-    def __init__(self, *token_database_or_elf, show_errors: bool = False):
+    def __init__(
+        self,
+        *token_database_or_elf,
+        show_errors: bool = False,
+        cache_size: int | None = DEFAULT_CACHE_SIZE,
+    ):
         """Decodes and detokenizes binary messages.
 
         Args:
@@ -223,35 +324,115 @@ class Detokenizer:
               database, a tokens.Database, or an elf_reader.Elf
           show_errors: if True, an error message is used in place of the %
               conversion specifier when an argument fails to decode
+          cache_size: the maximum number of tokens for which to cache compiled
+              format strings; the least recently used tokens are evicted
+              first; None for no limit
         """
         self.show_errors = show_errors
 
+        # Serializes database reloads. Lookups do not take this lock; they use
+        # whichever snapshot is current when they start.
         self._database_lock = threading.Lock()
 
-        # Cache FormatStrings for faster lookup & formatting.
-        self._cache: dict[int, list[_TokenizedFormatString]] = {}
+        self._cache_size = cache_size
+        self._cache_hits = 0
+        self._cache_misses = 0
 
         self._initialize_database(token_database_or_elf)
 
+    @property
+    def database(self) -> tokens.Database:
+        """The token database currently used for detokenization."""
+        return self._snapshot.database
+
+    @database.setter
+    def database(self, token_database: tokens.Database) -> None:
+        self._snapshot = _DatabaseSnapshot(token_database)
+
     def _initialize_database(self, token_sources: Iterable) -> None:
+        token_sources = tuple(token_sources)
+
+        # Use a memory-mapped database directly, rather than merging it into a
+        # new Database, so that its entries are only decoded when looked up.
+        token_database: tokens.Database
+        if len(token_sources) == 1 and isinstance(
+            token_sources[0], tokens.MappedBinaryDatabase
+        ):
+            token_database = token_sources[0]
+        else:
+            token_database = database.load_token_database(*token_sources)
+
         with self._database_lock:
-            self.database = database.load_token_database(*token_sources)
-            self._cache.clear()
+            # Replacing the snapshot is atomic, so lookups never see a
+            # partially loaded database.
+            self.database = token_database
 
-    def lookup(self, token: int) -> list[_TokenizedFormatString]:
-        """Returns (TokenizedStringEntry, FormatString) list for matches."""
+    def _update_database(self, token_database: tokens.Database) -> None:
+        """Replaces the database, keeping cached strings for unchanged tokens.
+
+        Only tokens that were added, removed, or changed are evicted from the
+        format string cache.
+        """
         with self._database_lock:
+            old = self._snapshot
+            new = _DatabaseSnapshot(token_database)
+
+            # Copying an OrderedDict with int keys is atomic with respect to
+            # other threads, so lookups may continue in the old snapshot.
+            new.cache = old.cache.copy()
+            for token in _changed_tokens(old.database, token_database):
+                new.cache.pop(token, None)
+
+            self._snapshot = new
+
+    def lookup(self, token: int) -> list[_TokenizedFormatString]:
+        """Returns (TokenizedStringEntry, FormatString) list for matches.
+
+        Lookups do not block each other or wait for the database to reload.
+        """
+        snapshot = self._snapshot
+        cache = snapshot.cache
+
+        try:
+            format_strings = cache[token]
+        except KeyError:
+            pass
+        else:
             try:
-                return self._cache[token]
-            except KeyError:
-                format_strings = [
-                    _TokenizedFormatString(
-                        entry, decode.FormatString(str(entry))
-                    )
-                    for entry in self.database.token_to_entries[token]
-                ]
-                self._cache[token] = format_strings
-                return format_strings
+                cache.move_to_end(token)
+            except KeyError:  # Evicted by another thread
+                pass
+            self._cache_hits += 1
+            return format_strings
+
+        self._cache_misses += 1
+        format_strings = [
+            _TokenizedFormatString(entry, decode.FormatString(str(entry)))
+            for entry in snapshot.database.token_to_entries.get(token, ())
+        ]
+        cache[token] = format_strings
+
+        if self._cache_size is not None:
+            while len(cache) > self._cache_size:
+                try:
+                    cache.popitem(last=False)
+                except KeyError:  # Emptied by another thread
+                    break
+
+        return format_strings
+
+    def cache_info(self) -> CacheInfo:
+        """Returns hit and miss counts and the size of the lookup cache.
+
+        The counts are updated without locking, so they are approximate when
+        several threads detokenize at once.
+        """
+        return CacheInfo(
+            self._cache_hits,
+            self._cache_misses,
+            self._cache_size,
+            len(self._snapshot.cache),
+        )
 
     def detokenize(
         self,
@@ -344,20 +525,33 @@ class Detokenizer:
         prefix: str | bytes = NESTED_TOKEN_PREFIX,
         recursion: int = DEFAULT_RECURSION,
     ) -> None:
-        """Reads chars one-at-a-time, decoding messages; SLOW for big files."""
+        """Decodes messages from a stream as data arrives until EOF.
 
-        def transform(data: bytes) -> bytes:
-            return self._detokenize_nested(data.decode(), prefix, recursion)
-
-        for message in NestedMessageParser(prefix, _BASE64_CHARS).transform_io(
-            input_file, transform
-        ):
-            output.write(message)
+        Data is read in large blocks as it becomes available. Text that may be
+        the start of a token is held until the next read completes it.
+        """
+        prefix = prefix.encode() if isinstance(prefix, str) else prefix
+        read = _block_reader(input_file)
+        pending = b''
+
+        # Stop at EOF, or if a nonblocking stream has no data (returns None).
+        while data := read():
+            data = pending + data
+            complete = _complete_length(data, prefix)
+            pending = data[complete:]
+
+            if complete:
+                output.write(
+                    self._detokenize_nested(data[:complete], prefix, recursion)
+                )
 
-            # Flush each line to prevent delays when piping between processes.
-            if b'\n' in message:
+                # Flush to prevent delays when piping between processes.
                 output.flush()
 
+        if pending:
+            output.write(self._detokenize_nested(pending, prefix, recursion))
+            output.flush()
+
     # TODO(gschen): remove unnecessary function
     def detokenize_base64_live(
         self,
@@ -378,7 +572,11 @@ class Detokenizer:
 
         def detokenize(message: AnyStr) -> AnyStr:
             result = self._detokenize_nested(message, prefix, recursion)
-            return result.decode() if isinstance(message, str) else result
+            return (
+                result.decode(errors=_ERROR_HANDLER)
+                if isinstance(message, str)
+                else result
+            )
 
         return detokenize
 
@@ -395,19 +593,47 @@ class Detokenizer:
         """
         # A unified format across the token types is required for regex
         # consistency.
-        message = message.encode() if isinstance(message, str) else message
+        message = (
+            message.encode(errors=_ERROR_HANDLER)
+            if isinstance(message, str)
+            else message
+        )
         prefix = prefix.encode() if isinstance(prefix, str) else prefix
 
         if not self.database:
             return message
 
-        result = message
-        for _ in range(recursion - 1):
-            result = _token_regex(prefix).sub(self._detokenize_scan, result)
+        return self._detokenize_nested_tokens(
+            message, prefix, _token_regex(prefix), recursion - 1
+        )
+
+    def _detokenize_nested_tokens(
+        self,
+        message: bytes,
+        prefix: bytes,
+        token_regex: Pattern[bytes],
+        passes: int,
+    ) -> bytes:
+        """Replaces tokens in one pass, then detokenizes only the replacements.
+
+        Text outside of replaced tokens is scanned once, rather than once per
+        level of recursion.
+        """
+        if passes <= 0:
+            return message
+
+        def replace(match: Match[bytes]) -> bytes:
+            result = self._detokenize_scan(match)
 
-            if result == message:
+            # Only scan replacements that may contain nested tokens.
+            if prefix not in result or result == match.group(0):
                 return result
-        return result
+
+            return self._detokenize_nested_tokens(
+                result, prefix, token_regex, passes - 1
+            )
+
+        return token_regex.sub(replace, message)
 
     def _detokenize_scan(self, match: Match[bytes]) -> bytes:
         """Decodes prefixed tokens for one of multiple formats."""
@@ -437,7 +663,7 @@ class Detokenizer:
         entries = self.database.token_to_entries[token]
 
         if len(entries) == 1:
-            return str(entries[0]).encode()
+            return str(entries[0]).encode(errors=_ERROR_HANDLER)
 
         # TODO(gschen): improve token collision reporting
 
@@ -460,7 +686,7 @@ class Detokenizer:
             )
 
             if detokenized_string.matches():
-                return str(detokenized_string).encode()
+                return str(detokenized_string).encode(errors=_ERROR_HANDLER)
 
         except binascii.Error:
             pass
@@ -489,16 +715,35 @@ def _parse_domain(path: Path | str) -> tuple[Path, Pattern[str] | None]:
     )
 
 
+def _merged_copy(databases: Iterable[tokens.Database]) -> tokens.Database:
+    """Merges databases without modifying their entries.
+
+    Database.merge() updates the removal dates of the entries it merges. A
+    CompactDatabase copies entries into its own storage, so the source
+    databases remain reusable.
+    """
+    return tokens.CompactDatabase.merged(*databases)
+
+
 class AutoUpdatingDetokenizer(Detokenizer):
     """Loads and updates a detokenizer from database paths."""
 
     class _DatabasePath:
-        """Tracks the modified time of a path or file object."""
+        """Tracks the modified time of a path or file object.
+
+        The most recently loaded database is kept, so only paths that changed
+        are parsed again. For directory databases, only the CSV files that
+        changed are parsed again.
+        """
 
         def __init__(self, path: Path | str) -> None:
             self.path, self.domain = _parse_domain(path)
             self._modified_time: float | None = self._last_modified_time()
 
+            self._database: tokens.Database | None = None
+            self._loaded_time: float | None = None
+            self._csv_databases: dict[Path, tuple[float, tokens.Database]] = {}
+
         def updated(self) -> bool:
             """True if the path has been updated since the last call."""
             modified_time = self._last_modified_time()
@@ -521,6 +766,25 @@ class AutoUpdatingDetokenizer(Detokenizer):
                 return None
 
         def load(self) -> tokens.Database:
+            """Returns the database, parsing only files that have changed.
+
+            The returned database must not be modified.
+            """
+            if self.path.is_dir():
+                return self._load_directory()
+
+            modified_time = self._last_modified_time()
+            if (
+                self._database is None
+                or modified_time is None
+                or modified_time != self._loaded_time
+            ):
+                self._database = self._load_path()
+                self._loaded_time = modified_time
+
+            return self._database
+
+        def _load_path(self) -> tokens.Database:
             try:
                 if self.domain is not None:
                     return database.load_token_database(
@@ -530,37 +794,119 @@ class AutoUpdatingDetokenizer(Detokenizer):
             except FileNotFoundError:
                 return database.load_token_database()
 
+        def _load_directory(self) -> tokens.Database:
+            csv_databases: dict[Path, tuple[float, tokens.Database]] = {}
+
+            for csv_path in self.path.glob(tokens.DIR_DB_GLOB):
+                try:
+                    mtime = os.path.getmtime(csv_path)
+                except FileNotFoundError:
+                    continue
+
+                cached = self._csv_databases.get(csv_path)
+                if cached is not None and cached[0] == mtime:
+                    csv_databases[csv_path] = cached
+                else:
+                    csv_databases[csv_path] = (
+                        mtime,
+                        tokens.DatabaseFile.load(csv_path),
+                    )
+
+            # Drop CSVs that were deleted.
+            self._csv_databases = csv_databases
+            return _merged_copy(db for _, db in csv_databases.values())
+
     def __init__(
         self,
         *paths_or_files: Path | str,
-        min_poll_period_s: float = 1.0,
+        min_poll_period_s: float | None = 1.0,
         pool: Executor = ThreadPoolExecutor(max_workers=1),
+        cache_size: int | None = DEFAULT_CACHE_SIZE,
     ) -> None:
+        """Loads the databases and starts watching them for changes.
+
+        Args:
+          *paths_or_files: paths to databases, optionally with a ``#<domain>``
+              suffix
+          min_poll_period_s: how often a background thread checks the paths
+              for changes; if None, paths are only checked when
+              ``check_for_updates()`` is called
+          pool: executor in which to reload the databases
+          cache_size: the maximum number of tokens for which to cache compiled
+              format strings
+        """
         self.paths = tuple(self._DatabasePath(path) for path in paths_or_files)
         self.min_poll_period_s = min_poll_period_s
-        self._last_checked_time: float = time.time()
         # Thread pool to use for loading the databases. Limit to a single
         # worker since this is low volume and not time critical.
         self._pool = pool
-        super().__init__(*(path.load() for path in self.paths))
+        self._stop_watching = threading.Event()
+        super().__init__(self._load_paths(), cache_size=cache_size)
+
+        if min_poll_period_s is not None:
+            threading.Thread(
+                target=self._watch,
+                args=(
+                    weakref.ref(self),
+                    self._stop_watching,
+                    min_poll_period_s,
+                ),
+                name='AutoUpdatingDetokenizer watcher',
+                daemon=True,
+            ).start()
 
     def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stops watching the database paths for changes."""
+        self._stop_watching.set()
         self._pool.shutdown(wait=False)
 
+    @staticmethod
+    def _watch(
+        detokenizer_ref: 'weakref.ref[AutoUpdatingDetokenizer]',
+        stop: threading.Event,
+        poll_period_s: float,
+    ) -> None:
+        """Periodically checks for updates until stopped or collected.
+
+        Only a weak reference to the detokenizer is held between checks, so
+        this thread does not keep it alive.
+        """
+        while not stop.wait(poll_period_s):
+            detokenizer = detokenizer_ref()
+            if detokenizer is None:
+                return
+
+            try:
+                detokenizer.check_for_updates()
+            except Exception:  # pylint: disable=broad-except
+                _LOG.exception('Failed to check token databases for changes')
+
+            del detokenizer
+
+    def _load_paths(self) -> tokens.Database:
+        return _merged_copy(path.load() for path in self.paths)
+
     def _reload_paths(self) -> None:
-        self._initialize_database([path.load() for path in self.paths])
+        self._update_database(self._load_paths())
 
-    def _reload_if_changed(self) -> None:
-        if time.time() - self._last_checked_time >= self.min_poll_period_s:
-            self._last_checked_time = time.time()
+    def check_for_updates(self) -> bool:
+        """Reloads the databases in the pool if any path has changed.
 
-            if any(path.updated() for path in self.paths):
-                _LOG.info('Changes detected; reloading token database')
-                self._pool.submit(self._reload_paths)
+        This is called periodically from a background thread, so it is not
+        necessary to call it unless automatic polling is disabled.
 
-    def lookup(self, token: int) -> list[_TokenizedFormatString]:
-        self._reload_if_changed()
-        return super().lookup(token)
+        Returns:
+          True if a reload was scheduled
+        """
+        if any(path.updated() for path in self.paths):
+            _LOG.info('Changes detected; reloading token database')
+            self._pool.submit(self._reload_paths)
+            return True
+
+        return False
 
 
 class NestedMessageParser:
@@ -595,6 +941,14 @@ class NestedMessageParser:
                 'character that is not a valid message character.'
             )
 
+        # Matches the message bytes that follow a prefix.
+        self._message_chars = re.compile(
+            b'['
+            + b''.join(re.escape(bytes([c])) for c in sorted(chars))
+            + b']*'
+        )
+        self._prefix_byte = bytes([self._prefix])
+
         self._buffer = bytearray()
         self._state: NestedMessageParser._State = self._State.NON_MESSAGE
 
@@ -611,17 +965,15 @@ class NestedMessageParser:
         Yields:
             ``(is_message, contents)`` chunks.
         """
+        read = _block_reader(binary_io)
+
         # The read may block indefinitely, depending on the IO object.
-        while (read_byte := binary_io.read(1)) != b'':
+        while (data := read()) != b'':
             # Handle non-blocking IO by returning when no bytes are available.
-            if read_byte is None:
+            if data is None:
                 return
 
-            for byte in read_byte:
-                yield from self._handle_byte(byte)
-
-            if self._state is self._State.NON_MESSAGE:  # yield non-message byte
-                yield from self._flush()
+            yield from self.read_messages(data)
 
         yield from self._flush()  # Always flush after EOF
         self._state = self._State.NON_MESSAGE
@@ -642,26 +994,37 @@ class NestedMessageParser:
         Yields:
             ``(is_message, contents)`` chunks.
         """
-        for byte in chunk:
-            yield from self._handle_byte(byte)
-
-        if flush or self._state is self._State.NON_MESSAGE:
-            yield from self._flush()
+        index = 0
+
+        while index < len(chunk):
+            if self._state is self._State.MESSAGE:
+                # Extend the message until the first non-message byte.
+                match = self._message_chars.match(chunk, index)
+                assert match is not None  # The pattern can match nothing.
+                end = match.end()
+                self._buffer += chunk[index:end]
+                if end == len(chunk):  # The message may continue.
+                    break
 
-    def _handle_byte(self, byte: int) -> Iterator[tuple[bool, bytes]]:
-        if self._state is self._State.MESSAGE:
-            if byte not in self._message_bytes:
                 yield from self._flush()
-                if byte != self._prefix:
-                    self._state = self._State.NON_MESSAGE
-        elif self._state is self._State.NON_MESSAGE:
-            if byte == self._prefix:
+                self._state = self._State.NON_MESSAGE
+                index = end
+            elif self._state is self._State.NON_MESSAGE:
+                start = chunk.find(self._prefix_byte, index)
+                if start == -1:
+                    self._buffer += chunk[index:]
+                    break
+
+                self._buffer += chunk[index:start]
                 yield from self._flush()
                 self._state = self._State.MESSAGE
-        else:
-            raise NotImplementedError(f'Unsupported state: {self._state}')
+                self._buffer.append(self._prefix)
+                index = start + 1
+            else:
+                raise NotImplementedError(f'Unsupported state: {self._state}')
 
-        self._buffer.append(byte)
+        if flush or self._state is self._State.NON_MESSAGE:
+            yield from self._flush()
 
     def _flush(self) -> Iterator[tuple[bool, bytes]]:
         data = bytes(self._buffer)
@@ -730,6 +1093,143 @@ def _follow_and_detokenize_file(
         pass
 
 
+# Bulk detokenization splits input into chunks of about this many bytes.
+_BULK_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Detokenizer used by each bulk detokenization worker process.
+_bulk_detokenizer: Detokenizer | None = None
+
+
+class BulkStats(NamedTuple):
+    """Throughput of a bulk detokenization run."""
+
+    input_bytes: int
+    messages: int
+    seconds: float
+
+    def __str__(self) -> str:
+        seconds = max(self.seconds, 1e-9)
+        return (
+            f'Detokenized {self.input_bytes / 1e6:.1f} MB with '
+            f'{self.messages} messages in {self.seconds:.2f} s '
+            f'({self.input_bytes / 1e6 / seconds:.1f} MB/s, '
+            f'{self.messages / seconds:.0f} messages/s)'
+        )
+
+
+def _bulk_chunks(
+    input_file: BinaryIO, prefix: bytes, chunk_size: int
+) -> Iterator[bytes]:
+    """Splits a stream into chunks that may be detokenized independently.
+
+    Chunks end on a line boundary when possible. Lines longer than a chunk are
+    split where they cannot end in a partial nested token.
+    """
+    pending = b''
+
+    while data := input_file.read(chunk_size):
+        data = pending + data
+        end = data.rfind(b'\n') + 1 or _complete_length(data, prefix)
+        pending = data[end:]
+
+        if end:
+            yield data[:end]
+
+    if pending:
+        yield pending
+
+
+def _init_bulk_worker(database_path: str, show_errors: bool) -> None:
+    """Memory-maps the shared token database in a bulk worker process."""
+    global _bulk_detokenizer  # pylint: disable=global-statement
+    _bulk_detokenizer = Detokenizer(
+        tokens.MappedBinaryDatabase(database_path), show_errors=show_errors
+    )
+
+
+def _detokenize_bulk_chunk(chunk: bytes, prefix: bytes) -> tuple[bytes, int]:
+    """Detokenizes a chunk; returns the result and its number of messages."""
+    # pylint: disable=protected-access
+    assert _bulk_detokenizer is not None, 'Worker was not initialized'
+    # A bare prefix also matches the token regex; only count actual tokens.
+    messages = sum(
+        1
+        for match in _token_regex(prefix).finditer(chunk)
+        if any(match.group('base8', 'base10', 'base16', 'base64'))
+    )
+    result = _bulk_detokenizer._detokenize_nested(
+        chunk, prefix, DEFAULT_RECURSION
+    )
+    return result, messages
+
+
+def detokenize_bulk(
+    token_database: tokens.Database,
+    input_file: BinaryIO,
+    output: BinaryIO,
+    prefix: str | bytes = NESTED_TOKEN_PREFIX,
+    jobs: int | None = None,
+    show_errors: bool = False,
+    chunk_size: int = _BULK_CHUNK_SIZE,
+) -> BulkStats:
+    """Detokenizes a large file or stream in parallel worker processes.
+
+    The input is split into chunks on line boundaries, which are detokenized
+    in a process pool and written to output in their original order. The
+    database is written once to a temporary binary database file, which each
+    worker memory-maps rather than receiving its own copy.
+
+    Args:
+      token_database: the token database to use
+      input_file: binary stream to detokenize until EOF
+      output: binary stream to which to write the detokenized data
+      prefix: the nested token prefix character
+      jobs: the number of worker processes; defaults to the number of CPUs
+      show_errors: whether to show errors in detokenized messages
+      chunk_size: approximate number of bytes to send to a worker at once
+
+    Returns:
+      the number of bytes and messages processed and the time it took
+    """
+    prefix = prefix.encode() if isinstance(prefix, str) else prefix
+    jobs = jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    input_bytes = messages = 0
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database_path = os.path.join(temp_dir, 'tokens.bin')
+        with open(database_path, 'wb') as fd:
+            tokens.write_binary(token_database, fd)
+
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_bulk_worker,
+            initargs=(database_path, show_errors),
+        ) as pool:
+            # Limit the chunks in flight to bound memory use.
+            in_flight: deque[Future[tuple[bytes, int]]] = deque()
+
+            def write_next() -> None:
+                nonlocal messages
+                result, count = in_flight.popleft().result()
+                output.write(result)
+                messages += count
+
+            for chunk in _bulk_chunks(input_file, prefix, chunk_size):
+                input_bytes += len(chunk)
+                in_flight.append(
+                    pool.submit(_detokenize_bulk_chunk, chunk, prefix)
+                )
+                if len(in_flight) > 2 * jobs:
+                    write_next()
+
+            while in_flight:
+                write_next()
+
+    output.flush()
+    return BulkStats(input_bytes, messages, time.perf_counter() - start)
+
+
 def _handle_base64(
     databases,
     input_file: BinaryIO,
@@ -737,6 +1237,7 @@ def _handle_base64(
     prefix: str,
     show_errors: bool,
     follow: bool,
+    jobs: int | None,
 ) -> None:
     """Handles the base64 command line option."""
     # argparse.FileType doesn't correctly handle - for binary files.
@@ -746,18 +1247,28 @@ def _handle_base64(
     if output is sys.stdout:
         output = sys.stdout.buffer
 
+    if jobs is not None:
+        stats = detokenize_bulk(
+            _merged_copy(databases),
+            input_file,
+            output,
+            prefix,
+            jobs,
+            show_errors,
+        )
+        print(stats, file=sys.stderr)
+        return
+
     detokenizer = Detokenizer(
         tokens.Database.merged(*databases), show_errors=show_errors
     )
 
     if follow:
         _follow_and_detokenize_file(detokenizer, input_file, output, prefix)
-    elif input_file.seekable():
-        # Process seekable files all at once, which is MUCH faster.
-        detokenizer.detokenize_base64_to_file(input_file.read(), output, prefix)
     else:
-        # For non-seekable inputs (e.g. pipes), read one character at a time.
-        detokenizer.detokenize_base64_live(input_file, output, prefix)
+        # Files and pipes are read in large blocks, so large files are not
+        # loaded into memory all at once.
+        detokenizer.detokenize_text_live(input_file, output, prefix)
 
 
 def _parse_args() -> argparse.Namespace:
@@ -796,6 +1307,18 @@ def _parse_args() -> argparse.Namespace:
             'tail -f.'
         ),
     )
+    subparser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        nargs='?',
+        const=0,
+        help=(
+            'Detokenize a large file in bulk with this many worker processes '
+            '(default: the number of CPUs), preserving output order. Reports '
+            'throughput to stderr. Cannot be combined with --follow.'
+        ),
+    )
     subparser.add_argument(
         '-o',
         '--output',
@@ -825,7 +1348,12 @@ def _parse_args() -> argparse.Namespace:
         ),
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    if getattr(args, 'follow', False) and args.jobs is not None:
+        parser.error('--jobs cannot be used with --follow')
+
+    return args
 
 
 def main() -> int:
@@ -16,12 +16,18 @@
 from __future__ import annotations
 
 from abc import abstractmethod
+from array import array
+import bisect
 import collections
+import collections.abc
 import csv
 from dataclasses import dataclass
 from datetime import datetime
 import io
+import itertools
 import logging
+import mmap
+from operator import itemgetter
 from pathlib import Path
 import re
 import struct
@@ -29,12 +35,14 @@ import subprocess
 from typing import (
     BinaryIO,
     Callable,
+    Collection,
     Iterable,
     Iterator,
+    Mapping,
     NamedTuple,
     Pattern,
+    Sequence,
     TextIO,
-    ValuesView,
 )
 from uuid import uuid4
 
@@ -52,6 +60,10 @@ TOKENIZER_HASH_CONSTANT = 65599
 
 _LOG = logging.getLogger('pw_tokenizer')
 
+# Strings from ELF files may not be valid UTF-8. Their invalid bytes are kept as
+# surrogate escapes, so encode and decode strings with the same error handler.
+_ERROR_HANDLER = 'surrogateescape'
+
 
 def _value(char: int | str) -> int:
     return char if isinstance(char, int) else ord(char)
@@ -166,16 +178,21 @@ class Database:
         return db
 
     @property
-    def token_to_entries(self) -> dict[int, list[TokenizedStringEntry]]:
+    def token_to_entries(self) -> Mapping[int, list[TokenizedStringEntry]]:
         """Returns a dict that maps tokens to a list of TokenizedStringEntry."""
         if self._cache is None:  # build cache token -> entry cache
-            self._cache = collections.defaultdict(list)
+            # Build the cache before storing it so that other threads never
+            # see a partially built cache.
+            cache: dict[
+                int, list[TokenizedStringEntry]
+            ] = collections.defaultdict(list)
             for entry in self._database.values():
-                self._cache[entry.token].append(entry)
+                cache[entry.token].append(entry)
+            self._cache = cache
 
         return self._cache
 
-    def entries(self) -> ValuesView[TokenizedStringEntry]:
+    def entries(self) -> Collection[TokenizedStringEntry]:
         """Returns iterable over all TokenizedStringEntries in the database."""
         return self._database.values()
 
@@ -328,11 +345,14 @@ class Database:
 
     def difference(self, other: Database) -> Database:
         """Returns a new Database with entries in this DB not in the other."""
-        # pylint: disable=protected-access
+        other_keys = other._keys()  # pylint: disable=protected-access
         return Database(
-            e for k, e in self._database.items() if k not in other._database
+            e for k, e in self._database.items() if k not in other_keys
         )
-        # pylint: enable=protected-access
+
+    def _keys(self) -> Collection[_EntryKey]:
+        """The keys of all entries, for fast membership tests."""
+        return self._database.keys()
 
     def __len__(self) -> int:
         """Returns the number of entries in the database."""
@@ -349,6 +369,489 @@ class Database:
         return csv_output.getvalue().decode()
 
 
+class _LazyEntries(collections.abc.Sequence):
+    """Entries of a Database that are only created as they are accessed."""
+
+    def __init__(
+        self,
+        count: int,
+        decode: Callable[[int], TokenizedStringEntry],
+        iterate: Callable[[], Iterator[TokenizedStringEntry]],
+    ) -> None:
+        self._count = count
+        self._decode = decode
+        self._iterate = iterate
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+
+        if index < 0:
+            index += self._count
+
+        if not 0 <= index < self._count:
+            raise IndexError('entry index out of range')
+
+        return self._decode(index)
+
+    def __iter__(self) -> Iterator[TokenizedStringEntry]:
+        return self._iterate()
+
+
+class _LazyTokenTable(collections.abc.Mapping):
+    """Maps tokens to entries that are looked up in sorted storage on demand.
+
+    Like the defaultdict used by Database, indexing with a token that is not in
+    the database returns an empty list.
+    """
+
+    def __init__(
+        self,
+        lookup: Callable[[int], list[TokenizedStringEntry]],
+        tokens: Callable[[], Iterator[int]],
+    ) -> None:
+        self._lookup = lookup
+        self._tokens = tokens
+        self._token_count: int | None = None
+
+    def __getitem__(self, token: int) -> list[TokenizedStringEntry]:
+        return self._lookup(token)
+
+    def get(self, key, default=None):
+        return self._lookup(key) or default
+
+    def __contains__(self, token) -> bool:
+        return bool(self._lookup(token))
+
+    def __iter__(self) -> Iterator[int]:
+        last_token = None
+        for token in self._tokens():
+            if token != last_token:
+                last_token = token
+                yield token
+
+    def __len__(self) -> int:
+        if self._token_count is None:
+            self._token_count = sum(1 for _ in self)
+        return self._token_count
+
+
+# Removal dates are packed as (year << 16 | month << 8 | day), so that packed
+# dates sort like the dates. Entries that were not removed sort after them all.
+_NOT_REMOVED = 0xFFFFFFFF
+
+
+def _pack_date(date: datetime | None) -> int:
+    if date is None:
+        return _NOT_REMOVED
+    return date.year << 16 | date.month << 8 | date.day
+
+
+def _unpack_date(packed: int) -> datetime | None:
+    if packed == _NOT_REMOVED:
+        return None
+    return datetime(packed >> 16, packed >> 8 & 0xFF, packed & 0xFF)
+
+
+# An entry's (token, UTF-8 string) key.
+_CompactKey = tuple[int, bytes]
+
+
+class _Part(NamedTuple):
+    """Entries as parallel lists, which are combined to build _EntryColumns."""
+
+    keys: list[_CompactKey]
+    dates_removed: array
+    domains: list[str]
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[TokenizedStringEntry]) -> _Part:
+        part = cls([], array('I'), [])
+        for entry in entries:
+            part.keys.append(
+                (entry.token, entry.string.encode(errors=_ERROR_HANDLER))
+            )
+            part.dates_removed.append(_pack_date(entry.date_removed))
+            part.domains.append(entry.domain)
+        return part
+
+
+class _EntryColumns:
+    """Entries stored in parallel arrays, sorted by token and then string.
+
+    Columns are never modified; operations on a CompactDatabase create new
+    columns and replace the old ones.
+    """
+
+    __slots__ = (
+        'tokens',
+        'strings',
+        'offsets',
+        'dates_removed',
+        'domains',
+        'domain_names',
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        tokens: array,
+        strings: bytes,
+        offsets: array,
+        dates_removed: array,
+        domains: array,
+        domain_names: tuple[str, ...],
+    ) -> None:
+        self.tokens = tokens
+        self.strings = strings  # All strings, encoded as UTF-8
+        self.offsets = offsets  # Offsets of each string, plus the end offset
+        self.dates_removed = dates_removed  # Packed removal dates
+        self.domains = domains  # Indices into domain_names
+        self.domain_names = domain_names
+
+    @classmethod
+    def from_parts(
+        cls, parts: Sequence[_Part], keep_first_domain: bool
+    ) -> _EntryColumns:
+        """Builds columns from parts, combining entries with the same key.
+
+        Combined entries keep the newest removal date. Their domain is from
+        either the first or the last part with the key.
+        """
+        # Add removed entries in order of removal date so that the newest date
+        # for each key is stored last. Entries that are still present are
+        # added after all removed entries.
+        removed: list[tuple[_CompactKey, int]] = []
+        for part in parts:
+            is_removed = list(map(_NOT_REMOVED.__ne__, part.dates_removed))
+            if any(is_removed):
+                removed += zip(
+                    itertools.compress(part.keys, is_removed),
+                    itertools.compress(part.dates_removed, is_removed),
+                )
+
+        date_by_key = dict(sorted(removed, key=itemgetter(1)))
+        for part in parts:
+            present = map(_NOT_REMOVED.__eq__, part.dates_removed)
+            date_by_key.update(
+                zip(
+                    itertools.compress(part.keys, present),
+                    itertools.repeat(_NOT_REMOVED),
+                )
+            )
+
+        keys = sorted(date_by_key)
+        strings = list(map(itemgetter(1), keys))
+
+        domain_names = tuple(set().union(*(part.domains for part in parts)))
+        if len(domain_names) <= 1:  # Most databases only use one domain.
+            domains = array('I', bytes(4 * len(keys)))
+        else:
+            domain_by_key: dict[_CompactKey, str] = {}
+            for part in reversed(parts) if keep_first_domain else parts:
+                domain_by_key.update(zip(part.keys, part.domains))
+
+            domain_index = {name: i for i, name in enumerate(domain_names)}
+            domains = array(
+                'I',
+                map(
+                    domain_index.__getitem__,
+                    map(domain_by_key.__getitem__, keys),
+                ),
+            )
+
+        return cls(
+            array('I', map(itemgetter(0), keys)),
+            b''.join(strings),
+            array('Q', itertools.accumulate(map(len, strings), initial=0)),
+            array('I', map(date_by_key.__getitem__, keys)),
+            domains,
+            domain_names,
+        )
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def encoded_strings(self) -> list[bytes]:
+        ends = itertools.islice(self.offsets, 1, None)
+        return list(
+            map(self.strings.__getitem__, map(slice, self.offsets, ends))
+        )
+
+    def keys(self) -> list[_CompactKey]:
+        return list(zip(self.tokens, self.encoded_strings()))
+
+    def part(self) -> _Part:
+        return _Part(
+            self.keys(),
+            self.dates_removed,
+            list(map(self.domain_names.__getitem__, self.domains)),
+        )
+
+    def select(self, indices: Sequence[int]) -> _EntryColumns:
+        """Returns columns with only the entries at the given indices."""
+        strings = self.encoded_strings()
+        selected = list(map(strings.__getitem__, indices))
+        return _EntryColumns(
+            array('I', map(self.tokens.__getitem__, indices)),
+            b''.join(selected),
+            array('Q', itertools.accumulate(map(len, selected), initial=0)),
+            array('I', map(self.dates_removed.__getitem__, indices)),
+            array('I', map(self.domains.__getitem__, indices)),
+            self.domain_names,
+        )
+
+    def with_dates_removed(self, dates_removed: array) -> _EntryColumns:
+        return _EntryColumns(
+            self.tokens,
+            self.strings,
+            self.offsets,
+            dates_removed,
+            self.domains,
+            self.domain_names,
+        )
+
+    def entry(self, index: int) -> TokenizedStringEntry:
+        return TokenizedStringEntry(
+            self.tokens[index],
+            self.strings[self.offsets[index] : self.offsets[index + 1]].decode(
+                errors=_ERROR_HANDLER
+            ),
+            self.domain_names[self.domains[index]],
+            _unpack_date(self.dates_removed[index]),
+        )
+
+    def iter_entries(self) -> Iterator[TokenizedStringEntry]:
+        return map(self.entry, range(len(self)))
+
+    def lookup(self, token: int) -> list[TokenizedStringEntry]:
+        start = bisect.bisect_left(self.tokens, token)
+        end = bisect.bisect_right(self.tokens, token, start)
+        return [self.entry(i) for i in range(start, end)]
+
+    def iter_tokens(self) -> Iterator[int]:
+        return iter(self.tokens)
+
+
+class CompactDatabase(Database):
+    """A Database that stores its entries in compact, sorted columns.
+
+    Rather than a TokenizedStringEntry object per string, a CompactDatabase
+    stores tokens, packed removal dates, and interned domains in arrays and all
+    strings in a single UTF-8 buffer. This uses a fraction of the memory of a
+    Database, and merge, add, difference, filter, mark_removed, and purge
+    operate on whole columns instead of individual entries, which makes
+    combining many databases much faster.
+
+    Entries are created when they are accessed, so modifying an entry returned
+    by entries() or token_to_entries does not change the database. Removal
+    dates are stored with a resolution of one day, as in database files.
+    """
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, entries: Iterable[TokenizedStringEntry] = ()
+    ) -> None:
+        self._columns = _EntryColumns.from_parts(
+            [_Part.from_entries(entries)], keep_first_domain=False
+        )
+        self._token_table: _LazyTokenTable | None = None
+
+    def _set_columns(self, columns: _EntryColumns) -> None:
+        self._columns = columns
+        self._token_table = None
+
+    @property
+    def _database(self) -> dict[_EntryKey, TokenizedStringEntry]:
+        """Entries by key, for Database methods that access them directly."""
+        return {entry.key(): entry for entry in self.entries()}
+
+    @_database.setter
+    def _database(self, entries: dict[_EntryKey, TokenizedStringEntry]):
+        self._set_columns(
+            _EntryColumns.from_parts(
+                [_Part.from_entries(entries.values())], keep_first_domain=False
+            )
+        )
+
+    @staticmethod
+    def _part(database: Database) -> _Part:
+        if isinstance(database, CompactDatabase):
+            return database._columns.part()  # pylint: disable=protected-access
+        return _Part.from_entries(database.entries())
+
+    def _keys(self) -> Collection[_EntryKey]:
+        columns = self._columns
+        return frozenset(
+            map(
+                _EntryKey._make,
+                zip(
+                    columns.tokens,
+                    (
+                        s.decode(errors=_ERROR_HANDLER)
+                        for s in columns.encoded_strings()
+                    ),
+                ),
+            )
+        )
+
+    @property
+    def token_to_entries(self) -> Mapping[int, list[TokenizedStringEntry]]:
+        if self._token_table is None:
+            columns = self._columns
+            self._token_table = _LazyTokenTable(
+                columns.lookup, columns.iter_tokens
+            )
+        return self._token_table
+
+    def entries(self) -> Collection[TokenizedStringEntry]:
+        columns = self._columns
+        return _LazyEntries(len(columns), columns.entry, columns.iter_entries)
+
+    def mark_removed(
+        self,
+        all_entries: Iterable[TokenizedStringEntry],
+        removal_date: datetime | None = None,
+    ) -> list[TokenizedStringEntry]:
+        if removal_date is None:
+            removal_date = datetime.now()
+
+        removal = _pack_date(removal_date)
+        all_keys = frozenset(
+            (entry.token, entry.string.encode(errors=_ERROR_HANDLER))
+            for entry in all_entries
+        )
+
+        columns = self._columns
+        marked = [
+            i
+            for i, (key, date) in enumerate(
+                zip(columns.keys(), columns.dates_removed)
+            )
+            if date > removal and key not in all_keys
+        ]
+
+        dates_removed = array('I', columns.dates_removed)
+        for i in marked:
+            dates_removed[i] = removal
+
+        self._set_columns(columns.with_dates_removed(dates_removed))
+        return [self._columns.entry(i) for i in marked]
+
+    def add(self, entries: Iterable[TokenizedStringEntry]) -> None:
+        self._set_columns(
+            _EntryColumns.from_parts(
+                [self._columns.part(), _Part.from_entries(entries)],
+                keep_first_domain=False,
+            )
+        )
+
+    def purge(
+        self, date_removed_cutoff: datetime | None = None
+    ) -> list[TokenizedStringEntry]:
+        if date_removed_cutoff is None:
+            date_removed_cutoff = datetime.max
+
+        cutoff = _pack_date(date_removed_cutoff)
+        columns = self._columns
+
+        purged = [
+            columns.entry(i)
+            for i, date in enumerate(columns.dates_removed)
+            if date <= cutoff
+        ]
+        if purged:
+            self._set_columns(
+                columns.select(
+                    [
+                        i
+                        for i, date in enumerate(columns.dates_removed)
+                        if date > cutoff
+                    ]
+                )
+            )
+        return purged
+
+    def merge(self, *databases: Database) -> None:
+        parts = [self._columns.part()]
+        parts += (self._part(database) for database in databases)
+        self._set_columns(
+            _EntryColumns.from_parts(parts, keep_first_domain=True)
+        )
+
+    def filter(
+        self,
+        include: Iterable[str | Pattern[str]] = (),
+        exclude: Iterable[str | Pattern[str]] = (),
+        replace: Iterable[tuple[str | Pattern[str], str]] = (),
+    ) -> None:
+        columns = self._columns
+
+        if include or exclude:
+            strings = [
+                s.decode(errors=_ERROR_HANDLER)
+                for s in columns.encoded_strings()
+            ]
+            selected: Sequence[int] = range(len(strings))
+
+            if include:
+                include_re = [re.compile(pattern) for pattern in include]
+                selected = [
+                    i
+                    for i in selected
+                    if any(rgx.search(strings[i]) for rgx in include_re)
+                ]
+
+            if exclude:
+                exclude_re = [re.compile(pattern) for pattern in exclude]
+                selected = [
+                    i
+                    for i in selected
+                    if not any(rgx.search(strings[i]) for rgx in exclude_re)
+                ]
+
+            columns = columns.select(selected)
+
+        if replace:
+            # Replacing text changes keys, so the columns must be rebuilt.
+            part = columns.part()
+            for search, replacement in replace:
+                search = re.compile(search)
+                part.keys[:] = [
+                    (
+                        token,
+                        search.sub(
+                            replacement, s.decode(errors=_ERROR_HANDLER)
+                        ).encode(errors=_ERROR_HANDLER),
+                    )
+                    for token, s in part.keys
+                ]
+            columns = _EntryColumns.from_parts([part], keep_first_domain=True)
+
+        self._set_columns(columns)
+
+    def difference(self, other: Database) -> CompactDatabase:
+        """Returns a new database with entries in this DB not in the other."""
+        other_keys = frozenset(self._part(other).keys)
+        columns = self._columns
+
+        difference = CompactDatabase()
+        difference._set_columns(  # pylint: disable=protected-access
+            columns.select(
+                [
+                    i
+                    for i, key in enumerate(columns.keys())
+                    if key not in other_keys
+                ]
+            )
+        )
+        return difference
+
+    def __bool__(self) -> bool:
+        return len(self._columns) != 0
+
+
 def parse_csv(fd: TextIO) -> Iterable[TokenizedStringEntry]:
     """Parses TokenizedStringEntries from a CSV token database file."""
     entries = []
@@ -441,6 +944,14 @@ def _check_that_file_is_csv_database(path: Path) -> None:
         ) from err
 
 
+def _binary_date_removed(day: int, month: int, year: int) -> datetime | None:
+    """Decodes a binary entry's removal date; 0xFF bytes mean not removed."""
+    try:
+        return datetime(year, month, day)
+    except ValueError:
+        return None
+
+
 def parse_binary(fd: BinaryIO) -> Iterable[TokenizedStringEntry]:
     """Parses TokenizedStringEntries from a binary token database file."""
     magic, entry_count = BINARY_FORMAT.header.unpack(
@@ -459,13 +970,7 @@ def parse_binary(fd: BinaryIO) -> Iterable[TokenizedStringEntry]:
         token, day, month, year = BINARY_FORMAT.entry.unpack(
             fd.read(BINARY_FORMAT.entry.size)
         )
-
-        try:
-            date_removed: datetime | None = datetime(year, month, day)
-        except ValueError:
-            date_removed = None
-
-        entries.append((token, date_removed))
+        entries.append((token, _binary_date_removed(day, month, year)))
 
     # Read the entire string table and define a function for looking up strings.
     string_table = fd.read()
@@ -473,7 +978,9 @@ def parse_binary(fd: BinaryIO) -> Iterable[TokenizedStringEntry]:
     def read_string(start):
         end = string_table.find(b'\0', start)
         return (
-            string_table[start : string_table.find(b'\0', start)].decode(),
+            string_table[start : string_table.find(b'\0', start)].decode(
+                errors=_ERROR_HANDLER
+            ),
             end + 1,
         )
 
@@ -504,7 +1011,7 @@ def write_binary(database: Database, fd: BinaryIO) -> None:
             removed_month = 0xFF
             removed_year = 0xFFFF
 
-        string_table += entry.string.encode()
+        string_table += entry.string.encode(errors=_ERROR_HANDLER)
         string_table.append(0)
 
         fd.write(
@@ -516,6 +1023,188 @@ def write_binary(database: Database, fd: BinaryIO) -> None:
     fd.write(string_table)
 
 
+class MappedBinaryDatabase(Database):
+    """A binary format token database read on demand from a memory-mapped file.
+
+    parse_binary decodes every entry in a database when it is loaded. A
+    MappedBinaryDatabase only reads the header when it is opened. Token lookups
+    binary search the database's sorted entry table and decode only the matching
+    entries, so large databases load quickly and use little memory.
+
+    The read-only API (token_to_entries, entries, collisions) uses the mapped
+    file directly. Methods that modify the database first decode all entries
+    into memory, after which it behaves like a regular Database.
+
+    The file must not be modified in place while it is mapped.
+    """
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, path: Path | str, domain: str = DEFAULT_DOMAIN
+    ) -> None:
+        """Maps a binary database file.
+
+        Args:
+          path: the binary token database file
+          domain: the domain of all entries; binary databases do not store
+              domains
+        """
+        self.path = Path(path)
+        self.domain = domain
+
+        with self.path.open('rb') as fd:
+            header = fd.read(BINARY_FORMAT.header.size)
+            if len(header) != BINARY_FORMAT.header.size:
+                raise DatabaseFormatError(
+                    f'{self.path} is too short ({len(header)} B) to be a '
+                    'binary token database'
+                )
+
+            magic, self.entry_count = BINARY_FORMAT.header.unpack(header)
+            if magic != BINARY_FORMAT.magic:
+                raise DatabaseFormatError(
+                    f'Binary token database magic number mismatch (found '
+                    f'{magic!r}, expected {BINARY_FORMAT.magic!r}) while '
+                    f'reading from {self.path}'
+                )
+
+            self._data = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._strings_start = (
+            BINARY_FORMAT.header.size
+            + self.entry_count * BINARY_FORMAT.entry.size
+        )
+        if len(self._data) < self._strings_start:
+            raise DatabaseFormatError(
+                f'{self.path} is too short for its {self.entry_count} entries'
+            )
+
+        # Offsets of each entry's string, built on first use. Entries do not
+        # store string offsets, so the string table must be scanned once.
+        self._string_offsets: array | None = None
+
+        self._token_table = _LazyTokenTable(self._lookup, self._iter_tokens)
+
+        # Set if the database is modified; the entries are then kept in memory.
+        self._decoded: dict[_EntryKey, TokenizedStringEntry] | None = None
+        self._cache = None
+
+    @property
+    def _database(self) -> dict[_EntryKey, TokenizedStringEntry]:
+        """Decodes all entries for Database methods that use them directly."""
+        if self._decoded is None:
+            # pylint: disable-next=protected-access
+            self._decoded = Database(self._iter_entries())._database
+        return self._decoded
+
+    @_database.setter
+    def _database(self, entries: dict[_EntryKey, TokenizedStringEntry]):
+        self._decoded = entries
+
+    def _keys(self) -> Collection[_EntryKey]:
+        if self._decoded is not None:
+            return super()._keys()
+        return frozenset(entry.key() for entry in self._iter_entries())
+
+    @property
+    def token_to_entries(self) -> Mapping[int, list[TokenizedStringEntry]]:
+        if self._decoded is not None:
+            return super().token_to_entries
+        return self._token_table
+
+    def entries(self) -> Collection[TokenizedStringEntry]:
+        if self._decoded is not None:
+            return super().entries()
+        return _LazyEntries(
+            self.entry_count, self._decode_entry, self._iter_entries
+        )
+
+    def __bool__(self) -> bool:
+        return len(self) != 0
+
+    def close(self) -> None:
+        """Unmaps the file. Entries decoded into memory remain usable."""
+        self._data.close()
+
+    def _offsets(self) -> array:
+        if self._string_offsets is None:
+            # Build the offsets before storing them so that other threads never
+            # see a partial list.
+            offsets = array('Q', [self._strings_start])
+            find = self._data.find
+            for _ in range(self.entry_count):
+                end = find(b'\0', offsets[-1])
+                if end == -1:
+                    raise DatabaseFormatError(
+                        f'The string table in {self.path} is truncated'
+                    )
+                offsets.append(end + 1)
+
+            self._string_offsets = offsets
+
+        return self._string_offsets
+
+    @staticmethod
+    def _entry_offset(index: int) -> int:
+        return BINARY_FORMAT.header.size + index * BINARY_FORMAT.entry.size
+
+    def _token_at(self, index: int) -> int:
+        return BINARY_FORMAT.entry.unpack_from(
+            self._data, self._entry_offset(index)
+        )[0]
+
+    def _decode_entry(self, index: int) -> TokenizedStringEntry:
+        token, day, month, year = BINARY_FORMAT.entry.unpack_from(
+            self._data, self._entry_offset(index)
+        )
+        offsets = self._offsets()
+        return TokenizedStringEntry(
+            token,
+            self._data[offsets[index] : offsets[index + 1] - 1].decode(
+                errors=_ERROR_HANDLER
+            ),
+            self.domain,
+            _binary_date_removed(day, month, year),
+        )
+
+    def _lookup(self, token: int) -> list[TokenizedStringEntry]:
+        """Finds the entries for a token; entries are sorted by token."""
+        low, high = 0, self.entry_count
+        while low < high:
+            mid = (low + high) // 2
+            if self._token_at(mid) < token:
+                low = mid + 1
+            else:
+                high = mid
+
+        entries = []
+        while low < self.entry_count and self._token_at(low) == token:
+            entries.append(self._decode_entry(low))
+            low += 1
+
+        return entries
+
+    def _iter_tokens(self) -> Iterator[int]:
+        for token, _, _, _ in BINARY_FORMAT.entry.iter_unpack(
+            self._data[BINARY_FORMAT.header.size : self._strings_start]
+        ):
+            yield token
+
+    def _iter_entries(self) -> Iterator[TokenizedStringEntry]:
+        offsets = self._offsets()
+        table = BINARY_FORMAT.entry.iter_unpack(
+            self._data[BINARY_FORMAT.header.size : self._strings_start]
+        )
+        for i, (token, day, month, year) in enumerate(table):
+            yield TokenizedStringEntry(
+                token,
+                self._data[offsets[i] : offsets[i + 1] - 1].decode(
+                    errors=_ERROR_HANDLER
+                ),
+                self.domain,
+                _binary_date_removed(day, month, year),
+            )
+
+
 class DatabaseFile(Database):
     """A token database that is associated with a particular file.
 
@@ -22,6 +22,7 @@ import shutil
 import tempfile
 from typing import Iterator
 import unittest
+from unittest import mock
 
 from pw_tokenizer import tokens
 from pw_tokenizer.tokens import c_hash, DIR_DB_SUFFIX, _LOG
@@ -601,6 +602,272 @@ class TestDatabaseFile(unittest.TestCase):
             tokens.DatabaseFile.load(self._path)
 
 
+class TestMappedBinaryDatabase(unittest.TestCase):
+    """Tests the MappedBinaryDatabase class."""
+
+    def setUp(self) -> None:
+        file = tempfile.NamedTemporaryFile(delete=False)
+        file.close()
+        self._path = Path(file.name)
+        self._path.write_bytes(BINARY_DATABASE)
+        self._db = tokens.MappedBinaryDatabase(self._path)
+
+    def tearDown(self) -> None:
+        self._db.close()
+        self._path.unlink()
+
+    def test_matches_parsed_database(self) -> None:
+        self.assertEqual(str(self._db), CSV_DATABASE)
+        self.assertEqual(len(self._db), 16)
+        self.assertEqual(
+            list(self._db.entries()),
+            list(tokens.parse_binary(io.BytesIO(BINARY_DATABASE))),
+        )
+
+    def test_lookup(self) -> None:
+        parsed = read_db_from_csv(CSV_DATABASE)
+
+        for token, entries in parsed.token_to_entries.items():
+            self.assertEqual(self._db.token_to_entries[token], entries)
+
+        self.assertEqual(
+            list(self._db.token_to_entries), list(parsed.token_to_entries)
+        )
+        self.assertEqual(
+            self._db.token_to_entries[0x2E668CD6][0].string, 'Jello, world!'
+        )
+        self.assertIn(0x2E668CD6, self._db.token_to_entries)
+
+    def test_lookup_missing_token(self) -> None:
+        self.assertEqual(self._db.token_to_entries[0x12345678], [])
+        self.assertIsNone(self._db.token_to_entries.get(0x12345678))
+        self.assertNotIn(0xFFFFFFFF, self._db.token_to_entries)
+
+    def test_collisions(self) -> None:
+        db = read_db_from_csv(CSV_DATABASE)
+        db.add([tokens.TokenizedStringEntry(0x31631781, '%i')])
+        with self._path.open('wb') as fd:
+            tokens.write_binary(db, fd)
+
+        mapped = tokens.MappedBinaryDatabase(self._path)
+        self.assertEqual(
+            [str(e) for e in mapped.token_to_entries[0x31631781]], ['%d', '%i']
+        )
+        self.assertEqual(list(mapped.collisions()), list(db.collisions()))
+        mapped.close()
+
+    def test_modifying_decodes_entries(self) -> None:
+        self._db.add([tokens.TokenizedStringEntry(0xFFFFFFFF, 'New entry!')])
+        self._db.close()
+
+        self.assertEqual(
+            str(self._db), CSV_DATABASE + 'ffffffff,          ,"New entry!"\n'
+        )
+        self.assertEqual(
+            self._db.token_to_entries[0xFFFFFFFF][0].string, 'New entry!'
+        )
+
+    def test_difference_does_not_decode_entries(self) -> None:
+        other = read_db_from_csv(CSV_DATABASE_2)
+        with mock.patch.object(
+            tokens.MappedBinaryDatabase,
+            '_database',
+            new_callable=mock.PropertyMock,
+            side_effect=AssertionError,
+        ):
+            difference = other.difference(self._db)
+
+        self.assertEqual(
+            str(difference),
+            str(other.difference(read_db_from_csv(CSV_DATABASE))),
+        )
+
+    def test_empty_database(self) -> None:
+        with self._path.open('wb') as fd:
+            tokens.write_binary(tokens.Database(), fd)
+
+        mapped = tokens.MappedBinaryDatabase(self._path)
+        self.assertFalse(mapped)
+        self.assertEqual(mapped.token_to_entries[1], [])
+        mapped.close()
+
+    def test_bad_magic_raises_exception(self) -> None:
+        self._path.write_bytes(b'NOTTOKENS' + BINARY_DATABASE[9:])
+
+        with self.assertRaises(tokens.DatabaseFormatError):
+            tokens.MappedBinaryDatabase(self._path)
+
+    def test_truncated_file_raises_exception(self) -> None:
+        self._path.write_bytes(BINARY_DATABASE[:40])
+
+        with self.assertRaises(tokens.DatabaseFormatError):
+            tokens.MappedBinaryDatabase(self._path)
+
+
+def _sorted_entries(
+    db: tokens.Database,
+) -> list[tokens.TokenizedStringEntry]:
+    return sorted(db.entries(), key=lambda e: (e.token, e.string))
+
+
+class TestCompactDatabase(unittest.TestCase):
+    """Tests that CompactDatabase behaves like Database."""
+
+    def setUp(self) -> None:
+        self.db = read_db_from_csv(CSV_DATABASE)
+        self.compact = tokens.CompactDatabase(self.db.entries())
+
+    def assert_same(self, db: tokens.Database, compact: tokens.Database):
+        self.assertEqual(_sorted_entries(compact), _sorted_entries(db))
+        self.assertEqual(str(compact), str(db))
+        self.assertEqual(len(compact), len(db))
+        self.assertEqual(bool(compact), bool(db))
+
+    def test_load(self) -> None:
+        self.assert_same(self.db, self.compact)
+        self.assertIsInstance(self.compact, tokens.Database)
+
+    def test_lookup(self) -> None:
+        for token, entries in self.db.token_to_entries.items():
+            self.assertEqual(self.compact.token_to_entries[token], entries)
+
+        self.assertEqual(
+            sorted(self.compact.token_to_entries),
+            sorted(self.db.token_to_entries),
+        )
+        self.assertEqual(self.compact.token_to_entries[0xFFFFFFFF], [])
+        self.assertNotIn(0xFFFFFFFF, self.compact.token_to_entries)
+
+    def test_collisions(self) -> None:
+        entries = [tokens.TokenizedStringEntry(0x31631781, '%i', 'dom')]
+        self.db.add(entries)
+        self.compact.add(entries)
+
+        self.assertEqual(
+            list(self.compact.collisions()), list(self.db.collisions())
+        )
+        self.assertEqual(
+            self.compact.token_to_entries[0x31631781][1].domain, 'dom'
+        )
+
+    def test_add(self) -> None:
+        entries = [
+            tokens.TokenizedStringEntry(1, 'new'),
+            tokens.TokenizedStringEntry(0x2E668CD6, 'Jello, world!'),
+            tokens.TokenizedStringEntry(
+                0xB3653E13, 'Jello!', date_removed=datetime(2024, 1, 1)
+            ),
+            tokens.TokenizedStringEntry(
+                0xE65AEFEF, "Won't fit : %s%d", 'dom', datetime(2000, 1, 1)
+            ),
+        ]
+        self.db.add(entries)
+        self.compact.add(entries)
+        self.assert_same(self.db, self.compact)
+
+    def test_merge(self) -> None:
+        others = [
+            read_db_from_csv(CSV_DATABASE_2),
+            tokens.CompactDatabase(read_db_from_csv(CSV_DATABASE_3).entries()),
+            read_db_from_csv(CSV_DATABASE_4),
+        ]
+        self.db.merge(*others)
+        self.compact.merge(*others)
+        self.assert_same(self.db, self.compact)
+
+    def test_merged(self) -> None:
+        databases = [
+            read_db_from_csv(csv) for csv in (CSV_DATABASE, CSV_DATABASE_2)
+        ]
+        self.assert_same(
+            tokens.Database.merged(*databases),
+            tokens.CompactDatabase.merged(*databases),
+        )
+
+    def test_strings_that_are_not_utf8(self) -> None:
+        # Strings read from ELF files keep invalid bytes as surrogate escapes.
+        entry = tokens.TokenizedStringEntry(1, 'Jello\udcff world!')
+        compact = tokens.CompactDatabase.merged(
+            tokens.Database([entry]), self.db
+        )
+        self.assertEqual(compact.token_to_entries[1], [entry])
+
+        binary = io.BytesIO()
+        tokens.write_binary(compact, binary)
+        self.assertIn(entry, tokens.parse_binary(io.BytesIO(binary.getvalue())))
+
+        compact.filter(include=['\udcff'], replace=[('world', 'planet')])
+        self.assertEqual(
+            [entry.string for entry in compact.entries()],
+            ['Jello\udcff planet!'],
+        )
+
+    def test_mark_removed(self) -> None:
+        all_entries = list(read_db_from_csv(CSV_DATABASE_2).entries())
+        removed = self.db.mark_removed(all_entries, datetime(2019, 6, 11))
+        compact_removed = self.compact.mark_removed(
+            all_entries, datetime(2019, 6, 11)
+        )
+
+        self.assertEqual(
+            _sorted_entries(tokens.Database(removed)), compact_removed
+        )
+        self.assert_same(self.db, self.compact)
+
+    def test_purge(self) -> None:
+        for cutoff in (datetime(2019, 6, 10), datetime(2019, 6, 11), None):
+            purged = self.db.purge(cutoff)
+            compact_purged = self.compact.purge(cutoff)
+
+            self.assertEqual(
+                _sorted_entries(tokens.Database(purged)), compact_purged
+            )
+            self.assert_same(self.db, self.compact)
+
+    def test_filter(self) -> None:
+        self.db.filter(
+            include=['%', 'ello'],
+            exclude=['answer'],
+            replace=[('ello', 'ELLO'), ('%', '#')],
+        )
+        self.compact.filter(
+            include=['%', 'ello'],
+            exclude=['answer'],
+            replace=[('ello', 'ELLO'), ('%', '#')],
+        )
+        self.assertEqual(
+            [(e.token, e.string) for e in _sorted_entries(self.compact)],
+            [(e.token, e.string) for e in _sorted_entries(self.db)],
+        )
+
+    def test_difference(self) -> None:
+        other = read_db_from_csv(CSV_DATABASE_2)
+        self.assert_same(
+            self.db.difference(other), self.compact.difference(other)
+        )
+        self.assert_same(
+            other.difference(self.db), other.difference(self.compact)
+        )
+
+    def test_database_difference_uses_keys(self) -> None:
+        other = read_db_from_csv(CSV_DATABASE_2)
+        expected = other.difference(self.db)
+
+        # Building a dict of the CompactDatabase for each key is quadratic.
+        with mock.patch.object(
+            tokens.CompactDatabase,
+            '_database',
+            new_callable=mock.PropertyMock,
+            side_effect=AssertionError,
+        ):
+            self.assert_same(expected, other.difference(self.compact))
+
+    def test_entries_are_copies(self) -> None:
+        entry = next(iter(self.compact.entries()))
+        entry.string = 'changed'
+        self.assert_same(self.db, self.compact)
+
+
 class TestFilter(unittest.TestCase):
     """Tests the filtering functionality."""
 
@@ -89,6 +89,55 @@ class LargeReadTransferIntegrationTest(TransferIntegrationTest):
         config = TransferConfig(server_config, client_config, proxy_config)
         self.do_single_read(client_type, config, resource_id, payload)
 
+    @parameterized.expand(
+        [
+            ("fixed_window", False),
+            ("adaptive_congestion_control", True),
+        ]
+    )
+    def test_1mb_read_high_latency(self, _, adaptive_congestion_control):
+        """Compares the Python client's window algorithms over a slow link."""
+        server_config = config_pb2.ServerConfig(
+            chunk_size_bytes=216,
+            pending_bytes=128 * 1024,
+            chunk_timeout_seconds=5,
+            transfer_service_retries=4,
+            extend_window_divisor=8,
+        )
+        client_config = config_pb2.ClientConfig(
+            max_retries=5,
+            max_lifetime_retries=1500,
+            initial_chunk_timeout_ms=10000,
+            chunk_timeout_ms=4000,
+            adaptive_congestion_control=adaptive_congestion_control,
+        )
+        proxy_config = text_format.Parse(
+            """
+            client_filter_stack: [
+                { latency_injector: {
+                    delay: 0.1, jitter: 0.02, seed: 1649963713563718435
+                } },
+                { rate_limiter: {rate: 50000} },
+                { hdlc_packetizer: {} },
+                { data_dropper: {rate: 0.01, seed: 1649963713563718435} }
+            ]
+
+            server_filter_stack: [
+                { latency_injector: {
+                    delay: 0.1, jitter: 0.02, seed: 1649963713563718436
+                } },
+                { rate_limiter: {rate: 50000} },
+                { hdlc_packetizer: {} },
+                { data_dropper: {rate: 0.01, seed: 1649963713563718436} }
+        ]""",
+            config_pb2.ProxyConfig(),
+        )
+
+        payload = random.Random(1649963713563718437).randbytes(1 * 1024 * 1024)
+        resource_id = 12
+        config = TransferConfig(server_config, client_config, proxy_config)
+        self.do_single_read("python", config, resource_id, payload)
+
     @parameterized.expand(_ALL_LANGUAGES)
     def test_1mb_read_reordered_data(self, client_type):
         server_config = config_pb2.ServerConfig(
@@ -226,6 +226,56 @@ class RateLimiter(Filter):
         await self.send_data(data)
 
 
+class LatencyInjector(Filter):
+    """A filter which delays data to simulate a high-latency link.
+
+    Each chunk of data is sent ``delay`` seconds after it arrives, plus a random
+    jitter of up to ``jitter`` seconds. Unlike RateLimiter, chunks are delayed
+    concurrently, so this adds latency without limiting throughput. Data is
+    never reordered; a chunk is not sent before the chunk preceding it.
+    """
+
+    def __init__(
+        self,
+        send_data: Callable[[bytes], Awaitable[None]],
+        name: str,
+        delay: float,
+        jitter: float,
+        seed: int,
+    ):
+        super().__init__(send_data)
+        self._name = name
+        self._delay = delay
+        self._jitter = jitter
+        self._data_queue: asyncio.Queue = asyncio.Queue()
+        self._rng = random.Random(seed)
+        self._delay_task = asyncio.create_task(self._delay_handler())
+
+        _LOG.info(f'{name} LatencyInjector initialized with seed {seed}')
+
+    def __del__(self):
+        _LOG.info(f'{self._name} cleaning up latency task.')
+        self._delay_task.cancel()
+
+    async def _delay_handler(self):
+        """Async task that sends queued data once its delay has elapsed."""
+        loop = asyncio.get_running_loop()
+        while True:
+            send_time, data = await self._data_queue.get()
+            delay = send_time - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.send_data(data)
+
+    async def process(self, data: bytes) -> None:
+        send_time = (
+            asyncio.get_running_loop().time()
+            + self._delay
+            + self._rng.uniform(0.0, self._jitter)
+        )
+        await self._data_queue.put((send_time, data))
+
+
 class DataTransposer(Filter):
     """A filter which occasionally transposes two chunks of data.
 
@@ -526,6 +576,15 @@ async def _handle_simplex_connection(
                 transposer.timeout,
                 transposer.seed,
             )
+        elif filter_name == "latency_injector":
+            latency_injector = config.latency_injector
+            filter_stack = LatencyInjector(
+                filter_stack,
+                name,
+                latency_injector.delay,
+                latency_injector.jitter,
+                latency_injector.seed,
+            )
         elif filter_name == "server_failure":
             server_failure = config.server_failure
             filter_stack = ServerFailure(
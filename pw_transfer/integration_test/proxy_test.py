@@ -104,6 +104,41 @@ class ProxyTest(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(sent_packets, [b'aaaaaaaaaa', b'bbbbbbbbbb'])
 
+    async def test_latency_injector(self):
+        sent_packets: list[tuple[float, bytes]] = []
+        loop = asyncio.get_running_loop()
+
+        # Async helper so LatencyInjector can await on it.
+        async def append(list: list[tuple[float, bytes]], data: bytes):
+            list.append((loop.time(), data))
+
+        latency_injector = proxy.LatencyInjector(
+            lambda data: append(sent_packets, data),
+            name="test",
+            delay=0.2,
+            jitter=0.1,
+            seed=1234567890,
+        )
+        latency_injector._rng = MockRng([0.0, 1.0])
+
+        start_time = loop.time()
+        await latency_injector.process(b'aaaaaaaaaa')
+        await latency_injector.process(b'bbbbbbbbbb')
+
+        # Neither packet is sent before the delay elapses.
+        await asyncio.sleep(0.1)
+        self.assertEqual(sent_packets, [])
+
+        # Give the injector time to send both packets.
+        await asyncio.sleep(0.5)
+
+        # The second packet has less jitter, but is not sent before the first.
+        self.assertEqual(
+            [data for _, data in sent_packets], [b'aaaaaaaaaa', b'bbbbbbbbbb']
+        )
+        self.assertGreaterEqual(sent_packets[0][0] - start_time, 0.3)
+        self.assertGreaterEqual(sent_packets[1][0], sent_packets[0][0])
+
     async def test_server_failure(self):
         sent_packets: list[bytes] = []
 
@@ -154,6 +154,7 @@ def _main() -> int:
                 max_retries=config.max_retries,
                 max_lifetime_retries=config.max_lifetime_retries,
                 default_protocol_version=pw_transfer.ProtocolVersion.LATEST,
+                adaptive_congestion_control=config.adaptive_congestion_control,
             )
 
             transfer_logger = logging.getLogger('pw_transfer')
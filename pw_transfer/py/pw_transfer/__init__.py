@@ -25,3 +25,4 @@ from pw_transfer.transfer import (
     ProtocolVersion,
 )
 from pw_transfer.client import Error, Manager
+from pw_transfer.scheduler import TransferScheduler
@@ -0,0 +1,354 @@
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""Compares read transfer receive modes over a simulated lossy link.
+
+Runs a ReadTransfer against an in-process transmitter that behaves like the
+pw_transfer server: it sends the window requested by each parameters chunk,
+restarting from the requested offset for retransmits. Chunks in both
+directions pass through a pw_rpc LossyChannel, which drops packets and
+reinjects stale ones, and up to --in-flight data chunks may be on the link at
+once, so chunks sent before a retransmit request still arrive.
+
+Each loss rate is run with the default in-order receive mode and with
+out-of-order chunk buffering, reporting the effective throughput, the amount of
+data the transmitter sent, and the number of parameters chunks and timeouts.
+
+  python -m pw_transfer.benchmark --loss 0 0.01 0.05 0.1 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import deque
+import dataclasses
+import json
+import sys
+import time
+
+from pw_rpc.lossy_channel import LossyChannel, RandomLossGenerator
+from pw_status import Status
+
+from pw_transfer.chunk import Chunk, ProtocolVersion
+from pw_transfer.transfer import ReadTransfer
+
+try:
+    from pw_transfer import transfer_pb2
+except ImportError:
+    # For the bazel build, which puts generated protos in a different location.
+    from pigweed.pw_transfer import transfer_pb2  # type: ignore
+
+_RESOURCE_ID = 7
+
+# How long to wait for the link when there is nothing to deliver. The
+# transfer's response timer fires during these waits.
+_IDLE_POLL_S = 0.0005
+
+
+@dataclasses.dataclass(frozen=True)
+class Result:
+    """The results of one simulated read transfer."""
+
+    mode: str
+    loss: float
+    status: str
+    size_bytes: int
+    seconds: float
+    throughput_bytes_per_s: float
+    transmitted_bytes: int
+    parameters_chunks: int
+    timeouts: int
+
+    def __str__(self) -> str:
+        return (
+            f'{self.mode:<10}{self.loss:>6.1%} loss'
+            f'{self.throughput_bytes_per_s / 1024:>10.1f} KiB/s'
+            f'{self.transmitted_bytes / max(self.size_bytes, 1):>7.2f}x sent'
+            f'{self.parameters_chunks:>6} params'
+            f'{self.timeouts:>5} timeouts  {self.status}'
+        )
+
+
+class _Transmitter:
+    """Sends the windows of data requested by a read transfer's parameters."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._offset = 0
+        self._window_end_offset = 0
+        self._max_chunk_size = 0
+
+        self.transmitted_bytes = 0
+        self.parameters_chunks = 0
+
+    def handle_chunk(self, chunk: Chunk) -> None:
+        if chunk.status is not None:
+            return  # The transfer is complete.
+
+        self.parameters_chunks += 1
+
+        if chunk.requests_transmission_from_offset():
+            self._offset = chunk.offset
+
+        self._window_end_offset = min(chunk.window_end_offset, len(self._data))
+        if chunk.max_chunk_size_bytes is not None:
+            self._max_chunk_size = chunk.max_chunk_size_bytes
+
+    def next_chunk(self) -> Chunk | None:
+        """Returns the next data chunk in the window, if any."""
+        if self._offset >= self._window_end_offset:
+            return None
+
+        end = min(self._offset + self._max_chunk_size, self._window_end_offset)
+        chunk = Chunk(
+            ProtocolVersion.LEGACY,
+            Chunk.Type.DATA,
+            session_id=_RESOURCE_ID,
+            offset=self._offset,
+            data=self._data[self._offset : end],
+        )
+        if end == len(self._data):
+            chunk.remaining_bytes = 0
+
+        self.transmitted_bytes += end - self._offset
+        self._offset = end
+        return chunk
+
+
+class _Link:
+    """Connects a ReadTransfer and a _Transmitter through lossy channels."""
+
+    def __init__(
+        self, transmitter: _Transmitter, loss: float, in_flight: int, seed: int
+    ) -> None:
+        self._transmitter = transmitter
+        self._in_flight = in_flight
+        self._to_receiver: deque[bytes] = deque()
+
+        self._data_channel = self._lossy_channel('data', loss, seed)
+        self._data_channel.send_packet = self._to_receiver.append
+
+        self._parameters_channel = self._lossy_channel(
+            'parameters', loss, seed + 1
+        )
+        self._parameters_channel.send_packet = self._deliver_to_transmitter
+
+    @staticmethod
+    def _lossy_channel(name: str, loss: float, seed: int) -> LossyChannel:
+        return LossyChannel(
+            name,
+            RandomLossGenerator(
+                duplicated_packet_probability=0,
+                max_duplications_per_packet=1,
+                out_of_order_probability=loss / 2,
+                delayed_packet_probability=0,
+                delayed_packet_range_ms=(0, 0),
+                dropped_packet_probability=loss,
+                seed=seed,
+            ),
+        )
+
+    def send_to_transmitter(self, chunk: Chunk) -> None:
+        self._parameters_channel.process_and_send(
+            chunk.to_message().SerializeToString()
+        )
+
+    def _deliver_to_transmitter(self, packet: bytes) -> None:
+        self._transmitter.handle_chunk(
+            Chunk.from_message(transfer_pb2.Chunk.FromString(packet))
+        )
+
+    async def run(self, transfer: ReadTransfer) -> None:
+        """Moves chunks across the link until the transfer finishes."""
+        while not transfer.done.is_set():
+            chunk = self._transmitter.next_chunk()
+            if chunk is not None:
+                self._data_channel.process_and_send(
+                    chunk.to_message().SerializeToString()
+                )
+
+            if self._to_receiver and (
+                chunk is None or len(self._to_receiver) > self._in_flight
+            ):
+                await transfer.handle_chunk(
+                    Chunk.from_message(
+                        transfer_pb2.Chunk.FromString(
+                            self._to_receiver.popleft()
+                        )
+                    )
+                )
+            elif chunk is None:
+                await asyncio.sleep(_IDLE_POLL_S)
+
+
+class _CountingReadTransfer(ReadTransfer):
+    """A ReadTransfer that counts its response timeouts."""
+
+    timeouts = 0
+
+    def _on_timeout(self) -> None:
+        self.timeouts += 1
+        super()._on_timeout()
+
+
+async def _read(
+    data: bytes,
+    buffer_out_of_order_chunks: bool,
+    loss: float,
+    *,
+    chunk_size: int,
+    max_window_size: int,
+    in_flight: int,
+    timeout_s: float,
+    seed: int,
+) -> Result:
+    transmitter = _Transmitter(data)
+    link = _Link(transmitter, loss, in_flight, seed)
+
+    transfer = _CountingReadTransfer(
+        _RESOURCE_ID,
+        _RESOURCE_ID,
+        link.send_to_transmitter,
+        lambda _: None,
+        response_timeout_s=timeout_s,
+        initial_response_timeout_s=timeout_s,
+        max_retries=10,
+        max_lifetime_retries=10000,
+        protocol_version=ProtocolVersion.LEGACY,
+        max_window_size_bytes=max_window_size,
+        max_chunk_size=chunk_size,
+        buffer_out_of_order_chunks=buffer_out_of_order_chunks,
+    )
+
+    start = time.perf_counter()
+    await transfer.begin()
+    await link.run(transfer)
+    seconds = time.perf_counter() - start
+
+    if transfer.status is Status.OK and transfer.data != data:
+        raise AssertionError('The transfer completed with corrupt data')
+
+    return Result(
+        mode='buffered' if buffer_out_of_order_chunks else 'in-order',
+        loss=loss,
+        status=str(transfer.status),
+        size_bytes=len(data),
+        seconds=seconds,
+        throughput_bytes_per_s=len(data) / seconds if seconds else 0.0,
+        transmitted_bytes=transmitter.transmitted_bytes,
+        parameters_chunks=transmitter.parameters_chunks,
+        timeouts=transfer.timeouts,
+    )
+
+
+def run(
+    loss: float,
+    buffer_out_of_order_chunks: bool,
+    size_bytes: int = 256 * 1024,
+    chunk_size: int = 1024,
+    max_window_size: int = 32 * 1024,
+    in_flight: int = 8,
+    timeout_s: float = 0.02,
+    seed: int = 0,
+) -> Result:
+    """Reads size_bytes of data over a link with the given loss rate."""
+    if size_bytes <= 0:
+        raise ValueError('The transfer size must be positive')
+
+    data = bytes(i % 251 for i in range(size_bytes))
+    return asyncio.run(
+        _read(
+            data,
+            buffer_out_of_order_chunks,
+            loss,
+            chunk_size=chunk_size,
+            max_window_size=max_window_size,
+            in_flight=in_flight,
+            timeout_s=timeout_s,
+            seed=seed,
+        )
+    )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        '--loss',
+        type=float,
+        nargs='+',
+        default=[0.0, 0.01, 0.02, 0.05, 0.1],
+        help='Probabilities of dropping each chunk',
+    )
+    parser.add_argument(
+        '--size', type=int, default=256 * 1024, help='Bytes to transfer'
+    )
+    parser.add_argument(
+        '--chunk-size', type=int, default=1024, help='Maximum chunk size'
+    )
+    parser.add_argument(
+        '--window', type=int, default=32 * 1024, help='Maximum window size'
+    )
+    parser.add_argument(
+        '--in-flight',
+        type=int,
+        default=8,
+        help='Data chunks on the link before the receiver sees them',
+    )
+    parser.add_argument(
+        '--timeout', type=float, default=0.02, help='Response timeout (s)'
+    )
+    parser.add_argument(
+        '--seed', type=int, default=0, help='Seed for the lossy channels'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print the results as a JSON list instead of a table',
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+
+    results = [
+        run(
+            loss,
+            buffered,
+            size_bytes=args.size,
+            chunk_size=args.chunk_size,
+            max_window_size=args.window,
+            in_flight=args.in_flight,
+            timeout_s=args.timeout,
+            seed=args.seed,
+        )
+        for loss in args.loss
+        for buffered in (False, True)
+    ]
+
+    if args.json:
+        json.dump([dataclasses.asdict(r) for r in results], sys.stdout)
+        print()
+    else:
+        for result in results:
+            print(result)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,10 +14,14 @@
 """Client for the pw_transfer service, which transmits data over pw_rpc."""
 
 import asyncio
+from concurrent.futures import Future
 import ctypes
+import functools
 import logging
+from pathlib import Path
 import threading
-from typing import Any, Callable
+from typing import Any, BinaryIO, Callable, cast
+import zlib
 
 from pw_rpc.callback_client import BidirectionalStreamingCall
 from pw_status import Status
@@ -27,9 +31,18 @@ from pw_transfer.transfer import (
     ProtocolVersion,
     ReadTransfer,
     Transfer,
+    WriteSource,
     WriteTransfer,
 )
 from pw_transfer.chunk import Chunk
+from pw_transfer.journal import (
+    JournalEntry,
+    JournalingProgressCallback,
+    JournalingWriter,
+    TransferJournal,
+    checksum_stream,
+)
+from pw_transfer.scheduler import ScheduledTransfer, TransferScheduler
 
 try:
     from pw_transfer import transfer_pb2
@@ -41,6 +54,9 @@ _LOG = logging.getLogger(__package__)
 
 _TransferDict = dict[int, Transfer]
 
+# Invoked when a transfer ends, before its future is resolved.
+_FinishCallback = Callable[[Transfer], None]
+
 
 class _TransferStream:
     def __init__(
@@ -113,9 +129,14 @@ class Manager:  # pylint: disable=too-many-instance-attributes
 
     When created, a Manager starts a separate thread in which transfer
     communications and events are handled.
+
+    read() and write() block until their transfer completes. To run several
+    transfers at once, submit them with submit_read() and submit_write(), which
+    return futures. A TransferScheduler limits how many of them run
+    concurrently, and may be shared by Managers for different devices.
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         rpc_transfer_service,
         *,
@@ -125,6 +146,9 @@ class Manager:  # pylint: disable=too-many-instance-attributes
         max_lifetime_retries: int = 1500,
         max_chunk_size_bytes: int = 1024,
         default_protocol_version=ProtocolVersion.VERSION_TWO,
+        buffer_out_of_order_chunks: bool = False,
+        scheduler: TransferScheduler | None = None,
+        adaptive_congestion_control: bool = False,
     ):
         """Initializes a Manager on top of a TransferService.
 
@@ -141,6 +165,19 @@ class Manager:  # pylint: disable=too-many-instance-attributes
           default_protocol_version: Version of the pw_transfer protocol to use.
               Defaults to the latest, but can be set to legacy for projects
               which use legacy devices.
+          buffer_out_of_order_chunks: In a read transfer, keep data chunks
+              that arrive after a lost chunk and skip past them once the
+              missing data arrives, instead of discarding them and receiving
+              them again. Improves throughput on lossy links.
+          scheduler: Limits the transfers that run at once and shares the
+              window between them. May be shared by several Managers. By
+              default, all transfers start immediately.
+          adaptive_congestion_control: In a read transfer, derive the retry
+              timeout from the measured round-trip time and size the window
+              from the measured bandwidth-delay product, instead of using
+              default_response_timeout_s and growing the window by fixed steps.
+              Improves throughput on high-latency links and recovers from loss
+              faster on low-latency ones.
         """
         self._service: Any = rpc_transfer_service
         self._default_response_timeout_s = default_response_timeout_s
@@ -149,10 +186,22 @@ class Manager:  # pylint: disable=too-many-instance-attributes
         self.max_lifetime_retries = max_lifetime_retries
         self._max_chunk_size_bytes = max_chunk_size_bytes
         self._default_protocol_version = default_protocol_version
+        self._buffer_out_of_order_chunks = buffer_out_of_order_chunks
+        self._adaptive_congestion_control = adaptive_congestion_control
+        self._scheduler = (
+            TransferScheduler() if scheduler is None else scheduler
+        )
 
-        # Ongoing transfers in the service by resource ID.
+        # Ongoing and queued transfers in the service by resource ID.
         self._read_transfers: _TransferDict = {}
         self._write_transfers: _TransferDict = {}
+
+        # Transfers submitted to the scheduler, the futures for their results,
+        # and callbacks to invoke when they end, until they complete.
+        self._scheduled: dict[
+            Transfer,
+            tuple[ScheduledTransfer, Future, _FinishCallback | None],
+        ] = {}
         self._next_session_id = ctypes.c_uint32(1)
 
         self._loop = asyncio.new_event_loop()
@@ -227,7 +276,139 @@ class Manager:  # pylint: disable=too-many-instance-attributes
         Raises:
           Error: the transfer failed to complete
         """
+        return self._read(
+            resource_id,
+            progress_callback,
+            protocol_version,
+            chunk_timeout_s,
+            initial_timeout_s,
+            initial_offset,
+        ).result()
+
+    def read_into(
+        self,
+        resource_id: int,
+        output: BinaryIO,
+        progress_callback: ProgressCallback | None = None,
+        protocol_version: ProtocolVersion | None = None,
+        chunk_timeout_s: float | None = None,
+        initial_timeout_s: float | None = None,
+        initial_offset: int = 0,
+        journal_path: str | Path | None = None,
+    ) -> None:
+        """Receives data from the server, writing it to a stream as it arrives.
+
+        Unlike read(), the resource is never held in memory in full, so this
+        is suitable for large resources. The output is not rewound or closed.
+
+        If a journal path is given, the read is resumable. The offset and a
+        CRC-32 of the data written to the output are periodically recorded in
+        the journal file. If the journal exists when the read starts and the
+        output holds the data it describes, the read continues from the
+        journaled offset rather than from initial_offset. Otherwise the output
+        is truncated and the read starts over. The journal is deleted once the
+        read succeeds. Resuming requires a transfer handler that supports
+        offsets, and is not possible with the legacy protocol.
+
+        Args:
+          resource_id: ID of the resource from which to read.
+          output: Writable binary stream, such as an open file, to which the
+              data is written in order.
+          progress_callback: Optional callback periodically invoked throughout
+              the transfer with the transfer state.
+          protocol_version: The desired protocol version to use for this
+              transfer. Defaults to the version the manager was initialized
+              (typically VERSION_TWO).
+          chunk_timeout_s: Timeout for any individual chunk.
+          initial_timeout_s: Timeout for the first chunk, overrides
+              chunk_timeout_s.
+          initial_offset: Initial offset to start reading from. The first byte
+              written to the output is the byte at this offset.
+          journal_path: Optional file in which to record the progress of the
+              read so that it can be resumed. The output must then be readable
+              and seekable, such as a file opened in 'r+b' or 'a+b' mode,
+              positioned where the data from initial_offset begins.
+
+        Raises:
+          Error: the transfer failed to complete
+        """
+        self._read(
+            resource_id,
+            progress_callback,
+            protocol_version,
+            chunk_timeout_s,
+            initial_timeout_s,
+            initial_offset,
+            output,
+            journal_path,
+        ).result()
+
+    def submit_read(
+        self,
+        resource_id: int,
+        progress_callback: ProgressCallback | None = None,
+        protocol_version: ProtocolVersion | None = None,
+        chunk_timeout_s: float | None = None,
+        initial_timeout_s: float | None = None,
+        initial_offset: int = 0,
+        output: BinaryIO | None = None,
+        journal_path: str | Path | None = None,
+    ) -> 'Future[bytes]':
+        """Starts receiving data from the server without blocking.
+
+        The transfer runs concurrently with other submitted transfers, subject
+        to the Manager's scheduler. Cancelling the future only has an effect
+        while the transfer is waiting to start. Callbacks added to the future
+        run on the transfer thread and must not block.
+
+        Args:
+          resource_id: ID of the resource from which to read.
+          progress_callback: Optional callback periodically invoked throughout
+              the transfer with the transfer state.
+          protocol_version: The desired protocol version to use for this
+              transfer. Defaults to the version the manager was initialized
+              (typically VERSION_TWO).
+          chunk_timeout_s: Timeout for any individual chunk.
+          initial_timeout_s: Timeout for the first chunk, overrides
+              chunk_timeout_s.
+          initial_offset: Initial offset to start reading from.
+          output: Optional writable binary stream to which the data is written
+              as it arrives, as in read_into(). The future's result is then
+              empty.
+          journal_path: Optional file in which to record the progress of the
+              read so that it can be resumed, as in read_into(). Requires an
+              output.
+
+        Returns:
+          A future for the data read. If the transfer fails, the future's
+          exception is an Error.
+
+        Raises:
+          ValueError: a read of the resource is already in progress or queued
+        """
+        return self._read(
+            resource_id,
+            progress_callback,
+            protocol_version,
+            chunk_timeout_s,
+            initial_timeout_s,
+            initial_offset,
+            output,
+            journal_path,
+        )
 
+    def _read(  # pylint: disable=too-many-arguments
+        self,
+        resource_id: int,
+        progress_callback: ProgressCallback | None,
+        protocol_version: ProtocolVersion | None,
+        chunk_timeout_s: float | None,
+        initial_timeout_s: float | None,
+        initial_offset: int,
+        output: BinaryIO | None = None,
+        journal_path: str | Path | None = None,
+    ) -> 'Future[bytes]':
+        """Submits a read transfer and returns a future for its data."""
         if resource_id in self._read_transfers:
             raise ValueError(
                 f'Read transfer for resource {resource_id} already exists'
@@ -236,6 +417,26 @@ class Manager:  # pylint: disable=too-many-instance-attributes
         if protocol_version is None:
             protocol_version = self._default_protocol_version
 
+        on_finish: _FinishCallback | None = None
+
+        if journal_path is not None:
+            if output is None:
+                raise ValueError('A resumable read requires an output stream')
+
+            journal = TransferJournal(
+                journal_path, resource_id, 'read', initial_offset
+            )
+            start = _resume_read(
+                journal, output, initial_offset, protocol_version
+            )
+            initial_offset = start.offset
+
+            writer = JournalingWriter(output, journal, start)
+            output = cast(BinaryIO, writer)
+            on_finish = functools.partial(
+                _finish_journal, journal=journal, record=writer.record
+            )
+
         if protocol_version == ProtocolVersion.LEGACY and initial_offset != 0:
             raise ValueError(
                 f'Unsupported transfer with offset {initial_offset} started '
@@ -267,15 +468,13 @@ class Manager:  # pylint: disable=too-many-instance-attributes
             max_chunk_size=self._max_chunk_size_bytes,
             progress_callback=progress_callback,
             initial_offset=initial_offset,
+            buffer_out_of_order_chunks=self._buffer_out_of_order_chunks,
+            output=output,
+            adaptive_congestion_control=self._adaptive_congestion_control,
+        )
+        return self._submit_transfer(
+            transfer, self._read_transfers, self._read_stream, on_finish
         )
-        self._start_read_transfer(transfer)
-
-        transfer.done.wait()
-
-        if not transfer.status.ok():
-            raise Error(transfer.resource_id, transfer.status)
-
-        return transfer.data
 
     def write(
         self,
@@ -286,9 +485,18 @@ class Manager:  # pylint: disable=too-many-instance-attributes
         chunk_timeout_s: Any | None = None,
         initial_timeout_s: Any | None = None,
         initial_offset: int = 0,
+        journal_path: str | Path | None = None,
     ) -> None:
         """Transmits ("uploads") data to the server.
 
+        If a journal path is given, the write is resumable. The offset the
+        server has confirmed receiving and a CRC-32 of the data up to it are
+        periodically recorded in the journal file. If the journal exists when
+        the write starts and describes the beginning of the same data, the
+        write continues from the journaled offset. The journal is deleted once
+        the write succeeds. Resuming requires a transfer handler that supports
+        offsets, and is not possible with the legacy protocol.
+
         Args:
           resource_id: ID of the resource to which to write.
           data: Data to send to the server.
@@ -306,6 +514,8 @@ class Manager:  # pylint: disable=too-many-instance-attributes
               the default. data arg should start with the data you want to see
               starting at this initial offset on the server. No seeking is done
               in the transfer operation on the client side.
+          journal_path: Optional file in which to record the progress of the
+              write so that it can be resumed.
 
         Raises:
           Error: the transfer failed to complete
@@ -314,6 +524,132 @@ class Manager:  # pylint: disable=too-many-instance-attributes
         if isinstance(data, str):
             data = data.encode()
 
+        self._write(
+            resource_id,
+            data,
+            progress_callback,
+            protocol_version,
+            chunk_timeout_s,
+            initial_timeout_s,
+            initial_offset,
+            journal_path,
+        ).result()
+
+    def write_from(
+        self,
+        resource_id: int,
+        source: WriteSource,
+        progress_callback: ProgressCallback | None = None,
+        protocol_version: ProtocolVersion | None = None,
+        chunk_timeout_s: Any | None = None,
+        initial_timeout_s: Any | None = None,
+        initial_offset: int = 0,
+    ) -> None:
+        """Transmits data to the server, reading it from a stream as needed.
+
+        Only the data the server has not yet confirmed receiving is held in
+        memory, which is bounded by the server's window size. Since that data
+        is discarded once confirmed, the transfer fails with OUT_OF_RANGE if
+        the server requests an earlier offset.
+
+        Args:
+          resource_id: ID of the resource to which to write.
+          source: Readable binary stream, such as an open file, or an async
+              iterable of bytes, which is consumed on the transfer thread's
+              event loop. The data is read until the end of the stream.
+          progress_callback: Optional callback periodically invoked throughout
+              the transfer with the transfer state. The total size is unknown
+              until the source is exhausted.
+          protocol_version: The desired protocol version to use for this
+              transfer. Defaults to the version the manager was initialized
+              (defaults to LATEST).
+          chunk_timeout_s: Timeout for any individual chunk.
+          initial_timeout_s: Timeout for the first chunk, overrides
+              chunk_timeout_s.
+          initial_offset: Initial offset to start writing to. The source
+              should start with the data to write at this offset.
+
+        Raises:
+          Error: the transfer failed to complete
+        """
+        self._write(
+            resource_id,
+            source,
+            progress_callback,
+            protocol_version,
+            chunk_timeout_s,
+            initial_timeout_s,
+            initial_offset,
+        ).result()
+
+    def submit_write(
+        self,
+        resource_id: int,
+        data: bytes | str | WriteSource,
+        progress_callback: ProgressCallback | None = None,
+        protocol_version: ProtocolVersion | None = None,
+        chunk_timeout_s: Any | None = None,
+        initial_timeout_s: Any | None = None,
+        initial_offset: int = 0,
+        journal_path: str | Path | None = None,
+    ) -> 'Future[None]':
+        """Starts transmitting data to the server without blocking.
+
+        The transfer runs concurrently with other submitted transfers, subject
+        to the Manager's scheduler. Cancelling the future only has an effect
+        while the transfer is waiting to start. Callbacks added to the future
+        run on the transfer thread and must not block.
+
+        Args:
+          resource_id: ID of the resource to which to write.
+          data: Data to send to the server, or a stream to read it from as in
+              write_from().
+          progress_callback: Optional callback periodically invoked throughout
+              the transfer with the transfer state.
+          protocol_version: The desired protocol version to use for this
+              transfer. Defaults to the version the manager was initialized
+              (defaults to LATEST).
+          chunk_timeout_s: Timeout for any individual chunk.
+          initial_timeout_s: Timeout for the first chunk, overrides
+              chunk_timeout_s.
+          initial_offset: Initial offset to start writing to.
+          journal_path: Optional file in which to record the progress of the
+              write so that it can be resumed, as in write(). Requires the data
+              as bytes.
+
+        Returns:
+          A future that completes when the transfer does. If the transfer
+          fails, the future's exception is an Error.
+
+        Raises:
+          ValueError: a write to the resource is already in progress or queued
+        """
+        if isinstance(data, str):
+            data = data.encode()
+
+        return self._write(
+            resource_id,
+            data,
+            progress_callback,
+            protocol_version,
+            chunk_timeout_s,
+            initial_timeout_s,
+            initial_offset,
+            journal_path,
+        )
+
+    def _write(  # pylint: disable=too-many-arguments
+        self,
+        resource_id: int,
+        data: bytes | WriteSource,
+        progress_callback: ProgressCallback | None,
+        protocol_version: ProtocolVersion | None,
+        chunk_timeout_s: Any | None,
+        initial_timeout_s: Any | None,
+        initial_offset: int,
+        journal_path: str | Path | None = None,
+    ) -> 'Future[None]':
+        """Submits a write transfer and returns a future for its completion."""
         if resource_id in self._write_transfers:
             raise ValueError(
                 f'Write transfer for resource {resource_id} already exists'
@@ -322,6 +658,32 @@ class Manager:  # pylint: disable=too-many-instance-attributes
         if protocol_version is None:
             protocol_version = self._default_protocol_version
 
+        on_finish: _FinishCallback | None = None
+
+        if journal_path is not None:
+            if not isinstance(data, (bytes, bytearray)):
+                raise ValueError('A resumable write requires the data as bytes')
+
+            journal = TransferJournal(
+                journal_path, resource_id, 'write', initial_offset
+            )
+            start = _resume_write(
+                journal, data, initial_offset, protocol_version
+            )
+
+            journaling_callback = JournalingProgressCallback(
+                data, initial_offset, journal, start, progress_callback
+            )
+            progress_callback = journaling_callback
+            on_finish = functools.partial(
+                _finish_journal,
+                journal=journal,
+                record=journaling_callback.record,
+            )
+
+            data = data[start.offset - initial_offset :]
+            initial_offset = start.offset
+
         if (
             protocol_version != ProtocolVersion.VERSION_TWO
             and initial_offset != 0
@@ -357,12 +719,9 @@ class Manager:  # pylint: disable=too-many-instance-attributes
             progress_callback=progress_callback,
             initial_offset=initial_offset,
         )
-        self._start_write_transfer(transfer)
-
-        transfer.done.wait()
-
-        if not transfer.status.ok():
-            raise Error(transfer.resource_id, transfer.status)
+        return self._submit_transfer(
+            transfer, self._write_transfers, self._write_stream, on_finish
+        )
 
     def assign_session_id(self) -> int:
         new_id = self._next_session_id.value
@@ -470,31 +829,97 @@ class Manager:  # pylint: disable=too-many-instance-attributes
     def _on_read_error(self, status: Status) -> None:
         """Callback for an RPC error in the read stream."""
 
-        for transfer in self._read_transfers.values():
-            transfer.finish(Status.INTERNAL, skip_callback=True)
+        transfers = list(self._read_transfers.values())
         self._read_transfers.clear()
 
+        for transfer in transfers:
+            transfer.finish(Status.INTERNAL, skip_callback=True)
+            self._finish_scheduled_transfer(transfer)
+
         _LOG.error('Read stream shut down: %s', status)
 
     def _on_write_error(self, status: Status) -> None:
         """Callback for an RPC error in the write stream."""
 
-        for transfer in self._write_transfers.values():
-            transfer.finish(Status.INTERNAL, skip_callback=True)
+        transfers = list(self._write_transfers.values())
         self._write_transfers.clear()
 
-        _LOG.error('Write stream shut down: %s', status)
+        for transfer in transfers:
+            transfer.finish(Status.INTERNAL, skip_callback=True)
+            self._finish_scheduled_transfer(transfer)
 
-    def _start_read_transfer(self, transfer: Transfer) -> None:
-        """Begins a new read transfer, opening the stream if it isn't."""
+        _LOG.error('Write stream shut down: %s', status)
 
-        self._read_transfers[transfer.resource_id] = transfer
-        self._read_stream.open()
+    def _submit_transfer(
+        self,
+        transfer: Transfer,
+        transfers: _TransferDict,
+        stream: _TransferStream,
+        on_finish: _FinishCallback | None = None,
+    ) -> Future:
+        """Queues a transfer with the scheduler and returns its future."""
+        transfers[transfer.resource_id] = transfer
+
+        def limit_window_size(size: int) -> None:
+            assert isinstance(transfer, ReadTransfer)
+            self._loop.call_soon_threadsafe(transfer.limit_window_size, size)
+
+        future: Future = Future()
+        scheduled = ScheduledTransfer(
+            self,
+            lambda: self._start_transfer(transfer, transfers, stream, future),
+            limit_window_size if isinstance(transfer, ReadTransfer) else None,
+        )
+        self._scheduled[transfer] = (scheduled, future, on_finish)
+        self._scheduler.submit(scheduled)
+        return future
 
-        _LOG.debug('Starting new read transfer %d', transfer.id)
+    def _start_transfer(
+        self,
+        transfer: Transfer,
+        transfers: _TransferDict,
+        stream: _TransferStream,
+        future: Future,
+    ) -> bool:
+        """Begins a scheduled transfer, opening the stream if it isn't."""
+
+        # The transfer may have been cancelled or failed by a stream error
+        # while it was queued.
+        if transfer.done.is_set() or not future.set_running_or_notify_cancel():
+            if transfers.get(transfer.resource_id) is transfer:
+                del transfers[transfer.resource_id]
+            self._scheduled.pop(transfer, None)
+            return False
+
+        stream.open()
+
+        _LOG.debug('Starting new transfer %d', transfer.id)
         self._loop.call_soon_threadsafe(
             self._new_transfer_queue.put_nowait, transfer
         )
+        return True
+
+    def _finish_scheduled_transfer(self, transfer: Transfer) -> None:
+        """Resolves a transfer's future and frees its scheduler slot."""
+        scheduled = self._scheduled.pop(transfer, None)
+        if scheduled is None:
+            return
+
+        scheduled_transfer, future, on_finish = scheduled
+        if on_finish is not None:
+            on_finish(transfer)
+
+        if not future.done():
+            if not transfer.status.ok():
+                future.set_exception(
+                    Error(transfer.resource_id, transfer.status)
+                )
+            elif isinstance(transfer, ReadTransfer):
+                future.set_result(transfer.data)
+            else:
+                future.set_result(None)
+
+        self._scheduler.finished(scheduled_transfer)
 
     def _end_read_transfer(self, transfer: Transfer) -> None:
         """Completes a read transfer."""
@@ -507,21 +932,12 @@ class Manager:  # pylint: disable=too-many-instance-attributes
                 transfer.status,
             )
 
+        self._finish_scheduled_transfer(transfer)
+
         # If no more transfers are using the read stream, close it.
         if not self._read_transfers:
             self._read_stream.close()
 
-    def _start_write_transfer(self, transfer: Transfer) -> None:
-        """Begins a new write transfer, opening the stream if it isn't."""
-
-        self._write_transfers[transfer.resource_id] = transfer
-        self._write_stream.open()
-
-        _LOG.debug('Starting new write transfer %d', transfer.id)
-        self._loop.call_soon_threadsafe(
-            self._new_transfer_queue.put_nowait, transfer
-        )
-
     def _end_write_transfer(self, transfer: Transfer) -> None:
         """Completes a write transfer."""
         del self._write_transfers[transfer.resource_id]
@@ -533,11 +949,106 @@ class Manager:  # pylint: disable=too-many-instance-attributes
                 transfer.status,
             )
 
+        self._finish_scheduled_transfer(transfer)
+
         # If no more transfers are using the write stream, close it.
         if not self._write_transfers:
             self._write_stream.close()
 
 
+def _resume_read(
+    journal: TransferJournal,
+    output: BinaryIO,
+    initial_offset: int,
+    protocol_version: ProtocolVersion,
+) -> JournalEntry:
+    """Positions the output to continue a journaled read.
+
+    Returns:
+      The offset from which to read and the checksum of the data before it
+    """
+    if not (output.readable() and output.seekable()):
+        raise ValueError(
+            'A resumable read requires a readable, seekable output'
+        )
+
+    start = JournalEntry(initial_offset, 0)
+    base = output.tell()
+    entry = journal.load()
+
+    if entry is not None and entry.offset > initial_offset:
+        if protocol_version is ProtocolVersion.LEGACY:
+            _LOG.warning(
+                'Cannot resume read transfer %s with the legacy protocol',
+                journal.path,
+            )
+        elif checksum_stream(output, entry.offset - initial_offset) == (
+            entry.offset - initial_offset,
+            entry.checksum,
+        ):
+            _LOG.info(
+                'Resuming read transfer from offset %d (%s)',
+                entry.offset,
+                journal.path,
+            )
+            start = entry
+        else:
+            _LOG.warning(
+                'Output does not match journal %s; restarting read transfer',
+                journal.path,
+            )
+
+    # Discard any data received after the journaled offset.
+    output.seek(base + start.offset - initial_offset)
+    output.truncate()
+    return start
+
+
+def _resume_write(
+    journal: TransferJournal,
+    data: bytes,
+    initial_offset: int,
+    protocol_version: ProtocolVersion,
+) -> JournalEntry:
+    """Returns the offset from which to continue a journaled write."""
+    entry = journal.load()
+
+    if entry is None or entry.offset <= initial_offset:
+        return JournalEntry(initial_offset, 0)
+
+    if protocol_version is ProtocolVersion.LEGACY:
+        _LOG.warning(
+            'Cannot resume write transfer %s with the legacy protocol',
+            journal.path,
+        )
+    elif entry.offset - initial_offset <= len(data) and entry.checksum == (
+        zlib.crc32(memoryview(data)[: entry.offset - initial_offset])
+    ):
+        _LOG.info(
+            'Resuming write transfer from offset %d (%s)',
+            entry.offset,
+            journal.path,
+        )
+        return entry
+    else:
+        _LOG.warning(
+            'Data does not match journal %s; restarting write transfer',
+            journal.path,
+        )
+
+    return JournalEntry(initial_offset, 0)
+
+
+def _finish_journal(
+    transfer: Transfer, journal: TransferJournal, record: Callable[[], None]
+) -> None:
+    """Deletes the journal of a successful transfer or updates it."""
+    if transfer.status.ok():
+        journal.clear()
+    else:
+        record()
+
+
 class Error(Exception):
     """Exception raised when a transfer fails.
 
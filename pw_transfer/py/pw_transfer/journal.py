@@ -0,0 +1,237 @@
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""Records the progress of transfers in local files so they can be resumed."""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import BinaryIO, NamedTuple
+import zlib
+
+from pw_transfer.transfer import ProgressCallback, ProgressStats
+
+_LOG = logging.getLogger(__package__)
+
+# How much data is transferred between updates to a journal file.
+DEFAULT_INTERVAL_BYTES = 64 * 1024
+
+# The size of blocks in which data is read back to verify its checksum.
+_VERIFY_BLOCK_SIZE = 64 * 1024
+
+
+class JournalEntry(NamedTuple):
+    """The progress of a transfer.
+
+    Attributes:
+      offset: The offset up to which the data has been confirmed.
+      checksum: CRC-32 of the data from the transfer's initial offset up to
+          offset.
+    """
+
+    offset: int
+    checksum: int
+
+
+class TransferJournal:
+    """A file recording how far a transfer has progressed.
+
+    The file is replaced atomically on each update, so it always holds either
+    the previous or the new progress. Each journal belongs to a single resource,
+    direction, and initial offset; a journal file written for another transfer
+    is ignored.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        resource_id: int,
+        direction: str,
+        initial_offset: int = 0,
+    ):
+        self._path = Path(path)
+        self._resource_id = resource_id
+        self._direction = direction
+        self._initial_offset = initial_offset
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self) -> JournalEntry | None:
+        """Returns the recorded progress, or None if there is none."""
+        try:
+            state = json.loads(self._path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as err:
+            _LOG.warning('Ignoring unreadable journal %s: %s', self._path, err)
+            return None
+
+        if (
+            not isinstance(state, dict)
+            or state.get('resource_id') != self._resource_id
+            or state.get('direction') != self._direction
+            or state.get('initial_offset', 0) != self._initial_offset
+        ):
+            _LOG.warning(
+                'Ignoring journal %s, which is not for %s transfer %d',
+                self._path,
+                self._direction,
+                self._resource_id,
+            )
+            return None
+
+        try:
+            return JournalEntry(int(state['offset']), int(state['checksum']))
+        except (KeyError, TypeError, ValueError):
+            _LOG.warning('Ignoring malformed journal %s', self._path)
+            return None
+
+    def record(self, entry: JournalEntry) -> None:
+        """Replaces the recorded progress."""
+        temp_path = self._path.with_name(self._path.name + '.tmp')
+        temp_path.write_text(
+            json.dumps(
+                {
+                    'resource_id': self._resource_id,
+                    'direction': self._direction,
+                    'initial_offset': self._initial_offset,
+                    'offset': entry.offset,
+                    'checksum': entry.checksum,
+                }
+            )
+        )
+        os.replace(temp_path, self._path)
+
+    def clear(self) -> None:
+        """Deletes the journal file, if it exists."""
+        self._path.unlink(missing_ok=True)
+
+
+def checksum_stream(stream: BinaryIO, size: int) -> tuple[int, int]:
+    """Reads up to size bytes from a stream.
+
+    Returns:
+      The number of bytes read and their CRC-32.
+    """
+    checksum = 0
+    read = 0
+
+    while read < size:
+        block = stream.read(min(_VERIFY_BLOCK_SIZE, size - read))
+        if not block:
+            break
+        checksum = zlib.crc32(block, checksum)
+        read += len(block)
+
+    return read, checksum
+
+
+class JournalingWriter:
+    """Writes received data to an output, recording progress in a journal.
+
+    The output is flushed before each journal update, so the journal never
+    covers data that has not been handed to the operating system.
+    """
+
+    def __init__(
+        self,
+        output: BinaryIO,
+        journal: TransferJournal,
+        start: JournalEntry,
+        interval_bytes: int = DEFAULT_INTERVAL_BYTES,
+    ):
+        self._output = output
+        self._journal = journal
+        self._interval_bytes = interval_bytes
+        self._offset = start.offset
+        self._checksum = start.checksum
+        self._journaled_offset = start.offset
+
+    def write(self, data: bytes) -> int:
+        written = self._output.write(data)
+        self._checksum = zlib.crc32(data, self._checksum)
+        self._offset += len(data)
+
+        if self._offset - self._journaled_offset >= self._interval_bytes:
+            self.record()
+
+        return written
+
+    def record(self) -> None:
+        """Records the data written so far in the journal."""
+        self._output.flush()
+        self._journal.record(JournalEntry(self._offset, self._checksum))
+        self._journaled_offset = self._offset
+
+
+class JournalingProgressCallback:
+    """Records the data a receiver has confirmed from write progress updates.
+
+    Wraps the progress callback of a write transfer. Progress is recorded when
+    the confirmed offset has advanced by the journal interval, or when it moves
+    back because the receiver requested data again.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        data: bytes,
+        initial_offset: int,
+        journal: TransferJournal,
+        start: JournalEntry,
+        callback: ProgressCallback | None = None,
+        interval_bytes: int = DEFAULT_INTERVAL_BYTES,
+    ):
+        self._data = memoryview(data)
+        self._initial_offset = initial_offset
+        self._journal = journal
+        self._callback = callback
+        self._interval_bytes = interval_bytes
+        self._confirmed = start
+        self._journaled_offset = start.offset
+
+    def __call__(self, stats: ProgressStats) -> None:
+        offset = min(
+            max(stats.bytes_confirmed_received, self._initial_offset),
+            self._initial_offset + len(self._data),
+        )
+
+        if offset >= self._confirmed.offset:
+            checksum = zlib.crc32(
+                self._data[
+                    self._confirmed.offset
+                    - self._initial_offset : offset
+                    - self._initial_offset
+                ],
+                self._confirmed.checksum,
+            )
+        else:
+            checksum = zlib.crc32(self._data[: offset - self._initial_offset])
+
+        self._confirmed = JournalEntry(offset, checksum)
+
+        if (
+            offset < self._journaled_offset
+            or offset - self._journaled_offset >= self._interval_bytes
+        ):
+            self.record()
+
+        if self._callback is not None:
+            self._callback(stats)
+
+    def record(self) -> None:
+        """Records the data confirmed so far in the journal."""
+        self._journal.record(self._confirmed)
+        self._journaled_offset = self._confirmed.offset
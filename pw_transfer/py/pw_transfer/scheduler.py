@@ -0,0 +1,187 @@
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""Scheduling of concurrent transfers across one or more Managers."""
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+import logging
+import threading
+from typing import Callable, Hashable
+
+_LOG = logging.getLogger(__package__)
+
+
+@dataclass(eq=False)
+class ScheduledTransfer:
+    """A transfer submitted to a TransferScheduler.
+
+    Attributes:
+      queue: Key of the queue the transfer waits in, typically its Manager.
+          Transfers in different queues take turns starting.
+      start: Starts the transfer. Returns False if it was cancelled while
+          waiting, in which case it does not occupy a slot.
+      limit_window_size: For transfers whose window is set by this client
+          (reads), sets the largest window the transfer may request. The
+          limit is applied before the transfer starts and whenever the set of
+          active transfers changes.
+    """
+
+    queue: Hashable
+    start: Callable[[], bool]
+    limit_window_size: Callable[[int], None] | None = None
+
+
+class TransferScheduler:
+    """Limits how many transfers run at once and shares the link between them.
+
+    Transfers submitted to a Manager wait in a queue for that Manager until the
+    scheduler has a free slot. A scheduler may be shared by several Managers,
+    such as one per device, in which case the limits apply to their combined
+    transfers, and the Managers' queues take turns starting transfers so that
+    a long backlog on one device does not starve another.
+
+    The aggregate window budget is divided evenly between the active read
+    transfers, which sets how much unacknowledged data each may have in flight
+    and therefore shares the link bandwidth fairly. Each read window is still at
+    least one chunk. Write windows are chosen by the server, so they do not
+    count against the budget; active writes on a Manager are interleaved chunk
+    by chunk on its transfer thread.
+
+    This class is thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_transfers: int | None = None,
+        max_window_size_bytes: int | None = None,
+    ):
+        """Creates a scheduler.
+
+        Args:
+          max_concurrent_transfers: Maximum number of transfers to run at
+              once. Others wait until one finishes. None for no limit.
+          max_window_size_bytes: Total window size shared by active read
+              transfers. None to let each use its own maximum window size.
+        """
+        if (
+            max_concurrent_transfers is not None
+            and max_concurrent_transfers < 1
+        ):
+            raise ValueError('max_concurrent_transfers must be at least 1')
+
+        if max_window_size_bytes is not None and max_window_size_bytes < 1:
+            raise ValueError('max_window_size_bytes must be at least 1')
+
+        self._max_concurrent_transfers = max_concurrent_transfers
+        self._max_window_size_bytes = max_window_size_bytes
+
+        self._lock = threading.RLock()
+        self._queues: OrderedDict[
+            Hashable, deque[ScheduledTransfer]
+        ] = OrderedDict()
+        self._active: list[ScheduledTransfer] = []
+
+    @property
+    def active_transfers(self) -> int:
+        """Returns the number of transfers that are running."""
+        with self._lock:
+            return len(self._active)
+
+    @property
+    def pending_transfers(self) -> int:
+        """Returns the number of transfers waiting to start."""
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def submit(self, transfer: ScheduledTransfer) -> None:
+        """Queues a transfer, starting it if there is a free slot."""
+        with self._lock:
+            self._queues.setdefault(transfer.queue, deque()).append(transfer)
+
+        self._dispatch()
+
+    def finished(self, transfer: ScheduledTransfer) -> None:
+        """Releases the slot of a completed transfer and starts the next one.
+
+        Does nothing if the transfer is not active.
+        """
+        with self._lock:
+            try:
+                self._active.remove(transfer)
+            except ValueError:
+                return
+
+        # The remaining reads get a larger share of the window budget.
+        self._dispatch(rebalance=True)
+
+    def _dispatch(self, rebalance: bool = False) -> None:
+        """Starts queued transfers while there are free slots."""
+        while True:
+            with self._lock:
+                starting = self._take_pending()
+                if not starting and not rebalance:
+                    return
+
+                window_size = self._read_window_size()
+                reads = [t for t in self._active if t.limit_window_size]
+
+            # The new window sizes are set before the transfers start, which
+            # Managers do in order on their transfer threads.
+            if window_size is not None:
+                for read in reads:
+                    assert read.limit_window_size is not None
+                    read.limit_window_size(window_size)
+
+            rebalance = False
+            for transfer in starting:
+                if not transfer.start():
+                    _LOG.debug('Skipping transfer cancelled before starting')
+                    with self._lock:
+                        self._active.remove(transfer)
+                    rebalance = True
+
+            if not starting:
+                return
+
+    def _take_pending(self) -> list[ScheduledTransfer]:
+        """Moves transfers from the queues to the active list, round-robin."""
+        taken: list[ScheduledTransfer] = []
+
+        while self._queues and (
+            self._max_concurrent_transfers is None
+            or len(self._active) < self._max_concurrent_transfers
+        ):
+            key, queue = next(iter(self._queues.items()))
+            transfer = queue.popleft()
+
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+
+            self._active.append(transfer)
+            taken.append(transfer)
+
+        return taken
+
+    def _read_window_size(self) -> int | None:
+        """Returns each active read's share of the window budget."""
+        if self._max_window_size_bytes is None:
+            return None
+
+        reads = sum(1 for t in self._active if t.limit_window_size)
+        if reads == 0:
+            return None
+
+        return self._max_window_size_bytes // reads
@@ -15,12 +15,21 @@
 
 import abc
 import asyncio
+from collections import deque
 from dataclasses import dataclass
 import enum
 import logging
 import math
 import threading
-from typing import Any, Callable
+import time
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Iterator,
+)
 
 from pw_status import Status
 from pw_transfer.chunk import Chunk, ProtocolVersion
@@ -52,6 +61,9 @@ class ProgressStats:
 
 ProgressCallback = Callable[[ProgressStats], Any]
 
+# A stream from which a write transfer reads the data it sends.
+WriteSource = BinaryIO | AsyncIterable[bytes]
+
 
 class _Timer:
     """A timer which invokes a callback after a certain timeout."""
@@ -84,6 +96,71 @@ class _Timer:
         self._callback()
 
 
+class _LinkEstimator:
+    """Estimates the round-trip time and bandwidth of a transfer's link.
+
+    The retransmit timeout is derived from the smoothed RTT and its variation as
+    in RFC 6298. The bandwidth-delay product uses the highest recent delivery
+    rate and the lowest recent RTT. Rates measured while the window limits the
+    transfer are too low, and RTTs measured while data is queued are too high.
+    """
+
+    # The number of recent samples from which the bandwidth and minimum RTT are
+    # taken.
+    _SAMPLES = 8
+
+    # Bounds for the retransmit timeout. The lower bound is well below the 1
+    # second of RFC 6298 so that loss on fast local links is recovered quickly.
+    MIN_RETRANSMIT_TIMEOUT_S = 0.05
+    MAX_RETRANSMIT_TIMEOUT_S = 60.0
+
+    def __init__(self) -> None:
+        self._smoothed_rtt_s: float | None = None
+        self._rtt_variation_s = 0.0
+        self._rtt_samples: deque[float] = deque(maxlen=self._SAMPLES)
+        self._rate_samples: deque[float] = deque(maxlen=self._SAMPLES)
+
+    def add_rtt_sample(self, rtt_s: float) -> None:
+        if self._smoothed_rtt_s is None:
+            self._smoothed_rtt_s = rtt_s
+            self._rtt_variation_s = rtt_s / 2
+        else:
+            self._rtt_variation_s = 0.75 * self._rtt_variation_s + 0.25 * abs(
+                self._smoothed_rtt_s - rtt_s
+            )
+            self._smoothed_rtt_s = 0.875 * self._smoothed_rtt_s + 0.125 * rtt_s
+
+        self._rtt_samples.append(rtt_s)
+
+    def add_delivery_rate_sample(self, bytes_per_s: float) -> None:
+        self._rate_samples.append(bytes_per_s)
+
+    def bandwidth(self) -> float | None:
+        """Returns the estimated bandwidth in bytes per second, if known."""
+        return max(self._rate_samples) if self._rate_samples else None
+
+    def bandwidth_delay_product(self) -> float | None:
+        """Returns the bytes in flight needed to fill the link, if known."""
+        bandwidth = self.bandwidth()
+        if bandwidth is None or not self._rtt_samples:
+            return None
+
+        return bandwidth * min(self._rtt_samples)
+
+    def retransmit_timeout_s(self) -> float | None:
+        """Returns the timeout derived from the RTT samples, if any."""
+        if self._smoothed_rtt_s is None:
+            return None
+
+        return min(
+            max(
+                self._smoothed_rtt_s + 4 * self._rtt_variation_s,
+                self.MIN_RETRANSMIT_TIMEOUT_S,
+            ),
+            self.MAX_RETRANSMIT_TIMEOUT_S,
+        )
+
+
 class Transfer(abc.ABC):
     """A client-side data transfer through a Manager.
 
@@ -220,6 +297,10 @@ class Transfer(abc.ABC):
     def _set_initial_chunk_fields(self, chunk: Chunk) -> None:
         """Sets fields for the initial non-handshake chunk of the transfer."""
 
+    def _size_bytes(self) -> int:
+        """Returns the size of the data transferred."""
+        return len(self.data)
+
     def _send_chunk(self, chunk: Chunk) -> None:
         """Sends a chunk to the server, keeping track of the last chunk sent."""
         self._send_chunk_fn(chunk)
@@ -396,7 +477,7 @@ class Transfer(abc.ABC):
         self.status = status
 
         if status.ok():
-            total_size = len(self.data)
+            total_size = self._size_bytes()
             self._update_progress(total_size, total_size, total_size)
 
         if not skip_callback:
@@ -442,14 +523,88 @@ class Transfer(abc.ABC):
             self.finish(status)
 
 
+class _StreamSource:
+    """Provides write transfer data read incrementally from a stream.
+
+    Data is kept from the last offset the receiver confirmed so that it can be
+    retransmitted, so at most about one window of data is held in memory.
+    """
+
+    def __init__(self, source: WriteSource, offset: int):
+        if isinstance(source, AsyncIterable):
+            self._blocks: AsyncIterator[bytes] | None = aiter(source)
+            self._file: BinaryIO | None = None
+        else:
+            self._blocks = None
+            self._file = source
+
+        self._buffer = bytearray()
+        self._buffer_offset = offset
+        self._end_of_stream = False
+
+    @property
+    def start_offset(self) -> int:
+        """Returns the earliest offset that can still be read."""
+        return self._buffer_offset
+
+    async def read(self, offset: int, size: int) -> tuple[bytes, bool]:
+        """Returns up to size bytes from offset and whether they end the data.
+
+        Reads one byte past the requested range, if available, so that the
+        final chunk of the transfer can be identified.
+        """
+        assert offset >= self._buffer_offset
+
+        end = offset + size
+        while (
+            not self._end_of_stream
+            and self._buffer_offset + len(self._buffer) <= end
+        ):
+            block = await self._read_block(
+                end + 1 - self._buffer_offset - len(self._buffer)
+            )
+            if block:
+                self._buffer += block
+            else:
+                self._end_of_stream = True
+
+        start = offset - self._buffer_offset
+        data = bytes(self._buffer[start : start + size])
+        return data, self._end_of_stream and start + len(data) == len(
+            self._buffer
+        )
+
+    def release(self, offset: int) -> None:
+        """Discards buffered data before an offset the receiver confirmed."""
+        released = min(offset - self._buffer_offset, len(self._buffer))
+        if released > 0:
+            del self._buffer[:released]
+            self._buffer_offset += released
+
+    async def _read_block(self, size: int) -> bytes:
+        if self._file is not None:
+            return self._file.read(size)
+
+        assert self._blocks is not None
+        try:
+            return await anext(self._blocks)
+        except StopAsyncIteration:
+            return b''
+
+
 class WriteTransfer(Transfer):
-    """A client -> server write transfer."""
+    """A client -> server write transfer.
+
+    The data to send is either provided in full as bytes or read incrementally
+    from a file-like object or async iterable of bytes. A streamed source must
+    start at initial_offset; its size is unknown until it is exhausted.
+    """
 
     def __init__(  # pylint: disable=too-many-arguments
         self,
         session_id: int,
         resource_id: int,
-        data: bytes,
+        data: bytes | WriteSource,
         send_chunk: Callable[[Chunk], None],
         end_transfer: Callable[[Transfer], None],
         response_timeout_s: float,
@@ -473,9 +628,17 @@ class WriteTransfer(Transfer):
             progress_callback,
             initial_offset=initial_offset,
         )
-        self._data = data
         self.initial_offset = initial_offset
 
+        if isinstance(data, (bytes, bytearray)):
+            self._data = bytes(data)
+            self._source: _StreamSource | None = None
+            self._end_offset: int | None = len(data) + initial_offset
+        else:
+            self._data = b''
+            self._source = _StreamSource(data, initial_offset)
+            self._end_offset = None
+
         self._window_end_offset = 0
         self._max_chunk_size = 0
         self._chunk_delay_us: int | None = None
@@ -487,8 +650,15 @@ class WriteTransfer(Transfer):
 
     @property
     def data(self) -> bytes:
+        """Returns the data to write, or b'' if it is read from a stream."""
         return self._data
 
+    def _size_bytes(self) -> int:
+        if self._source is None or self._end_offset is None:
+            return len(self.data)
+
+        return self._end_offset - self.initial_offset
+
     def _set_initial_chunk_fields(self, chunk: Chunk) -> None:
         # Nothing to tag onto the initial chunk in a write transfer.
         pass
@@ -510,6 +680,9 @@ class WriteTransfer(Transfer):
             return
 
         self._bytes_confirmed_received = chunk.offset
+        if self._source is not None:
+            self._source.release(chunk.offset)
+
         self._state = Transfer._State.TRANSMITTING
 
         self._window_id += 1
@@ -533,16 +706,29 @@ class WriteTransfer(Transfer):
             _LOG.debug('Transfer %d: Skipping stale window', self.id)
             return
 
-        chunk = self._next_chunk()
+        chunk = await self._next_chunk()
+
+        # Reading from an async source may yield to a parameters update.
+        if (
+            self._state is not Transfer._State.TRANSMITTING
+            or window_id != self._window_id
+        ):
+            return
+
         self._offset += len(chunk.data)
 
-        sent_requested_bytes = self._offset == self._window_end_offset
+        # The size of streamed data is known once the stream is exhausted.
+        if chunk.remaining_bytes == 0:
+            self._end_offset = self._offset
+
+        sent_requested_bytes = self._offset in (
+            self._window_end_offset,
+            self._end_offset,
+        )
 
         self._send_chunk(chunk)
         self._update_progress(
-            self._offset,
-            self._bytes_confirmed_received,
-            len(self.data) + self.initial_offset,
+            self._offset, self._bytes_confirmed_received, self._end_offset
         )
 
         if sent_requested_bytes:
@@ -557,13 +743,29 @@ class WriteTransfer(Transfer):
     def _handle_parameters_update(self, chunk: Chunk) -> bool:
         """Updates transfer state based on a transfer parameters update."""
 
-        if chunk.offset > len(self.data) + self.initial_offset:
+        if self._end_offset is not None and chunk.offset > self._end_offset:
             # Bad offset; terminate the transfer.
             _LOG.error(
                 'Transfer %d: server requested invalid offset %d (size %d)',
                 self.id,
                 chunk.offset,
-                len(self.data) + self.initial_offset,
+                self._end_offset,
+            )
+
+            self._send_final_chunk(Status.OUT_OF_RANGE)
+            return False
+
+        if (
+            self._source is not None
+            and chunk.offset < self._source.start_offset
+        ):
+            # Streamed data before the confirmed offset has been discarded.
+            _LOG.error(
+                'Transfer %d: server requested offset %d, which precedes '
+                'the confirmed offset %d of the streamed data',
+                self.id,
+                chunk.offset,
+                self._source.start_offset,
             )
 
             self._send_final_chunk(Status.OUT_OF_RANGE)
@@ -578,9 +780,11 @@ class WriteTransfer(Transfer):
             return False
 
         # Extend the window to the new end offset specified by the server.
-        self._window_end_offset = min(
-            chunk.window_end_offset, len(self.data) + self.initial_offset
-        )
+        self._window_end_offset = chunk.window_end_offset
+        if self._end_offset is not None:
+            self._window_end_offset = min(
+                self._window_end_offset, self._end_offset
+            )
 
         if chunk.requests_transmission_from_offset():
             # Check whether the client has sent a previous data offset, which
@@ -610,7 +814,7 @@ class WriteTransfer(Transfer):
         ):
             self._send_chunk(self._last_chunk)
 
-    def _next_chunk(self) -> Chunk:
+    async def _next_chunk(self) -> Chunk:
         """Returns the next Chunk message to send in the data transfer."""
         chunk = Chunk(
             self._configured_protocol_version,
@@ -622,6 +826,15 @@ class WriteTransfer(Transfer):
         max_bytes_in_chunk = min(
             self._max_chunk_size, self._window_end_offset - self._offset
         )
+
+        if self._source is not None:
+            chunk.data, end_of_data = await self._source.read(
+                self._offset, max_bytes_in_chunk
+            )
+            if end_of_data:
+                chunk.remaining_bytes = 0
+            return chunk
+
         chunk.data = self.data[
             self._offset
             - self.initial_offset : self._offset
@@ -645,6 +858,14 @@ class ReadTransfer(Transfer):
     Although Python can effectively handle an unlimited transfer window, this
     client sets a conservative window and chunk size to avoid overloading the
     device. These are configurable in the constructor.
+
+    Received data is accumulated in memory unless an output stream is provided,
+    in which case each chunk is written to it as soon as it is in order.
+
+    With adaptive congestion control, the transfer measures the round-trip time
+    of each window extension and the rate at which data arrives. The timeout
+    for retrying is derived from the measured RTT, and the window is sized from
+    the bandwidth-delay product rather than growing by a fixed amount.
     """
 
     # pylint: disable=too-many-instance-attributes
@@ -658,6 +879,13 @@ class ReadTransfer(Transfer):
     # third of the window, and so on.
     EXTEND_WINDOW_DIVISOR = 2
 
+    # With adaptive congestion control, the multiple of the measured
+    # bandwidth-delay product to which the window is set. The window is larger
+    # than the product so that the transfer can discover more bandwidth. Growth
+    # is more cautious once data has been lost.
+    SLOW_START_WINDOW_GAIN = 2.0
+    CONGESTION_AVOIDANCE_WINDOW_GAIN = 1.25
+
     # Slow start and congestion avoidance are analogues to the equally named
     # phases in TCP congestion control.
     class _TransmitPhase(enum.Enum):
@@ -679,6 +907,10 @@ class ReadTransfer(Transfer):
         # Rewind the transfer to a certain offset following data loss.
         RETRANSMIT = 3
 
+        # Move the transmitter past data that was received out of order, or
+        # request missing data again, without treating it as a new packet loss.
+        RETRANSMIT_MISSING = 4
+
     def __init__(  # pylint: disable=too-many-arguments
         self,
         session_id: int,
@@ -695,6 +927,9 @@ class ReadTransfer(Transfer):
         chunk_delay_us: int | None = None,
         progress_callback: ProgressCallback | None = None,
         initial_offset: int = 0,
+        buffer_out_of_order_chunks: bool = False,
+        output: BinaryIO | None = None,
+        adaptive_congestion_control: bool = False,
     ):
         super().__init__(
             session_id,
@@ -710,22 +945,67 @@ class ReadTransfer(Transfer):
             initial_offset=initial_offset,
         )
         self._max_window_size_bytes = max_window_size_bytes
+        self._window_size_limit_bytes = max_window_size_bytes
         self._max_chunk_size = max_chunk_size
         self._chunk_delay_us = chunk_delay_us
 
         self._remaining_transfer_size: int | None = None
         self._data = bytearray()
+        self._output = output
+        self._bytes_written = 0
         self._window_end_offset = max_chunk_size
         self._window_size_multiplier = 1
         self._window_size = self._max_chunk_size * self._window_size_multiplier
         self._transmit_phase = ReadTransfer._TransmitPhase.SLOW_START
         self._last_chunk_offset: int | None = None
 
+        # If enabled, chunks received after a gap in the data are kept until
+        # the gap is filled, rather than being retransmitted by the server.
+        self._buffer_out_of_order_chunks = buffer_out_of_order_chunks
+        self._out_of_order_chunks: dict[int, Chunk] = {}
+
+        # The end of the largest window requested so far. Chunks sent for an
+        # earlier window may arrive after the window is narrowed to request
+        # missing data.
+        self._furthest_window_end_offset = self._window_end_offset
+
+        self._link = _LinkEstimator() if adaptive_congestion_control else None
+        self._configured_timeout_s = response_timeout_s
+
+        # An RTT measurement in progress: when a window extension was sent, the
+        # end of the window before it, and how much of that window was still to
+        # be received. The first data past the old window ends the measurement.
+        self._rtt_sample_start: tuple[float, int, int] | None = None
+
+        # The time and offset from which the next delivery rate is measured.
+        self._rate_sample_start: tuple[float, int] | None = None
+
     @property
     def data(self) -> bytes:
-        """Returns an immutable copy of the data that has been read."""
+        """Returns an immutable copy of the data that has been read.
+
+        Empty if the data was written to an output stream.
+        """
         return bytes(self._data)
 
+    def _size_bytes(self) -> int:
+        return len(self._data) + self._bytes_written
+
+    def limit_window_size(self, max_bytes: int) -> None:
+        """Lowers the largest window the transfer requests from the server.
+
+        The limit cannot raise the window above the size the transfer was
+        created with, or lower it below one chunk. It applies from the next
+        transfer parameters chunk. Must be called from the transfer thread.
+        """
+        self._window_size_limit_bytes = max(
+            min(max_bytes, self._max_window_size_bytes), self._max_chunk_size
+        )
+        self._window_size_multiplier = min(
+            self._window_size_multiplier,
+            self._window_size_limit_bytes // self._max_chunk_size,
+        )
+
     def _set_initial_chunk_fields(self, chunk: Chunk) -> None:
         self._update_and_set_transfer_parameters(
             chunk, ReadTransfer._TransmitAction.BEGIN
@@ -738,6 +1018,13 @@ class ReadTransfer(Transfer):
         Once all pending data is received, the transfer parameters are updated.
         """
 
+        if self._link is not None:
+            self._measure_link(chunk)
+
+        if self._buffer_out_of_order_chunks:
+            self._handle_data_chunk_buffered(chunk)
+            return
+
         if self._state is Transfer._State.RECOVERY:
             if chunk.offset != self._offset:
                 if self._last_chunk_offset == chunk.offset:
@@ -791,7 +1078,152 @@ class ReadTransfer(Transfer):
             )
             return
 
-        self._data += chunk.data
+        if self._receive_data(chunk):
+            return
+
+        self._report_progress()
+
+        if not self._update_window_end_offset(chunk):
+            return
+
+        self._extend_window_if_needed()
+
+    def _handle_data_chunk_buffered(self, chunk: Chunk) -> None:
+        """Processes a data chunk, keeping chunks received out of order.
+
+        Chunks that follow a gap in the received data are buffered if they fall
+        within a requested window, rather than discarded. The server is asked to
+        retransmit from the gap as usual, but once the missing data arrives,
+        the buffered chunks are appended and the server is moved past them to
+        the next gap or the end of the received data. Only the missing data and
+        the chunks already in flight are sent again.
+        """
+        chunk_end = chunk.offset + len(chunk.data)
+
+        if chunk.offset < self._offset:
+            if chunk_end <= self._offset:
+                _LOG.debug(
+                    'Transfer %d ignoring repeated data at offset %d',
+                    self.id,
+                    chunk.offset,
+                )
+                return
+
+            # Keep only the part of the chunk that has not been received.
+            chunk.data = chunk.data[self._offset - chunk.offset :]
+            chunk.offset = self._offset
+
+        if chunk.offset > self._offset:
+            self._buffer_chunk(chunk)
+            return
+
+        if self._receive_data(chunk):
+            return
+
+        if not self._update_window_end_offset(chunk):
+            return
+
+        appended_buffered_chunks = False
+        for buffered in self._pop_contiguous_chunks():
+            appended_buffered_chunks = True
+            if self._receive_data(buffered):
+                return
+
+        self._report_progress()
+
+        if not self._out_of_order_chunks and (
+            self._state is Transfer._State.RECOVERY
+        ):
+            _LOG.debug(
+                'Transfer %d received missing data, resuming at offset %d',
+                self.id,
+                self._offset,
+            )
+            self._state = Transfer._State.WAITING
+
+        if appended_buffered_chunks:
+            # The server is resending data that was already buffered. Move it
+            # past that data, to the next gap if there is one.
+            self._send_chunk(
+                self._transfer_parameters(
+                    ReadTransfer._TransmitAction.RETRANSMIT_MISSING
+                )
+            )
+        elif self._state is Transfer._State.WAITING:
+            self._extend_window_if_needed()
+
+    def _buffer_chunk(self, chunk: Chunk) -> None:
+        """Keeps a chunk that arrived ahead of the expected offset."""
+        if chunk.offset + len(chunk.data) > self._furthest_window_end_offset:
+            _LOG.debug(
+                'Transfer %d ignoring chunk at offset %d outside of window',
+                self.id,
+                chunk.offset,
+            )
+            return
+
+        if chunk.offset in self._out_of_order_chunks:
+            # If the first chunk after the gap is received again, the server
+            # retransmitted past the gap without the missing data arriving.
+            if self._state is Transfer._State.RECOVERY and chunk.offset == min(
+                self._out_of_order_chunks
+            ):
+                _LOG.debug(
+                    'Transfer %d still missing offset %d, requesting it again',
+                    self.id,
+                    self._offset,
+                )
+                self._send_chunk(
+                    self._transfer_parameters(
+                        ReadTransfer._TransmitAction.RETRANSMIT_MISSING
+                    )
+                )
+            return
+
+        self._out_of_order_chunks[chunk.offset] = chunk
+
+        if self._state is Transfer._State.RECOVERY:
+            return  # The missing data was already requested.
+
+        _LOG.debug(
+            'Transfer %d expected offset %d, received %d: '
+            'requesting missing data',
+            self.id,
+            self._offset,
+            chunk.offset,
+        )
+        self._state = Transfer._State.RECOVERY
+        self._send_chunk(
+            self._transfer_parameters(ReadTransfer._TransmitAction.RETRANSMIT)
+        )
+
+    def _pop_contiguous_chunks(self) -> Iterator[Chunk]:
+        """Yields buffered chunks that continue the received data in order."""
+        while self._out_of_order_chunks:
+            offset = min(self._out_of_order_chunks)
+            if offset > self._offset:
+                return
+
+            chunk = self._out_of_order_chunks.pop(offset)
+            if offset == self._offset or (
+                offset + len(chunk.data) > self._offset
+            ):
+                chunk.data = chunk.data[self._offset - offset :]
+                chunk.offset = self._offset
+                yield chunk
+
+    def _receive_data(self, chunk: Chunk) -> bool:
+        """Appends the data from a chunk at the current offset.
+
+        Returns:
+          True if the chunk completed the transfer
+        """
+        if self._output is None:
+            self._data += chunk.data
+        else:
+            self._output.write(chunk.data)
+            self._bytes_written += len(chunk.data)
+
         self._offset += len(chunk.data)
 
         # Update the last offset seen so that retries can be detected.
@@ -801,7 +1233,7 @@ class ReadTransfer(Transfer):
             if chunk.remaining_bytes == 0:
                 # No more data to read. Acknowledge receipt and finish.
                 self._send_final_chunk(Status.OK)
-                return
+                return True
 
             # The server may indicate if the amount of remaining data is known.
             self._remaining_transfer_size = chunk.remaining_bytes
@@ -813,6 +1245,9 @@ class ReadTransfer(Transfer):
             if self._remaining_transfer_size <= 0:
                 self._remaining_transfer_size = None
 
+        return False
+
+    def _report_progress(self) -> None:
         total_size = (
             None
             if self._remaining_transfer_size is None
@@ -820,32 +1255,49 @@ class ReadTransfer(Transfer):
         )
         self._update_progress(self._offset, self._offset, total_size)
 
-        if chunk.window_end_offset != 0:
-            if chunk.window_end_offset < self._offset:
-                _LOG.error(
-                    'Transfer %d: transmitter sent invalid earlier end offset '
-                    '%d (receiver offset %d)',
-                    self.id,
-                    chunk.window_end_offset,
-                    self._offset,
-                )
-                self._send_final_chunk(Status.INTERNAL)
-                return
+    def _update_window_end_offset(self, chunk: Chunk) -> bool:
+        """Applies the window end offset sent with a data chunk, if any.
 
-            if chunk.window_end_offset > self._window_end_offset:
-                _LOG.error(
-                    'Transfer %d: transmitter sent invalid later end offset '
-                    '%d (receiver end offset %d)',
-                    self.id,
-                    chunk.window_end_offset,
-                    self._window_end_offset,
-                )
-                self._send_final_chunk(Status.INTERNAL)
-                return
+        Returns:
+          False if the offset was invalid and the transfer was terminated
+        """
+        if chunk.window_end_offset == 0:
+            return True
 
-            self._window_end_offset = chunk.window_end_offset
+        if chunk.window_end_offset < self._offset:
+            _LOG.error(
+                'Transfer %d: transmitter sent invalid earlier end offset '
+                '%d (receiver offset %d)',
+                self.id,
+                chunk.window_end_offset,
+                self._offset,
+            )
+            self._send_final_chunk(Status.INTERNAL)
+            return False
 
-        if self._offset == self._window_end_offset:
+        max_window_end_offset = (
+            self._furthest_window_end_offset
+            if self._buffer_out_of_order_chunks
+            else self._window_end_offset
+        )
+        if chunk.window_end_offset > max_window_end_offset:
+            _LOG.error(
+                'Transfer %d: transmitter sent invalid later end offset '
+                '%d (receiver end offset %d)',
+                self.id,
+                chunk.window_end_offset,
+                max_window_end_offset,
+            )
+            self._send_final_chunk(Status.INTERNAL)
+            return False
+
+        self._window_end_offset = min(
+            self._window_end_offset, chunk.window_end_offset
+        )
+        return True
+
+    def _extend_window_if_needed(self) -> None:
+        if self._offset >= self._window_end_offset:
             # All pending data was received. Send out a new parameters chunk for
             # the next block.
             self._send_chunk(
@@ -864,7 +1316,74 @@ class ReadTransfer(Transfer):
                 self._transfer_parameters(ReadTransfer._TransmitAction.EXTEND)
             )
 
+    def _start_rtt_sample(self, action: 'ReadTransfer._TransmitAction') -> None:
+        """Begins measuring the RTT of a window extension about to be sent.
+
+        Only one measurement is made at a time. Parameters sent to recover from
+        loss or at the start of the transfer may be retried, and responses to
+        retries are ambiguous, so they are not measured.
+        """
+        if action is not ReadTransfer._TransmitAction.EXTEND:
+            self._rtt_sample_start = None
+        elif self._rtt_sample_start is None:
+            self._rtt_sample_start = (
+                time.monotonic(),
+                self._window_end_offset,
+                max(self._window_end_offset - self._offset, 0),
+            )
+
+    def _measure_link(self, chunk: Chunk) -> None:
+        """Takes RTT and delivery rate samples once an extension is served."""
+        assert self._link is not None
+
+        if self._rtt_sample_start is None:
+            return
+
+        sent_s, previous_window_end, outstanding = self._rtt_sample_start
+        if chunk.offset + len(chunk.data) <= previous_window_end:
+            return
+
+        now = time.monotonic()
+        self._rtt_sample_start = None
+
+        if self._rate_sample_start is not None:
+            start_s, start_offset = self._rate_sample_start
+            if now > start_s and self._offset > start_offset:
+                self._link.add_delivery_rate_sample(
+                    (self._offset - start_offset) / (now - start_s)
+                )
+        self._rate_sample_start = (now, self._offset)
+
+        rtt_s = now - sent_s
+        if outstanding:
+            # The transmitter sent the rest of the old window before this data,
+            # which took the time to transmit it at the link's bandwidth.
+            bandwidth = self._link.bandwidth()
+            if bandwidth is None:
+                return
+            rtt_s -= outstanding / bandwidth
+
+        if rtt_s > 0:
+            self._link.add_rtt_sample(rtt_s)
+            timeout_s = self._link.retransmit_timeout_s()
+            assert timeout_s is not None
+            self._response_timer.timeout_s = timeout_s
+
     def _retry_after_data_timeout(self) -> None:
+        if self._link is not None:
+            # The response to a retried chunk cannot be told apart from the
+            # response to the original, so it is not measured. Back off until
+            # the next measurement, up to the configured timeout or the
+            # measured one, whichever is longer.
+            self._rtt_sample_start = None
+            self._response_timer.timeout_s = min(
+                2 * self._response_timer.timeout_s,
+                max(
+                    self._configured_timeout_s,
+                    self._link.retransmit_timeout_s() or 0.0,
+                ),
+            )
+
         if (
             self._state is Transfer._State.WAITING
             or self._state is Transfer._State.RECOVERY
@@ -879,10 +1398,37 @@ class ReadTransfer(Transfer):
         self, chunk: Chunk, action: 'ReadTransfer._TransmitAction'
     ) -> None:
         if action is ReadTransfer._TransmitAction.EXTEND:
+            bandwidth_delay_product = (
+                None
+                if self._link is None
+                else self._link.bandwidth_delay_product()
+            )
+
+            if bandwidth_delay_product is not None:
+                # Size the window from the measured bandwidth-delay product,
+                # but at most double it, so that a single fast sample cannot
+                # flood the transmitter.
+                gain = (
+                    ReadTransfer.SLOW_START_WINDOW_GAIN
+                    if self._transmit_phase
+                    == ReadTransfer._TransmitPhase.SLOW_START
+                    else ReadTransfer.CONGESTION_AVOIDANCE_WINDOW_GAIN
+                )
+                self._window_size_multiplier = min(
+                    max(
+                        round(
+                            gain
+                            * bandwidth_delay_product
+                            / self._max_chunk_size
+                        ),
+                        1,
+                    ),
+                    2 * self._window_size_multiplier,
+                )
             # Window was received succesfully without packet loss and should
             # grow. Double the window size during slow start, or increase it by
             # a single chunk in congestion avoidance.
-            if self._transmit_phase == ReadTransfer._TransmitPhase.SLOW_START:
+            elif self._transmit_phase == ReadTransfer._TransmitPhase.SLOW_START:
                 self._window_size_multiplier *= 2
             else:
                 self._window_size_multiplier += 1
@@ -891,10 +1437,10 @@ class ReadTransfer(Transfer):
             # If it does, reduce the multiplier to the largest size that fits.
             if (
                 self._window_size_multiplier * self._max_chunk_size
-                > self._max_window_size_bytes
+                > self._window_size_limit_bytes
             ):
                 self._window_size_multiplier = (
-                    self._max_window_size_bytes // self._max_chunk_size
+                    self._window_size_limit_bytes // self._max_chunk_size
                 )
 
         elif action is ReadTransfer._TransmitAction.RETRANSMIT:
@@ -911,11 +1457,18 @@ class ReadTransfer(Transfer):
 
         self._window_size = min(
             self._max_chunk_size * self._window_size_multiplier,
-            self._max_window_size_bytes,
+            self._window_size_limit_bytes,
         )
 
+        if self._link is not None:
+            self._start_rtt_sample(action)
+
         self._window_end_offset = self._offset + self._window_size
 
+        self._furthest_window_end_offset = max(
+            self._furthest_window_end_offset, self._window_end_offset
+        )
+
         chunk.offset = self._offset
         chunk.window_end_offset = self._window_end_offset
         chunk.max_chunk_size_bytes = self._max_chunk_size
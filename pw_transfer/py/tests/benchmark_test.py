@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""Tests the read transfer loss benchmark."""
+
+import unittest
+
+from pw_transfer import benchmark
+
+
+class BenchmarkTest(unittest.TestCase):
+    """Runs small simulated transfers in each receive mode."""
+
+    def test_lossless(self) -> None:
+        for buffered in (False, True):
+            result = benchmark.run(0, buffered, size_bytes=8192)
+
+            self.assertEqual(result.status, 'Status.OK')
+            self.assertEqual(result.transmitted_bytes, 8192)
+            self.assertEqual(result.timeouts, 0)
+
+    def test_lossy(self) -> None:
+        in_order = benchmark.run(0.05, False, size_bytes=32768, seed=3)
+        buffered = benchmark.run(0.05, True, size_bytes=32768, seed=3)
+
+        self.assertEqual(in_order.status, 'Status.OK')
+        self.assertEqual(buffered.status, 'Status.OK')
+        self.assertEqual(buffered.mode, 'buffered')
+        self.assertGreater(in_order.transmitted_bytes, 32768)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""Tests for transfer journals."""
+
+import io
+from pathlib import Path
+import tempfile
+import unittest
+import zlib
+
+from pw_transfer.journal import (
+    JournalEntry,
+    JournalingProgressCallback,
+    JournalingWriter,
+    TransferJournal,
+    checksum_stream,
+)
+from pw_transfer.transfer import ProgressStats
+
+
+# pylint: disable=missing-function-docstring
+
+
+class TransferJournalTest(unittest.TestCase):
+    """Tests for the TransferJournal class."""
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._path = Path(self._temp_dir.name, 'journal')
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def test_load_missing(self) -> None:
+        self.assertIsNone(TransferJournal(self._path, 1, 'read').load())
+
+    def test_record_and_load(self) -> None:
+        journal = TransferJournal(self._path, 1, 'read', initial_offset=10)
+        journal.record(JournalEntry(20, 1234))
+        journal.record(JournalEntry(30, 5678))
+
+        self.assertEqual(journal.load(), JournalEntry(30, 5678))
+        # The temporary file used to replace the journal is not left behind.
+        self.assertEqual(
+            list(Path(self._temp_dir.name).iterdir()), [self._path]
+        )
+
+    def test_ignores_other_transfers(self) -> None:
+        TransferJournal(self._path, 1, 'read').record(JournalEntry(20, 1234))
+
+        self.assertIsNone(TransferJournal(self._path, 2, 'read').load())
+        self.assertIsNone(TransferJournal(self._path, 1, 'write').load())
+        self.assertIsNone(TransferJournal(self._path, 1, 'read', 5).load())
+
+    def test_ignores_malformed_file(self) -> None:
+        self._path.write_text('{"resource_id": 1')
+        self.assertIsNone(TransferJournal(self._path, 1, 'read').load())
+
+    def test_clear(self) -> None:
+        journal = TransferJournal(self._path, 1, 'read')
+        journal.record(JournalEntry(20, 1234))
+        journal.clear()
+        journal.clear()  # Clearing again has no effect.
+
+        self.assertFalse(self._path.exists())
+
+
+class JournalingTest(unittest.TestCase):
+    """Tests for recording transfer progress."""
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._journal = TransferJournal(
+            Path(self._temp_dir.name, 'journal'), 1, 'read'
+        )
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def test_checksum_stream(self) -> None:
+        stream = io.BytesIO(b'abcdef')
+        self.assertEqual(checksum_stream(stream, 4), (4, zlib.crc32(b'abcd')))
+        self.assertEqual(checksum_stream(stream, 4), (2, zlib.crc32(b'ef')))
+
+    def test_writer_records_at_interval(self) -> None:
+        output = io.BytesIO()
+        writer = JournalingWriter(
+            output,
+            self._journal,
+            JournalEntry(2, zlib.crc32(b'xy')),
+            interval_bytes=4,
+        )
+
+        writer.write(b'abc')
+        self.assertIsNone(self._journal.load())
+
+        writer.write(b'def')
+        self.assertEqual(
+            self._journal.load(), JournalEntry(8, zlib.crc32(b'xyabcdef'))
+        )
+
+        writer.write(b'g')
+        writer.record()
+        self.assertEqual(
+            self._journal.load(), JournalEntry(9, zlib.crc32(b'xyabcdefg'))
+        )
+        self.assertEqual(output.getvalue(), b'abcdefg')
+
+    def test_progress_callback_records_confirmed_data(self) -> None:
+        progress: list[ProgressStats] = []
+        callback = JournalingProgressCallback(
+            b'abcdefgh',
+            10,
+            self._journal,
+            JournalEntry(10, 0),
+            progress.append,
+            interval_bytes=4,
+        )
+
+        callback(ProgressStats(13, 12, 8))
+        self.assertIsNone(self._journal.load())
+
+        callback(ProgressStats(16, 15, 8))
+        self.assertEqual(
+            self._journal.load(), JournalEntry(15, zlib.crc32(b'abcde'))
+        )
+
+        # The receiver requested data again from an earlier offset.
+        callback(ProgressStats(16, 13, 8))
+        self.assertEqual(
+            self._journal.load(), JournalEntry(13, zlib.crc32(b'abc'))
+        )
+
+        callback(ProgressStats(18, 18, 8))
+        callback.record()
+        self.assertEqual(
+            self._journal.load(), JournalEntry(18, zlib.crc32(b'abcdefgh'))
+        )
+        self.assertEqual(len(progress), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
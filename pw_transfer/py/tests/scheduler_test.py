@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# Copyright 2024 The Pigweed Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""Tests for the transfer scheduler."""
+
+import unittest
+
+from pw_transfer.scheduler import ScheduledTransfer, TransferScheduler
+
+
+# pylint: disable=missing-function-docstring
+
+
+class TransferSchedulerTest(unittest.TestCase):
+    """Tests for the TransferScheduler class."""
+
+    def setUp(self) -> None:
+        self._started: list[str] = []
+        self._windows: dict[str, list[int]] = {}
+
+    def _transfer(
+        self, queue: str, name: str, read: bool = False, cancelled=False
+    ) -> ScheduledTransfer:
+        def start() -> bool:
+            if cancelled:
+                return False
+            self._started.append(name)
+            return True
+
+        def limit_window_size(size: int) -> None:
+            self._windows.setdefault(name, []).append(size)
+
+        return ScheduledTransfer(
+            queue, start, limit_window_size if read else None
+        )
+
+    def test_unlimited_starts_immediately(self) -> None:
+        scheduler = TransferScheduler()
+        for i in range(5):
+            scheduler.submit(self._transfer('a', str(i)))
+
+        self.assertEqual(self._started, ['0', '1', '2', '3', '4'])
+        self.assertEqual(scheduler.active_transfers, 5)
+        self.assertEqual(scheduler.pending_transfers, 0)
+
+    def test_limits_concurrent_transfers(self) -> None:
+        scheduler = TransferScheduler(max_concurrent_transfers=2)
+        transfers = [self._transfer('a', str(i)) for i in range(4)]
+        for transfer in transfers:
+            scheduler.submit(transfer)
+
+        self.assertEqual(self._started, ['0', '1'])
+        self.assertEqual(scheduler.pending_transfers, 2)
+
+        scheduler.finished(transfers[1])
+        self.assertEqual(self._started, ['0', '1', '2'])
+
+        scheduler.finished(transfers[0])
+        scheduler.finished(transfers[0])  # Finishing again has no effect.
+        self.assertEqual(self._started, ['0', '1', '2', '3'])
+        self.assertEqual(scheduler.active_transfers, 2)
+        self.assertEqual(scheduler.pending_transfers, 0)
+
+    def test_queues_take_turns(self) -> None:
+        scheduler = TransferScheduler(max_concurrent_transfers=1)
+        transfers = {
+            name: self._transfer(name[0], name)
+            for name in ('a0', 'a1', 'a2', 'a3', 'b0', 'b1')
+        }
+        for transfer in transfers.values():
+            scheduler.submit(transfer)
+
+        while len(self._started) < len(transfers):
+            scheduler.finished(transfers[self._started[-1]])
+
+        self.assertEqual(self._started, ['a0', 'a1', 'b0', 'a2', 'b1', 'a3'])
+
+    def test_skips_cancelled_transfers(self) -> None:
+        scheduler = TransferScheduler(max_concurrent_transfers=1)
+        first = self._transfer('a', '0')
+        scheduler.submit(first)
+        scheduler.submit(self._transfer('a', '1', cancelled=True))
+        scheduler.submit(self._transfer('a', '2'))
+
+        scheduler.finished(first)
+        self.assertEqual(self._started, ['0', '2'])
+        self.assertEqual(scheduler.active_transfers, 1)
+        self.assertEqual(scheduler.pending_transfers, 0)
+
+    def test_shares_window_between_reads(self) -> None:
+        scheduler = TransferScheduler(max_window_size_bytes=4096)
+        first = self._transfer('a', 'r0', read=True)
+        scheduler.submit(first)
+        scheduler.submit(self._transfer('a', 'w0'))
+        scheduler.submit(self._transfer('b', 'r1', read=True))
+
+        self.assertEqual(self._windows['r0'], [4096, 4096, 2048])
+        self.assertEqual(self._windows['r1'], [2048])
+
+        scheduler.finished(first)
+        self.assertEqual(self._windows['r1'], [2048, 4096])
+
+    def test_invalid_limits(self) -> None:
+        with self.assertRaises(ValueError):
+            TransferScheduler(max_concurrent_transfers=0)
+
+        with self.assertRaises(ValueError):
+            TransferScheduler(max_window_size_bytes=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,17 +15,22 @@
 """Tests for the transfer service client."""
 
 import enum
+import io
 import math
 import os
+from pathlib import Path
+import tempfile
 import unittest
-from typing import Iterable
+import zlib
+from typing import AsyncIterator, Iterable
 
 from pw_status import Status
 from pw_rpc import callback_client, client, ids, packets
 from pw_rpc.internal import packet_pb2
 
 import pw_transfer
-from pw_transfer import ProtocolVersion
+from pw_transfer import ProtocolVersion, transfer
+from pw_transfer.journal import JournalEntry, TransferJournal
 
 try:
     from pw_transfer import transfer_pb2
@@ -197,6 +202,41 @@ class TransferManagerTest(unittest.TestCase):
             ],
         )
 
+    def test_read_transfer_into_stream(self) -> None:
+        manager = pw_transfer.Manager(
+            self._service, default_response_timeout_s=DEFAULT_TIMEOUT_S
+        )
+
+        self._enqueue_server_responses(
+            _Method.READ,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=0, data=b'abc', remaining_bytes=3
+                    ),
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=3, data=b'def', remaining_bytes=0
+                    ),
+                ),
+            ),
+        )
+
+        output = io.BytesIO(b'xy')
+        output.seek(0, io.SEEK_END)
+        progress: list[pw_transfer.ProgressStats] = []
+
+        manager.read_into(3, output, progress.append)
+        self.assertEqual(output.getvalue(), b'xyabcdef')
+        self.assertEqual(len(self._sent_chunks), 2)
+        self.assertEqual(self._sent_chunks[-1].status, 0)
+        self.assertEqual(
+            progress,
+            [
+                pw_transfer.ProgressStats(3, 3, 6),
+                pw_transfer.ProgressStats(6, 6, 6),
+            ],
+        )
+
     def test_read_transfer_retry_bad_offset(self) -> None:
         """Server responds with an unexpected offset in a read transfer."""
         manager = pw_transfer.Manager(
@@ -305,6 +345,161 @@ class TransferManagerTest(unittest.TestCase):
             self._sent_chunks[3].type, transfer_pb2.Chunk.Type.COMPLETION
         )
 
+    def test_read_transfer_buffered_out_of_order_chunk(self) -> None:
+        manager = pw_transfer.Manager(
+            self._service,
+            default_response_timeout_s=DEFAULT_TIMEOUT_S,
+            buffer_out_of_order_chunks=True,
+        )
+
+        self._enqueue_server_responses(
+            _Method.READ,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=0, data=b'abc', remaining_bytes=6
+                    ),
+                    # The chunk at offset 3 was lost.
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=6, data=b'ghi', remaining_bytes=0
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=3, data=b'def', remaining_bytes=3
+                    ),
+                ),
+            ),
+        )
+
+        data = manager.read(3)
+        self.assertEqual(data, b'abcdefghi')
+
+        # The buffered chunk completes the transfer once the gap is filled.
+        self.assertEqual(len(self._sent_chunks), 3)
+        self.assertEqual(
+            self._sent_chunks[1].type,
+            transfer_pb2.Chunk.Type.PARAMETERS_RETRANSMIT,
+        )
+        self.assertEqual(self._sent_chunks[1].offset, 3)
+        self.assertTrue(self._sent_chunks[-1].HasField('status'))
+        self.assertEqual(self._sent_chunks[-1].status, 0)
+
+    def test_read_transfer_buffered_multiple_gaps(self) -> None:
+        manager = pw_transfer.Manager(
+            self._service,
+            default_response_timeout_s=DEFAULT_TIMEOUT_S,
+            buffer_out_of_order_chunks=True,
+        )
+
+        self._enqueue_server_responses(
+            _Method.READ,
+            (
+                (
+                    transfer_pb2.Chunk(transfer_id=3, offset=0, data=b'ab'),
+                    transfer_pb2.Chunk(transfer_id=3, offset=4, data=b'ef'),
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=8, data=b'ij', remaining_bytes=0
+                    ),
+                ),
+                (transfer_pb2.Chunk(transfer_id=3, offset=2, data=b'cd'),),
+                (transfer_pb2.Chunk(transfer_id=3, offset=6, data=b'gh'),),
+            ),
+        )
+
+        data = manager.read(3)
+        self.assertEqual(data, b'abcdefghij')
+
+        # Each gap is requested once. Filling the first gap moves the server
+        # past the buffered chunk to the second gap.
+        self.assertEqual(
+            [(chunk.type, chunk.offset) for chunk in self._sent_chunks[1:3]],
+            [
+                (transfer_pb2.Chunk.Type.PARAMETERS_RETRANSMIT, 2),
+                (transfer_pb2.Chunk.Type.PARAMETERS_RETRANSMIT, 6),
+            ],
+        )
+        self.assertEqual(len(self._sent_chunks), 4)
+        self.assertEqual(self._sent_chunks[-1].status, 0)
+
+    def test_read_transfer_buffered_missing_data_lost_again(self) -> None:
+        manager = pw_transfer.Manager(
+            self._service,
+            default_response_timeout_s=DEFAULT_TIMEOUT_S,
+            buffer_out_of_order_chunks=True,
+        )
+
+        self._enqueue_server_responses(
+            _Method.READ,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=0, data=b'abc', remaining_bytes=6
+                    ),
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=6, data=b'ghi', remaining_bytes=0
+                    ),
+                ),
+                # The retransmitted chunk at offset 3 was lost again.
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=6, data=b'ghi', remaining_bytes=0
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=3, data=b'def', remaining_bytes=3
+                    ),
+                ),
+            ),
+        )
+
+        data = manager.read(3)
+        self.assertEqual(data, b'abcdefghi')
+
+        # The missing data is requested again without waiting for a timeout.
+        self.assertEqual(
+            [(chunk.type, chunk.offset) for chunk in self._sent_chunks[1:3]],
+            [
+                (transfer_pb2.Chunk.Type.PARAMETERS_RETRANSMIT, 3),
+                (transfer_pb2.Chunk.Type.PARAMETERS_RETRANSMIT, 3),
+            ],
+        )
+        self.assertEqual(len(self._sent_chunks), 4)
+        self.assertEqual(self._sent_chunks[-1].status, 0)
+
+    def test_read_transfer_buffered_ignores_repeated_data(self) -> None:
+        manager = pw_transfer.Manager(
+            self._service,
+            default_response_timeout_s=DEFAULT_TIMEOUT_S,
+            buffer_out_of_order_chunks=True,
+        )
+
+        self._enqueue_server_responses(
+            _Method.READ,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=0, data=b'abc', remaining_bytes=3
+                    ),
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=0, data=b'abc', remaining_bytes=3
+                    ),
+                    # Overlaps data that was already received.
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=2, data=b'cdef', remaining_bytes=0
+                    ),
+                ),
+            ),
+        )
+
+        data = manager.read(3)
+        self.assertEqual(data, b'abcdef')
+
+        # No retransmission was requested.
+        self.assertEqual(len(self._sent_chunks), 2)
+        self.assertEqual(self._sent_chunks[-1].status, 0)
+
     def test_read_transfer_retry_timeout(self) -> None:
         """Server doesn't respond to read transfer parameters."""
         manager = pw_transfer.Manager(
@@ -472,6 +667,201 @@ class TransferManagerTest(unittest.TestCase):
         self.assertEqual(exception.resource_id, 31)
         self.assertEqual(exception.status, Status.INTERNAL)
 
+    def test_submit_read_limits_concurrent_transfers(self) -> None:
+        manager = pw_transfer.Manager(
+            self._service,
+            default_response_timeout_s=DEFAULT_TIMEOUT_S,
+            default_protocol_version=ProtocolVersion.LEGACY,
+            scheduler=pw_transfer.TransferScheduler(max_concurrent_transfers=1),
+        )
+
+        self._enqueue_server_responses(
+            _Method.READ,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=3, offset=0, data=b'abc', remaining_bytes=0
+                    ),
+                ),
+                # No response to the first transfer's completion chunk.
+                (),
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=4, offset=0, data=b'def', remaining_bytes=0
+                    ),
+                ),
+            ),
+        )
+
+        futures = [manager.submit_read(3), manager.submit_read(4)]
+
+        self.assertEqual([f.result() for f in futures], [b'abc', b'def'])
+
+        # The second transfer only starts once the first has finished.
+        self.assertEqual(
+            [
+                (chunk.transfer_id, chunk.HasField('status'))
+                for chunk in self._sent_chunks
+            ],
+            [(3, False), (3, True), (4, False), (4, True)],
+        )
+
+    def test_submit_read_cancel_queued_transfer(self) -> None:
+        manager = pw_transfer.Manager(
+            self._service,
+            initial_response_timeout_s=DEFAULT_TIMEOUT_S,
+            default_response_timeout_s=DEFAULT_TIMEOUT_S,
+            default_protocol_version=ProtocolVersion.LEGACY,
+            scheduler=pw_transfer.TransferScheduler(max_concurrent_transfers=1),
+        )
+
+        first = manager.submit_read(3)
+        second = manager.submit_read(4)
+
+        with self.assertRaises(ValueError):
+            manager.submit_read(4)
+
+        self.assertTrue(second.cancel())
+
+        with self.assertRaises(pw_transfer.Error) as context:
+            first.result()
+
+        self.assertEqual(context.exception.status, Status.DEADLINE_EXCEEDED)
+        self.assertTrue(second.cancelled())
+        self.assertTrue(self._sent_chunks)
+        self.assertTrue(all(c.transfer_id == 3 for c in self._sent_chunks))
+
+    def test_submit_read_error(self) -> None:
+        manager = pw_transfer.Manager(
+            self._service, default_response_timeout_s=DEFAULT_TIMEOUT_S
+        )
+
+        self._enqueue_server_responses(
+            _Method.READ,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=31, status=Status.NOT_FOUND.value
+                    ),
+                ),
+            ),
+        )
+
+        exception = manager.submit_read(31).exception()
+
+        assert isinstance(exception, pw_transfer.Error)
+        self.assertEqual(exception.resource_id, 31)
+        self.assertEqual(exception.status, Status.NOT_FOUND)
+
+    def test_submit_write_transfer(self) -> None:
+        manager = pw_transfer.Manager(
+            self._service, default_response_timeout_s=DEFAULT_TIMEOUT_S
+        )
+
+        self._enqueue_server_responses(
+            _Method.WRITE,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=4,
+                        offset=0,
+                        pending_bytes=32,
+                        max_chunk_size_bytes=8,
+                    ),
+                ),
+                (transfer_pb2.Chunk(transfer_id=4, status=Status.OK.value),),
+            ),
+        )
+
+        self.assertIsNone(manager.submit_write(4, b'hello').result())
+        self.assertEqual(self._received_data(), b'hello')
+
+    def test_scheduler_limits_read_window(self) -> None:
+        test_max_chunk_size = 16
+
+        manager = pw_transfer.Manager(
+            self._service,
+            default_response_timeout_s=DEFAULT_TIMEOUT_S,
+            max_chunk_size_bytes=test_max_chunk_size,
+            default_protocol_version=ProtocolVersion.LEGACY,
+            scheduler=pw_transfer.TransferScheduler(
+                max_window_size_bytes=2 * test_max_chunk_size
+            ),
+        )
+
+        self._enqueue_server_responses(
+            _Method.READ,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=_ARBITRARY_TRANSFER_ID,
+                        offset=i * test_max_chunk_size,
+                        data=b'#' * test_max_chunk_size,
+                    ),
+                )
+                for i in range(3)
+            ),
+        )
+        self._enqueue_server_responses(
+            _Method.READ,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=_ARBITRARY_TRANSFER_ID,
+                        offset=3 * test_max_chunk_size,
+                        data=b'#' * test_max_chunk_size,
+                        remaining_bytes=0,
+                    ),
+                ),
+            ),
+        )
+
+        data = manager.read(_ARBITRARY_TRANSFER_ID)
+        self.assertEqual(data, b'#' * (4 * test_max_chunk_size))
+
+        # Without the scheduler, the window would grow to 4 chunks.
+        self.assertEqual(
+            max(chunk.pending_bytes for chunk in self._sent_chunks),
+            2 * test_max_chunk_size,
+        )
+
+    def test_read_transfer_adaptive_congestion_control(self) -> None:
+        test_max_chunk_size = 16
+
+        manager = pw_transfer.Manager(
+            self._service,
+            default_response_timeout_s=DEFAULT_TIMEOUT_S,
+            max_chunk_size_bytes=test_max_chunk_size,
+            default_protocol_version=ProtocolVersion.LEGACY,
+            adaptive_congestion_control=True,
+        )
+
+        chunks = [
+            transfer_pb2.Chunk(
+                transfer_id=_ARBITRARY_TRANSFER_ID,
+                offset=i * test_max_chunk_size,
+                data=bytes([i]) * test_max_chunk_size,
+            )
+            for i in range(8)
+        ]
+        chunks[-1].remaining_bytes = 0
+        self._enqueue_server_responses(
+            _Method.READ, ((chunk,) for chunk in chunks)
+        )
+
+        data = manager.read(_ARBITRARY_TRANSFER_ID)
+
+        self.assertEqual(
+            data, b''.join(bytes([i]) * test_max_chunk_size for i in range(8))
+        )
+        self.assertTrue(self._sent_chunks[-1].HasField('status'))
+        self.assertEqual(self._sent_chunks[-1].status, Status.OK.value)
+
+        # The window never grows more than twofold at a time.
+        windows = [chunk.pending_bytes for chunk in self._sent_chunks[:-1]]
+        for previous, window in zip(windows, windows[1:]):
+            self.assertLessEqual(window, 2 * previous)
+
     def test_read_transfer_adaptive_window_slow_start(self) -> None:
         test_max_chunk_size = 16
 
@@ -1026,23 +1416,153 @@ class TransferManagerTest(unittest.TestCase):
                 (
                     transfer_pb2.Chunk(
                         transfer_id=4,
-                        offset=0,
-                        pending_bytes=32,
-                        max_chunk_size_bytes=8,
+                        offset=0,
+                        pending_bytes=32,
+                        max_chunk_size_bytes=8,
+                    ),
+                ),
+                (),
+                (transfer_pb2.Chunk(transfer_id=4, status=Status.OK.value),),
+            ),
+        )
+
+        manager.write(4, b'hello world')
+        self.assertEqual(len(self._sent_chunks), 3)
+        self.assertEqual(self._received_data(), b'hello world')
+        self.assertEqual(self._sent_chunks[1].data, b'hello wo')
+        self.assertEqual(self._sent_chunks[2].data, b'rld')
+
+    def test_write_transfer_multiple_parameters(self) -> None:
+        manager = pw_transfer.Manager(
+            self._service, default_response_timeout_s=DEFAULT_TIMEOUT_S
+        )
+
+        self._enqueue_server_responses(
+            _Method.WRITE,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=4,
+                        offset=0,
+                        pending_bytes=8,
+                        max_chunk_size_bytes=8,
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=4,
+                        offset=8,
+                        pending_bytes=8,
+                        max_chunk_size_bytes=8,
+                    ),
+                ),
+                (transfer_pb2.Chunk(transfer_id=4, status=Status.OK.value),),
+            ),
+        )
+
+        manager.write(4, b'data to write')
+        self.assertEqual(len(self._sent_chunks), 3)
+        self.assertEqual(self._received_data(), b'data to write')
+        self.assertEqual(self._sent_chunks[1].data, b'data to ')
+        self.assertEqual(self._sent_chunks[2].data, b'write')
+
+    def test_write_transfer_progress_callback(self) -> None:
+        manager = pw_transfer.Manager(
+            self._service, default_response_timeout_s=DEFAULT_TIMEOUT_S
+        )
+
+        self._enqueue_server_responses(
+            _Method.WRITE,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=4,
+                        offset=0,
+                        pending_bytes=8,
+                        max_chunk_size_bytes=8,
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=4,
+                        offset=8,
+                        pending_bytes=8,
+                        max_chunk_size_bytes=8,
+                    ),
+                ),
+                (transfer_pb2.Chunk(transfer_id=4, status=Status.OK.value),),
+            ),
+        )
+
+        progress: list[pw_transfer.ProgressStats] = []
+
+        manager.write(4, b'data to write', progress.append)
+        self.assertEqual(len(self._sent_chunks), 3)
+        self.assertEqual(self._received_data(), b'data to write')
+        self.assertEqual(self._sent_chunks[1].data, b'data to ')
+        self.assertEqual(self._sent_chunks[2].data, b'write')
+        self.assertEqual(
+            progress,
+            [
+                pw_transfer.ProgressStats(8, 0, 13),
+                pw_transfer.ProgressStats(13, 8, 13),
+                pw_transfer.ProgressStats(13, 13, 13),
+            ],
+        )
+
+    def test_write_transfer_rewind(self) -> None:
+        """Write transfer in which the server re-requests an earlier offset."""
+        manager = pw_transfer.Manager(
+            self._service, default_response_timeout_s=DEFAULT_TIMEOUT_S
+        )
+
+        self._enqueue_server_responses(
+            _Method.WRITE,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=4,
+                        offset=0,
+                        pending_bytes=8,
+                        max_chunk_size_bytes=8,
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=4,
+                        offset=8,
+                        pending_bytes=8,
+                        max_chunk_size_bytes=8,
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=4,
+                        offset=4,  # rewind
+                        pending_bytes=8,
+                        max_chunk_size_bytes=8,
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=4,
+                        offset=12,
+                        pending_bytes=16,  # update max size
+                        max_chunk_size_bytes=16,
                     ),
                 ),
-                (),
                 (transfer_pb2.Chunk(transfer_id=4, status=Status.OK.value),),
             ),
         )
 
-        manager.write(4, b'hello world')
-        self.assertEqual(len(self._sent_chunks), 3)
-        self.assertEqual(self._received_data(), b'hello world')
-        self.assertEqual(self._sent_chunks[1].data, b'hello wo')
-        self.assertEqual(self._sent_chunks[2].data, b'rld')
+        manager.write(4, b'pigweed data transfer')
+        self.assertEqual(len(self._sent_chunks), 5)
+        self.assertEqual(self._sent_chunks[1].data, b'pigweed ')
+        self.assertEqual(self._sent_chunks[2].data, b'data tra')
+        self.assertEqual(self._sent_chunks[3].data, b'eed data')
+        self.assertEqual(self._sent_chunks[4].data, b' transfer')
 
-    def test_write_transfer_multiple_parameters(self) -> None:
+    def test_write_transfer_bad_offset(self) -> None:
         manager = pw_transfer.Manager(
             self._service, default_response_timeout_s=DEFAULT_TIMEOUT_S
         )
@@ -1061,7 +1581,7 @@ class TransferManagerTest(unittest.TestCase):
                 (
                     transfer_pb2.Chunk(
                         transfer_id=4,
-                        offset=8,
+                        offset=100,  # larger offset than data
                         pending_bytes=8,
                         max_chunk_size_bytes=8,
                     ),
@@ -1070,13 +1590,14 @@ class TransferManagerTest(unittest.TestCase):
             ),
         )
 
-        manager.write(4, b'data to write')
-        self.assertEqual(len(self._sent_chunks), 3)
-        self.assertEqual(self._received_data(), b'data to write')
-        self.assertEqual(self._sent_chunks[1].data, b'data to ')
-        self.assertEqual(self._sent_chunks[2].data, b'write')
+        with self.assertRaises(pw_transfer.Error) as context:
+            manager.write(4, b'small data')
 
-    def test_write_transfer_progress_callback(self) -> None:
+        exception = context.exception
+        self.assertEqual(exception.resource_id, 4)
+        self.assertEqual(exception.status, Status.OUT_OF_RANGE)
+
+    def test_write_transfer_from_stream(self) -> None:
         manager = pw_transfer.Manager(
             self._service, default_response_timeout_s=DEFAULT_TIMEOUT_S
         )
@@ -1106,22 +1627,22 @@ class TransferManagerTest(unittest.TestCase):
 
         progress: list[pw_transfer.ProgressStats] = []
 
-        manager.write(4, b'data to write', progress.append)
+        manager.write_from(4, io.BytesIO(b'data to write'), progress.append)
         self.assertEqual(len(self._sent_chunks), 3)
-        self.assertEqual(self._received_data(), b'data to write')
         self.assertEqual(self._sent_chunks[1].data, b'data to ')
+        self.assertFalse(self._sent_chunks[1].HasField('remaining_bytes'))
         self.assertEqual(self._sent_chunks[2].data, b'write')
+        self.assertEqual(self._sent_chunks[2].remaining_bytes, 0)
         self.assertEqual(
             progress,
             [
-                pw_transfer.ProgressStats(8, 0, 13),
+                pw_transfer.ProgressStats(8, 0, None),
                 pw_transfer.ProgressStats(13, 8, 13),
                 pw_transfer.ProgressStats(13, 13, 13),
             ],
         )
 
-    def test_write_transfer_rewind(self) -> None:
-        """Write transfer in which the server re-requests an earlier offset."""
+    def test_write_transfer_from_stream_ends_at_window(self) -> None:
         manager = pw_transfer.Manager(
             self._service, default_response_timeout_s=DEFAULT_TIMEOUT_S
         )
@@ -1137,42 +1658,56 @@ class TransferManagerTest(unittest.TestCase):
                         max_chunk_size_bytes=8,
                     ),
                 ),
+                (transfer_pb2.Chunk(transfer_id=4, status=Status.OK.value),),
+            ),
+        )
+
+        manager.write_from(4, io.BytesIO(b'8 bytes!'))
+        self.assertEqual(len(self._sent_chunks), 2)
+        self.assertEqual(self._sent_chunks[1].data, b'8 bytes!')
+        self.assertEqual(self._sent_chunks[1].remaining_bytes, 0)
+
+    def test_write_transfer_from_async_iterable_rewind(self) -> None:
+        manager = pw_transfer.Manager(
+            self._service, default_response_timeout_s=DEFAULT_TIMEOUT_S
+        )
+
+        self._enqueue_server_responses(
+            _Method.WRITE,
+            (
                 (
                     transfer_pb2.Chunk(
                         transfer_id=4,
-                        offset=8,
-                        pending_bytes=8,
-                        max_chunk_size_bytes=8,
-                    ),
-                ),
-                (
-                    transfer_pb2.Chunk(
-                        transfer_id=4,
-                        offset=4,  # rewind
-                        pending_bytes=8,
+                        offset=0,
+                        pending_bytes=16,
                         max_chunk_size_bytes=8,
                     ),
                 ),
+                (),
                 (
                     transfer_pb2.Chunk(
                         transfer_id=4,
-                        offset=12,
-                        pending_bytes=16,  # update max size
-                        max_chunk_size_bytes=16,
+                        offset=4,  # rewind within the unconfirmed data
+                        pending_bytes=32,
+                        max_chunk_size_bytes=32,
                     ),
                 ),
                 (transfer_pb2.Chunk(transfer_id=4, status=Status.OK.value),),
             ),
         )
 
-        manager.write(4, b'pigweed data transfer')
-        self.assertEqual(len(self._sent_chunks), 5)
+        async def blocks() -> AsyncIterator[bytes]:
+            for block in (b'pig', b'weed data ', b'transfer'):
+                yield block
+
+        manager.write_from(4, blocks())
+        self.assertEqual(len(self._sent_chunks), 4)
         self.assertEqual(self._sent_chunks[1].data, b'pigweed ')
         self.assertEqual(self._sent_chunks[2].data, b'data tra')
-        self.assertEqual(self._sent_chunks[3].data, b'eed data')
-        self.assertEqual(self._sent_chunks[4].data, b' transfer')
+        self.assertEqual(self._sent_chunks[3].data, b'eed data transfer')
+        self.assertEqual(self._sent_chunks[3].remaining_bytes, 0)
 
-    def test_write_transfer_bad_offset(self) -> None:
+    def test_write_transfer_from_stream_rewind_past_confirmed(self) -> None:
         manager = pw_transfer.Manager(
             self._service, default_response_timeout_s=DEFAULT_TIMEOUT_S
         )
@@ -1191,21 +1726,26 @@ class TransferManagerTest(unittest.TestCase):
                 (
                     transfer_pb2.Chunk(
                         transfer_id=4,
-                        offset=100,  # larger offset than data
+                        offset=8,
+                        pending_bytes=8,
+                        max_chunk_size_bytes=8,
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        transfer_id=4,
+                        offset=4,  # data before offset 8 was discarded
                         pending_bytes=8,
                         max_chunk_size_bytes=8,
                     ),
                 ),
-                (transfer_pb2.Chunk(transfer_id=4, status=Status.OK.value),),
             ),
         )
 
         with self.assertRaises(pw_transfer.Error) as context:
-            manager.write(4, b'small data')
+            manager.write_from(4, io.BytesIO(b'pigweed data transfer'))
 
-        exception = context.exception
-        self.assertEqual(exception.resource_id, 4)
-        self.assertEqual(exception.status, Status.OUT_OF_RANGE)
+        self.assertEqual(context.exception.status, Status.OUT_OF_RANGE)
 
     def test_write_transfer_error(self) -> None:
         manager = pw_transfer.Manager(
@@ -1550,6 +2090,208 @@ class TransferManagerTest(unittest.TestCase):
 
         self.assertEqual(self._received_data(), b'write version 2')
 
+    def test_v2_read_transfer_resume_from_journal(self) -> None:
+        """Tests resuming a read transfer from the offset in its journal."""
+        manager = pw_transfer.Manager(
+            self._service,
+            default_response_timeout_s=DEFAULT_TIMEOUT_S,
+            default_protocol_version=ProtocolVersion.VERSION_TWO,
+        )
+
+        self._enqueue_server_responses(
+            _Method.READ,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        resource_id=39,
+                        session_id=_FIRST_SESSION_ID,
+                        type=transfer_pb2.Chunk.Type.START_ACK,
+                        protocol_version=ProtocolVersion.VERSION_TWO.value,
+                        initial_offset=4,
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        session_id=_FIRST_SESSION_ID,
+                        type=transfer_pb2.Chunk.Type.DATA,
+                        offset=4,
+                        data=b'efgh',
+                        remaining_bytes=0,
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        session_id=_FIRST_SESSION_ID,
+                        type=transfer_pb2.Chunk.Type.COMPLETION_ACK,
+                    ),
+                ),
+            ),
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            journal_path = Path(temp_dir, 'journal')
+            TransferJournal(journal_path, 39, 'read').record(
+                JournalEntry(4, zlib.crc32(b'abcd'))
+            )
+
+            # Data after the journaled offset was not confirmed, so it is
+            # replaced.
+            output = io.BytesIO(b'abcdXX')
+            manager.read_into(39, output, journal_path=journal_path)
+
+            self.assertFalse(journal_path.exists())
+
+        self.assertEqual(output.getvalue(), b'abcdefgh')
+        self.assertEqual(self._sent_chunks[0].initial_offset, 4)
+
+    def test_v2_read_transfer_journal_mismatch_restarts(self) -> None:
+        """Tests that a journal not matching the output is discarded."""
+        manager = pw_transfer.Manager(
+            self._service,
+            default_response_timeout_s=DEFAULT_TIMEOUT_S,
+            default_protocol_version=ProtocolVersion.VERSION_TWO,
+        )
+
+        self._enqueue_server_responses(
+            _Method.READ,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        resource_id=39,
+                        session_id=_FIRST_SESSION_ID,
+                        type=transfer_pb2.Chunk.Type.START_ACK,
+                        protocol_version=ProtocolVersion.VERSION_TWO.value,
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        session_id=_FIRST_SESSION_ID,
+                        type=transfer_pb2.Chunk.Type.DATA,
+                        offset=0,
+                        data=b'abcdefgh',
+                        remaining_bytes=0,
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        session_id=_FIRST_SESSION_ID,
+                        type=transfer_pb2.Chunk.Type.COMPLETION_ACK,
+                    ),
+                ),
+            ),
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            journal_path = Path(temp_dir, 'journal')
+            TransferJournal(journal_path, 39, 'read').record(
+                JournalEntry(4, zlib.crc32(b'abcd'))
+            )
+
+            output = io.BytesIO(b'wxyz')
+            manager.read_into(39, output, journal_path=journal_path)
+
+        self.assertEqual(output.getvalue(), b'abcdefgh')
+        self.assertEqual(self._sent_chunks[0].initial_offset, 0)
+
+    def test_v2_read_transfer_error_keeps_journal(self) -> None:
+        """Tests that a failed read records its progress in the journal."""
+        manager = pw_transfer.Manager(
+            self._service,
+            default_response_timeout_s=DEFAULT_TIMEOUT_S,
+            default_protocol_version=ProtocolVersion.VERSION_TWO,
+        )
+
+        self._enqueue_server_responses(
+            _Method.READ,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        resource_id=39,
+                        session_id=_FIRST_SESSION_ID,
+                        type=transfer_pb2.Chunk.Type.START_ACK,
+                        protocol_version=ProtocolVersion.VERSION_TWO.value,
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        session_id=_FIRST_SESSION_ID,
+                        type=transfer_pb2.Chunk.Type.DATA,
+                        offset=0,
+                        data=b'abcd',
+                    ),
+                    transfer_pb2.Chunk(
+                        session_id=_FIRST_SESSION_ID,
+                        type=transfer_pb2.Chunk.Type.COMPLETION,
+                        status=Status.UNAVAILABLE.value,
+                    ),
+                ),
+            ),
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            journal_path = Path(temp_dir, 'journal')
+            output = io.BytesIO()
+
+            with self.assertRaises(pw_transfer.Error):
+                manager.read_into(39, output, journal_path=journal_path)
+
+            self.assertEqual(
+                TransferJournal(journal_path, 39, 'read').load(),
+                JournalEntry(4, zlib.crc32(b'abcd')),
+            )
+
+    def test_v2_write_transfer_resume_from_journal(self) -> None:
+        """Tests resuming a write transfer from the offset in its journal."""
+        manager = pw_transfer.Manager(
+            self._service,
+            default_response_timeout_s=DEFAULT_TIMEOUT_S,
+            default_protocol_version=ProtocolVersion.VERSION_TWO,
+        )
+
+        self._enqueue_server_responses(
+            _Method.WRITE,
+            (
+                (
+                    transfer_pb2.Chunk(
+                        resource_id=72,
+                        session_id=_FIRST_SESSION_ID,
+                        type=transfer_pb2.Chunk.Type.START_ACK,
+                        protocol_version=ProtocolVersion.VERSION_TWO.value,
+                        initial_offset=8,
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        session_id=_FIRST_SESSION_ID,
+                        type=transfer_pb2.Chunk.Type.PARAMETERS_RETRANSMIT,
+                        offset=8,
+                        window_end_offset=32,
+                        max_chunk_size_bytes=8,
+                    ),
+                ),
+                (
+                    transfer_pb2.Chunk(
+                        session_id=_FIRST_SESSION_ID,
+                        type=transfer_pb2.Chunk.Type.COMPLETION,
+                        status=Status.OK.value,
+                    ),
+                ),
+            ),
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            journal_path = Path(temp_dir, 'journal')
+            TransferJournal(journal_path, 72, 'write').record(
+                JournalEntry(8, zlib.crc32(b'write ve'))
+            )
+
+            manager.write(72, b'write version 2', journal_path=journal_path)
+
+            self.assertFalse(journal_path.exists())
+
+        self.assertEqual(self._sent_chunks[0].initial_offset, 8)
+        self.assertEqual(self._received_data(), b'rsion 2')
+
     def test_v2_write_transfer_legacy_fallback(self) -> None:
         """Tests a v2 write transfer when the server only supports legacy."""
         manager = pw_transfer.Manager(
@@ -1963,6 +2705,66 @@ class TransferManagerTest(unittest.TestCase):
         self.assertEqual(data, b'dropped completion')
 
 
+class LinkEstimatorTest(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def test_no_samples(self) -> None:
+        link = transfer._LinkEstimator()
+        self.assertIsNone(link.retransmit_timeout_s())
+        self.assertIsNone(link.bandwidth())
+        self.assertIsNone(link.bandwidth_delay_product())
+
+    def test_retransmit_timeout_from_first_sample(self) -> None:
+        link = transfer._LinkEstimator()
+        link.add_rtt_sample(0.2)
+
+        # SRTT + 4 * RTTVAR, where RTTVAR starts at half of the first sample.
+        timeout = link.retransmit_timeout_s()
+        assert timeout is not None
+        self.assertAlmostEqual(timeout, 0.2 + 4 * 0.1)
+
+    def test_retransmit_timeout_smoothed(self) -> None:
+        link = transfer._LinkEstimator()
+        link.add_rtt_sample(0.2)
+        link.add_rtt_sample(0.4)
+
+        rtt_variation = 0.75 * 0.1 + 0.25 * 0.2
+        smoothed_rtt = 0.875 * 0.2 + 0.125 * 0.4
+        timeout = link.retransmit_timeout_s()
+        assert timeout is not None
+        self.assertAlmostEqual(timeout, smoothed_rtt + 4 * rtt_variation)
+
+    def test_retransmit_timeout_bounds(self) -> None:
+        fast = transfer._LinkEstimator()
+        fast.add_rtt_sample(0.0001)
+        self.assertEqual(
+            fast.retransmit_timeout_s(),
+            transfer._LinkEstimator.MIN_RETRANSMIT_TIMEOUT_S,
+        )
+
+        slow = transfer._LinkEstimator()
+        slow.add_rtt_sample(1000)
+        self.assertEqual(
+            slow.retransmit_timeout_s(),
+            transfer._LinkEstimator.MAX_RETRANSMIT_TIMEOUT_S,
+        )
+
+    def test_bandwidth_delay_product(self) -> None:
+        link = transfer._LinkEstimator()
+        link.add_rtt_sample(0.3)
+        link.add_rtt_sample(0.1)
+        link.add_rtt_sample(0.2)
+        link.add_delivery_rate_sample(1000)
+        link.add_delivery_rate_sample(4000)
+        link.add_delivery_rate_sample(2000)
+
+        # The highest rate and the lowest RTT are used.
+        self.assertEqual(link.bandwidth(), 4000)
+        bandwidth_delay_product = link.bandwidth_delay_product()
+        assert bandwidth_delay_product is not None
+        self.assertAlmostEqual(bandwidth_delay_product, 400)
+
+
 class ProgressStatsTest(unittest.TestCase):
     def test_received_percent_known_total(self) -> None:
         self.assertEqual(